@@ -0,0 +1,57 @@
+'''Benchmark validate_attr using test_validate_attr_* cases of tests/utils.
+
+Run from root of repo: python -m benchmarks.validate_attr [--rounds ROUNDS]
+'''
+
+from typing import Dict, List, Tuple, Callable, Awaitable
+
+import argparse, asyncio, importlib, inspect, pathlib, time
+
+
+def _collect_cases() -> List[Tuple[str, str, Callable[[], Awaitable[None]]]]:
+	# [DOC] Collect cases calling validate_attr, and not requiring fixtures, as these are callable as-is outside pytest
+	cases = []
+	tests_path = pathlib.Path(__file__).parent.parent / 'tests' / 'utils'
+	for test_file in sorted(tests_path.glob('test_validate_attr_*.py')):
+		test_module = importlib.import_module(f'tests.utils.{test_file.stem}')
+		for test_name, test_func in inspect.getmembers(
+			test_module, inspect.iscoroutinefunction
+		):
+			if (
+				test_name.startswith('test_')
+				and not inspect.signature(test_func).parameters
+				and 'validate_attr(' in inspect.getsource(test_func)
+			):
+				cases.append((test_file.stem.replace('test_validate_attr_', ''), test_name, test_func))
+	return cases
+
+
+async def _run_cases(*, rounds: int):
+	cases = _collect_cases()
+	timings: Dict[str, float] = {}
+	cases_count: Dict[str, int] = {}
+	for attr_type, _, test_func in cases:
+		start = time.perf_counter()
+		for _ in range(rounds):
+			await test_func()
+		timings[attr_type] = timings.get(attr_type, 0) + time.perf_counter() - start
+		cases_count[attr_type] = cases_count.get(attr_type, 0) + 1
+
+	print(f'{"Attr Type":<14}{"Cases":>7}{"Total (ms)":>14}{"Per call (us)":>16}')
+	for attr_type in timings.keys():
+		print(
+			f'{attr_type:<14}{cases_count[attr_type]:>7}{timings[attr_type] * 1000:>14.2f}'
+			f'{timings[attr_type] / (rounds * cases_count[attr_type]) * 1000000:>16.2f}'
+		)
+	total = sum(timings.values())
+	print(
+		f'{"TOTAL":<14}{len(cases):>7}{total * 1000:>14.2f}'
+		f'{total / (rounds * len(cases)) * 1000000:>16.2f}'
+	)
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument('--rounds', type=int, default=1000)
+	args = parser.parse_args()
+	asyncio.run(_run_cases(rounds=args.rounds))
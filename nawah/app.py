@@ -3,6 +3,7 @@ from typing import Dict, Any, Union, List, cast
 
 async def run_app():
 	from nawah.base_module import BaseModule
+	from nawah.base_method import _response_query
 	from nawah.enums import Event
 	from nawah.config import Config
 	from nawah import data as Data
@@ -11,11 +12,12 @@ async def run_app():
 		_process_file_obj,
 		validate_doc,
 		_config_data,
+		_warm_cache,
 		_compile_anon_user,
 		_compile_anon_session,
 	)
 	from nawah.classes import (
-		JSONEncoder,
+		_json_serializer,
 		DictObj,
 		NAWAH_ENV,
 		BaseModel,
@@ -93,7 +95,7 @@ async def run_app():
 		return aiohttp.web.Response(
 			status=404,
 			headers=headers,
-			body=JSONEncoder().encode({'status': 404, 'msg': '404 NOT FOUND'}),
+			body=_json_serializer().encode({'status': 404, 'msg': '404 NOT FOUND'}),
 		)
 
 	async def not_allowed_handler(request):
@@ -110,7 +112,7 @@ async def run_app():
 		return aiohttp.web.Response(
 			status=405,
 			headers=headers,
-			body=JSONEncoder().encode({'status': 405, 'msg': '404 NOT ALLOWED'}),
+			body=_json_serializer().encode({'status': 405, 'msg': '404 NOT ALLOWED'}),
 		)
 
 	async def root_handler(request: aiohttp.web.Request):
@@ -127,7 +129,7 @@ async def run_app():
 		return aiohttp.web.Response(
 			status=200,
 			headers=headers,
-			body=JSONEncoder().encode(
+			body=_json_serializer().encode(
 				{
 					'status': 200,
 					'msg': f'Welcome to {Config._app_name}!',
@@ -157,7 +159,7 @@ async def run_app():
 			return aiohttp.web.Response(
 				status=200,
 				headers=headers,
-				body=JSONEncoder().encode(
+				body=_json_serializer().encode(
 					{
 						'status': 200,
 						'msg': 'OPTIONS request is allowed.',
@@ -186,7 +188,7 @@ async def run_app():
 					return aiohttp.web.Response(
 						status=429,
 						headers=headers,
-						body=JSONEncoder().encode(
+						body=_json_serializer().encode(
 							{
 								'status': 429,
 								'msg': 'You have hit calls quota from this IP.',
@@ -220,7 +222,7 @@ async def run_app():
 					return aiohttp.web.Response(
 						status=400,
 						headers=headers,
-						body=JSONEncoder()
+						body=_json_serializer()
 						.encode(
 							{
 								'status': 400,
@@ -238,7 +240,7 @@ async def run_app():
 					return aiohttp.web.Response(
 						status=400,
 						headers=headers,
-						body=JSONEncoder()
+						body=_json_serializer()
 						.encode(
 							{
 								'status': 400,
@@ -278,7 +280,7 @@ async def run_app():
 				return aiohttp.web.Response(
 					status=400,
 					headers=headers,
-					body=JSONEncoder()
+					body=_json_serializer()
 					.encode(
 						{
 							'status': 400,
@@ -300,7 +302,7 @@ async def run_app():
 				return aiohttp.web.Response(
 					status=403,
 					headers=headers,
-					body=JSONEncoder()
+					body=_json_serializer()
 					.encode(
 						{
 							'status': 403,
@@ -326,7 +328,7 @@ async def run_app():
 					return aiohttp.web.Response(
 						status=500,
 						headers=headers,
-						body=JSONEncoder()
+						body=_json_serializer()
 						.encode(
 							{
 								'status': 500,
@@ -340,7 +342,7 @@ async def run_app():
 					return aiohttp.web.Response(
 						status=500,
 						headers=headers,
-						body=JSONEncoder()
+						body=_json_serializer()
 						.encode(
 							{
 								'status': 500,
@@ -360,7 +362,7 @@ async def run_app():
 				return aiohttp.web.Response(
 					status=403,
 					headers=headers,
-					body=JSONEncoder()
+					body=_json_serializer()
 					.encode(
 						{
 							'status': 403,
@@ -388,7 +390,7 @@ async def run_app():
 					return aiohttp.web.Response(
 						status=403,
 						headers=headers,
-						body=JSONEncoder().encode(session_results).encode('utf-8'),
+						body=_json_serializer().encode_bytes(session_results),
 					)
 				else:
 					session = session_results.args.session
@@ -417,9 +419,38 @@ async def run_app():
 			except Exception as e:
 				doc = {}
 
-		results = await Config.modules[module].methods[method](
-			env=env, query=[request_args], doc=doc
-		)
+		# [DOC] Mark call as client-facing, allowing Cache Sets to serve it pre-encoded response
+		response_token = _response_query.set(True)
+		try:
+			results = await Config.modules[module].methods[method](
+				env=env, query=[request_args], doc=doc
+			)
+		finally:
+			_response_query.reset(response_token)
+
+		# [DOC] Export stream reads docs from connection as it is written to response, close connection after writing it
+		if 'return' in results.args and results.args['return'] == 'stream':
+			export_stream = results.args['stream']
+			headers['Content-Type'] = export_stream.content_type
+			if export_stream.name:
+				headers['Content-Disposition'] = export_stream.content_disposition
+			response = aiohttp.web.StreamResponse(status=results.status, headers=headers)
+			await response.prepare(request)
+			try:
+				async for chunk in export_stream.encode():
+					await response.write(chunk)
+			except Exception:
+				# [DOC] Response status is already sent. Abort response without writing final chunk, so client sees incomplete transfer rather than truncated export
+				logger.error(f'An error occurred. Details: {traceback.format_exc()}.')
+				response.force_close()
+				if request.transport:
+					request.transport.close()
+				return response
+			finally:
+				logger.debug('Closing connection.')
+				env['conn'].close()
+			await response.write_eof()
+			return response
 
 		logger.debug('Closing connection.')
 		env['conn'].close()
@@ -432,15 +463,21 @@ async def run_app():
 				return aiohttp.web.Response(
 					status=results.status,
 					headers=headers,
-					body=JSONEncoder()
+					body=_json_serializer()
 					.encode({'status': 404, 'msg': 'Requested content not found.'})
 					.encode('utf-8'),
 				)
+			elif '__response' in results.args:
+				return aiohttp.web.Response(
+					status=results.status,
+					headers=headers,
+					body=results.args['__response'].encode('utf-8'),
+				)
 			else:
 				return aiohttp.web.Response(
 					status=results.status,
 					headers=headers,
-					body=JSONEncoder().encode(results),
+					body=_json_serializer().encode_bytes(results),
 				)
 		elif results.args['return'] == 'file':
 			del results.args['return']
@@ -463,7 +500,7 @@ async def run_app():
 		return aiohttp.web.Response(
 			status=405,
 			headers=headers,
-			body=JSONEncoder().encode({'status': 405, 'msg': 'METHOD NOT ALLOWED'}),
+			body=_json_serializer().encode({'status': 405, 'msg': 'METHOD NOT ALLOWED'}),
 		)
 
 	async def websocket_handler(request: aiohttp.web.Request):
@@ -498,7 +535,7 @@ async def run_app():
 		)
 
 		await ws.send_str(
-			JSONEncoder().encode(
+			_json_serializer().encode(
 				{
 					'status': 200,
 					'msg': 'Connection ready',
@@ -589,7 +626,7 @@ async def run_app():
 				res = jwt.decode(res['token'], env['session'].token, algorithms=['HS256'])
 			except Exception:
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 403,
 							'msg': 'Request token is not accepted.',
@@ -609,7 +646,7 @@ async def run_app():
 			# [DOC] Check if msg should be denied for quota hit
 			if decline_quota == 'ip':
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 429,
 							'msg': 'You have hit calls quota from this IP.',
@@ -623,7 +660,7 @@ async def run_app():
 				return
 			elif decline_quota == 'session':
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 429,
 							'msg': 'You have hit calls quota.',
@@ -636,11 +673,12 @@ async def run_app():
 				)
 				return
 
-			logger.debug(f'Decoded request: {JSONEncoder().encode(res)}')
+			if logger.isEnabledFor(logging.DEBUG):
+				logger.debug(f'Decoded request: {_json_serializer().encode(res)}')
 
 			if 'endpoint' not in res.keys():
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 400,
 							'msg': 'Request missing endpoint.',
@@ -656,7 +694,7 @@ async def run_app():
 			if env['init'] == False:
 				if res['endpoint'] != 'conn/verify':
 					await env['ws'].send_str(
-						JSONEncoder().encode(
+						_json_serializer().encode(
 							{
 								'status': 1008,
 								'msg': 'Request token is not accepted.',
@@ -680,7 +718,7 @@ async def run_app():
 						)
 					):
 						await env['ws'].send_str(
-							JSONEncoder().encode(
+							_json_serializer().encode(
 								{
 									'status': 1008,
 									'msg': 'Request token is not accepted.',
@@ -701,22 +739,19 @@ async def run_app():
 							env['client_app'] = res['doc']['app']
 						logger.debug(f'Connection on session #\'{env["id"]}\' is verified.')
 						if Config.analytics_events['app_conn_verified']:
-							asyncio.create_task(
-								Config.modules['analytic'].create(
-									skip_events=[Event.PERM],
-									env=env,
-									doc={
-										'event': 'CONN_VERIFIED',
-										'subevent': env['client_app'],
-										'args': {
-											'REMOTE_ADDR': env['REMOTE_ADDR'],
-											'HTTP_USER_AGENT': env['HTTP_USER_AGENT'],
-										},
+							Config.modules['analytic'].enqueue(
+								env=env,
+								doc={
+									'event': 'CONN_VERIFIED',
+									'subevent': env['client_app'],
+									'args': {
+										'REMOTE_ADDR': env['REMOTE_ADDR'],
+										'HTTP_USER_AGENT': env['HTTP_USER_AGENT'],
 									},
-								)
+								},
 							)
 						await env['ws'].send_str(
-							JSONEncoder().encode(
+							_json_serializer().encode(
 								{
 									'status': 200,
 									'msg': 'Connection established',
@@ -737,7 +772,7 @@ async def run_app():
 			if res['endpoint'] == 'heart/beat':
 				logger.debug(f'Received connection heartbeat on session #\'{env["id"]}\'.')
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 200,
 							'msg': 'Heartbeat received.',
@@ -756,7 +791,7 @@ async def run_app():
 				and str(env['session']._id) != 'f00000000000000000000012'
 			):
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 400,
 							'msg': 'You are already authed.',
@@ -773,7 +808,7 @@ async def run_app():
 				and str(env['session']._id) == 'f00000000000000000000012'
 			):
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 400,
 							'msg': 'Singout is not allowed for \'__ANON\' user.',
@@ -803,7 +838,7 @@ async def run_app():
 
 			if len(request['path']) != 2:
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 400,
 							'msg': 'Endpoint path is invalid.',
@@ -829,7 +864,7 @@ async def run_app():
 							watch_task['stream'].close()
 							watch_task['task'].cancel()
 						await env['ws'].send_str(
-							JSONEncoder().encode(
+							_json_serializer().encode(
 								{
 									'status': 200,
 									'msg': 'All watch tasks deleted.',
@@ -845,7 +880,7 @@ async def run_app():
 						env['watch_tasks'][request['query'][0]['watch']]['stream'].close()
 						env['watch_tasks'][request['query'][0]['watch']]['task'].cancel()
 						await env['ws'].send_str(
-							JSONEncoder().encode(
+							_json_serializer().encode(
 								{
 									'status': 200,
 									'msg': 'Watch task deleted.',
@@ -859,7 +894,7 @@ async def run_app():
 						del env['watch_tasks'][request['query'][0]['watch']]
 				except:
 					await env['ws'].send_str(
-						JSONEncoder().encode(
+						_json_serializer().encode(
 							{
 								'status': 400,
 								'msg': 'Watch is invalid.',
@@ -874,7 +909,7 @@ async def run_app():
 
 			if module not in Config.modules.keys():
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 400,
 							'msg': 'Endpoint module is invalid.',
@@ -889,7 +924,7 @@ async def run_app():
 
 			if request['path'][1].lower() not in Config.modules[module].methods.keys():
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 400,
 							'msg': 'Endpoint method is invalid.',
@@ -904,7 +939,7 @@ async def run_app():
 
 			if Config.modules[module].methods[request['path'][1].lower()].get_method:
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 400,
 							'msg': 'Endpoint method is a GET method.',
@@ -938,7 +973,7 @@ async def run_app():
 			logger.error(f'An error occurred. Details: {traceback.format_exc()}.')
 			if Config.debug:
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 500,
 							'msg': f'Unexpected error has occurred [{str(e)}].',
@@ -948,7 +983,7 @@ async def run_app():
 				)
 			else:
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 500,
 							'msg': 'Unexpected error has occurred.',
@@ -1078,6 +1113,37 @@ async def run_app():
 			except Exception:
 				logger.error(f'An error occurred. Details: {traceback.format_exc()}.')
 
+	async def analytics_loop():
+		# [DOC] Analytics Workflow - Flush occurrences of events buffered by request path
+		while True:
+			await asyncio.sleep(Config.analytics_flush_interval)
+			try:
+				await Config.modules['analytic'].flush(env=Config._sys_env)
+			except Exception:
+				logger.error(f'An error occurred. Details: {traceback.format_exc()}.')
+
+	async def diff_loop():
+		# [DOC] Diff Workflow - Flush Diff docs buffered by update calls
+		from nawah.packages.core.diff import Diff
+
+		Diff._buffering = True
+		while True:
+			await asyncio.sleep(Config.diff_flush_interval)
+			try:
+				await Config.modules['diff'].flush(env=Config._sys_env)
+			except Exception:
+				logger.error(f'An error occurred. Details: {traceback.format_exc()}.')
+
+	async def flush_buffers(*args):
+		# [DOC] Flush buffers of workflows before app exits, to not lose buffered docs
+		for module_name in ['analytic', 'diff']:
+			try:
+				await Config.modules[module_name].flush(env=Config._sys_env)
+			except Exception:
+				logger.error(f'An error occurred. Details: {traceback.format_exc()}.')
+		# [DOC] Wait for cache invalidations running in background, to not leave other app processes, shared Cache Backend stale
+		await asyncio.gather(*BaseModule._cache_invalidation_tasks, return_exceptions=True)
+
 	def create_error_middleware(overrides):
 		@aiohttp.web.middleware
 		async def error_middleware(request, handler):
@@ -1105,6 +1171,7 @@ async def run_app():
 				}
 			)
 		)
+		app.on_shutdown.append(flush_buffers)
 		app.router.add_route('GET', '/', root_handler)
 		app.router.add_route('*', '/ws', websocket_handler)
 		for route in get_routes:
@@ -1116,7 +1183,17 @@ async def run_app():
 		await aiohttp.web.run_app(app, host='0.0.0.0', port=Config.port)
 
 	async def loop_gather():
-		await asyncio.gather(jobs_loop(), web_loop())
+		# [DOC] Connect to Cache Bus, if configured, to receive cache invalidations from other app processes
+		if Config.cache_bus:
+			from nawah.cache import _process_cache_message
+
+			await Config.cache_bus.connect(on_message=_process_cache_message)
+		# [DOC] Warm Cache Sets before web_loop starts accepting traffic
+		await _warm_cache()
+		try:
+			await asyncio.gather(jobs_loop(), analytics_loop(), diff_loop(), web_loop())
+		finally:
+			await flush_buffers()
 
 	try:
 		asyncio.run(loop_gather())
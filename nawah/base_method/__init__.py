@@ -1 +1 @@
-from ._base_method import BaseMethod
\ No newline at end of file
+from ._base_method import BaseMethod, _response_query
\ No newline at end of file
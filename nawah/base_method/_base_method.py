@@ -5,7 +5,7 @@ from nawah.classes import (
 	DictObj,
 	BaseModel,
 	Query,
-	JSONEncoder,
+	_json_serializer,
 	ATTR,
 	NAWAH_EVENTS,
 	NAWAH_ENV,
@@ -23,6 +23,7 @@ from ._check_permissions import _check_permissions, InvalidPermissionsExcpetion
 from ._validate_args import _validate_args
 
 from asyncio import coroutine
+from contextvars import ContextVar
 from aiohttp.web import WebSocketResponse
 from typing import (
 	List,
@@ -47,6 +48,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger('nawah')
 
+# [DOC] Holds Query object of the client-facing call being processed, allowing Cache Sets to serve it pre-encoded response. HTTP handler sets it to True before calling method
+_response_query: ContextVar[Union[Query, bool, None]] = ContextVar(
+	'_response_query', default=None
+)
+
 
 class BaseMethod:
 	def __init__(
@@ -91,10 +97,17 @@ class BaseMethod:
 		query = cast(Union[NAWAH_QUERY, Query], query)
 		doc = cast(NAWAH_DOC, doc)
 		call_id = cast(str, call_id)
-		# [DOC] Convert list query to Query object
-		query = Query(copy.deepcopy(query))
-		# [DOC] deepcopy() doc object ro prevent mutating original doc
-		doc = copy.deepcopy(doc)
+		# [DOC] Check if call is client-facing, and unset _response_query so nested calls are not
+		response_call = bool(call_id and call_id != '__TEST__')
+		if _response_query.get() is True:
+			response_call = True
+			_response_query.set(None)
+		# [DOC] Convert list query to Query object. Query, doc of client-facing calls are decoded from request for the call, and are owned by it. Otherwise, deepcopy() them to prevent mutating original objects of caller
+		if response_call:
+			query = Query(query)
+		else:
+			query = Query(copy.deepcopy(query))
+			doc = copy.deepcopy(doc)
 
 		logger.debug(
 			f'Calling: {self.module.module_name}.{self.method}, with skip_events:{skip_events}, query:{str(query)[:250]}, doc.keys:{doc.keys()}'
@@ -117,16 +130,11 @@ class BaseMethod:
 							doc=doc,
 							method=self.method,
 						)
-						analytic_results = await Config.modules['analytic'].create(
-							skip_events=[Event.PERM], env=env, doc=analytic_doc
-						)
+						# [DOC] Buffer Analytic doc, to be written by analytics flush without blocking call
+						Config.modules['analytic'].enqueue(env=env, doc=analytic_doc)
 					except Exception as e:
 						logger.error(
-							f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
-						)
-					if analytic_results.status != 200:
-						logger.error(
-							f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
+							f'Failed to buffer \'Analytic\' doc for call: {self.module.module_name}.{self.method}. Exception: {e}'
 						)
 
 		if Event.PERM not in skip_events and env['session']:
@@ -165,7 +173,7 @@ class BaseMethod:
 						while current is not None:
 							prev = current
 							current = current.tb_next
-						logger.error(f'Scope variables: {JSONEncoder().encode(prev.tb_frame.f_locals)}')
+						logger.error(f'Scope variables: {_json_serializer().encode(prev.tb_frame.f_locals)}')
 					return await self.return_results(
 						ws=env['ws'] if 'ws' in env.keys() else None,
 						results=DictObj(
@@ -311,7 +319,7 @@ class BaseMethod:
 			# [DOC] Call method function
 			if self.watch_method:
 				await env['ws'].send_str(
-					JSONEncoder().encode(
+					_json_serializer().encode(
 						{
 							'status': 200,
 							'msg': 'Created watch task.',
@@ -333,10 +341,13 @@ class BaseMethod:
 				env['watch_tasks'][call_id]['task'] = asyncio.create_task(watch_loop)
 				return None
 			else:
+				response_token = _response_query.set(query if response_call else None)
 				try:
 					results = await method(skip_events=skip_events, env=env, query=query, doc=doc)
 				except MethodException as e:
 					results = e.args[0]
+				finally:
+					_response_query.reset(response_token)
 
 				if type(results) == coroutine:
 					raise TypeError('Method returned coroutine rather than acceptable results format.')
@@ -347,7 +358,8 @@ class BaseMethod:
 				except Exception:
 					results['args'] = DictObj({})
 
-				logger.debug(f'Call results: {JSONEncoder().encode(results)}')
+				if logger.isEnabledFor(logging.DEBUG):
+					logger.debug(f'Call results: {_json_serializer().encode(results)}')
 				# [DOC] Check for session in results
 				if 'session' in results.args:
 					if results.args.session._id == 'f00000000000000000000012':
@@ -373,7 +385,7 @@ class BaseMethod:
 				while current is not None:
 					prev = current
 					current = current.tb_next
-				logger.error(f'Scope variables: {JSONEncoder().encode(prev.tb_frame.f_locals)}')
+				logger.error(f'Scope variables: {_json_serializer().encode(prev.tb_frame.f_locals)}')
 			query = Query([])
 			if Config.debug:
 				return await self.return_results(
@@ -410,9 +422,15 @@ class BaseMethod:
 		self, ws: Optional[WebSocketResponse], results: DictObj, call_id: Optional[str]
 	) -> Optional[DictObj]:
 		if call_id and call_id != '__TEST__':
-			results.args['call_id'] = call_id
 			ws = cast(WebSocketResponse, ws)
-			await ws.send_str(JSONEncoder().encode(results))
+			# [DOC] Send pre-encoded response served by Cache Set, with call_id spliced into its args
+			if '__response' in results.args:
+				await ws.send_str(
+					f'{results.args["__response"][:-2]}, "call_id": {_json_serializer().encode(call_id)}}}}}'
+				)
+				return None
+			results.args['call_id'] = call_id
+			await ws.send_str(_json_serializer().encode(results))
 			return None
 		else:
 			return results
@@ -441,6 +459,6 @@ class BaseMethod:
 			results.args['call_id'] = call_id
 			results.args['watch'] = call_id
 
-			await ws.send_str(JSONEncoder().encode(results))
+			await ws.send_str(_json_serializer().encode(results))
 
 		logger.debug('Generator ended at BaseMethod.')
@@ -3,6 +3,7 @@ from nawah.enums import Event, DELETE_STRATEGY, CACHE_STRATEGY, NAWAH_VALUES
 from nawah import data as Data
 from nawah.utils import (
 	validate_doc,
+	compile_attr,
 	_expand_attr,
 	_update_attr_values,
 )
@@ -10,6 +11,7 @@ from nawah.classes import (
 	DictObj,
 	BaseModel,
 	Query,
+	_json_serializer,
 	NAWAH_EVENTS,
 	NAWAH_ENV,
 	Query,
@@ -31,7 +33,8 @@ from nawah.classes import (
 	MissingAttrException,
 	ConvertAttrException,
 )
-from nawah.base_method import BaseMethod
+from nawah.classes._module import _cache_message_docs, _cache_message_doc
+from nawah.base_method import BaseMethod, _response_query
 
 from typing import (
 	List,
@@ -45,6 +48,7 @@ from typing import (
 	Literal,
 	Optional,
 	AsyncGenerator,
+	Set,
 )
 
 from PIL import Image
@@ -56,14 +60,18 @@ logger = logging.getLogger('nawah')
 
 class BaseModule:
 	_nawah_module: bool = True
+	# [DOC] References of background cache invalidation tasks, as event loop keeps weak references of tasks only
+	_cache_invalidation_tasks: Set['asyncio.Task'] = set()
 
 	collection: Optional[str]
 	attrs: Dict[str, ATTR]
 	diff: Union[bool, ATTR]
 	create_draft: Union[bool, ATTR]
 	update_draft: Union[bool, ATTR]
+	concurrent_validation: bool
 	defaults: Dict[str, Any]
 	unique_attrs: List[Union[str, Tuple[str, ...]]]
+	read_stages: List[Dict[str, Any]]
 	extns: Dict[str, Union[EXTN, ATTR]]
 	privileges: List[str]
 	methods: Dict[str, METHOD]
@@ -84,10 +92,14 @@ class BaseModule:
 			self.create_draft = False
 		if not getattr(self, 'update_draft', None):
 			self.update_draft = False
+		if not getattr(self, 'concurrent_validation', None):
+			self.concurrent_validation = False
 		if not getattr(self, 'defaults', None):
 			self.defaults = {}
 		if not getattr(self, 'unique_attrs', None):
 			self.unique_attrs = []
+		if not getattr(self, 'read_stages', None):
+			self.read_stages = []
 		if not getattr(self, 'extns', None):
 			self.extns = {}
 		if not getattr(self, 'privileges', None):
@@ -113,6 +125,9 @@ class BaseModule:
 	def _initialise(self) -> None:
 		# [DOC] Call _pre_initialise for advanced module initialisation
 		self._pre_initialise()
+		# [DOC] Set Cache Sets namespace to separate them in shared Cache Backend
+		for i in range(len(self.cache)):
+			self.cache[i].namespace = f'{self.module_name}:{i}'
 		# [DOC] Check attrs for any invalid type
 		for attr in self.attrs.keys():
 			try:
@@ -194,6 +209,13 @@ class BaseModule:
 				logger.error(e)
 				logger.error('Exiting.')
 				exit(1)
+		# [DOC] Compile Attr Types of attrs, and methods query_args, doc_args into validators, ahead of first call
+		for attr in self.attrs.keys():
+			compile_attr(attr_type=self.attrs[attr])
+		for method in self.methods.values():
+			for args_set in (method.query_args or []) + (method.doc_args or []):
+				for arg in args_set.keys():
+					compile_attr(attr_type=args_set[arg])
 		# [DOC] Check extns for invalid extended attrs
 		for attr in self.extns.keys():
 			if type(self.extns[attr]) not in [EXTN, ATTR]:
@@ -359,8 +381,36 @@ class BaseModule:
 		doc: NAWAH_DOC,
 		payload: Dict[str, Any],
 	) -> ON_HANDLER_RETURN:
+		# [DOC] Call on_read_doc for every doc, if module is defining it
+		if type(self).on_read_doc is not BaseModule.on_read_doc:
+			read_docs = []
+			for read_doc in results['docs']:
+				read_doc = await self.on_read_doc(
+					read_doc=read_doc,
+					skip_events=skip_events,
+					env=env,
+					query=query,
+					doc=doc,
+					payload=payload,
+				)
+				if read_doc:
+					read_docs.append(read_doc)
+			results['count'] -= len(results['docs']) - len(read_docs)
+			results['docs'] = read_docs
 		return (results, skip_events, env, query, doc, payload)
 
+	async def on_read_doc(
+		self,
+		read_doc: BaseModel,
+		skip_events: NAWAH_EVENTS,
+		env: NAWAH_ENV,
+		query: Query,
+		doc: NAWAH_DOC,
+		payload: Dict[str, Any],
+	) -> Optional[BaseModel]:
+		# [DOC] Per-doc variant of on_read, used by iter_read. Returning None drops doc from results
+		return read_doc
+
 	async def read(
 		self,
 		skip_events: NAWAH_EVENTS = [],
@@ -390,6 +440,7 @@ class BaseModule:
 				return payload['__results']
 
 		# [DOC] Check for cache workflow instructins
+		response_cache: Optional[Tuple[CACHE, str, CACHED_QUERY]] = None
 		if self.cache:
 			results: Optional[Dict[str, Any]] = None
 			for cache_set in self.cache:
@@ -397,37 +448,84 @@ class BaseModule:
 					cache_key = f'{str(query._query)}____{str(query._special)}'
 					if Event.EXTN in skip_events:
 						cache_key += '____EVENT_EXTN'
-					if cache_key in cache_set.queries.keys():
-						if cache_set.period:
-							if (
-								cache_set.queries[cache_key].query_time
-								+ datetime.timedelta(seconds=cache_set.period)
-							) < datetime.datetime.utcnow():
-								if not results:
-									results = await Data.read(
-										env=env,
-										collection_name=self.collection,
-										attrs=self.attrs,
-										query=query,
-										skip_extn='$extn' in query or Event.EXTN in skip_events,
-									)
-								cache_set.queries[cache_key] = CACHED_QUERY(results=results)
-							else:
-								results = cache_set.queries[cache_key].results
-								results['cache'] = cache_set.queries[cache_key].query_time.isoformat()
-						else:
-							results = cache_set.queries[cache_key].results
-							results['cache'] = cache_set.queries[cache_key].query_time.isoformat()
+					cached_query = cache_set.get_query(query_key=cache_key)
+					if not cached_query:
+						cached_query = await cache_set.load_query(
+							query_key=cache_key,
+							query=query,
+							skip_extn='$extn' in query or Event.EXTN in skip_events,
+						)
+					if cached_query:
+						# [DOC] Cached query is served stale, refresh it in background
+						if (
+							cached_query.expired
+							and cache_key not in cache_set._revalidating_queries
+						):
+							cache_set._revalidating_queries.add(cache_key)
+							asyncio.create_task(
+								self._revalidate_cache(
+									env=env,
+									cache_set=cache_set,
+									cache_key=cache_key,
+									cached_query=cached_query,
+								)
+							)
+						# [DOC] Encoded response can be served only to client-facing calls, if on_read can't mutate results
+						if (
+							not results
+							and cache_set.cache_response
+							and _response_query.get() is query
+							and (
+								Event.ON in skip_events
+								or (
+									type(self).on_read is BaseModule.on_read
+									and type(self).on_read_doc is BaseModule.on_read_doc
+								)
+							)
+						):
+							if cached_query.response:
+								return self.status(
+									status=200,
+									msg=f'Found {cached_query._results["count"]} docs.',
+									args={'__response': cached_query.response},
+								)
+							response_cache = (cache_set, cache_key, cached_query)
+						results = cached_query.results
+						results['cache'] = cached_query.query_time.isoformat()
 					else:
+						cache_version = cache_set.version
+						backend_version = await cache_set.backend_version()
 						if not results:
-							results = await Data.read(
-								env=env,
-								collection_name=self.collection,
-								attrs=self.attrs,
-								query=query,
-								skip_extn='$extn' in query or Event.EXTN in skip_events,
-							)
-						cache_set.queries[cache_key] = CACHED_QUERY(results=results)
+							try:
+								results = await Data.read(
+									env=env,
+									collection_name=self.collection,
+									attrs=self.attrs,
+									query=query,
+									skip_extn='$extn' in query or Event.EXTN in skip_events,
+									stages=self.read_stages,
+								)
+							except Exception as e:
+								# [DOC] Attempt to serve expired cached query if Cache Set allows it
+								stale_query = cache_set.get_stale_query(query_key=cache_key)
+								if not stale_query:
+									raise e
+								logger.warning(
+									f'Serving stale cached query for module \'{self.module_name}\' due to failed read. Original exception: {e}'
+								)
+								results = stale_query.results
+								results['cache'] = stale_query.query_time.isoformat()
+								continue
+						cached_query = cache_set.cache_query(
+							query_key=cache_key,
+							results=results,
+							query=query,
+							skip_extn='$extn' in query or Event.EXTN in skip_events,
+							version=cache_version,
+						)
+						await cache_set.store_query(
+							query_key=cache_key, cached_query=cached_query, version=backend_version
+						)
 			if not results:
 				results = await Data.read(
 					env=env,
@@ -435,6 +533,7 @@ class BaseModule:
 					attrs=self.attrs,
 					query=query,
 					skip_extn='$extn' in query or Event.EXTN in skip_events,
+					stages=self.read_stages,
 				)
 		else:
 			results = await Data.read(
@@ -443,6 +542,7 @@ class BaseModule:
 				attrs=self.attrs,
 				query=query,
 				skip_extn='$extn' in query or Event.EXTN in skip_events,
+				stages=self.read_stages,
 			)
 		if Event.ON not in skip_events:
 			on_read = await self.on_read(
@@ -462,11 +562,136 @@ class BaseModule:
 						{
 							attr: results['docs'][i][attr]
 							for attr in query['$attrs']
-							if attr in results['docs'][i]._attrs()
+							if attr in results['docs'][i]
 						}
 					)
 
-		return self.status(status=200, msg=f'Found {results["count"]} docs.', args=results)
+		read_results = self.status(status=200, msg=f'Found {results["count"]} docs.', args=results)
+		# [DOC] Keep encoded response with cached query, to be served as-is for following calls
+		if response_cache:
+			cache_set, cache_key, cached_query = response_cache
+			response = _json_serializer().encode(read_results)
+			cache_set.set_response(query_key=cache_key, cached_query=cached_query, response=response)
+			return self.status(status=200, msg=read_results.msg, args={'__response': response})
+
+		return read_results
+
+	async def iter_read(
+		self,
+		skip_events: NAWAH_EVENTS = [],
+		env: NAWAH_ENV = {},
+		query: Union[NAWAH_QUERY, Query] = [],
+		doc: NAWAH_DOC = {},
+		batch_size: Optional[int] = None,
+	) -> AsyncGenerator[BaseModel, None]:
+		# [DOC] Yield docs matching query one by one as they are read, without holding all results in memory. This is not a method, and permissions are not checked
+		if not self.collection:
+			raise self.exception(
+				status=400,
+				msg='Utility module can\'t call \'iter_read\' method.',
+				args={'code': 'INVALID_CALL'},
+			)
+
+		payload: Dict[str, Any] = {}
+
+		if type(query) != Query:
+			query = Query(copy.deepcopy(query))
+		query = cast(Query, query)
+		batch_size = batch_size or Config.data_stream_batch_size
+
+		if Event.PRE not in skip_events:
+			pre_read = await self.pre_read(
+				skip_events=skip_events, env=env, query=query, doc=doc, payload=payload
+			)
+			skip_events, env, query, doc, payload = pre_read
+
+			# [DOC] Check if __results are passed in payload
+			if '__results' in payload.keys():
+				for read_doc in payload['__results'].args.docs:
+					yield read_doc
+				return
+
+		read_attrs: Optional[List[str]] = None
+		if '$attrs' in query:
+			read_attrs = ['_id', *query['$attrs']]
+
+		def project_read_doc(read_doc: BaseModel) -> BaseModel:
+			# [DOC] if $attrs query arg is present return only required keys.
+			if not read_attrs:
+				return read_doc
+			return BaseModel({attr: read_doc[attr] for attr in read_attrs if attr in read_doc})
+
+		# [DOC] Modules defining on_read handler, rather than on_read_doc, have it called for every batch of docs
+		on_read_batch = Event.ON not in skip_events and type(self).on_read is not BaseModule.on_read
+		read_docs: List[BaseModel] = []
+		self.collection = cast(str, self.collection)
+		async for read_doc in Data.stream(
+			env=env,
+			collection_name=self.collection,
+			attrs=self.attrs,
+			query=query,
+			skip_extn='$extn' in query or Event.EXTN in skip_events,
+			batch_size=batch_size,
+			stages=self.read_stages,
+		):
+			if not on_read_batch:
+				if Event.ON not in skip_events:
+					read_doc = await self.on_read_doc(
+						read_doc=read_doc,
+						skip_events=skip_events,
+						env=env,
+						query=query,
+						doc=doc,
+						payload=payload,
+					)
+					if not read_doc:
+						continue
+				yield project_read_doc(read_doc)
+				continue
+
+			read_docs.append(read_doc)
+			if len(read_docs) == batch_size:
+				for read_doc in await self._on_read_batch(
+					read_docs=read_docs,
+					skip_events=skip_events,
+					env=env,
+					query=query,
+					doc=doc,
+					payload=payload,
+				):
+					yield project_read_doc(read_doc)
+				read_docs = []
+
+		if read_docs:
+			for read_doc in await self._on_read_batch(
+				read_docs=read_docs,
+				skip_events=skip_events,
+				env=env,
+				query=query,
+				doc=doc,
+				payload=payload,
+			):
+				yield project_read_doc(read_doc)
+
+	async def _on_read_batch(
+		self,
+		*,
+		read_docs: List[BaseModel],
+		skip_events: NAWAH_EVENTS,
+		env: NAWAH_ENV,
+		query: Query,
+		doc: NAWAH_DOC,
+		payload: Dict[str, Any],
+	) -> List[BaseModel]:
+		results, *_ = await self.on_read(
+			results={'total': None, 'count': len(read_docs), 'docs': read_docs, 'groups': {}},
+			skip_events=skip_events,
+			env=env,
+			query=query,
+			doc=doc,
+			payload=payload,
+		)
+		return results['docs']
 
 	async def pre_watch(
 		self,
@@ -549,7 +774,7 @@ class BaseModule:
 							{
 								attr: results['docs'][i][attr]
 								for attr in query['$attrs']
-								if attr in results['docs'][i]._attrs()
+								if attr in results['docs'][i]
 							}
 						)
 			yield self.status(status=200, msg=f'Detected {results["count"]} docs.', args=results)
@@ -737,6 +962,7 @@ class BaseModule:
 					skip_events=skip_events,
 					env=env,
 					query=query,
+					concurrent=self.concurrent_validation,
 				)
 			except MissingAttrException as e:
 				raise self.exception(
@@ -787,6 +1013,8 @@ class BaseModule:
 		results = await Data.create(
 			env=env, collection_name=self.collection, attrs=self.attrs, doc=doc
 		)
+		# [DOC] Module collection is updated, update_cache
+		await self.update_cache(env=env, docs=[{**doc, '_id': results['docs'][0]._id}])
 
 		# [DOC] Check for __create_draft and delete it
 		if '__create_draft' in query:
@@ -820,9 +1048,6 @@ class BaseModule:
 			)
 			results = read_results.args
 
-		# [DOC] Module collection is updated, update_cache
-		asyncio.create_task(self.update_cache(env=env))
-
 		return self.status(status=200, msg=f'Created {results["count"]} docs.', args=results)
 
 	async def pre_update(
@@ -921,6 +1146,7 @@ class BaseModule:
 				skip_events=skip_events,
 				env=env,
 				query=query,
+				concurrent=self.concurrent_validation,
 			)
 		except MissingAttrException as e:
 			raise self.exception(
@@ -1035,6 +1261,8 @@ class BaseModule:
 			docs=[doc._id for doc in docs_results['docs']],
 			doc=doc,
 		)
+		# [DOC] Module collection is updated, update_cache
+		await self.update_cache(env=env, doc=doc, docs=docs_results['docs'])
 
 		# [DOC] Check for update_draft and delete it
 		if update_draft:
@@ -1079,35 +1307,29 @@ class BaseModule:
 						scope=doc,
 					)
 
-					# [DOC] if function passes, create Diff doc with default callable
+					# [DOC] if function passes, buffer Diff docs with default callable
 					diff_vars = doc
-					diff_results = await Config.modules['diff'].create(
-						skip_events=[Event.PERM],
+					await Config.modules['diff'].enqueue(
 						env=env,
-						query=query,
-						doc={'module': self.module_name, 'vars': diff_vars},
+						module_name=self.module_name,
+						docs=[doc._id for doc in docs_results['docs']],
+						vars=diff_vars,
 					)
-					if diff_results.status != 200:
-						logger.error(f'Failed to create Diff doc, results: {diff_results}')
 				except:
 					logger.debug(f'Skipped Diff Workflow due to failed condition.')
 			else:
-				diff_results = await Config.modules['diff'].create(
-					skip_events=[Event.PERM],
+				# [DOC] Buffer Diff docs for updated docs, to be written by diff flush without blocking call
+				await Config.modules['diff'].enqueue(
 					env=env,
-					query=query,
-					doc={'module': self.module_name, 'vars': doc},
+					module_name=self.module_name,
+					docs=[doc._id for doc in docs_results['docs']],
+					vars=doc,
 				)
-				if diff_results.status != 200:
-					logger.error(f'Failed to create Diff doc, results: {diff_results}')
 		else:
 			logger.debug(
 				f'Skipped Diff Workflow due to: {results["count"]}, {self.diff}, {Event.DIFF not in skip_events}'
 			)
 
-		# [DOC] Module collection is updated, update_cache
-		asyncio.create_task(self.update_cache(env=env))
-
 		return self.status(status=200, msg=f'Updated {results["count"]} docs.', args=results)
 
 	async def pre_delete(
@@ -1183,6 +1405,8 @@ class BaseModule:
 			docs=[doc._id for doc in docs_results['docs']],
 			strategy=strategy,
 		)
+		# [DOC] Module collection is updated, update_cache
+		await self.update_cache(env=env, docs=docs_results['docs'])
 		if Event.ON not in skip_events:
 			on_delete = await self.on_delete(
 				results=results,
@@ -1194,9 +1418,6 @@ class BaseModule:
 			)
 			results, skip_events, env, query, doc, payload = on_delete
 
-		# [DOC] Module collection is updated, update_cache
-		asyncio.create_task(self.update_cache(env=env))
-
 		return self.status(status=200, msg=f'Deleted {results["count"]} docs.', args=results)
 
 	async def pre_create_file(
@@ -1551,26 +1772,151 @@ class BaseModule:
 		env: NAWAH_ENV = {},
 		query: Union[NAWAH_QUERY, Query] = [],
 		doc: NAWAH_DOC = {},
+		docs: List[Dict[str, Any]] = None,
+		broadcast: bool = True,
 	) -> DictObj:
 		if self.collection and self.cache:
+			# [DOC] Propagate invalidation to other app processes and shared backend in background, so writes don't wait on them. Invalidation received from Cache Bus was already propagated by originating process
+			if broadcast:
+				invalidation_task = asyncio.create_task(
+					self._propagate_cache_invalidation(
+						docs=_cache_message_docs(docs=docs), doc=_cache_message_doc(doc=doc)
+					)
+				)
+				BaseModule._cache_invalidation_tasks.add(invalidation_task)
+				invalidation_task.add_done_callback(
+					BaseModule._cache_invalidation_tasks.discard
+				)
+
 			for cache_set in self.cache:
+				# [DOC] Delete cached queries affected by written docs, or all if docs are not passed
+				invalidated_queries = cache_set.invalidate_queries(docs=docs, doc=doc)
+				if not invalidated_queries:
+					continue
+
 				# [DOC] Check if Cache Set requires recreating queries, or dismiss them
 				if cache_set.cache_strategy == CACHE_STRATEGY.DISMISS:
-					cache_set.queries = {}
 					continue
 
-				for cache_key in cache_set.queries.keys():
-					del cache_set.queries[cache_key]
-					cache_key_split = cache_key.split('____')
-					cache_query: NAWAH_QUERY = eval(cache_key_split[0])
-					cache_special: NAWAH_QUERY = eval(cache_key_split[1])
-					cache_query.append(cache_special)
+				# [DOC] Debounce concurrent writes into one refresh task per Cache Set
+				cache_set._pending_queries.update(invalidated_queries)
+				if not cache_set._refresh_task or cache_set._refresh_task.done():
+					cache_set._refresh_task = asyncio.create_task(
+						self._refresh_cache(env=env, cache_set=cache_set)
+					)
+		return self.status(status=200, msg='Cache deleted.', args={})
+
+	async def _propagate_cache_invalidation(
+		self, *, docs: Optional[List[Dict[str, Any]]], doc: NAWAH_DOC
+	) -> None:
+		# [DOC] Broadcast invalidation to other app processes, if Cache Bus is configured
+		if Config.cache_bus:
+			try:
+				await Config.cache_bus.publish(
+					message={'module': self.module_name, 'docs': docs, 'doc': doc}
+				)
+			except Exception as e:
+				logger.error(
+					f'Failed to broadcast cache invalidation of module \'{self.module_name}\'. Original exception: {e}'
+				)
+		for cache_set in self.cache:
+			await cache_set.invalidate_backend(docs=docs, doc=doc)
+
+	async def _broadcast_module_cache(self, *, message: Dict[str, Any]) -> None:
+		# [DOC] Broadcast invalidation of module-specific cache to other app processes, if Cache Bus is configured
+		if not Config.cache_bus:
+			return
+		try:
+			await Config.cache_bus.publish(
+				message={'module': self.module_name, 'module_cache': message}
+			)
+		except Exception as e:
+			logger.error(
+				f'Failed to broadcast module cache invalidation of module \'{self.module_name}\'. Original exception: {e}'
+			)
+
+	async def _process_module_cache(self, *, message: Dict[str, Any]) -> None:
+		# [DOC] Apply invalidation of module-specific cache received from other process. Message with 'reset' key clears all of it. Modules with own caches override this
+		pass
+
+	async def _revalidate_cache(
+		self,
+		*,
+		env: NAWAH_ENV,
+		cache_set: CACHE,
+		cache_key: str,
+		cached_query: CACHED_QUERY,
+	) -> None:
+		cache_version = cache_set.version
+		backend_version = await cache_set.backend_version()
+		try:
+			results = await Data.read(
+				env=env,
+				collection_name=self.collection,
+				attrs=self.attrs,
+				query=copy.deepcopy(cached_query.query),
+				skip_extn=cached_query.skip_extn,
+				stages=self.read_stages,
+			)
+			revalidated_query = cache_set.cache_query(
+				query_key=cache_key,
+				results=results,
+				query=cached_query.query,
+				skip_extn=cached_query.skip_extn,
+				version=cache_version,
+			)
+			await cache_set.store_query(
+				query_key=cache_key, cached_query=revalidated_query, version=backend_version
+			)
+		except Exception as e:
+			logger.error(
+				f'Failed to revalidate cached query \'{cache_key}\' of module \'{self.module_name}\'. Original exception: {e}'
+			)
+			# [DOC] Unless Cache Set allows serving stale results on failure, drop cached query
+			if (
+				not cache_set.stale_if_error
+				and cache_set.queries.get(cache_key) is cached_query
+			):
+				cache_set.delete_query(query_key=cache_key)
+		finally:
+			cache_set._revalidating_queries.discard(cache_key)
+
+	async def _refresh_cache(self, *, env: NAWAH_ENV, cache_set: CACHE) -> None:
+		while cache_set._pending_queries:
+			await asyncio.sleep(cache_set.refresh_delay)
+			pending_queries = cache_set._pending_queries
+			cache_set._pending_queries = {}
+			for cache_key, cached_query in pending_queries.items():
+				# [DOC] Skip queries cached again by reads since they were invalidated
+				if cache_key in cache_set.queries.keys() or cached_query.query == None:
+					continue
+				cache_set._refreshing_queries[cache_key] = cached_query
+				backend_version = await cache_set.backend_version()
+				try:
 					results = await Data.read(
 						env=env,
 						collection_name=self.collection,
 						attrs=self.attrs,
-						query=Query(cache_query),
-						skip_extn=(len(cache_key_split) == 3 and cache_key_split[2] == 'EVENT_EXTN'),
+						query=copy.deepcopy(cached_query.query),
+						skip_extn=cached_query.skip_extn,
+						stages=self.read_stages,
 					)
-					cache_set.queries[cache_key] = CACHED_QUERY(results=results)
-		return self.status(status=200, msg='Cache deleted.', args={})
+				except Exception as e:
+					logger.error(
+						f'Failed to refresh cached query \'{cache_key}\' of module \'{self.module_name}\'. Original exception: {e}'
+					)
+					continue
+				finally:
+					del cache_set._refreshing_queries[cache_key]
+				# [DOC] If query was invalidated again while being read, leave it for next iteration
+				if cache_key in cache_set._pending_queries.keys():
+					continue
+				refreshed_query = cache_set.cache_query(
+					query_key=cache_key,
+					results=results,
+					query=cached_query.query,
+					skip_extn=cached_query.skip_extn,
+				)
+				await cache_set.store_query(
+					query_key=cache_key, cached_query=refreshed_query, version=backend_version
+				)
@@ -0,0 +1,8 @@
+from ._bus import CacheBus, UnixSocketCacheBus, _process_cache_message
+from ._backend import (
+	CACHE_BACKEND_RECORD,
+	CacheBackend,
+	MemoryCacheBackend,
+	UnixSocketCacheBackend,
+)
+from ._serializer import CacheSerializer, BSONCacheSerializer, PickleCacheSerializer
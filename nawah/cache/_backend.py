@@ -0,0 +1,395 @@
+from nawah.classes import NAWAH_DOC
+from nawah.classes._module import _cache_deps_affected
+
+from ._bus import _acquire_hub_lock, _unlink_socket
+
+from collections import OrderedDict
+from typing import Dict, Any, List, Set, Optional, TypedDict, cast
+
+import asyncio, datetime, logging, os, bson
+
+logger = logging.getLogger('nawah')
+
+CACHE_BACKEND_RECORD = TypedDict(
+	'CACHE_BACKEND_RECORD', {'value': bytes, 'query_time': datetime.datetime}
+)
+
+
+class CacheBackend:
+	'''Base class for storage of cached queries shared by Cache Sets of app processes. Subclasses implement get, set, version, invalidate, clear, close.'''
+
+	async def get(self, *, namespace: str, key: str) -> Optional[CACHE_BACKEND_RECORD]:
+		raise NotImplementedError()
+
+	async def set(
+		self,
+		*,
+		namespace: str,
+		key: str,
+		value: bytes,
+		query_time: datetime.datetime,
+		expiry: Optional[datetime.datetime],
+		ids: List[str],
+		deps: Dict[str, List[List[Any]]],
+		version: Optional[int] = None,
+	) -> None:
+		raise NotImplementedError()
+
+	async def version(self, *, namespace: str) -> int:
+		raise NotImplementedError()
+
+	async def invalidate(
+		self,
+		*,
+		namespace: str,
+		docs: Optional[List[Dict[str, Any]]],
+		doc: Optional[NAWAH_DOC] = None,
+	) -> None:
+		raise NotImplementedError()
+
+	async def clear(self) -> None:
+		raise NotImplementedError()
+
+	async def close(self) -> None:
+		raise NotImplementedError()
+
+
+class MemoryCacheBackend(CacheBackend):
+	'''Cache Backend storing cached queries in memory of current process. Used by UnixSocketCacheBackend hub, and for testing.'''
+
+	max_entries: Optional[int]
+	_records: 'OrderedDict[str, Dict[str, Any]]'
+	_versions: Dict[str, int]
+	_clears: int
+
+	def __init__(self, *, max_entries: int = None):
+		self.max_entries = max_entries
+		self._records = OrderedDict()
+		self._versions = {}
+		self._clears = 0
+
+	async def get(self, *, namespace: str, key: str) -> Optional[CACHE_BACKEND_RECORD]:
+		record_key = f'{namespace}____{key}'
+		if record_key not in self._records.keys():
+			return None
+		record = self._records[record_key]
+		if record['expiry'] and record['expiry'] < datetime.datetime.utcnow():
+			del self._records[record_key]
+			return None
+		self._records.move_to_end(record_key)
+		return {'value': record['value'], 'query_time': record['query_time']}
+
+	async def set(
+		self,
+		*,
+		namespace: str,
+		key: str,
+		value: bytes,
+		query_time: datetime.datetime,
+		expiry: Optional[datetime.datetime],
+		ids: List[str],
+		deps: Dict[str, List[List[Any]]],
+		version: Optional[int] = None,
+	) -> None:
+		# [DOC] Reject records read before namespace was last invalidated, as they might be stale
+		if version != None and version != await self.version(namespace=namespace):
+			logger.debug(f'Skipped setting record \'{key}\' read before invalidation.')
+			return
+		record_key = f'{namespace}____{key}'
+		self._records[record_key] = {
+			'namespace': namespace,
+			'value': value,
+			'query_time': query_time,
+			'expiry': expiry,
+			'ids': set(ids),
+			'deps': {attr: [set(vals) for vals in deps[attr]] for attr in deps.keys()},
+			'version': version,
+		}
+		self._records.move_to_end(record_key)
+		# [DOC] Evict least recently used records
+		while self.max_entries and len(self._records) > self.max_entries:
+			self._records.popitem(last=False)
+
+	async def version(self, *, namespace: str) -> int:
+		# [DOC] Version of namespace is bumped whenever it is invalidated, or backend is cleared
+		return self._versions.get(namespace, 0) + self._clears
+
+	async def invalidate(
+		self,
+		*,
+		namespace: str,
+		docs: Optional[List[Dict[str, Any]]],
+		doc: Optional[NAWAH_DOC] = None,
+	) -> None:
+		self._versions[namespace] = self._versions.get(namespace, 0) + 1
+		for record_key, record in list(self._records.items()):
+			if record['namespace'] != namespace:
+				continue
+			if docs == None or _cache_deps_affected(
+				ids=record['ids'], deps=record['deps'], docs=docs, doc=doc
+			):
+				del self._records[record_key]
+
+	async def clear(self) -> None:
+		self._records = OrderedDict()
+		self._clears += 1
+
+	async def close(self) -> None:
+		pass
+
+
+class UnixSocketCacheBackend(CacheBackend):
+	'''Cache Backend for app processes running on same host. First process to use it becomes the hub, storing cached queries in memory and serving other processes over unix socket.'''
+
+	path: str
+	max_entries: Optional[int]
+	reconnect_delay: float
+	reconnect_attempts: int
+	_memory: Optional[MemoryCacheBackend]
+	_server: Optional[asyncio.AbstractServer]
+	_reader: Optional[asyncio.StreamReader]
+	_writer: Optional[asyncio.StreamWriter]
+	_lock: Optional[asyncio.Lock]
+	_write_lock: Optional[asyncio.Lock]
+	_read_task: Optional['asyncio.Task']
+	_requests: Dict[int, 'asyncio.Future[Dict[str, Any]]']
+	_request_id: int
+	_hub_lock: Optional[int]
+	_clients_tasks: Set['asyncio.Task']
+
+	def __init__(
+		self,
+		*,
+		path: str = '/tmp/nawah_cache_backend.sock',
+		max_entries: int = None,
+		reconnect_delay: float = 0.05,
+		reconnect_attempts: int = 20,
+	):
+		self.path = path
+		self.max_entries = max_entries
+		self.reconnect_delay = reconnect_delay
+		self.reconnect_attempts = reconnect_attempts
+		self._memory = None
+		self._server = None
+		self._reader = None
+		self._writer = None
+		self._lock = None
+		self._write_lock = None
+		self._read_task = None
+		self._requests = {}
+		self._request_id = 0
+		self._hub_lock = None
+		self._clients_tasks = set()
+
+	@property
+	def is_hub(self) -> bool:
+		return self._server != None
+
+	async def get(self, *, namespace: str, key: str) -> Optional[CACHE_BACKEND_RECORD]:
+		response = await self._request(request={'op': 'get', 'namespace': namespace, 'key': key})
+		if response['record'] == None:
+			return None
+		return cast(CACHE_BACKEND_RECORD, response['record'])
+
+	async def set(
+		self,
+		*,
+		namespace: str,
+		key: str,
+		value: bytes,
+		query_time: datetime.datetime,
+		expiry: Optional[datetime.datetime],
+		ids: List[str],
+		deps: Dict[str, List[List[Any]]],
+		version: Optional[int] = None,
+	) -> None:
+		await self._request(
+			request={
+				'op': 'set',
+				'namespace': namespace,
+				'key': key,
+				'value': value,
+				'query_time': query_time,
+				'expiry': expiry,
+				'ids': ids,
+				'deps': deps,
+				'version': version,
+			}
+		)
+
+	async def version(self, *, namespace: str) -> int:
+		response = await self._request(request={'op': 'version', 'namespace': namespace})
+		return cast(int, response['version'])
+
+	async def invalidate(
+		self,
+		*,
+		namespace: str,
+		docs: Optional[List[Dict[str, Any]]],
+		doc: Optional[NAWAH_DOC] = None,
+	) -> None:
+		await self._request(
+			request={'op': 'invalidate', 'namespace': namespace, 'docs': docs, 'doc': doc}
+		)
+
+	async def clear(self) -> None:
+		await self._request(request={'op': 'clear'})
+
+	async def close(self) -> None:
+		self._reset_connection()
+		for client_task in self._clients_tasks:
+			client_task.cancel()
+		self._clients_tasks = set()
+		if self._server:
+			self._server.close()
+			await self._server.wait_closed()
+			self._server = None
+		if self._hub_lock != None:
+			os.close(self._hub_lock)
+			self._hub_lock = None
+		self._memory = None
+
+	async def _connect(self) -> None:
+		for _ in range(self.reconnect_attempts):
+			try:
+				# [DOC] Attempt to connect to running hub
+				self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+				logger.debug(f'Cache Backend connected to hub on \'{self.path}\'.')
+				return
+			except (FileNotFoundError, ConnectionRefusedError):
+				pass
+			# [DOC] No hub is running. Only process holding hub lock becomes the hub, which prevents processes connecting at same time from removing socket of each other
+			self._hub_lock = _acquire_hub_lock(path=self.path)
+			if self._hub_lock != None:
+				_unlink_socket(path=self.path)
+				self._memory = MemoryCacheBackend(max_entries=self.max_entries)
+				self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+				logger.debug(f'Cache Backend hub is listening on \'{self.path}\'.')
+				return
+			# [DOC] Other process is taking over as the hub, retry connecting to it
+			await asyncio.sleep(self.reconnect_delay)
+		raise ConnectionRefusedError(f'Cache Backend failed to connect to hub on \'{self.path}\'.')
+
+	async def _request(self, *, request: Dict[str, Any]) -> Dict[str, Any]:
+		if not self._lock:
+			self._lock = asyncio.Lock()
+			self._write_lock = asyncio.Lock()
+		# [DOC] Lock is held only while connecting, to have concurrent requests share one connection
+		async with self._lock:
+			if not self._writer and not self._server:
+				await self._connect()
+				if self._reader:
+					self._read_task = asyncio.create_task(self._read_responses(self._reader))
+		if self._server:
+			return await self._process_request(request=request)
+		# [DOC] Requests are pipelined over connection, and matched with responses by request id, so slow requests don't block others
+		self._request_id += 1
+		request_id = self._request_id
+		response_future: 'asyncio.Future[Dict[str, Any]]' = (
+			asyncio.get_running_loop().create_future()
+		)
+		self._requests[request_id] = response_future
+		writer = self._writer
+		try:
+			async with cast(asyncio.Lock, self._write_lock):
+				if not writer or writer is not self._writer:
+					raise ConnectionResetError('Cache Backend lost connection to hub.')
+				writer.write(bson.encode({**request, 'request_id': request_id}))
+				await writer.drain()
+			response = await response_future
+		except ConnectionError:
+			# [DOC] Hub went away, reset connection, unless other request did already, to reconnect with next request
+			if writer and writer is self._writer:
+				self._reset_connection()
+			raise
+		finally:
+			self._requests.pop(request_id, None)
+		if 'error' in response.keys():
+			raise Exception(f'Cache Backend hub failed to process request: {response["error"]}')
+		return response
+
+	async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+		try:
+			while True:
+				response = await _read_frame(reader)
+				response_future = self._requests.get(response.pop('request_id', None))
+				if response_future and not response_future.done():
+					response_future.set_result(response)
+		except (ConnectionError, asyncio.IncompleteReadError):
+			logger.warning('Cache Backend lost connection to hub.')
+		except Exception as e:
+			logger.error(f'Cache Backend failed to read from hub. Original exception: {e}')
+		if self._reader is reader:
+			self._read_task = None
+			self._reset_connection()
+
+	def _reset_connection(self) -> None:
+		# [DOC] Close connection, and fail requests waiting for responses, to reconnect with next request
+		if self._read_task:
+			self._read_task.cancel()
+			self._read_task = None
+		if self._writer:
+			self._writer.close()
+		self._reader = None
+		self._writer = None
+		for response_future in self._requests.values():
+			if not response_future.done():
+				response_future.set_exception(
+					ConnectionResetError('Cache Backend lost connection to hub.')
+				)
+		self._requests = {}
+
+	async def _handle_client(
+		self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+	) -> None:
+		client_task = cast('asyncio.Task', asyncio.current_task())
+		self._clients_tasks.add(client_task)
+		try:
+			while True:
+				request = await _read_frame(reader)
+				try:
+					response = await self._process_request(request=request)
+				except Exception as e:
+					logger.error(f'Failed to process Cache Backend request. Original exception: {e}')
+					response = {'error': str(e)}
+				writer.write(bson.encode({**response, 'request_id': request['request_id']}))
+				await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+			self._clients_tasks.discard(client_task)
+
+	async def _process_request(self, *, request: Dict[str, Any]) -> Dict[str, Any]:
+		memory = cast(MemoryCacheBackend, self._memory)
+		if request['op'] == 'get':
+			return {
+				'record': await memory.get(namespace=request['namespace'], key=request['key'])
+			}
+		elif request['op'] == 'set':
+			await memory.set(
+				namespace=request['namespace'],
+				key=request['key'],
+				value=request['value'],
+				query_time=request['query_time'],
+				expiry=request['expiry'],
+				ids=request['ids'],
+				deps=request['deps'],
+				version=request['version'],
+			)
+		elif request['op'] == 'version':
+			return {'version': await memory.version(namespace=request['namespace'])}
+		elif request['op'] == 'invalidate':
+			await memory.invalidate(
+				namespace=request['namespace'], docs=request['docs'], doc=request['doc']
+			)
+		elif request['op'] == 'clear':
+			await memory.clear()
+		return {}
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+	# [DOC] BSON documents are prefixed by their length as little-endian int32
+	frame_size = await reader.readexactly(4)
+	frame = frame_size + await reader.readexactly(int.from_bytes(frame_size, 'little') - 4)
+	return bson.decode(frame)
@@ -0,0 +1,244 @@
+from nawah.config import Config
+from nawah.classes import _json_serializer
+
+from typing import Dict, Any, List, Set, Callable, Awaitable, Optional, cast
+
+import asyncio, json, logging, os, fcntl
+
+logger = logging.getLogger('nawah')
+
+CACHE_MESSAGE_HANDLER = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# [DOC] Message delivered when Cache Bus messages might have been missed, clearing all caches of all modules
+CACHE_RESET_MESSAGE: Dict[str, Any] = {'module': '*'}
+
+
+class CacheBus:
+	'''Base class for transports broadcasting cache invalidations between app processes. Subclasses implement connect, publish, close.'''
+
+	async def connect(self, *, on_message: CACHE_MESSAGE_HANDLER) -> None:
+		raise NotImplementedError()
+
+	async def publish(self, *, message: Dict[str, Any]) -> None:
+		raise NotImplementedError()
+
+	async def close(self) -> None:
+		raise NotImplementedError()
+
+
+class UnixSocketCacheBus(CacheBus):
+	'''Cache Bus for app processes running on same host. First process to connect becomes the hub, relaying messages between all other processes.'''
+
+	path: str
+	reconnect_delay: float
+	_on_message: Optional[CACHE_MESSAGE_HANDLER]
+	_server: Optional[asyncio.AbstractServer]
+	_peers: List[asyncio.StreamWriter]
+	_peers_tasks: Set['asyncio.Task']
+	_writer: Optional[asyncio.StreamWriter]
+	_read_task: Optional['asyncio.Task']
+	_hub_lock: Optional[int]
+	_closed: bool
+	_publish_dropped: bool
+
+	def __init__(self, *, path: str = '/tmp/nawah_cache_bus.sock', reconnect_delay: float = 1):
+		self.path = path
+		self.reconnect_delay = reconnect_delay
+		self._on_message = None
+		self._server = None
+		self._peers = []
+		self._peers_tasks = set()
+		self._writer = None
+		self._read_task = None
+		self._hub_lock = None
+		self._closed = False
+		self._publish_dropped = False
+
+	@property
+	def is_hub(self) -> bool:
+		return self._server != None
+
+	async def connect(self, *, on_message: CACHE_MESSAGE_HANDLER) -> None:
+		self._on_message = on_message
+		self._closed = False
+		while True:
+			try:
+				# [DOC] Attempt to connect to running hub
+				reader, self._writer = await asyncio.open_unix_connection(self.path)
+				break
+			except (FileNotFoundError, ConnectionRefusedError):
+				pass
+			# [DOC] No hub is running. Only process holding hub lock becomes the hub, which prevents processes reconnecting at same time from removing socket of each other
+			self._hub_lock = _acquire_hub_lock(path=self.path)
+			if self._hub_lock != None:
+				_unlink_socket(path=self.path)
+				self._server = await asyncio.start_unix_server(self._handle_peer, path=self.path)
+				logger.debug(f'Cache Bus hub is listening on \'{self.path}\'.')
+				return
+			# [DOC] Other process is taking over as the hub, retry connecting to it
+			await asyncio.sleep(self.reconnect_delay)
+		logger.debug(f'Cache Bus connected to hub on \'{self.path}\'.')
+		self._read_task = asyncio.create_task(self._read_hub(reader))
+
+	async def publish(self, *, message: Dict[str, Any]) -> None:
+		line = _json_serializer().encode_bytes(message) + b'\n'
+		if self.is_hub:
+			await self._write_peers(line=line)
+			return
+		if self._writer:
+			try:
+				self._writer.write(line)
+				await self._writer.drain()
+				return
+			except ConnectionError:
+				pass
+		# [DOC] Not connected to hub, message can't be delivered. Messages of other processes are missed as well, so clear local caches, and have other processes clear theirs once reconnected
+		logger.warning('Cache Bus is not connected to hub. Clearing local caches.')
+		self._publish_dropped = True
+		await self._reset_caches()
+
+	async def close(self) -> None:
+		self._closed = True
+		if self._read_task:
+			self._read_task.cancel()
+			self._read_task = None
+		if self._writer:
+			self._writer.close()
+			self._writer = None
+		for peer in self._peers:
+			peer.close()
+		self._peers = []
+		for peer_task in self._peers_tasks:
+			peer_task.cancel()
+		self._peers_tasks = set()
+		if self._server:
+			self._server.close()
+			await self._server.wait_closed()
+			self._server = None
+		if self._hub_lock != None:
+			os.close(self._hub_lock)
+			self._hub_lock = None
+
+	async def _handle_peer(
+		self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+	) -> None:
+		self._peers.append(writer)
+		peer_task = cast('asyncio.Task', asyncio.current_task())
+		self._peers_tasks.add(peer_task)
+		try:
+			while line := await reader.readline():
+				# [DOC] Relay message to all other peers, then process it locally
+				await self._write_peers(line=line, skip_peer=writer)
+				await self._deliver(line=line)
+		finally:
+			if writer in self._peers:
+				self._peers.remove(writer)
+			self._peers_tasks.discard(peer_task)
+
+	async def _write_peers(
+		self, *, line: bytes, skip_peer: asyncio.StreamWriter = None
+	) -> None:
+		for peer in list(self._peers):
+			if peer == skip_peer:
+				continue
+			try:
+				peer.write(line)
+				await peer.drain()
+			except ConnectionError:
+				self._peers.remove(peer)
+
+	async def _read_hub(self, reader: asyncio.StreamReader) -> None:
+		try:
+			while line := await reader.readline():
+				await self._deliver(line=line)
+		except Exception as e:
+			logger.error(f'Cache Bus failed to read from hub. Original exception: {e}')
+		if self._closed:
+			return
+		# [DOC] Hub went away, reconnect, which makes this process the hub if no other process did. Keep retrying, as failing to reconnect stops invalidations delivery
+		logger.warning('Cache Bus lost connection to hub. Reconnecting.')
+		self._writer = None
+		self._read_task = None
+		while not self._closed:
+			await asyncio.sleep(self.reconnect_delay)
+			if self._closed:
+				return
+			try:
+				await self.connect(on_message=cast(CACHE_MESSAGE_HANDLER, self._on_message))
+			except Exception as e:
+				logger.error(f'Cache Bus failed to reconnect to hub. Original exception: {e}')
+				continue
+			# [DOC] Messages published while reconnecting were missed, clear local caches. If messages of this process were dropped, have other processes clear their caches as well
+			await self._reset_caches()
+			if self._publish_dropped:
+				self._publish_dropped = False
+				try:
+					await self.publish(message=CACHE_RESET_MESSAGE)
+				except Exception as e:
+					logger.error(f'Cache Bus failed to publish reset message. Original exception: {e}')
+			return
+
+	async def _deliver(self, *, line: bytes) -> None:
+		try:
+			await self._on_message(json.loads(line))
+		except Exception as e:
+			logger.error(f'Failed to process Cache Bus message. Original exception: {e}')
+
+	async def _reset_caches(self) -> None:
+		if not self._on_message:
+			return
+		try:
+			await self._on_message(CACHE_RESET_MESSAGE)
+		except Exception as e:
+			logger.error(f'Failed to reset caches. Original exception: {e}')
+
+
+def _acquire_hub_lock(*, path: str) -> Optional[int]:
+	# [DOC] Hub holds lock file for as long as it is running. Lock is released by OS if hub process exits
+	lock_fd = os.open(f'{path}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+	try:
+		fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+	except BlockingIOError:
+		os.close(lock_fd)
+		return None
+	return lock_fd
+
+
+def _unlink_socket(*, path: str) -> None:
+	# [DOC] Remove stale socket file left by hub that went away, if any
+	try:
+		os.unlink(path)
+	except FileNotFoundError:
+		pass
+
+
+async def _process_cache_message(message: Dict[str, Any]) -> None:
+	# [DOC] Reset message clears Cache Sets, and module-specific caches of all modules
+	if message['module'] == CACHE_RESET_MESSAGE['module']:
+		for module in Config.modules.values():
+			try:
+				await module.update_cache(env=Config._sys_env, docs=None, doc={}, broadcast=False)
+				await module._process_module_cache(message={'reset': True})
+			except Exception as e:
+				logger.error(
+					f'Failed to reset cache of module \'{module.module_name}\'. Original exception: {e}'
+				)
+		return
+	# [DOC] Invalidate cache of module per message received from other process, without broadcasting it again
+	if message['module'] not in Config.modules.keys():
+		logger.warning(
+			f'Received Cache Bus message for unknown module \'{message["module"]}\'. Skipping.'
+		)
+		return
+	# [DOC] Module-specific caches, such as settings and privileges, are invalidated by the module itself
+	if 'module_cache' in message.keys():
+		await Config.modules[message['module']]._process_module_cache(
+			message=message['module_cache']
+		)
+		return
+	await Config.modules[message['module']].update_cache(
+		env=Config._sys_env,
+		docs=message['docs'],
+		doc=message['doc'],
+		broadcast=False,
+	)
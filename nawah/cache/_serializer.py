@@ -0,0 +1,58 @@
+from nawah.classes import BaseModel, DictObj
+
+from typing import Dict, Any
+
+import bson, pickle
+
+
+class CacheSerializer:
+	'''Base class for serialising cached results stored in Cache Backend. Subclasses implement dumps, loads.'''
+
+	def dumps(self, *, results: Dict[str, Any]) -> bytes:
+		raise NotImplementedError()
+
+	def loads(self, *, value: bytes) -> Dict[str, Any]:
+		raise NotImplementedError()
+
+
+class BSONCacheSerializer(CacheSerializer):
+	'''Serialises cached results as BSON, preserving ObjectId, datetime values.'''
+
+	def dumps(self, *, results: Dict[str, Any]) -> bytes:
+		return bson.encode(_plain_results(results))
+
+	def loads(self, *, value: bytes) -> Dict[str, Any]:
+		return _model_results(bson.decode(value))
+
+
+class PickleCacheSerializer(CacheSerializer):
+	'''Serialises cached results using pickle, supporting any Python values in results docs. Use only with trusted Cache Backend.'''
+
+	def dumps(self, *, results: Dict[str, Any]) -> bytes:
+		return pickle.dumps(_plain_results(results), protocol=pickle.HIGHEST_PROTOCOL)
+
+	def loads(self, *, value: bytes) -> Dict[str, Any]:
+		return _model_results(pickle.loads(value))
+
+
+def _plain_results(results: Dict[str, Any]) -> Dict[str, Any]:
+	# [DOC] Convert DictObj, BaseModel values in results to dict, as serialisers don't support them
+	return _plain_val(results)
+
+
+def _plain_val(val: Any) -> Any:
+	if isinstance(val, DictObj):
+		# [DOC] Read DictObj attrs as-is, to avoid copying shared attrs
+		val = object.__getattribute__(val, '_DictObj__attrs')
+		return {attr: _plain_val(val[attr]) for attr in val.keys()}
+	elif type(val) == dict:
+		return {attr: _plain_val(val[attr]) for attr in val.keys()}
+	elif type(val) in [list, tuple]:
+		return [_plain_val(item) for item in val]
+	return val
+
+
+def _model_results(results: Dict[str, Any]) -> Dict[str, Any]:
+	if 'docs' in results.keys():
+		results['docs'] = [BaseModel(doc) for doc in results['docs']]
+	return results
@@ -5,7 +5,13 @@ from ._attr import (
 )
 from ._base_model import BaseModel
 from ._dictobj import DictObj
-from ._json_encoder import JSONEncoder
+from ._json_encoder import (
+	JSONEncoder,
+	JSONSerializer,
+	StdJSONSerializer,
+	OrjsonJSONSerializer,
+	_json_serializer,
+)
 from ._module import (
 	PERM,
 	EXTN,
@@ -13,7 +19,9 @@ from ._module import (
 	CACHE,
 	CACHED_QUERY,
 	CACHE_CONDITION,
+	CACHE_STATS,
 	ANALYTIC,
+	EXPORT_STREAM,
 	PRE_HANDLER_RETURN,
 	ON_HANDLER_RETURN,
 )
@@ -36,7 +36,7 @@ logger = logging.getLogger('nawah')
 ATTRS_TYPES_ARGS: Dict[str, Dict[str, Union[Type, str]]] = {
 	'ANY': {},
 	'ACCESS': {},
-	'COUNTER': {'pattern': str},
+	'COUNTER': {'pattern': str, 'block': int},
 	'ID': {},
 	'STR': {'pattern': str},
 	'INT': {'ranges': List[List[int]]},
@@ -81,7 +81,7 @@ ATTRS_TYPES_ARGS: Dict[str, Dict[str, Union[Type, str]]] = {
 	'TYPED_DICT': {'dict': Dict[str, 'ATTR']},
 	'LITERAL': {'literal': List[Union[str, int, float, bool]]},
 	'UNION': {'union': List['ATTR']},
-	'TYPE': {'type': str},
+	'TYPE': {'type': str, 'ordered': bool},
 }
 
 SPECIAL_ATTRS = Literal[
@@ -144,6 +144,10 @@ class ATTR:
 	_args: Dict[str, Any]
 	_valid: bool = False
 	_extn: Optional[Union['EXTN', 'ATTR']] = None
+	# [DOC] Compiled validator of Attr Type, set by nawah.utils.compile_attr
+	_validator: Optional[Callable] = None
+	_validator_async: bool = False
+	_validator_ordered: bool = False
 
 	__default = NAWAH_VALUES.NONE_VALUE
 
@@ -180,8 +184,18 @@ class ATTR:
 		return ATTR(attr_type='ACCESS', desc=desc)
 
 	@classmethod
-	def COUNTER(cls, *, desc: str = None, pattern: str, values: List[Callable] = None):
-		return ATTR(attr_type='COUNTER', desc=desc, pattern=pattern, values=values)
+	def COUNTER(
+		cls,
+		*,
+		desc: str = None,
+		pattern: str,
+		values: List[Callable] = None,
+		block: int = None,
+	):
+		# [DOC] block sets count of counter values leased by worker at once, for high insert rates, at the cost of gaps in values
+		return ATTR(
+			attr_type='COUNTER', desc=desc, pattern=pattern, values=values, block=block
+		)
 
 	@classmethod
 	def ID(cls, *, desc: str = None):
@@ -339,8 +353,15 @@ class ATTR:
 		return ATTR(attr_type='UNION', desc=desc, union=union)
 
 	@classmethod
-	def TYPE(cls, *, desc: str = None, type: Union[str, ATTR_TYPE_CALLABLE_TYPE]):
-		return ATTR(attr_type='TYPE', desc=desc, type=type)
+	def TYPE(
+		cls,
+		*,
+		desc: str = None,
+		type: Union[str, ATTR_TYPE_CALLABLE_TYPE],
+		ordered: bool = False,
+	):
+		# [DOC] ordered marks TYPE function as reading other doc values, to be validated after, and before other attrs, when validating doc concurrently
+		return ATTR(attr_type='TYPE', desc=desc, type=type, ordered=ordered)
 
 	@classmethod
 	def validate_type(cls, *, attr_type: 'ATTR', skip_type: bool = False):
@@ -407,6 +428,9 @@ class ATTR:
 					raise InvalidAttrTypeException(attr_type=attr_type)
 				if '$__counters.' not in attr_type._args['pattern']:
 					logger.warning('Attr Type COUNTER is defined with not \'$__counters\'.')
+				if attr_type._args['block'] != None and attr_type._args['block'] < 1:
+					logger.error('Attr Type COUNTER is having \'block\' less than 1.')
+					raise InvalidAttrTypeException(attr_type=attr_type)
 				for group in counter_groups:
 					if group.startswith('$__counters.'):
 						Config.docs.append(
@@ -2,11 +2,16 @@ from ._dictobj import DictObj
 
 
 class BaseModel(DictObj):
+	'''DictObj of a doc. Nested dicts having _id are wrapped as BaseModel, lazily, when accessed.'''
+
+	__slots__ = ()
+
 	def __repr__(self):
 		return f'<Model:{str(self._id)}>'
 
-	def __init__(self, attrs):
-		for attr in attrs.keys():
-			if type(attrs[attr]) == dict and '_id' in attrs[attr].keys():
-				attrs[attr] = BaseModel(attrs[attr])
-		super().__init__(attrs)
\ No newline at end of file
+	def __getitem__(self, attr):
+		val = super().__getitem__(attr)
+		if type(val) in [dict, DictObj] and '_id' in val:
+			val = BaseModel(val)
+			self._DictObj__attrs[attr] = val
+		return val
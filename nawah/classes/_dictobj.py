@@ -1,39 +1,68 @@
-from collections.abc import MutableMapping
-from typing import Dict, Any, Union, cast
+from collections.abc import MutableMapping, Mapping
+from typing import Dict, Any, Union, Callable
 
-import logging, copy
+from bson import ObjectId
+
+import logging, copy, datetime
 
 logger = logging.getLogger('nawah')
 
+# [DOC] Values of these types can't be mutated in-place, and are safe to return from shared attrs
+_IMMUTABLE_TYPES = (
+	str,
+	int,
+	float,
+	bool,
+	bytes,
+	type(None),
+	ObjectId,
+	datetime.datetime,
+	datetime.date,
+	datetime.time,
+)
+
 # [REF]: https://treyhunner.com/2019/04/why-you-shouldnt-inherit-from-list-and-dict-in-python/
 class DictObj(MutableMapping):
+	'''Dict-like object allowing access to its attrs as object attributes. Initialising DictObj from another DictObj shares attrs of it, copy-on-write.'''
+
+	__slots__ = ('_DictObj__attrs', '_DictObj__shared')
+
 	__attrs: Dict[str, Any]
+	__shared: bool
 
 	def __repr__(self):
 		return f'<DictObj:{self.__attrs}>'
 
 	def __init__(self, data: Union['DictObj', Dict[str, Any]]):
-		if type(data) == DictObj:
-			data = cast(DictObj, data)
-			data = data._attrs()
+		if isinstance(data, DictObj):
+			# [DOC] Share attrs with data, and mark both as shared to have either of them copy attrs before mutating it
+			data.__shared = True
+			self.__attrs = data.__attrs
+			self.__shared = True
+			return
 		elif type(data) != dict:
 			raise TypeError(
 				f'DictObj can be initialised using DictObj or dict types only. Got \'{type(data)}\' instead.'
 			)
-		self.__attrs = {}
-		self.update(data)
+		self.__attrs = dict(data)
+		self.__shared = False
 
-	def __getattribute__(self, attr):
-		if attr in object.__getattribute__(self, '_DictObj__attrs').keys():
-			return object.__getattribute__(self, '_DictObj__attrs')[attr]
-		else:
-			return object.__getattribute__(self, attr)
+	def __getattr__(self, attr):
+		# [DOC] __getattr__ is called only if attr is not found as regular attribute. Skip slots of uninitialised object, and special attrs looked up by copy, pickle
+		if attr.startswith('_DictObj__') or (attr.startswith('__') and attr.endswith('__')):
+			raise AttributeError(attr)
+		try:
+			return self[attr]
+		except KeyError:
+			raise AttributeError(
+				f'\'{type(self).__name__}\' object has no attribute \'{attr}\''
+			) from None
 
 	def __deepcopy__(self, memo):
-		return DictObj(copy.deepcopy(self.__attrs))
+		return DictObj(self)
 
 	def __setattr__(self, attr, val):
-		if not attr.endswith('__attrs'):
+		if not attr.startswith('_DictObj__'):
 			raise AttributeError(
 				f'Can\'t assign to DictObj attr \'{attr}\' using __setattr__. Use __setitem__ instead.'
 			)
@@ -41,15 +70,22 @@ class DictObj(MutableMapping):
 
 	def __getitem__(self, attr):
 		try:
-			return self.__attrs[attr]
+			val = self.__attrs[attr]
 		except Exception as e:
 			logger.debug(f'Unable to __getitem__ {attr} of {self.__attrs.keys()}.')
 			raise e
+		# [DOC] Mutable values of shared attrs can be mutated in-place by caller, copy attrs first
+		if self.__shared and not isinstance(val, _IMMUTABLE_TYPES):
+			self._own()
+			val = self.__attrs[attr]
+		return val
 
 	def __setitem__(self, attr, val):
+		self._own()
 		self.__attrs[attr] = val
 
 	def __delitem__(self, attr):
+		self._own()
 		del self.__attrs[attr]
 
 	def __iter__(self):
@@ -59,7 +95,62 @@ class DictObj(MutableMapping):
 		return len(self.__attrs)
 
 	def __contains__(self, attr):
-		return attr in self.__attrs.keys()
+		return attr in self.__attrs
+
+	def __eq__(self, other):
+		if isinstance(other, DictObj):
+			return self.__attrs == other.__attrs
+		elif isinstance(other, Mapping):
+			return self.__attrs == other
+		return NotImplemented
+
+	def keys(self):
+		return self.__attrs.keys()
+
+	def _own(self):
+		# [DOC] Copy shared attrs, before they get mutated
+		if self.__shared:
+			self.__attrs = copy.deepcopy(self.__attrs)
+			self.__shared = False
 
 	def _attrs(self):
 		return copy.deepcopy(self.__attrs)
+
+
+class _StoredAttrFirst:
+	'''Descriptor of DictObj mapping methods, returning stored attr of same name, if any, rather than method.'''
+
+	__slots__ = ('name', 'method')
+
+	def __init__(self, *, name: str, method: Callable):
+		self.name = name
+		self.method = method
+
+	def __get__(self, obj, objtype=None):
+		if obj is not None:
+			try:
+				attrs = obj._DictObj__attrs
+			except AttributeError:
+				attrs = None
+			if attrs is not None and self.name in attrs:
+				return obj[self.name]
+		return self.method.__get__(obj, objtype)
+
+
+# [DOC] Stored attrs take precedence over mapping methods when accessed as object attributes, as __getattr__ is called only for attrs not found on class. Other attrs are looked up by __getattr__, not adding overhead to accessing them
+for _method_name in [
+	'keys',
+	'items',
+	'values',
+	'get',
+	'pop',
+	'popitem',
+	'clear',
+	'update',
+	'setdefault',
+]:
+	setattr(
+		DictObj,
+		_method_name,
+		_StoredAttrFirst(name=_method_name, method=getattr(DictObj, _method_name)),
+	)
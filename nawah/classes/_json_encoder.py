@@ -1,17 +1,24 @@
+from nawah.config import Config
+
 from bson import ObjectId
 
-import json, datetime
+from typing import Any, Optional
+
+import json, datetime, logging
 
 from ._base_model import BaseModel
 from ._dictobj import DictObj
 
+logger = logging.getLogger('nawah')
+
 
 class JSONEncoder(json.JSONEncoder):
 	def default(self, o):
 		if isinstance(o, ObjectId):
 			return str(o)
 		elif isinstance(o, BaseModel) or isinstance(o, DictObj):
-			return o._attrs()
+			# [DOC] Encoding doesn't mutate values, pass attrs as-is rather than deep copy of it from DictObj._attrs
+			return object.__getattribute__(o, '_DictObj__attrs')
 		elif type(o) == datetime.datetime:
 			return o.isoformat()
 		elif type(o) == bytes:
@@ -19,4 +26,74 @@ class JSONEncoder(json.JSONEncoder):
 		try:
 			return json.JSONEncoder.default(self, o)
 		except TypeError:
-			return str(o)
\ No newline at end of file
+			return str(o)
+
+
+class JSONSerializer:
+	'''Base class for serialising call results, and other values, to JSON. Subclasses implement encode, and optionally encode_bytes.'''
+
+	def encode(self, obj: Any) -> str:
+		raise NotImplementedError()
+
+	def encode_bytes(self, obj: Any) -> bytes:
+		return self.encode(obj).encode('utf-8')
+
+
+class StdJSONSerializer(JSONSerializer):
+	'''Serialises values using JSONEncoder, based on Python json module.'''
+
+	def __init__(self):
+		self._encoder = JSONEncoder()
+
+	def encode(self, obj: Any) -> str:
+		return self._encoder.encode(obj)
+
+
+class OrjsonJSONSerializer(JSONSerializer):
+	'''Serialises values using orjson, handling DictObj, BaseModel values without copying them. Falls back to JSONEncoder for values orjson can't serialise. Requires orjson package.'''
+
+	def __init__(self):
+		import orjson
+
+		self._orjson = orjson
+		self._option = orjson.OPT_NON_STR_KEYS
+		self._fallback = JSONEncoder()
+
+	def encode(self, obj: Any) -> str:
+		return self.encode_bytes(obj).decode('utf-8')
+
+	def encode_bytes(self, obj: Any) -> bytes:
+		try:
+			return self._orjson.dumps(obj, default=_orjson_default, option=self._option)
+		except TypeError:
+			# [DOC] orjson.JSONEncodeError is a subclass of TypeError, raised for values as integers over 64-bit
+			return self._fallback.encode(obj).encode('utf-8')
+
+
+def _orjson_default(o: Any) -> Any:
+	if isinstance(o, ObjectId):
+		return str(o)
+	elif isinstance(o, DictObj):
+		return object.__getattribute__(o, '_DictObj__attrs')
+	elif type(o) == bytes:
+		return True
+	return str(o)
+
+
+class _DefaultJSONSerializer:
+	serializer: Optional[JSONSerializer] = None
+
+
+def _json_serializer() -> JSONSerializer:
+	# [DOC] Return Config.json_serializer, if set, otherwise orjson-based serializer if orjson is installed, or JSONEncoder-based one
+	if Config.json_serializer:
+		return Config.json_serializer
+
+	if not _DefaultJSONSerializer.serializer:
+		try:
+			_DefaultJSONSerializer.serializer = OrjsonJSONSerializer()
+		except ModuleNotFoundError:
+			logger.debug('orjson is not installed. Using JSONEncoder-based JSON serializer.')
+			_DefaultJSONSerializer.serializer = StdJSONSerializer()
+
+	return _DefaultJSONSerializer.serializer
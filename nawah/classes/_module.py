@@ -8,8 +8,10 @@ from typing import (
 	Optional,
 	Union,
 	List,
+	Set,
 	TYPE_CHECKING,
 	AsyncGenerator,
+	AsyncIterable,
 	Callable,
 	Literal,
 	Protocol,
@@ -17,12 +19,16 @@ from typing import (
 	cast,
 )
 
-import datetime, logging
+from bson import ObjectId
+from collections import OrderedDict
+
+import datetime, logging, sys, copy, asyncio, csv, io, re, urllib.parse
 
 from ._dictobj import DictObj
 from ._exceptions import MethodException
 
 if TYPE_CHECKING:
+	from nawah.cache import CacheBackend, CacheSerializer
 	from nawah.base_module import BaseModule
 	from nawah.base_method import BaseMethod
 	from ._attr import ATTR
@@ -346,11 +352,45 @@ class CACHE_CONDITION(Protocol):
 		...
 
 
+class CACHE_STATS(TypedDict):
+	entries: int
+	bytes: int
+	hits: int
+	stale_hits: int
+	backend_hits: int
+	misses: int
+	evictions: int
+	expirations: int
+
+
 class CACHE:
 	condition: CACHE_CONDITION
 	period: Optional[int]
 	cache_strategy: CACHE_STRATEGY
-	queries: Dict[str, 'CACHED_QUERY']
+	max_entries: Optional[int]
+	max_bytes: Optional[int]
+	max_stale: Optional[int]
+	stale_if_error: bool
+	refresh_delay: float
+	queries: 'OrderedDict[str, CACHED_QUERY]'
+	size: int
+	version: int
+	hits: int
+	stale_hits: int
+	backend_hits: int
+	misses: int
+	evictions: int
+	expirations: int
+	_pending_queries: Dict[str, 'CACHED_QUERY']
+	_refreshing_queries: Dict[str, 'CACHED_QUERY']
+	_refresh_task: Optional['asyncio.Task']
+	_revalidating_queries: Set[str]
+	backend: Optional['CacheBackend']
+	serializer: Optional['CacheSerializer']
+	cache_response: bool
+	warm: List[Union['NAWAH_QUERY', 'Query']]
+	namespace: str
+	_backend_stale: bool
 
 	def __repr__(self):
 		return f'<CACHE:{self.condition},{self.period}>'
@@ -361,39 +401,531 @@ class CACHE:
 		condition: CACHE_CONDITION,
 		period: int = None,
 		cache_strategy: CACHE_STRATEGY = CACHE_STRATEGY.RECREATE,
+		max_entries: int = None,
+		max_bytes: int = None,
+		max_stale: int = None,
+		stale_if_error: bool = False,
+		refresh_delay: float = 0.1,
+		backend: 'CacheBackend' = None,
+		serializer: 'CacheSerializer' = None,
+		cache_response: bool = False,
+		warm: List[Union['NAWAH_QUERY', 'Query']] = None,
 	):
 		self.condition = condition
 		self.period = period
 		self.cache_strategy = cache_strategy
-		self.queries = {}
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.max_stale = max_stale
+		self.stale_if_error = stale_if_error
+		self.refresh_delay = refresh_delay
+		self.queries = OrderedDict()
+		self.size = 0
+		# [DOC] version is bumped whenever docs are written, allowing in-flight reads to detect they might be stale
+		self.version = 0
+		self.hits = 0
+		self.stale_hits = 0
+		self.backend_hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.expirations = 0
+		self._pending_queries = {}
+		self._refreshing_queries = {}
+		self._refresh_task = None
+		self._revalidating_queries = set()
+		self.backend = backend
+		self.serializer = serializer
+		# [DOC] cache_response keeps encoded response of cached queries, to be sent to clients as-is
+		self.cache_response = cache_response
+		# [DOC] warm queries are read at app start, using sys env, to populate Cache Set before serving traffic
+		if not warm:
+			warm = []
+		self.warm = warm
+		# [DOC] namespace is set by BaseModule to separate Cache Sets sharing same backend
+		self.namespace = ''
+		# [DOC] _backend_stale is set if namespace failed to be invalidated in backend, stopping reading from it until it is cleared
+		self._backend_stale = False
+
+	@property
+	def stats(self) -> CACHE_STATS:
+		return {
+			'entries': len(self.queries),
+			'bytes': self.size,
+			'hits': self.hits,
+			'stale_hits': self.stale_hits,
+			'backend_hits': self.backend_hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'expirations': self.expirations,
+		}
+
+	def get_query(self, *, query_key: str) -> Optional['CACHED_QUERY']:
+		if query_key not in self.queries.keys():
+			self.misses += 1
+			return None
+
+		cached_query = self.queries[query_key]
+		if cached_query.expired:
+			# [DOC] STALE_WHILE_REVALIDATE Cache Set serves expired entries, up to max_stale, while they are being refreshed
+			if (
+				self.cache_strategy == CACHE_STRATEGY.STALE_WHILE_REVALIDATE
+				and not cached_query.stale_expired(max_stale=self.max_stale)
+			):
+				self.queries.move_to_end(query_key)
+				self.stale_hits += 1
+				return cached_query
+
+			# [DOC] Expired entries are dropped, unless required to be served if reading fails, and counted as misses
+			if not self.stale_if_error:
+				self.delete_query(query_key=query_key)
+				self.expirations += 1
+			self.misses += 1
+			return None
+
+		# [DOC] Mark entry as most recently used
+		self.queries.move_to_end(query_key)
+		self.hits += 1
+		return cached_query
+
+	def get_stale_query(self, *, query_key: str) -> Optional['CACHED_QUERY']:
+		# [DOC] Return expired entry to be served if reading fails, if Cache Set has stale_if_error set
+		if not self.stale_if_error or query_key not in self.queries.keys():
+			return None
+		self.stale_hits += 1
+		return self.queries[query_key]
+
+	def cache_query(
+		self,
+		*,
+		query_key: str,
+		results: Dict[str, Any],
+		query: 'Query' = None,
+		skip_extn: bool = False,
+		version: int = None,
+	) -> 'CACHED_QUERY':
+		cached_query = CACHED_QUERY(
+			results=results, ttl=self.period, query=query, skip_extn=skip_extn
+		)
+		# [DOC] If cached queries were invalidated since results were read, skip caching stale results
+		if version != None and version != self.version:
+			logger.debug(f'Skipped caching query \'{query_key}\' read before invalidation.')
+			return cached_query
+
+		self._insert_query(query_key=query_key, cached_query=cached_query)
+		return cached_query
+
+	def _insert_query(self, *, query_key: str, cached_query: 'CACHED_QUERY') -> None:
+		if query_key in self.queries.keys():
+			self.delete_query(query_key=query_key)
+
+		# [DOC] Results bigger than max_bytes can never be cached
+		if self.max_bytes and cached_query.size > self.max_bytes:
+			logger.debug(
+				f'Skipped caching query \'{query_key}\' with size {cached_query.size} exceeding max_bytes {self.max_bytes}.'
+			)
+			return
+
+		self.queries[query_key] = cached_query
+		self.size += cached_query.size
+
+		# [DOC] Evict least recently used entries until cache is within limits
+		while (self.max_entries and len(self.queries) > self.max_entries) or (
+			self.max_bytes and self.size > self.max_bytes
+		):
+			evicted_key = next(iter(self.queries))
+			self.delete_query(query_key=evicted_key)
+			self.evictions += 1
+
+	def set_response(self, *, query_key: str, cached_query: 'CACHED_QUERY', response: str) -> None:
+		cached_query.response = response
+		cached_query.size += len(response)
+		# [DOC] Account for response size only if cached query is still in Cache Set
+		if self.queries.get(query_key) is cached_query:
+			self.size += len(response)
+
+	def delete_query(self, *, query_key: str) -> None:
+		cached_query = self.queries.pop(query_key)
+		self.size -= cached_query.size
+
+	def clear(self) -> None:
+		self.queries = OrderedDict()
+		self.size = 0
+		self.version += 1
+
+	def invalidate_queries(
+		self,
+		*,
+		docs: Optional[List[Dict[str, Any]]],
+		doc: 'NAWAH_DOC' = None,
+	) -> Dict[str, 'CACHED_QUERY']:
+		# [DOC] Delete cached queries affected by written docs, or all cached queries if docs is None. Affected queries pending refresh, or being refreshed are returned as well to have them refreshed again
+		invalidated_queries: Dict[str, CACHED_QUERY] = {}
+		# [DOC] Collect keys first, as deleting from queries while iterating over it is not possible
+		for query_key, cached_query in list(self.queries.items()):
+			if docs == None or cached_query.is_affected(docs=docs, doc=doc):
+				self.delete_query(query_key=query_key)
+				invalidated_queries[query_key] = cached_query
+
+		for query_key, cached_query in [
+			*self._pending_queries.items(),
+			*self._refreshing_queries.items(),
+		]:
+			if docs == None or cached_query.is_affected(docs=docs, doc=doc):
+				invalidated_queries[query_key] = cached_query
 
-	def cache_query(self, *, query_key: str, results: Dict[str, Any]):
-		self.queries[query_key] = CACHED_QUERY(results=results)
+		self.version += 1
+
+		return invalidated_queries
+
+	def _get_backend(self) -> Optional['CacheBackend']:
+		return self.backend or Config.cache_backend
+
+	def _get_serializer(self) -> 'CacheSerializer':
+		if not self.serializer:
+			from nawah.cache import BSONCacheSerializer
+
+			self.serializer = BSONCacheSerializer()
+		return self.serializer
+
+	async def load_query(
+		self, *, query_key: str, query: 'Query' = None, skip_extn: bool = False
+	) -> Optional['CACHED_QUERY']:
+		# [DOC] Attempt to load query cached by other app processes from shared backend
+		backend = self._get_backend()
+		if not backend:
+			return None
+		if self._backend_stale and not await self._clear_backend(backend=backend):
+			return None
+
+		try:
+			record = await backend.get(namespace=self.namespace, key=query_key)
+			if not record:
+				return None
+			results = self._get_serializer().loads(value=record['value'])
+		except Exception as e:
+			logger.error(
+				f'Failed to load cached query \'{query_key}\' from Cache Backend. Original exception: {e}'
+			)
+			return None
+
+		cached_query = CACHED_QUERY(
+			results=results,
+			query_time=record['query_time'],
+			ttl=self.period,
+			query=query,
+			skip_extn=skip_extn,
+		)
+		if cached_query.expired and (
+			self.cache_strategy != CACHE_STRATEGY.STALE_WHILE_REVALIDATE
+			or cached_query.stale_expired(max_stale=self.max_stale)
+		):
+			return None
+
+		self._insert_query(query_key=query_key, cached_query=cached_query)
+		self.backend_hits += 1
+		return cached_query
+
+	async def backend_version(self) -> Optional[int]:
+		# [DOC] Return version of namespace in shared backend, to be read before reading query and passed to store_query
+		backend = self._get_backend()
+		if not backend:
+			return None
+
+		try:
+			return await backend.version(namespace=self.namespace)
+		except Exception as e:
+			logger.error(
+				f'Failed to read version from Cache Backend. Original exception: {e}'
+			)
+			return None
+
+	async def store_query(
+		self, *, query_key: str, cached_query: 'CACHED_QUERY', version: Optional[int]
+	) -> None:
+		# [DOC] Store cached query in shared backend, only if it was cached locally, for other app processes to use
+		backend = self._get_backend()
+		if (
+			not backend
+			or self._backend_stale
+			or self.queries.get(query_key) is not cached_query
+		):
+			return
+		# [DOC] If backend version couldn't be read before reading query, results can't be checked against invalidations by other app processes
+		if version == None:
+			return
+
+		# [DOC] Set expiry for backend to drop cached query, unless it can be served stale indefinitely
+		expiry = None
+		if self.period and not self.stale_if_error:
+			if self.cache_strategy != CACHE_STRATEGY.STALE_WHILE_REVALIDATE:
+				expiry = cached_query.query_time + datetime.timedelta(seconds=self.period)
+			elif self.max_stale != None:
+				expiry = cached_query.query_time + datetime.timedelta(
+					seconds=self.period + self.max_stale
+				)
+
+		try:
+			await backend.set(
+				namespace=self.namespace,
+				key=query_key,
+				value=self._get_serializer().dumps(results=cached_query._results),
+				query_time=cached_query.query_time,
+				expiry=expiry,
+				ids=list(cached_query.ids),
+				deps={
+					attr: [list(vals) for vals in cached_query.deps[attr]]
+					for attr in cached_query.deps.keys()
+				},
+				version=version,
+			)
+		except Exception as e:
+			logger.error(
+				f'Failed to store cached query \'{query_key}\' in Cache Backend. Original exception: {e}'
+			)
+
+	async def invalidate_backend(
+		self, *, docs: Optional[List[Dict[str, Any]]], doc: 'NAWAH_DOC' = None
+	) -> None:
+		backend = self._get_backend()
+		if not backend:
+			return
+		if self._backend_stale:
+			await self._clear_backend(backend=backend)
+			return
+
+		try:
+			# [DOC] Send only attrs cached queries can depend on, rather than written docs as-is
+			await backend.invalidate(
+				namespace=self.namespace,
+				docs=_cache_message_docs(docs=docs),
+				doc=_cache_message_doc(doc=doc),
+			)
+			return
+		except Exception as e:
+			logger.error(
+				f'Failed to invalidate cached queries in Cache Backend. Original exception: {e}'
+			)
+		# [DOC] Fallback to clearing namespace, which bumps its version, as backend would otherwise keep serving stale cached queries
+		if docs != None:
+			await self._clear_backend(backend=backend)
+		else:
+			self._backend_stale = True
+
+	async def _clear_backend(self, *, backend: 'CacheBackend') -> bool:
+		try:
+			await backend.invalidate(namespace=self.namespace, docs=None)
+			self._backend_stale = False
+		except Exception as e:
+			logger.error(
+				f'Failed to clear namespace \'{self.namespace}\' in Cache Backend. Original exception: {e}'
+			)
+			self._backend_stale = True
+		return not self._backend_stale
 
 
 class CACHED_QUERY:
 	_results: Dict[str, Any]
 	query_time: datetime.datetime
+	ttl: Optional[int]
+	size: int
+	query: Optional['Query']
+	skip_extn: bool
+	ids: Set[str]
+	deps: Dict[str, List[Set[Any]]]
+	response: Optional[str]
 
 	@property
 	def results(self) -> Dict[str, Any]:
 		results = {k: v for k, v in self._results.items()}
 		if 'docs' in results.keys():
-			results['docs'] = [DictObj(doc._attrs()) for doc in results['docs']]
+			results['docs'] = [DictObj(doc) for doc in results['docs']]
 
 		return results
 
-	def __init__(self, *, results: Dict[str, Any], query_time: datetime.datetime = None):
+	@property
+	def expired(self) -> bool:
+		if not self.ttl:
+			return False
+		return (
+			self.query_time + datetime.timedelta(seconds=self.ttl)
+		) < datetime.datetime.utcnow()
+
+	def stale_expired(self, *, max_stale: Optional[int]) -> bool:
+		if not self.ttl or max_stale == None:
+			return False
+		return (
+			self.query_time + datetime.timedelta(seconds=self.ttl + max_stale)
+		) < datetime.datetime.utcnow()
+
+	def __init__(
+		self,
+		*,
+		results: Dict[str, Any],
+		query_time: datetime.datetime = None,
+		ttl: int = None,
+		query: 'Query' = None,
+		skip_extn: bool = False,
+	):
 		# [DOC] Re-construct results dict to avoid manipulation to cached data by on_read handler
 		results = {k: v for k, v in results.items()}
-		# [DOC] Re-construct BaseModel to avoid manipulation to cached data by on_read handler
+		# [DOC] Share docs copy-on-write, to avoid manipulation to cached data by on_read handler
 		if 'docs' in results.keys():
-			results['docs'] = [DictObj(doc._attrs()) for doc in results['docs']]
+			results['docs'] = [DictObj(doc) for doc in results['docs']]
 
 		self._results = results
 		if not query_time:
 			query_time = datetime.datetime.utcnow()
 		self.query_time = query_time
+		self.ttl = ttl
+		self.size = _estimate_size(results)
+		self.query = copy.deepcopy(query)
+		self.skip_extn = skip_extn
+		self.response = None
+
+		# [DOC] Track _id of docs in results, and values of attrs query matches with $eq, $in
+		self.ids = set()
+		if 'docs' in results.keys():
+			self.ids = {str(doc['_id']) for doc in results['docs'] if '_id' in doc}
+		self.deps = {}
+		if query != None:
+			for attr in query._index.keys():
+				# [DOC] Only use top-level attrs, as they are the ones all docs in results must satisfy
+				if '.' in attr or ':' in attr:
+					continue
+				for record in query._index[attr]:
+					if len(record['path']) != 1 or record['oper'] not in ['$eq', '$in']:
+						continue
+					try:
+						if record['oper'] == '$in':
+							vals = {_cache_dep_val(val) for val in record['val']['$in']}
+						elif type(record['val']) == dict:
+							vals = {_cache_dep_val(record['val']['$eq'])}
+						else:
+							vals = {_cache_dep_val(record['val'])}
+					except TypeError:
+						continue
+					if attr not in self.deps.keys():
+						self.deps[attr] = []
+					self.deps[attr].append(vals)
+
+	def is_affected(self, *, docs: List[Dict[str, Any]], doc: 'NAWAH_DOC' = None) -> bool:
+		# [DOC] Check whether writing docs could affect cached results. docs are the states of written docs prior to write, or created docs. doc is the update doc, if any
+		# [DOC] Cached query without a query, can't be checked
+		if self.query == None:
+			return True
+		return _cache_deps_affected(ids=self.ids, deps=self.deps, docs=docs, doc=doc)
+
+
+def _cache_deps_affected(
+	*,
+	ids: Set[str],
+	deps: Dict[str, List[Set[Any]]],
+	docs: List[Dict[str, Any]],
+	doc: 'NAWAH_DOC' = None,
+) -> bool:
+	# [DOC] Find update doc attrs that change attrs the cached query depends on
+	update_attrs: Dict[str, Any] = {}
+	if doc:
+		for attr in doc.keys():
+			attr_root = attr.split('.')[0].split(':')[0]
+			if attr_root not in deps.keys():
+				continue
+			# [DOC] Update doc attrs that are not set with a value can't be checked
+			if attr != attr_root or (
+				type(doc[attr]) == dict
+				and doc[attr].keys()
+				and list(doc[attr].keys())[0][0] == '$'
+			):
+				return True
+			update_attrs[attr] = doc[attr]
+
+	for written_doc in docs:
+		if str(written_doc['_id']) in ids:
+			return True
+		if _cache_deps_may_match(deps=deps, doc=written_doc):
+			return True
+		if update_attrs and _cache_deps_may_match(
+			deps=deps, doc={**written_doc, **update_attrs}
+		):
+			return True
+
+	return False
+
+
+def _cache_deps_may_match(*, deps: Dict[str, List[Set[Any]]], doc: Dict[str, Any]) -> bool:
+	for attr in deps.keys():
+		# [DOC] Doc missing attr can't be checked
+		if attr not in doc:
+			return True
+		try:
+			if type(doc[attr]) == list:
+				doc_vals = {_cache_dep_val(val) for val in doc[attr]}
+			else:
+				doc_vals = {_cache_dep_val(doc[attr])}
+		except TypeError:
+			return True
+		for vals in deps[attr]:
+			if not doc_vals & vals:
+				return False
+	return True
+
+
+def _cache_message_docs(
+	*, docs: Optional[List[Dict[str, Any]]]
+) -> Optional[List[Dict[str, Any]]]:
+	# [DOC] Cached queries depend only on top-level scalar attrs of docs, strip the rest before sending docs to other app processes, or Cache Backend
+	if docs == None:
+		return None
+	return [
+		{attr: written_doc[attr] for attr in written_doc if _cache_message_val(written_doc[attr])}
+		for written_doc in docs
+	]
+
+
+def _cache_message_doc(*, doc: 'NAWAH_DOC') -> 'NAWAH_DOC':
+	# [DOC] Only attrs names, and scalar values of update doc are checked against cached queries dependencies. Replace other values with update operator placeholder, which affects cached queries depending on attr, as the value itself would
+	if not doc:
+		return doc
+	return {
+		attr: doc[attr] if _cache_message_val(doc[attr]) else {'$': None} for attr in doc
+	}
+
+
+def _cache_message_val(val: Any) -> bool:
+	return (
+		val == None
+		or type(val) in [str, int, float, bool, ObjectId]
+		or (
+			type(val) == list
+			and all(type(item) in [str, int, float, bool, ObjectId] for item in val)
+		)
+	)
+
+
+def _cache_dep_val(val: Any) -> Any:
+	# [DOC] Normalise values to compare cached queries dependencies, raising TypeError for values that can't be compared
+	if type(val) == ObjectId:
+		return str(val)
+	if isinstance(val, DictObj) and '_id' in val:
+		return str(val['_id'])
+	if val == None or type(val) in [str, int, float, bool]:
+		return val
+	raise TypeError(f'Can\'t use value of type \'{type(val)}\' as cache dependency.')
+
+
+def _estimate_size(obj: Any) -> int:
+	# [DOC] Estimate memory footprint of cached results by walking containers, and summing sys.getsizeof
+	size = sys.getsizeof(obj)
+	if isinstance(obj, DictObj):
+		obj = object.__getattribute__(obj, '_DictObj__attrs')
+		size += sys.getsizeof(obj)
+	if isinstance(obj, dict):
+		for key, val in obj.items():
+			size += sys.getsizeof(key) + _estimate_size(val)
+	elif isinstance(obj, (list, tuple, set)):
+		for item in obj:
+			size += _estimate_size(item)
+	return size
 
 
 class ANALYTIC_CONDITION(Protocol):
@@ -432,3 +964,103 @@ class ANALYTIC:
 	):
 		setattr(self, 'condition', condition)
 		setattr(self, 'doc', doc)
+
+
+class EXPORT_STREAM:
+	'''Docs returned by GET method with `return: 'stream'`, to be written to response as NDJSON, or CSV rows as they are yielded, rather than encoded into one JSON body.'''
+
+	docs: AsyncIterable[Any]
+	format: Literal['ndjson', 'csv']
+	attrs: Optional[List[str]]
+	name: Optional[str]
+	chunk_size: int
+
+	def __init__(
+		self,
+		*,
+		docs: AsyncIterable[Any],
+		format: Literal['ndjson', 'csv'] = 'ndjson',
+		attrs: Optional[List[str]] = None,
+		name: Optional[str] = None,
+		chunk_size: int = 65536,
+	):
+		if format not in ['ndjson', 'csv']:
+			raise Exception(f'Invalid EXPORT_STREAM format \'{format}\'.')
+		setattr(self, 'docs', docs)
+		setattr(self, 'format', format)
+		setattr(self, 'attrs', attrs)
+		setattr(self, 'name', name)
+		setattr(self, 'chunk_size', chunk_size)
+
+	def __deepcopy__(self, memo):
+		# [DOC] Docs async iterable can't be copied, and is consumed once. Share it with copies of call results
+		return self
+
+	@property
+	def content_type(self) -> str:
+		if self.format == 'csv':
+			return 'text/csv; charset=utf-8'
+		return 'application/x-ndjson; charset=utf-8'
+
+	@property
+	def content_disposition(self) -> Optional[str]:
+		if not self.name:
+			return None
+		# [DOC] Name is set by app code and can include quotes, line breaks, or non-ASCII chars. Use safe ASCII fallback, with full name as RFC 5987 filename*
+		ascii_name = re.sub(r'[^A-Za-z0-9._ -]', '_', self.name)
+		return f'attachment; filename="{ascii_name}"; filename*=UTF-8\'\'{urllib.parse.quote(self.name, safe="")}'
+
+	async def encode(self) -> AsyncGenerator[bytes, None]:
+		# [DOC] Yield encoded docs in chunks of at least chunk_size bytes, so memory used is bound by chunk_size, not number of docs
+		from ._json_encoder import _json_serializer
+
+		json_serializer = _json_serializer()
+		attrs = self.attrs
+		chunk: List[bytes] = []
+		chunk_len = 0
+		if self.format == 'csv' and attrs != None:
+			chunk.append(_encode_csv_row(vals=attrs))
+		async for doc in self.docs:
+			if self.format == 'ndjson':
+				line = json_serializer.encode_bytes(doc) + b'\n'
+			else:
+				# [DOC] If no attrs are set, use attrs of first doc as CSV header
+				if attrs == None:
+					attrs = list(doc.keys())
+					chunk.append(_encode_csv_row(vals=attrs))
+				line = _encode_csv_row(
+					vals=[
+						_encode_csv_val(
+							val=doc[attr] if attr in doc.keys() else None,
+							json_serializer=json_serializer,
+						)
+						for attr in attrs
+					]
+				)
+			chunk.append(line)
+			chunk_len += len(line)
+			if chunk_len >= self.chunk_size:
+				yield b''.join(chunk)
+				chunk = []
+				chunk_len = 0
+		if chunk:
+			yield b''.join(chunk)
+
+
+def _encode_csv_row(*, vals: List[Any]) -> bytes:
+	csv_row = io.StringIO()
+	csv.writer(csv_row).writerow(vals)
+	return csv_row.getvalue().encode('utf-8')
+
+
+def _encode_csv_val(*, val: Any, json_serializer: Any) -> Any:
+	# [DOC] CSV cells are flat. Encode nested values as JSON
+	if val == None:
+		return ''
+	elif type(val) in [str, int, float, bool]:
+		return val
+	elif isinstance(val, ObjectId):
+		return str(val)
+	elif isinstance(val, (dict, list, DictObj)):
+		return json_serializer.encode(val)
+	return str(val)
@@ -20,6 +20,8 @@ from croniter import croniter
 from ._types import NAWAH_DOC
 
 if TYPE_CHECKING:
+	from nawah.cache import CacheBus, CacheBackend
+	from ._json_encoder import JSONSerializer
 	from ._attr import ATTR
 	from ._types import NAWAH_ENV
 
@@ -174,6 +176,14 @@ class PACKAGE_CONFIG:
 	vars: Optional[Dict[str, Any]] = None
 	client_apps: Optional[Dict[str, CLIENT_APP]] = None
 	analytics_events: Optional[ANALYTICS_EVENTS] = None
+	analytics_flush_interval: Optional[int] = None
+	analytics_buffer_limit: Optional[int] = None
+	analytics_buffer_cap: Optional[int] = None
+	analytics_bucket_size: Optional[int] = None
+	diff_flush_interval: Optional[int] = None
+	diff_buffer_limit: Optional[int] = None
+	settings_cache_limit: Optional[int] = None
+	privileges_cache_limit: Optional[int] = None
 	conn_timeout: Optional[int] = None
 	quota_anon_min: Optional[int] = None
 	quota_auth_min: Optional[int] = None
@@ -184,7 +194,11 @@ class PACKAGE_CONFIG:
 	data_ca_name: Optional[str] = None
 	data_ca: Optional[str] = None
 	data_disk_use: Optional[bool] = None
+	data_stream_batch_size: Optional[int] = None
 	data_azure_mongo: Optional[bool] = None
+	cache_bus: Optional['CacheBus'] = None
+	cache_backend: Optional['CacheBackend'] = None
+	json_serializer: Optional['JSONSerializer'] = None
 	locales: Optional[List[str]] = None
 	locale: Optional[str] = None
 	admin_doc: Optional[NAWAH_DOC] = None
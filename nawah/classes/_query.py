@@ -21,7 +21,7 @@ if TYPE_CHECKING:
 
 
 QUERY_INDEX_RECORD = TypedDict(
-	'QUERY_INDEX_RECORD', {'oper': str, 'path': str, 'val': Any}
+	'QUERY_INDEX_RECORD', {'oper': str, 'path': List[Any], 'val': Any}
 )
 
 
@@ -46,42 +46,141 @@ class Query(list):
 	def _create_index(self, query: 'NAWAH_QUERY', path=[]):
 		if not path:
 			self._index: Dict[str, List[QUERY_INDEX_RECORD]] = {}
+			# [DOC] Extract special attrs, and sanitise query before indexing it, so paths of index records point to steps of sanitised query
+			self._extract_special(query)
+			self._query = self._sanitise_query(query)
+			query = self._query
 		for i in range(len(query)):
-			if type(query[i]) == dict:
+			self._index_step(query[i], path=path + [i])
+
+	def _extract_special(self, query: 'NAWAH_QUERY'):
+		for step in query:
+			if type(step) == dict:
 				del_attrs = []
-				for attr in query[i].keys():
+				for attr in step.keys():
 					if attr in SPECIAL_ATTRS.__args__:  # type: ignore
-						self._special[attr] = query[i][attr]  # type: ignore
+						self._special[attr] = step[attr]  # type: ignore
 						del_attrs.append(attr)
 					elif attr.startswith('__or'):
-						self._create_index(query[i][attr], path=path + [i, attr])  # type: ignore
-					else:
-						if (
-							type(query[i][attr]) == dict  # type: ignore
-							and len(query[i][attr].keys()) == 1  # type: ignore
-							and list(query[i][attr].keys())[0][0] == '$'  # type: ignore
-						):
-							attr_oper = list(query[i][attr].keys())[0]  # type: ignore
-						else:
-							attr_oper = '$eq'
-						if attr not in self._index.keys():
-							self._index[attr] = []
-						if isinstance(query[i][attr], DictObj):  # type: ignore
-							query[i][attr] = query[i][attr]._id  # type: ignore
-						Query.validate_arg(arg_name=attr, arg_oper=attr_oper, arg_val=query[i][attr])  # type: ignore
-						self._index[attr].append(
-							{
-								'oper': attr_oper,
-								'path': path + [i],
-								'val': query[i][attr],  # type: ignore
-							}
-						)
+						self._extract_special(step[attr])  # type: ignore
 				for attr in del_attrs:
-					del query[i][attr]  # type: ignore
-			elif type(query[i]) == list:
-				self._create_index(query[i], path=path + [i])  # type: ignore
-		if not path:
-			self._query = self._sanitise_query()
+					del step[attr]  # type: ignore
+			elif type(step) == list:
+				self._extract_special(step)  # type: ignore
+
+	def _index_step(self, step: Any, *, path: List[Any]):
+		if type(step) == dict:
+			for attr in step.keys():
+				if attr.startswith('__or'):
+					self._create_index(step[attr], path=path + [attr])
+				else:
+					if attr not in self._index.keys():
+						self._index[attr] = []
+					self._index[attr].append(self._index_attr(step=step, attr=attr, path=path))
+		elif type(step) == list:
+			self._create_index(step, path=path)
+
+	def _index_attr(self, *, step: Dict[str, Any], attr: str, path: List[Any]) -> QUERY_INDEX_RECORD:
+		if (
+			type(step[attr]) == dict
+			and len(step[attr].keys()) == 1
+			and list(step[attr].keys())[0][0] == '$'
+		):
+			attr_oper = list(step[attr].keys())[0]
+		else:
+			attr_oper = '$eq'
+		if isinstance(step[attr], DictObj):
+			step[attr] = step[attr]._id
+		Query.validate_arg(arg_name=attr, arg_oper=attr_oper, arg_val=step[attr])
+		return {'oper': attr_oper, 'path': path, 'val': step[attr]}
+
+	def _get_step(self, path: List[Any]) -> Any:
+		step: Any = self._query
+		for path_part in path:
+			step = step[path_part]
+		return step
+
+	def _set_attr(self, *, attr: str, record: QUERY_INDEX_RECORD, val: Any):
+		# [DOC] Update attr, and its index record in-place, rather than re-creating index of whole query
+		step = self._get_step(record['path'])
+		step[attr] = val
+		updated_record = self._index_attr(step=step, attr=attr, path=record['path'])
+		record['oper'] = updated_record['oper']
+		record['val'] = updated_record['val']
+
+	def _del_attr(self, *, attr: str, record: QUERY_INDEX_RECORD):
+		step = self._get_step(record['path'])
+		del step[attr]
+		self._unindex_record(attr=attr, record=record)
+		if not _is_step_kept(step):
+			self._remove_step(record['path'])
+			list.__init__(self, self._query)
+
+	def _replace_attr(self, *, attr: str, record: QUERY_INDEX_RECORD, new_attr: str):
+		if new_attr == attr:
+			return
+		step = self._get_step(record['path'])
+		# [DOC] Replacing attr overrides new attr, if set in same step
+		if new_attr in step.keys():
+			for new_attr_record in self._index[new_attr]:
+				if new_attr_record['path'] == record['path']:
+					self._unindex_record(attr=new_attr, record=new_attr_record)
+					break
+		# [DOC] Set new attr
+		step[new_attr] = step[attr]
+		# [DOC] Delete old attr
+		del step[attr]
+		# [DOC] Update index
+		self._unindex_record(attr=attr, record=record)
+		if new_attr not in self._index.keys():
+			self._index[new_attr] = []
+		self._index[new_attr].append(record)
+		# [DOC] Keep index records in order of query steps, as re-creating index does
+		self._index[new_attr].sort(
+			key=lambda index_record: self._record_order(attr=new_attr, record=index_record)
+		)
+
+	def _record_order(self, *, attr: str, record: QUERY_INDEX_RECORD) -> List[int]:
+		order = []
+		step: Any = self._query
+		for path_part in record['path']:
+			order.append(list(step.keys()).index(path_part) if type(step) == dict else path_part)
+			step = step[path_part]
+		order.append(list(step.keys()).index(attr))
+		return order
+
+	def _unindex_record(self, *, attr: str, record: QUERY_INDEX_RECORD):
+		self._index[attr] = [
+			index_record for index_record in self._index[attr] if index_record is not record
+		]
+		if not self._index[attr]:
+			del self._index[attr]
+
+	def _remove_step(self, path: List[Any]):
+		# [DOC] Remove emptied step, unindex records left in it, and shift paths of index records of steps following it in same parent
+		parent = self._get_step(path[:-1])
+		del parent[path[-1]]
+		depth = len(path) - 1
+		for attr in list(self._index.keys()):
+			for record in list(self._index[attr]):
+				record_path = record['path']
+				if len(record_path) <= depth or record_path[:depth] != path[:-1]:
+					continue
+				if record_path[depth] == path[-1]:
+					self._unindex_record(attr=attr, record=record)
+				elif (
+					type(path[-1]) == int
+					and type(record_path[depth]) == int
+					and record_path[depth] > path[-1]
+				):
+					record['path'] = [
+						*record_path[:depth],
+						record_path[depth] - 1,
+						*record_path[depth + 1 :],
+					]
+		# [DOC] Remove emptied parents, except query itself
+		if len(path) > 1 and not _is_step_kept(parent):
+			self._remove_step(path[:-1])
 
 	def _sanitise_query(self, query: 'NAWAH_QUERY' = None):
 		if query == None:
@@ -108,10 +207,26 @@ class Query(list):
 	def __deepcopy__(self, memo):
 		return Query(copy.deepcopy(self._query + [self._special]))
 
+	def _copy(self) -> 'Query':
+		# [DOC] Copy query steps, sharing attrs values, without re-creating index. This is sufficient for processing that only sets, deletes attrs of steps, without mutating attrs values in-place
+		query = Query.__new__(Query)
+		query._query = _copy_query_steps(self._query)
+		query._special = copy.deepcopy(self._special)
+		query._index = {
+			attr: [{**record} for record in records] for attr, records in self._index.items()  # type: ignore
+		}
+		list.__init__(query, query._query)
+		return query
+
 	def append(self, obj: Any):
-		self._query.append(obj)
-		self._create_index(self._query)
-		super().__init__(self._query)
+		self._extract_special([obj])
+		sanitised_step = self._sanitise_query([obj])
+		if not sanitised_step:
+			return
+		self._query.append(sanitised_step[0])
+		# [DOC] Index appended step only, rather than re-creating index of whole query
+		self._index_step(sanitised_step[0], path=[len(self._query) - 1])
+		super().append(sanitised_step[0])
 
 	def __contains__(self, attr: str):  # type: ignore
 		if attr in SPECIAL_ATTRS.__args__:  # type: ignore
@@ -150,9 +265,15 @@ class Query(list):
 			elif ':*' not in attr:
 				oper_filter = attr.split(':')[1]
 
-			for index_attr in self._index.keys():
-				if attr_filter and index_attr != attr_filter:
-					continue
+			records = []
+			if not attr_filter:
+				index_attrs = list(self._index.keys())
+			elif attr_filter in self._index.keys():
+				index_attrs = [attr_filter]
+			else:
+				index_attrs = []
+
+			for index_attr in index_attrs:
 				i = 0
 				for val in self._index[index_attr]:
 					if not oper_filter or (oper_filter and val['oper'] == oper_filter):
@@ -167,8 +288,9 @@ class Query(list):
 							vals.append(val['val'][oper_filter])
 						paths.append(val['path'])
 						indexes.append(i)
+						records.append(val)
 						i += 1
-			return QueryAttrList(self, attrs, paths, indexes, vals)
+			return QueryAttrList(self, attrs, paths, indexes, vals, records)
 
 	def __setitem__(self, attr: str, val: Any):  # type: ignore
 		if attr[0] != '$':
@@ -225,6 +347,38 @@ class Query(list):
 			raise UnknownQueryArgException(arg_name=arg_name, arg_oper=arg_oper)
 
 
+def _is_step_kept(step: Any) -> bool:
+	# [DOC] Check if step would be kept by sanitising query, assuming its nested steps are already sanitised
+	if type(step) == dict:
+		for attr in step.keys():
+			if attr.startswith('__or'):
+				if step[attr]:
+					return True
+			elif attr[0] != '$':
+				return True
+		return False
+	elif type(step) == list:
+		return len(step) > 0
+	return True
+
+
+def _copy_query_steps(query: 'NAWAH_QUERY') -> 'NAWAH_QUERY':
+	query_copy: List[Any] = []
+	for step in query:
+		if type(step) == dict:
+			query_copy.append(
+				{
+					attr: _copy_query_steps(val) if attr.startswith('__or') else val  # type: ignore
+					for attr, val in step.items()  # type: ignore
+				}
+			)
+		elif type(step) == list:
+			query_copy.append(_copy_query_steps(step))  # type: ignore
+		else:
+			query_copy.append(step)
+	return cast('NAWAH_QUERY', query_copy)
+
+
 class QueryAttrList(list):
 	def __init__(
 		self,
@@ -233,12 +387,14 @@ class QueryAttrList(list):
 		paths: List[List[int]],
 		indexes: List[int],
 		vals: List[Any],
+		records: List[QUERY_INDEX_RECORD],
 	):
 		self._query = query
 		self._attrs = attrs
 		self._paths = paths
 		self._indexes = indexes
 		self._vals = vals
+		self._records = records
 		super().__init__(vals)
 
 	def __setitem__(self, item: Union[Literal['*'], int], val: Any):  # type: ignore
@@ -246,34 +402,22 @@ class QueryAttrList(list):
 			for i in range(len(self._vals)):
 				self.__setitem__(i, val)
 		else:
-			instance_attr = self._query._query
-			for path_part in self._paths[item]:
-				instance_attr = instance_attr[path_part]  # type: ignore
-			instance_attr[self._attrs[item].split(':')[0]] = val  # type: ignore
-			self._query._create_index(self._query._query)
+			self._query._set_attr(
+				attr=self._attrs[item].split(':')[0], record=self._records[item], val=val
+			)
 
 	def __delitem__(self, item: Union[Literal['*'], int]):  # type: ignore
 		if item == '*':
 			for i in range(len(self._vals)):
 				self.__delitem__(i)
 		else:
-			instance_attr = self._query._query
-			for path_part in self._paths[item]:
-				instance_attr = instance_attr[path_part]  # type: ignore
-			del instance_attr[self._attrs[item].split(':')[0]]  # type: ignore
-			self._query._create_index(self._query._query)
+			self._query._del_attr(attr=self._attrs[item].split(':')[0], record=self._records[item])
 
 	def replace_attr(self, item: Union[Literal['*'], int], new_attr: str):
 		if item == '*':
 			for i in range(len(self._vals)):
 				self.replace_attr(i, new_attr)
 		else:
-			instance_attr = self._query._query
-			for path_part in self._paths[item]:
-				instance_attr = instance_attr[path_part]  # type: ignore
-			# [DOC] Set new attr
-			instance_attr[new_attr] = instance_attr[self._attrs[item].split(':')[0]]  # type: ignore
-			# [DOC] Delete old attr
-			del instance_attr[self._attrs[item].split(':')[0]]  # type: ignore
-			# [DOC] Update index
-			self._query._create_index(self._query._query)
\ No newline at end of file
+			self._query._replace_attr(
+				attr=self._attrs[item].split(':')[0], record=self._records[item], new_attr=new_attr
+			)
@@ -11,6 +11,7 @@ def nawah_cli():
 	from ._launch import launch
 	from ._packages import packages_audit, packages_install, _packages_add, _packages_rm
 	from ._generate import generate_ref, generate_models
+	from ._data import data_import
 
 	if sys.version_info.major != 3 or sys.version_info.minor < 8:
 		print('Nawah framework CLI can only run with Python >= 3.8. Exiting.')
@@ -127,11 +128,51 @@ def nawah_cli():
 	parser_ref.add_argument('format', help='Format of models', choices=['js', 'ts'])
 	parser_ref.add_argument('--debug', help='Enable debug mode', action='store_true')
 
+	parser_data = subparsers.add_parser('data', help='Manage Nawah app data')
+	parser_data.set_defaults(func=lambda _: None)
+	data_subparser = parser_data.add_subparsers(
+		title='Data Command',
+		description='Data command to run',
+		dest='data_command',
+	)
+
+	parser_data_import = data_subparser.add_parser(
+		'import', help='Import docs from NDJSON, or CSV file to Nawah app module'
+	)
+	parser_data_import.set_defaults(func=data_import)
+	parser_data_import.add_argument('module', help='Name of module to import docs to')
+	parser_data_import.add_argument('file', help='Path to NDJSON, or CSV file to import')
+	parser_data_import.add_argument(
+		'--format',
+		help='Format of file [default by file extension]',
+		choices=['ndjson', 'csv'],
+	)
+	parser_data_import.add_argument(
+		'--batch-size',
+		help='Number of docs inserted per batch [default 1000]',
+		type=int,
+		default=1000,
+	)
+	parser_data_import.add_argument(
+		'--concurrency',
+		help='Number of batches inserted concurrently [default 4]',
+		type=int,
+		default=4,
+	)
+	parser_data_import.add_argument(
+		'--report',
+		help='Path to write rejected rows, and import summary to [default FILE.report.ndjson]',
+	)
+	parser_data_import.add_argument('--env', help='Choose specific env')
+	parser_data_import.add_argument('--debug', help='Enable debug mode', action='store_true')
+
 	args = parser.parse_args()
 
 	if args.command:
 		if args.command == 'packages' and not args.packages_command:
 			parser_packages.print_help()
+		elif args.command == 'data' and not args.data_command:
+			parser_data.print_help()
 		else:
 			args.func(args)
 	else:
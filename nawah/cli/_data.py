@@ -0,0 +1,222 @@
+from typing import Dict, Any, List, Tuple, Optional, Iterator, IO, TYPE_CHECKING
+
+import argparse, os, logging, json, csv, re, time, datetime, asyncio
+
+from ._launch import launch
+
+if TYPE_CHECKING:
+	from nawah.base_module import BaseModule
+	from nawah.classes import NAWAH_ENV, NAWAH_DOC, ATTR
+
+logger = logging.getLogger('nawah')
+
+# [DOC] Attrs Types with values read from CSV cells as-is. Values of other Attrs Types are decoded from JSON, if possible
+_CSV_STR_TYPES = [
+	'STR',
+	'EMAIL',
+	'PHONE',
+	'URI_WEB',
+	'IP',
+	'DATE',
+	'DATETIME',
+	'TIME',
+	'ID',
+	'LITERAL',
+]
+
+
+def data_import(args: argparse.Namespace):
+	if not os.path.exists(args.file):
+		logger.error(f'File \'{args.file}\' was not found. Exiting.')
+		exit(1)
+	if not args.format:
+		args.format = 'csv' if args.file.lower().endswith('.csv') else 'ndjson'
+	if not args.report:
+		args.report = f'{args.file}.report.ndjson'
+	launch(args=args, custom_launch='data_import')
+
+
+async def _data_import(*, args: argparse.Namespace):
+	from nawah.config import Config
+
+	if args.module not in Config.modules.keys() or not Config.modules[args.module].collection:
+		logger.error(f'Module \'{args.module}\' is not a data module of the app. Exiting.')
+		exit(1)
+
+	module = Config.modules[args.module]
+	logger.info(
+		f'Importing docs from \'{args.file}\' to module \'{args.module}\'. Rejected rows are reported to \'{args.report}\'.'
+	)
+	with open(args.file, newline='' if args.format == 'csv' else None) as f, open(
+		args.report, 'w'
+	) as report_file:
+		import_stats = await _import_docs(
+			env=Config._sys_env,
+			module=module,
+			rows=_read_rows(file=f, file_format=args.format, attrs=module.attrs),
+			batch_size=args.batch_size,
+			concurrency=args.concurrency,
+			report_file=report_file,
+		)
+	logger.info(f'Done importing docs: {import_stats}')
+
+
+def _read_rows(
+	*, file: IO[str], file_format: str, attrs: Dict[str, 'ATTR']
+) -> Iterator[Tuple[int, Optional['NAWAH_DOC'], Optional[str]]]:
+	# [DOC] Yield (row number, doc, error) for every row of file, reading file one row at a time
+	if file_format == 'ndjson':
+		for i, line in enumerate(file):
+			if not line.strip():
+				continue
+			try:
+				doc = json.loads(line)
+			except ValueError as e:
+				yield (i + 1, None, f'Invalid JSON: {e}')
+				continue
+			if type(doc) != dict:
+				yield (i + 1, None, 'Row is not JSON object.')
+				continue
+			yield (i + 1, doc, None)
+	else:
+		# [DOC] Row 1 is CSV header
+		for i, csv_row in enumerate(csv.DictReader(file)):
+			yield (
+				i + 2,
+				{
+					attr: _decode_csv_val(attr_type=attrs.get(attr), val=val)
+					for attr, val in csv_row.items()
+					if attr and val not in [None, '']
+				},
+				None,
+			)
+
+
+def _decode_csv_val(*, attr_type: Optional['ATTR'], val: str) -> Any:
+	if attr_type and attr_type._type in _CSV_STR_TYPES:
+		return val
+	try:
+		return json.loads(val)
+	except ValueError:
+		return val
+
+
+async def _import_docs(
+	*,
+	env: 'NAWAH_ENV',
+	module: 'BaseModule',
+	rows: Iterator[Tuple[int, Optional['NAWAH_DOC'], Optional[str]]],
+	batch_size: int,
+	concurrency: int,
+	report_file: IO[str],
+) -> Dict[str, Any]:
+	from nawah.enums import Event
+	from nawah.classes import (
+		InvalidAttrException,
+		MissingAttrException,
+		ConvertAttrException,
+		_json_serializer,
+	)
+	from nawah.utils import validate_doc
+	from nawah import data as Data
+	from bson import ObjectId
+	from pymongo.errors import BulkWriteError
+
+	json_serializer = _json_serializer()
+	import_stats = {'rows': 0, 'inserted': 0, 'rejected': 0}
+	start_time = time.monotonic()
+
+	def reject_row(*, row: int, error: str, doc: Optional['NAWAH_DOC'] = None):
+		import_stats['rejected'] += 1
+		report_file.write(
+			json_serializer.encode({'row': row, 'error': error, 'doc': doc}) + '\n'
+		)
+
+	async def insert_batch(*, batch_rows: List[int], batch_docs: List['NAWAH_DOC']):
+		try:
+			insert_results = await Data.create_many(
+				env=env,
+				collection_name=module.collection,
+				attrs=module.attrs,
+				docs=batch_docs,
+			)
+			import_stats['inserted'] += insert_results['count']
+		except BulkWriteError as e:
+			# [DOC] Batch is inserted unordered, only docs in writeErrors are not inserted
+			import_stats['inserted'] += e.details['nInserted']
+			for write_error in e.details['writeErrors']:
+				reject_row(
+					row=batch_rows[write_error['index']],
+					error=write_error['errmsg'],
+					doc=batch_docs[write_error['index']],
+				)
+		except Exception as e:
+			for row, doc in zip(batch_rows, batch_docs):
+				reject_row(row=row, error=str(e), doc=doc)
+
+	pending_batches = set()
+	batch_rows: List[int] = []
+	batch_docs: List['NAWAH_DOC'] = []
+	for row, row_doc, row_error in rows:
+		import_stats['rows'] += 1
+		if row_error:
+			reject_row(row=row, error=row_error)
+			continue
+		row_doc = row_doc or {}
+		# [DOC] Keep only _id, and module attrs of doc, as create method does
+		doc = {
+			attr: row_doc[attr]
+			for attr in ['_id', *module.attrs.keys()]
+			if attr in row_doc.keys() and row_doc[attr] != None
+		}
+		if '_id' in doc.keys() and type(doc['_id']) == str:
+			if not re.match(r'^[0-9a-fA-F]{24}$', doc['_id']):
+				reject_row(row=row, error='Invalid \'_id\'.', doc=row_doc)
+				continue
+			doc['_id'] = ObjectId(doc['_id'])
+		if 'create_time' in module.attrs.keys() and 'create_time' not in doc.keys():
+			doc['create_time'] = datetime.datetime.utcnow().isoformat()
+		try:
+			await validate_doc(
+				mode='create',
+				doc=doc,
+				attrs=module.attrs,
+				skip_events=[Event.PERM],
+				env=env,
+				query=[],
+				concurrent=module.concurrent_validation,
+			)
+		except (InvalidAttrException, MissingAttrException, ConvertAttrException) as e:
+			reject_row(row=row, error=str(e), doc=row_doc)
+			continue
+
+		batch_rows.append(row)
+		batch_docs.append(doc)
+		if len(batch_docs) < batch_size:
+			continue
+
+		# [DOC] Keep up to concurrency batches inserting, while next batch is validated
+		if len(pending_batches) >= concurrency:
+			_, pending_batches = await asyncio.wait(
+				pending_batches, return_when=asyncio.FIRST_COMPLETED
+			)
+		pending_batches.add(
+			asyncio.create_task(insert_batch(batch_rows=batch_rows, batch_docs=batch_docs))
+		)
+		batch_rows = []
+		batch_docs = []
+
+	if batch_docs:
+		pending_batches.add(
+			asyncio.create_task(insert_batch(batch_rows=batch_rows, batch_docs=batch_docs))
+		)
+	if pending_batches:
+		await asyncio.wait(pending_batches)
+
+	import_time = time.monotonic() - start_time
+	import_stats['seconds'] = round(import_time, 3)
+	import_stats['rows_per_second'] = (
+		round(import_stats['rows'] / import_time, 1) if import_time else None
+	)
+	report_file.write(json_serializer.encode({'summary': import_stats}) + '\n')
+	return import_stats
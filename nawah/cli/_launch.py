@@ -9,7 +9,7 @@ from ._logging import logger, handler, formatter
 
 def launch(
 	args: argparse.Namespace,
-	custom_launch: Literal['test', 'generate_ref', 'generate_models'] = None,
+	custom_launch: Literal['test', 'generate_ref', 'generate_models', 'data_import'] = None,
 ):
 
 	# [DOC] Update Config with Nawah CLI args
@@ -285,3 +285,14 @@ def launch(
 			_generate_models()
 
 		asyncio.run(_())
+	elif custom_launch == 'data_import':
+
+		async def _():
+			from nawah.utils import _import_modules, _config_data
+			from ._data import _data_import
+
+			await _import_modules()
+			await _config_data()
+			await _data_import(args=args)
+
+		asyncio.run(_())
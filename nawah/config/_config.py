@@ -21,8 +21,11 @@ if TYPE_CHECKING:
 		SYS_DOC,
 		USER_SETTING,
 		JOB,
+		JSONSerializer,
 	)
 
+	from nawah.cache import CacheBus, CacheBackend
+
 	from motor.motor_asyncio import AsyncIOMotorClient
 	from bson import ObjectId
 	from datetime import datetime
@@ -73,6 +76,14 @@ class Config:
 		'session_conn_deauth': True,
 		'session_user_deauth': True,
 	}
+	analytics_flush_interval: int = 10
+	analytics_buffer_limit: int = 1000
+	analytics_buffer_cap: int = 100000
+	analytics_bucket_size: int = 500
+	diff_flush_interval: int = 5
+	diff_buffer_limit: int = 1000
+	settings_cache_limit: int = 10000
+	privileges_cache_limit: int = 10000
 
 	conn_timeout: int = 120
 	quota_anon_min: int = 40
@@ -87,9 +98,15 @@ class Config:
 	data_ca_name: Optional[str] = None
 	data_ca: Optional[str] = None
 	data_disk_use: bool = False
+	data_stream_batch_size: int = 100
 
 	data_azure_mongo: bool = False
 
+	cache_bus: Optional['CacheBus'] = None
+	cache_backend: Optional['CacheBackend'] = None
+
+	json_serializer: Optional['JSONSerializer'] = None
+
 	locales: List[str] = ['ar_AE', 'en_AE']
 	locale: str = 'ar_AE'
 	locale_strategy: 'LOCALE_STRATEGY' = LOCALE_STRATEGY.DUPLICATE
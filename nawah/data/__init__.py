@@ -1,7 +1,10 @@
 from ._conn import create_conn
-from ._read import read
+from ._read import read, stream
 from ._watch import watch
 from ._create import create
+from ._create_many import create_many
 from ._update import update
+from ._increment import increment
+from ._upsert import upsert
 from ._delete import delete
 from ._drop import drop
\ No newline at end of file
@@ -1,5 +1,6 @@
 from nawah.config import Config
 from nawah.classes import NAWAH_ENV, NAWAH_DOC, ATTR, BaseModel
+from ._read import _count_write
 
 from typing import Dict, Any
 
@@ -12,6 +13,9 @@ async def create(
 	doc: NAWAH_DOC,
 ) -> Dict[str, Any]:
 	collection = env['conn'][Config.data_name][collection_name]
-	results = await collection.insert_one(doc)
+	try:
+		results = await collection.insert_one(doc)
+	finally:
+		_count_write(collection_name=collection_name)
 	_id = results.inserted_id
 	return {'count': 1, 'docs': [BaseModel({'_id': _id})]}
@@ -0,0 +1,24 @@
+from nawah.config import Config
+from nawah.classes import NAWAH_ENV, NAWAH_DOC, ATTR, BaseModel
+from ._read import _count_write
+
+from typing import Dict, List, Any
+
+
+async def create_many(
+	*,
+	env: NAWAH_ENV,
+	collection_name: str,
+	attrs: Dict[str, ATTR],
+	docs: List[NAWAH_DOC],
+) -> Dict[str, Any]:
+	# [DOC] Insert all docs in single insert_many round-trip
+	collection = env['conn'][Config.data_name][collection_name]
+	try:
+		results = await collection.insert_many(docs, ordered=False)
+	finally:
+		_count_write(collection_name=collection_name)
+	return {
+		'count': len(results.inserted_ids),
+		'docs': [BaseModel({'_id': _id}) for _id in results.inserted_ids],
+	}
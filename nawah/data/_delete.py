@@ -1,6 +1,7 @@
 from nawah.config import Config
 from nawah.enums import DELETE_STRATEGY
 from nawah.classes import NAWAH_ENV, ATTR, UnknownDeleteStrategyException
+from ._read import _count_write
 
 from bson import ObjectId
 from typing import Dict, List, Any, Union
@@ -35,14 +36,17 @@ async def delete(
 		collection = env['conn'][Config.data_name][collection_name]
 		update_doc = {'$set': {'__deleted': True}}
 		# [DOC] If using Azure Mongo service update docs one by one
-		if Config.data_azure_mongo:
-			update_count = 0
-			for _id in docs:
-				results = await collection.update_one({'_id': _id}, update_doc)
-				update_count += results.modified_count
-		else:
-			results = await collection.update_many({'_id': {'$in': docs}}, update_doc)
-			update_count = results.modified_count
+		try:
+			if Config.data_azure_mongo:
+				update_count = 0
+				for _id in docs:
+					results = await collection.update_one({'_id': _id}, update_doc)
+					update_count += results.modified_count
+			else:
+				results = await collection.update_many({'_id': {'$in': docs}}, update_doc)
+				update_count = results.modified_count
+		finally:
+			_count_write(collection_name=collection_name)
 		return {'count': update_count, 'docs': [{'_id': doc} for doc in docs]}
 	elif strategy in [DELETE_STRATEGY.FORCE_SKIP_SYS, DELETE_STRATEGY.FORCE_SYS]:
 		if strategy == DELETE_STRATEGY.FORCE_SKIP_SYS:
@@ -58,14 +62,17 @@ async def delete(
 			del_docs = [ObjectId(doc) for doc in docs]
 		# [DOC] Perform delete query on matching docs
 		collection = env['conn'][Config.data_name][collection_name]
-		if Config.data_azure_mongo:
-			delete_count = 0
-			for _id in del_docs:
-				results = await collection.delete_one({'_id': _id})
-				delete_count += results.deleted_count
-		else:
-			results = await collection.delete_many({'_id': {'$in': del_docs}})
-			delete_count = results.deleted_count
+		try:
+			if Config.data_azure_mongo:
+				delete_count = 0
+				for _id in del_docs:
+					results = await collection.delete_one({'_id': _id})
+					delete_count += results.deleted_count
+			else:
+				results = await collection.delete_many({'_id': {'$in': del_docs}})
+				delete_count = results.deleted_count
+		finally:
+			_count_write(collection_name=collection_name)
 		return {'count': delete_count, 'docs': [{'_id': doc} for doc in docs]}
 	else:
 		raise UnknownDeleteStrategyException(f'DELETE_STRATEGY \'{strategy}\' is unknown.')
@@ -1,10 +1,14 @@
 from nawah.config import Config
 from nawah.classes import NAWAH_ENV
+from ._read import _count_write
 
 from typing import Literal
 
 
 async def drop(env: NAWAH_ENV, collection_name: str) -> Literal[True]:
 	collection = env['conn'][Config.data_name][collection_name]
-	await collection.drop()
+	try:
+		await collection.drop()
+	finally:
+		_count_write(collection_name=collection_name)
 	return True
@@ -0,0 +1,38 @@
+from nawah.config import Config
+from nawah.classes import NAWAH_ENV
+from ._read import _count_write
+
+from pymongo import ReturnDocument
+from typing import Dict, Any
+
+import logging
+
+logger = logging.getLogger('nawah')
+
+
+async def increment(
+	*,
+	env: NAWAH_ENV,
+	collection_name: str,
+	query: Dict[str, Any],
+	attr: str,
+	val: int = 1,
+	doc: Dict[str, Any] = None,
+) -> int:
+	# [DOC] Atomically increment attr of doc matching query by val, in single round-trip. If no doc is matching query, it is created from query, and doc
+	collection = env['conn'][Config.data_name][collection_name]
+	update: Dict[str, Any] = {'$inc': {attr: val}}
+	if doc:
+		update['$setOnInsert'] = doc
+	try:
+		results = await collection.find_one_and_update(
+			query,
+			update,
+			projection={attr: True},
+			upsert=True,
+			return_document=ReturnDocument.AFTER,
+		)
+	finally:
+		_count_write(collection_name=collection_name)
+	logger.debug(f'Incremented attr \'{attr}\' of doc matching query: {query}, by: {val}.')
+	return results[attr]
@@ -4,13 +4,18 @@ from nawah.classes import ATTR, Query, NAWAH_QUERY_SPECIAL_GROUP, InvalidQueryEx
 from typing import Dict, List, Any, Union, Tuple, Optional, cast, TypedDict
 from bson import ObjectId
 
-import logging, copy, re
+import logging, re
 
 logger = logging.getLogger('nawah')
 
 
 def _compile_query(
-	*, collection_name: str, attrs: Dict[str, ATTR], query: Query, watch_mode: bool
+	*,
+	collection_name: str,
+	attrs: Dict[str, ATTR],
+	query: Query,
+	watch_mode: bool,
+	stages: Optional[List[Dict[str, Any]]] = None,
 ) -> Tuple[
 	Optional[int],
 	Optional[int],
@@ -30,7 +35,8 @@ def _compile_query(
 
 	if not isinstance(query, Query):
 		raise InvalidQueryException(f'Query of type \'{type(query)}\' is invalid.')
-	query = copy.deepcopy(query)
+	# [DOC] Processing query only sets, deletes attrs of its steps, copy steps rather than deepcopy whole query
+	query = query._copy()
 
 	# [DOC] Update variables per Doc Mode
 	if '__deleted' not in query or query['__deleted'] == False:
@@ -141,7 +147,8 @@ def _compile_query(
 	elif len(aggregate_match) == 0:
 		aggregate_query = []
 
-	aggregate_query = aggregate_prefix + aggregate_query + aggregate_suffix
+	# [DOC] Stages reshape docs, and are applied before query match, and $attrs, to have them match, and project docs as shaped by stages
+	aggregate_query = aggregate_prefix + (stages or []) + aggregate_query + aggregate_suffix
 	return (skip, limit, sort, group, aggregate_query)
 
 
@@ -14,12 +14,21 @@ from ._query import _compile_query
 
 from motor.motor_asyncio import AsyncIOMotorCollection
 from bson import ObjectId
-from typing import Dict, Any, Union, List, Optional, cast
+from typing import Dict, Any, Union, List, Optional, Tuple, AsyncGenerator, cast
 
-import logging, copy
+import logging, copy, asyncio
 
 logger = logging.getLogger('nawah')
 
+_reads_in_flight: Dict[Tuple[str, str, bool, bool, int], 'asyncio.Future'] = {}
+_reads_followers: Dict[Tuple[str, str, bool, bool, int], int] = {}
+# [DOC] Count of completed writes per collection, part of key of in-flight reads, so reads started after a write never join a read started before it
+_collections_writes: Dict[str, int] = {}
+
+
+def _count_write(*, collection_name: str):
+	_collections_writes[collection_name] = _collections_writes.get(collection_name, 0) + 1
+
 
 async def read(
 	*,
@@ -29,11 +38,102 @@ async def read(
 	query: Query,
 	skip_process: bool = False,
 	skip_extn: bool = False,
+	stages: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
+	# [DOC] Apply stages to docs before matching query, counting, sorting and paginating them
 	skip, limit, sort, group, aggregate_query = _compile_query(
-		collection_name=collection_name, attrs=attrs, query=query, watch_mode=False
+		collection_name=collection_name,
+		attrs=attrs,
+		query=query,
+		watch_mode=False,
+		stages=stages,
 	)
 
+	# [DOC] Coalesce identical concurrent reads into one in-flight read
+	read_key = (
+		collection_name,
+		str([skip, limit, sort, group, aggregate_query]),
+		skip_process,
+		skip_extn,
+		_collections_writes.get(collection_name, 0),
+	)
+	if read_key in _reads_in_flight.keys():
+		logger.debug(f'Awaiting in-flight read for \'{collection_name}\'.')
+		read_future = _reads_in_flight[read_key]
+		_reads_followers[read_key] += 1
+		try:
+			return _copy_results(await asyncio.shield(read_future))
+		except asyncio.CancelledError:
+			# [DOC] If in-flight read was cancelled, rather than the current call, read again
+			if not read_future.cancelled():
+				raise
+			return await read(
+				env=env,
+				collection_name=collection_name,
+				attrs=attrs,
+				query=query,
+				skip_process=skip_process,
+				skip_extn=skip_extn,
+				stages=stages,
+			)
+
+	read_future = asyncio.get_running_loop().create_future()
+	_reads_in_flight[read_key] = read_future
+	_reads_followers[read_key] = 0
+	try:
+		results = await _execute_read(
+			env=env,
+			collection_name=collection_name,
+			attrs=attrs,
+			skip=skip,
+			limit=limit,
+			sort=sort,
+			group=group,
+			aggregate_query=aggregate_query,
+			skip_process=skip_process,
+			skip_extn=skip_extn,
+		)
+	except asyncio.CancelledError:
+		read_future.cancel()
+		raise
+	except Exception as e:
+		read_future.set_exception(e)
+		# [DOC] Retrieve exception to avoid asyncio logging it as never retrieved if no calls are awaiting
+		read_future.exception()
+		raise
+	else:
+		read_future.set_result(results)
+	finally:
+		del _reads_in_flight[read_key]
+		read_followers = _reads_followers.pop(read_key)
+
+	# [DOC] Results are shared with calls awaiting in-flight read, return a private copy
+	if read_followers:
+		return _copy_results(results)
+	return results
+
+
+def _copy_results(results: Dict[str, Any]) -> Dict[str, Any]:
+	return {
+		**results,
+		'docs': [BaseModel(doc) for doc in results['docs']],
+		'groups': copy.deepcopy(results['groups']),
+	}
+
+
+async def _execute_read(
+	*,
+	env: NAWAH_ENV,
+	collection_name: str,
+	attrs: Dict[str, ATTR],
+	skip: Optional[int],
+	limit: Optional[int],
+	sort: Dict[str, int],
+	group: Optional[List[Any]],
+	aggregate_query: List[Dict[str, Any]],
+	skip_process: bool,
+	skip_extn: bool,
+) -> Dict[str, Any]:
 	logger.debug(f'aggregate_query: {aggregate_query}')
 	logger.debug(f'skip, limit, sort, group: {skip}, {limit}, {sort}, {group}.')
 
@@ -129,6 +229,65 @@ async def read(
 	}
 
 
+async def stream(
+	*,
+	env: NAWAH_ENV,
+	collection_name: str,
+	attrs: Dict[str, ATTR],
+	query: Query,
+	skip_process: bool = False,
+	skip_extn: bool = False,
+	batch_size: Optional[int] = None,
+	stages: Optional[List[Dict[str, Any]]] = None,
+) -> AsyncGenerator[BaseModel, None]:
+	# [DOC] Yield docs matching query as cursor produces them, fetching batch_size docs per round-trip, rather than collecting all of them first. Query groups are not generated for stream
+	skip, limit, sort, _, aggregate_query = _compile_query(
+		collection_name=collection_name,
+		attrs=attrs,
+		query=query,
+		watch_mode=False,
+		stages=stages,
+	)
+	if sort != None:
+		aggregate_query.append({'$sort': sort})
+	if skip != None:
+		aggregate_query.append({'$skip': skip})
+	if limit != None:
+		aggregate_query.append({'$limit': limit})
+
+	logger.debug(f'stream query: {collection_name}, {aggregate_query}.')
+
+	collection: AsyncIOMotorCollection = env['conn'][Config.data_name][collection_name]
+	batch_size = batch_size or Config.data_stream_batch_size
+	docs = collection.aggregate(
+		aggregate_query,
+		allowDiskUse=Config.data_disk_use,
+		batchSize=batch_size,
+	)
+	extn_models: Dict[str, Optional[BaseModel]] = {}
+	docs_count = 0
+	try:
+		async for doc in docs:
+			# [DOC] Reset extn_models every batch, so memory used is bound by batch_size, not count of distinct extended docs
+			if docs_count % batch_size == 0:
+				extn_models = {}
+			docs_count += 1
+			if not skip_process:
+				doc = await _process_results_doc(
+					env=env,
+					collection=collection,
+					attrs=attrs,
+					doc=doc,
+					extn_models=extn_models,
+					skip_extn=skip_extn,
+				)
+			if doc:
+				yield BaseModel(doc)
+	finally:
+		# [DOC] Close cursor if consumer stopped early, rather than leaving it open on server until it times out
+		await docs.close()
+
+
 async def _process_results_doc(
 	*,
 	env: NAWAH_ENV,
@@ -1,10 +1,12 @@
 from nawah.config import Config
 from nawah.classes import NAWAH_ENV, ATTR, NAWAH_DOC
+from ._read import _count_write
 
 from bson import ObjectId
-from typing import Dict, List, Any, Union
+from collections.abc import Mapping
+from typing import Dict, List, Tuple, Any, Union, Optional, cast
 
-import logging, copy
+import logging
 
 logger = logging.getLogger('nawah')
 
@@ -22,85 +24,285 @@ async def update(
 	# [DOC] Perform update query on matching docs
 	collection = env['conn'][Config.data_name][collection_name]
 	results = None
-	doc = copy.deepcopy(doc)
+	# [DOC] doc is only read to generate update, and is not copied
+	update_doc = _bind_update_plan(update_plan=_update_plan(doc=doc, attrs=attrs), doc=doc)
+
+	if logger.isEnabledFor(logging.DEBUG):
+		logger.debug(f'Final update: {update_doc}')
+
+	try:
+		# [DOC] If using Azure Mongo service update docs one by one
+		if Config.data_azure_mongo:
+			update_count = 0
+			for _id in docs:
+				results = await collection.update_one({'_id': _id}, update_doc)
+				update_count += results.modified_count
+		else:
+			results = await collection.update_many({'_id': {'$in': docs}}, update_doc)
+			update_count = results.modified_count
+	finally:
+		_count_write(collection_name=collection_name)
 
-	# [TODO] Abstract $set pipeline with colon support for all stages
+	return {'count': update_count, 'docs': [{'_id': doc} for doc in docs]}
 
-	# [DOC] Prepare empty update pipeline
-	update_pipeline: List[Any] = []
 
-	# [DOC] Iterate over attrs in doc to set update stage in pipeline
-	for attr in doc.keys():
-		# [DOC] Prepare stage pipeline
-		update_pipeline_stage_root: Dict[str, Any] = {'$set': {}}
-		update_pipeline_stage_current = update_pipeline_stage_root['$set']
-		attr_path_part = attr
-		attr_path_current = []
+# [DOC] Doc Opers in order they are checked by update compilers
+_UPDATE_OPERS = ['$add', '$multiply', '$append', '$set_index', '$del_val', '$del_index']
+# [DOC] Compiled updates keyed by doc shape, with values of doc replaced by _UpdateSlot. Cache is reset once it reaches its limit, as doc shapes are finite for any app
+_update_plans: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+_UPDATE_PLANS_LIMIT = 1024
 
-		if ':' in attr:
-			attr_path = attr.split('.')
-			for i in range(len(attr_path)):
-				attr_path_part = attr_path[i]
-				if i == 0:
-					# [DOC] First item has to have $
-					attr_path_current.append('$' + attr_path_part.split(':')[0])
-				else:
-					attr_path_current.append(attr_path_part.split(':')[0])
 
-				if ':' not in attr_path_part:
-					part_pipeline: Dict[str, Any] = {
-						'$arrayToObject': {
-							'$concatArrays': [
-								{
-									'$objectToArray': '.'.join(attr_path_current[:-1]),
-								},
-								[
-									{
-										'k': attr_path_part,
-										'v': None,
-									}
-								],
-							]
-						}
-					}
-					if 'v' in update_pipeline_stage_current.keys():
-						update_pipeline_stage_current['v'] = part_pipeline
-					elif 'then' in update_pipeline_stage_current.keys():
-						update_pipeline_stage_current['then'] = part_pipeline
-					else:
-						update_pipeline_stage_current[attr_path_part] = part_pipeline
+class _UpdateSlot:
+	'''Placeholder for value of doc attr, or of its Doc Oper, in compiled update. It is replaced by value of doc when update plan is bound to it.'''
 
-					update_pipeline_stage_current = part_pipeline['$arrayToObject']['$concatArrays'][
-						1
-					][0]
-				else:
-					part_pipeline = {
-						'$map': {
-							'input': '.'.join(attr_path_current),
-							'as': f'this_{i}',
-							'in': {
-								'$cond': {
-									'if': {
-										'$eq': [
-											{
-												'$indexOfArray': [
-													'.'.join(attr_path_current),
-													f'$$this_{i}',
-												]
-											},
-											int(attr_path_part.split(':')[1]),
-										]
-									},
-									'then': None,
-									'else': f'$$this_{i}',
-								}
-							},
-						}
-					}
+	__slots__ = ('attr', 'oper')
 
-					if i != 0:
-						# [DOC] For all subsequent array objects, wrap in object-to-array-to-object pipeline
-						part_pipeline = {
+	def __init__(self, *, attr: str, oper: Optional[str]):
+		self.attr = attr
+		self.oper = oper
+
+	def bind(self, *, doc: NAWAH_DOC) -> Any:
+		if self.oper == None:
+			return doc[self.attr]
+		return doc[self.attr][self.oper]
+
+
+def _update_shape(*, doc: NAWAH_DOC, attrs: Dict[str, ATTR]) -> Tuple[Any, ...]:
+	# [DOC] Shape of doc is attrs, Doc Opers, Doc Opers args affecting paths of update, and whether attrs can be null, but not values set by it
+	update_shape: List[Tuple[Any, ...]] = []
+	for attr in doc.keys():
+		attr_val = doc[attr]
+		attr_shape: Tuple[Any, ...] = (attr,)
+		if type(attr_val) == dict:
+			for oper in _UPDATE_OPERS:
+				if oper in attr_val.keys():
+					attr_shape = (
+						attr,
+						oper,
+						attr_val.get('$field'),
+						attr_val.get('$unique'),
+						attr_val.get('$index'),
+						attr_val['$del_index'] if oper == '$del_index' else None,
+						_is_attr_nullable(attrs=attrs, attr=attr)
+						if oper in ['$add', '$multiply', '$append']
+						else None,
+					)
+					break
+		update_shape.append(attr_shape)
+	return tuple(update_shape)
+
+
+def _update_plan(*, doc: NAWAH_DOC, attrs: Dict[str, ATTR]) -> Dict[str, Any]:
+	global _update_plans
+
+	update_shape = _update_shape(doc=doc, attrs=attrs)
+	if update_shape in _update_plans.keys():
+		return _update_plans[update_shape]
+
+	# [DOC] Compile updates for doc with values replaced by _UpdateSlot, so compiled updates can be reused for any doc of same shape
+	slots_doc: NAWAH_DOC = {}
+	for attr_shape in update_shape:
+		attr = attr_shape[0]
+		if len(attr_shape) == 1:
+			slots_doc[attr] = _UpdateSlot(attr=attr, oper=None)
+		elif attr_shape[1] == '$del_index':
+			slots_doc[attr] = doc[attr]
+		else:
+			slots_doc[attr] = {**doc[attr], attr_shape[1]: _UpdateSlot(attr=attr, oper=attr_shape[1])}
+
+	update = _compile_update(doc=slots_doc, attrs=attrs)
+	update_plan: Dict[str, Any] = {
+		'update': (
+			[
+				(update_oper, update_path, update[update_oper][update_path])
+				for update_oper in update.keys()
+				for update_path in update[update_oper].keys()
+			]
+			if update != None
+			else None
+		),
+		'pipeline': None,
+		'slots_doc': slots_doc,
+	}
+	if len(_update_plans) >= _UPDATE_PLANS_LIMIT:
+		_update_plans = {}
+	_update_plans[update_shape] = update_plan
+	return update_plan
+
+
+def _bind_update_slots(*, template: Any, doc: NAWAH_DOC) -> Any:
+	if type(template) == _UpdateSlot:
+		return template.bind(doc=doc)
+	elif type(template) == dict:
+		return {
+			key: _bind_update_slots(template=val, doc=doc) for key, val in template.items()
+		}
+	elif type(template) == list:
+		return [_bind_update_slots(template=item, doc=doc) for item in template]
+	return template
+
+
+def _bind_update_plan(
+	*, update_plan: Dict[str, Any], doc: NAWAH_DOC
+) -> Union[Dict[str, Any], List[Any]]:
+	if update_plan['update'] != None:
+		update: Dict[str, Dict[str, Any]] = {}
+		for update_oper, update_path, update_template in update_plan['update']:
+			update_val = _bind_update_slots(template=update_template, doc=doc)
+			# [DOC] Values with keys starting with $ are rejected by classic update operators, and require update pipeline
+			if not _is_oper_free(
+				val=update_val if update_oper != '$pull' else update_val['$in']
+			):
+				break
+			if update_oper not in update.keys():
+				update[update_oper] = {}
+			update[update_oper][update_path] = update_val
+		else:
+			return update
+
+	# [DOC] Compile update pipeline for shape of doc once, when first needed
+	if update_plan['pipeline'] == None:
+		update_plan['pipeline'] = _compile_update_pipeline(doc=update_plan['slots_doc'])
+	return _bind_update_slots(template=update_plan['pipeline'], doc=doc)
+
+
+def _is_oper_free(*, val: Any) -> bool:
+	# [DOC] Check val has no dict keys starting with $, which classic update operators reject, unlike $literal of update pipeline
+	if isinstance(val, Mapping):
+		for key in val.keys():
+			if type(key) == str and key.startswith('$'):
+				return False
+			if not _is_oper_free(val=val[key]):
+				return False
+	elif type(val) == list:
+		for item in val:
+			if not _is_oper_free(val=item):
+				return False
+	return True
+
+
+def _is_path_index(*, index: Any) -> bool:
+	if type(index) == int:
+		return index >= 0
+	return type(index) == str and index != '' and '.' not in index and not index.startswith('$')
+
+
+def _is_attr_nullable(*, attrs: Dict[str, ATTR], attr: str) -> bool:
+	# [DOC] Check if value of attr can be null, being optional attr without default, or attr not resolvable from attrs
+	attr_type = None
+	attr_types: Optional[Dict[str, ATTR]] = attrs
+	for attr_part in attr.split('.'):
+		if attr_types == None or attr_part not in attr_types.keys():
+			return True
+		attr_type = attr_types[attr_part]
+		attr_types = attr_type._args['dict'] if attr_type._type == 'TYPED_DICT' else None
+	attr_type = cast(ATTR, attr_type)
+	return (
+		attr_type._type == 'ANY'
+		or attr_type._default == None
+		or type(attr_type._default) == ATTR
+	)
+
+
+def _compile_update(
+	*, doc: NAWAH_DOC, attrs: Dict[str, ATTR]
+) -> Optional[Dict[str, Dict[str, Any]]]:
+	# [DOC] Compile doc to classic update operators, which the server applies in place. Return None if any attr needs update pipeline
+	update: Dict[str, Dict[str, Any]] = {}
+	update_paths: List[str] = []
+	for attr in doc.keys():
+		if ':' in attr:
+			return None
+
+		attr_val = doc[attr]
+		update_path = attr
+		# [DOC] $inc, $mul, $push, $addToSet fail on null values, unlike update pipeline which handles null as 0, or leaves it
+		if (
+			type(attr_val) == dict
+			and (
+				'$add' in attr_val.keys()
+				or '$multiply' in attr_val.keys()
+				or '$append' in attr_val.keys()
+			)
+			and _is_attr_nullable(attrs=attrs, attr=attr)
+		):
+			return None
+		if type(attr_val) == dict and '$add' in attr_val.keys():
+			if '$field' in attr_val.keys() and attr_val['$field'] not in [None, attr]:
+				return None
+			update_oper, update_val = '$inc', attr_val['$add']
+		elif type(attr_val) == dict and '$multiply' in attr_val.keys():
+			if '$field' in attr_val.keys() and attr_val['$field'] not in [None, attr]:
+				return None
+			update_oper, update_val = '$mul', attr_val['$multiply']
+		elif type(attr_val) == dict and '$append' in attr_val.keys():
+			if '$unique' in attr_val.keys() and attr_val['$unique'] == True:
+				update_oper = '$addToSet'
+			else:
+				update_oper = '$push'
+			update_val = attr_val['$append']
+		elif type(attr_val) == dict and '$set_index' in attr_val.keys():
+			# [DOC] Setting index past end of LIST pads it with nulls using classic update operators, rather than leaving it unchanged
+			return None
+		elif type(attr_val) == dict and '$del_val' in attr_val.keys():
+			update_oper, update_val = '$pull', {'$in': attr_val['$del_val']}
+		elif type(attr_val) == dict and '$del_index' in attr_val.keys():
+			# [DOC] Removing item of LIST by index can't be done using classic update operators in single update
+			if type(attr_val['$del_index']) != str or not _is_path_index(
+				index=attr_val['$del_index']
+			):
+				return None
+			update_path = f'{attr}.{attr_val["$del_index"]}'
+			update_oper, update_val = '$unset', ''
+		else:
+			update_oper, update_val = '$set', attr_val
+
+		if not _is_oper_free(val=update_val if update_oper != '$pull' else update_val['$in']):
+			return None
+		# [DOC] Classic update operators can't update same path, or path and its parent, in one update
+		for path in update_paths:
+			if (
+				path == update_path
+				or path.startswith(f'{update_path}.')
+				or update_path.startswith(f'{path}.')
+			):
+				return None
+		update_paths.append(update_path)
+
+		if update_oper not in update.keys():
+			update[update_oper] = {}
+		update[update_oper][update_path] = update_val
+
+	if not update:
+		return None
+	return update
+
+
+def _compile_update_pipeline(*, doc: NAWAH_DOC) -> List[Any]:
+		# [DOC] Prepare empty update pipeline
+		update_pipeline: List[Any] = []
+
+		# [DOC] Iterate over attrs in doc to set update stage in pipeline
+		for attr in doc.keys():
+			# [DOC] Prepare stage pipeline
+			update_pipeline_stage_root: Dict[str, Any] = {'$set': {}}
+			update_pipeline_stage_current = update_pipeline_stage_root['$set']
+			attr_path_part = attr
+			attr_path_current = []
+
+			if ':' in attr:
+				attr_path = attr.split('.')
+				for i in range(len(attr_path)):
+					attr_path_part = attr_path[i]
+					if i == 0:
+						# [DOC] First item has to have $
+						attr_path_current.append('$' + attr_path_part.split(':')[0])
+					else:
+						attr_path_current.append(attr_path_part.split(':')[0])
+
+					if ':' not in attr_path_part:
+						part_pipeline: Dict[str, Any] = {
 							'$arrayToObject': {
 								'$concatArrays': [
 									{
@@ -108,190 +310,205 @@ async def update(
 									},
 									[
 										{
-											'k': attr_path_part.split(':')[0],
-											'v': part_pipeline,
+											'k': attr_path_part,
+											'v': None,
 										}
 									],
 								]
 							}
 						}
+						if 'v' in update_pipeline_stage_current.keys():
+							update_pipeline_stage_current['v'] = part_pipeline
+						elif 'then' in update_pipeline_stage_current.keys():
+							update_pipeline_stage_current['then'] = part_pipeline
+						else:
+							update_pipeline_stage_current[attr_path_part] = part_pipeline
 
-					if 'v' in update_pipeline_stage_current.keys():
-						update_pipeline_stage_current['v'] = part_pipeline
-					elif 'then' in update_pipeline_stage_current.keys():
-						update_pipeline_stage_current['then'] = part_pipeline
-					else:
-						update_pipeline_stage_current[attr_path_part.split(':')[0]] = part_pipeline
-
-					if i == 0:
-						update_pipeline_stage_current = part_pipeline['$map']['in']['$cond']
-					else:
 						update_pipeline_stage_current = part_pipeline['$arrayToObject']['$concatArrays'][
 							1
-						][0]['v']['$map']['in']['$cond']
+						][0]
+					else:
+						part_pipeline = {
+							'$map': {
+								'input': '.'.join(attr_path_current),
+								'as': f'this_{i}',
+								'in': {
+									'$cond': {
+										'if': {
+											'$eq': [
+												{
+													'$indexOfArray': [
+														'.'.join(attr_path_current),
+														f'$$this_{i}',
+													]
+												},
+												int(attr_path_part.split(':')[1]),
+											]
+										},
+										'then': None,
+										'else': f'$$this_{i}',
+									}
+								},
+							}
+						}
 
-					attr_path_current = [f'$$this_{i}']
+						if i != 0:
+							# [DOC] For all subsequent array objects, wrap in object-to-array-to-object pipeline
+							part_pipeline = {
+								'$arrayToObject': {
+									'$concatArrays': [
+										{
+											'$objectToArray': '.'.join(attr_path_current[:-1]),
+										},
+										[
+											{
+												'k': attr_path_part.split(':')[0],
+												'v': part_pipeline,
+											}
+										],
+									]
+								}
+							}
 
-		# [DOC] Check for $add Doc Oper
-		if type(doc[attr]) == dict and '$add' in doc[attr].keys():
-			add_field = (
-				f'${doc[attr]["$field"]}'
-				if '$field' in doc[attr].keys() and doc[attr]['$field']
-				else f'${".".join(attr_path_current + [attr])}'
-			)
+						if 'v' in update_pipeline_stage_current.keys():
+							update_pipeline_stage_current['v'] = part_pipeline
+						elif 'then' in update_pipeline_stage_current.keys():
+							update_pipeline_stage_current['then'] = part_pipeline
+						else:
+							update_pipeline_stage_current[attr_path_part.split(':')[0]] = part_pipeline
+
+						if i == 0:
+							update_pipeline_stage_current = part_pipeline['$map']['in']['$cond']
+						else:
+							update_pipeline_stage_current = part_pipeline['$arrayToObject']['$concatArrays'][
+								1
+							][0]['v']['$map']['in']['$cond']
+
+						attr_path_current = [f'$$this_{i}']
+
+			# [DOC] Check for $add Doc Oper
+			if type(doc[attr]) == dict and '$add' in doc[attr].keys():
+				add_field = (
+					f'${doc[attr]["$field"]}'
+					if '$field' in doc[attr].keys() and doc[attr]['$field']
+					else f'${".".join(attr_path_current + [attr])}'
+				)
 
-			part_pipeline = {
-				'$add': [
-					{
-						'$cond': {
-							'if': {'$not': [add_field]},
-							'then': 0,
-							'else': add_field,
-						}
-					},
-					doc[attr]['$add'],
-				]
-			}
-
-			# [DOC] Add part_pipeline to update_pipeline_stage_current
-			if 'v' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['v'] = part_pipeline
-			elif 'then' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['then'] = part_pipeline
-			else:
-				update_pipeline_stage_current[attr_path_part] = part_pipeline
-
-		# [DOC] Check for $add Doc Oper
-		elif type(doc[attr]) == dict and '$multiply' in doc[attr].keys():
-			multiply_field = (
-				f'${doc[attr]["$field"]}'
-				if '$field' in doc[attr].keys() and doc[attr]['$field']
-				else f'${".".join(attr_path_current + [attr])}'
-			)
+				part_pipeline = {
+					'$add': [
+						{
+							'$cond': {
+								'if': {'$not': [add_field]},
+								'then': 0,
+								'else': add_field,
+							}
+						},
+						doc[attr]['$add'],
+					]
+				}
 
-			part_pipeline = {
-				'$multiply': [
-					{
-						'$cond': {
-							'if': {'$not': [multiply_field]},
-							'then': 0,
-							'else': multiply_field,
-						}
-					},
-					doc[attr]['$multiply'],
-				]
-			}
-
-			# [DOC] Add part_pipeline to update_pipeline_stage_current
-			if 'v' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['v'] = part_pipeline
-			elif 'then' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['then'] = part_pipeline
-			else:
-				update_pipeline_stage_current[attr_path_part] = part_pipeline
+				# [DOC] Add part_pipeline to update_pipeline_stage_current
+				if 'v' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['v'] = part_pipeline
+				elif 'then' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['then'] = part_pipeline
+				else:
+					update_pipeline_stage_current[attr_path_part] = part_pipeline
+
+			# [DOC] Check for $add Doc Oper
+			elif type(doc[attr]) == dict and '$multiply' in doc[attr].keys():
+				multiply_field = (
+					f'${doc[attr]["$field"]}'
+					if '$field' in doc[attr].keys() and doc[attr]['$field']
+					else f'${".".join(attr_path_current + [attr])}'
+				)
 
-		# [DOC] Check for $append Doc Oper
-		elif type(doc[attr]) == dict and '$append' in doc[attr].keys():
-			if '$unique' not in doc[attr].keys() or doc[attr]['$unique'] == False:
-				part_pipeline = {'$concatArrays': [f'${attr}', [doc[attr]['$append']]]}
-			else:
 				part_pipeline = {
-					'$concatArrays': [
-						f'${attr}',
+					'$multiply': [
 						{
 							'$cond': {
-								'if': {'$in': [doc[attr]['$append'], f'${attr}']},
-								'then': [],
-								'else': [doc[attr]['$append']],
+								'if': {'$not': [multiply_field]},
+								'then': 0,
+								'else': multiply_field,
 							}
 						},
+						doc[attr]['$multiply'],
 					]
 				}
 
-			# [DOC] Add part_pipeline to update_pipeline_stage_current
-			if 'v' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['v'] = part_pipeline
-			elif 'then' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['then'] = part_pipeline
-			else:
-				update_pipeline_stage_current[attr_path_part] = part_pipeline
-
-		# [DOC] Check for $set_index Doc Oper
-		elif type(doc[attr]) == dict and '$set_index' in doc[attr].keys():
-			part_pipeline = {
-				'$reduce': {
-					'input': f'${attr}',
-					'initialValue': [],
-					'in': {
-						'$concatArrays': [
-							'$$value',
-							{
-								'$cond': {
-									'if': {
-										'$eq': [
-											['$$this'],
-											[{'$arrayElemAt': [f'${attr}', doc[attr]['$index']]}],
-										]
-									},
-									'then': [doc[attr]['$set_index']],
-									'else': ['$$this'],
-								}
-							},
-						]
-					},
-				}
-			}
+				# [DOC] Add part_pipeline to update_pipeline_stage_current
+				if 'v' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['v'] = part_pipeline
+				elif 'then' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['then'] = part_pipeline
+				else:
+					update_pipeline_stage_current[attr_path_part] = part_pipeline
 
-			# [DOC] Add part_pipeline to update_pipeline_stage_current
-			if 'v' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['v'] = part_pipeline
-			elif 'then' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['then'] = part_pipeline
-			else:
-				update_pipeline_stage_current[attr_path_part] = part_pipeline
-
-		# [DOC] Check for $del_val Doc Oper
-		elif type(doc[attr]) == dict and '$del_val' in doc[attr].keys():
-			part_pipeline = {
-				'$reduce': {
-					'input': f'${attr}',
-					'initialValue': [],
-					'in': {
+			# [DOC] Check for $append Doc Oper
+			elif type(doc[attr]) == dict and '$append' in doc[attr].keys():
+				if '$unique' not in doc[attr].keys() or doc[attr]['$unique'] == False:
+					part_pipeline = {'$concatArrays': [f'${attr}', [doc[attr]['$append']]]}
+				else:
+					part_pipeline = {
 						'$concatArrays': [
-							'$$value',
+							f'${attr}',
 							{
 								'$cond': {
-									'if': {
-										'$eq': [
-											['$$this'],
-											doc[attr]['$del_val'],
-										]
-									},
+									'if': {'$in': [doc[attr]['$append'], f'${attr}']},
 									'then': [],
-									'else': ['$$this'],
+									'else': [doc[attr]['$append']],
 								}
 							},
 						]
-					},
-				}
-			}
+					}
 
-			# [DOC] Add part_pipeline to update_pipeline_stage_current
-			if 'v' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['v'] = part_pipeline
-			elif 'then' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['then'] = part_pipeline
-			else:
-				update_pipeline_stage_current[attr_path_part] = part_pipeline
+				# [DOC] Add part_pipeline to update_pipeline_stage_current
+				if 'v' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['v'] = part_pipeline
+				elif 'then' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['then'] = part_pipeline
+				else:
+					update_pipeline_stage_current[attr_path_part] = part_pipeline
 
-		# [DOC] Check for $del_index Doc Oper
-		elif type(doc[attr]) == dict and '$del_index' in doc[attr].keys():
-			part_pipeline = {
-				'$arrayToObject': {
+			# [DOC] Check for $set_index Doc Oper
+			elif type(doc[attr]) == dict and '$set_index' in doc[attr].keys():
+				part_pipeline = {
 					'$reduce': {
-						'input': {
-							'$objectToArray': f'${attr}',
+						'input': f'${attr}',
+						'initialValue': [],
+						'in': {
+							'$concatArrays': [
+								'$$value',
+								{
+									'$cond': {
+										'if': {
+											'$eq': [
+												['$$this'],
+												[{'$arrayElemAt': [f'${attr}', doc[attr]['$index']]}],
+											]
+										},
+										'then': [doc[attr]['$set_index']],
+										'else': ['$$this'],
+									}
+								},
+							]
 						},
+					}
+				}
+
+				# [DOC] Add part_pipeline to update_pipeline_stage_current
+				if 'v' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['v'] = part_pipeline
+				elif 'then' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['then'] = part_pipeline
+				else:
+					update_pipeline_stage_current[attr_path_part] = part_pipeline
+
+			# [DOC] Check for $del_val Doc Oper
+			elif type(doc[attr]) == dict and '$del_val' in doc[attr].keys():
+				part_pipeline = {
+					'$reduce': {
+						'input': f'${attr}',
 						'initialValue': [],
 						'in': {
 							'$concatArrays': [
@@ -299,7 +516,10 @@ async def update(
 								{
 									'$cond': {
 										'if': {
-											'$eq': ['$$this.k', doc[attr]['$del_index']],
+											'$eq': [
+												['$$this'],
+												doc[attr]['$del_val'],
+											]
 										},
 										'then': [],
 										'else': ['$$this'],
@@ -309,38 +529,60 @@ async def update(
 						},
 					}
 				}
-			}
 
-			# [DOC] Add part_pipeline to update_pipeline_stage_current
-			if 'v' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['v'] = part_pipeline
-			elif 'then' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['then'] = part_pipeline
-			else:
-				update_pipeline_stage_current[attr_path_part] = part_pipeline
+				# [DOC] Add part_pipeline to update_pipeline_stage_current
+				if 'v' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['v'] = part_pipeline
+				elif 'then' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['then'] = part_pipeline
+				else:
+					update_pipeline_stage_current[attr_path_part] = part_pipeline
 
-		else:
-			# [DOC] Add part_pipeline to update_pipeline_stage_current
-			if 'v' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['v'] = {'$literal': doc[attr]}
-			elif 'then' in update_pipeline_stage_current.keys():
-				update_pipeline_stage_current['then'] = {'$literal': doc[attr]}
-			else:
-				update_pipeline_stage_current[attr_path_part] = {'$literal': doc[attr]}
+			# [DOC] Check for $del_index Doc Oper
+			elif type(doc[attr]) == dict and '$del_index' in doc[attr].keys():
+				part_pipeline = {
+					'$arrayToObject': {
+						'$reduce': {
+							'input': {
+								'$objectToArray': f'${attr}',
+							},
+							'initialValue': [],
+							'in': {
+								'$concatArrays': [
+									'$$value',
+									{
+										'$cond': {
+											'if': {
+												'$eq': ['$$this.k', doc[attr]['$del_index']],
+											},
+											'then': [],
+											'else': ['$$this'],
+										}
+									},
+								]
+							},
+						}
+					}
+				}
 
-		# [DOC] Add stage to pipeline
-		update_pipeline.append(update_pipeline_stage_root)
+				# [DOC] Add part_pipeline to update_pipeline_stage_current
+				if 'v' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['v'] = part_pipeline
+				elif 'then' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['then'] = part_pipeline
+				else:
+					update_pipeline_stage_current[attr_path_part] = part_pipeline
 
-	logger.debug(f'Final update pipeline: {update_pipeline}')
+			else:
+				# [DOC] Add part_pipeline to update_pipeline_stage_current
+				if 'v' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['v'] = {'$literal': doc[attr]}
+				elif 'then' in update_pipeline_stage_current.keys():
+					update_pipeline_stage_current['then'] = {'$literal': doc[attr]}
+				else:
+					update_pipeline_stage_current[attr_path_part] = {'$literal': doc[attr]}
 
-	# [DOC] If using Azure Mongo service update docs one by one
-	if Config.data_azure_mongo:
-		update_count = 0
-		for _id in docs:
-			results = await collection.update_one({'_id': _id}, update_pipeline)
-			update_count += results.modified_count
-	else:
-		results = await collection.update_many({'_id': {'$in': docs}}, update_pipeline)
-		update_count = results.modified_count
+			# [DOC] Add stage to pipeline
+			update_pipeline.append(update_pipeline_stage_root)
 
-	return {'count': update_count, 'docs': [{'_id': doc} for doc in docs]}
+		return update_pipeline
@@ -0,0 +1,34 @@
+from nawah.config import Config
+from nawah.classes import NAWAH_ENV
+from ._read import _count_write
+
+from pymongo import UpdateOne
+from typing import Dict, List, Tuple, Any
+
+import logging
+
+logger = logging.getLogger('nawah')
+
+
+async def upsert(
+	*,
+	env: NAWAH_ENV,
+	collection_name: str,
+	updates: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+) -> Dict[str, Any]:
+	# [DOC] Apply all updates, as pairs of query, update operators, in single bulk_write round-trip. Docs not matching query of update are created from query, and update
+	collection = env['conn'][Config.data_name][collection_name]
+	try:
+		results = await collection.bulk_write(
+			[UpdateOne(query, update, upsert=True) for query, update in updates],
+			ordered=False,
+		)
+	finally:
+		_count_write(collection_name=collection_name)
+	logger.debug(
+		f'Upserted docs in collection \'{collection_name}\'. Matched: {results.matched_count}, upserted: {results.upserted_count}.'
+	)
+	return {
+		'count': results.matched_count + results.upserted_count,
+		'docs': [{'_id': _id} for _id in results.upserted_ids.values()],
+	}
@@ -28,6 +28,7 @@ class LOCALE_STRATEGY(Enum):
 class CACHE_STRATEGY(Enum):
 	RECREATE = auto()
 	DISMISS = auto()
+	STALE_WHILE_REVALIDATE = auto()
 
 
 class NAWAH_VALUES(Enum):
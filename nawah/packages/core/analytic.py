@@ -1,5 +1,7 @@
 from nawah.base_module import BaseModule
+from nawah.config import Config
 from nawah.enums import Event
+from nawah import data as Data
 from nawah.classes import (
 	ATTR,
 	PERM,
@@ -10,15 +12,22 @@ from nawah.classes import (
 	Query,
 	NAWAH_QUERY,
 	NAWAH_DOC,
+	InvalidAttrException,
+	MissingAttrException,
+	ConvertAttrException,
 )
+from nawah.utils import validate_doc
 
-from typing import Union
+from pymongo.errors import BulkWriteError
+from typing import Union, Optional, Dict, List, Tuple, Any
 
-import datetime
+import logging, asyncio, datetime
+
+logger = logging.getLogger('nawah')
 
 
 class Analytic(BaseModule):
-	'''`Analytic` module provides data type and controller from `Analytics Workflow` and accompanying analytics docs. It uses `pre_create` handler to assure no events duplications occur and all occurrences of the same event are recorded in one doc.'''
+	'''`Analytic` module provides data type and controller from `Analytics Workflow` and accompanying analytics docs. It buffers occurrences of events in memory, and flushes them periodically, and records occurrences of the same event in capped buckets docs using upserts, without having request path wait for analytics writes. Buckets of the same event are merged back into one doc by read aggregation.'''
 
 	collection = 'analytics'
 	attrs = {
@@ -53,7 +62,30 @@ class Analytic(BaseModule):
 			desc='Total score of all scores of all occurrences of the event. This can be used for data analysis.'
 		),
 	}
-	unique_attrs = [('user', 'event', 'subevent', 'date')]
+	# [DOC] Occurrences of the same (user, event, subevent, date) are stored in multiple buckets, so it is not unique. Buckets are merged into one doc, having _id of first bucket, before docs read are matched, sorted and paginated
+	read_stages = [
+		{'$unwind': {'path': '$occurrences', 'preserveNullAndEmptyArrays': True}},
+		{'$sort': {'occurrences.create_time': 1}},
+		{
+			'$group': {
+				'_id': {
+					'user': '$user',
+					'event': '$event',
+					'subevent': '$subevent',
+					'date': '$date',
+				},
+				'__bucket_id': {'$min': '$_id'},
+				'user': {'$first': '$user'},
+				'event': {'$first': '$event'},
+				'subevent': {'$first': '$subevent'},
+				'date': {'$first': '$date'},
+				'occurrences': {'$push': '$occurrences'},
+				'score': {'$sum': '$occurrences.score'},
+			}
+		},
+		{'$addFields': {'_id': '$__bucket_id'}},
+		{'$project': {'__bucket_id': 0}},
+	]
 	methods = {
 		'read': METHOD(permissions=[PERM(privilege='read')]),
 		'create': METHOD(
@@ -68,56 +100,255 @@ class Analytic(BaseModule):
 		'delete': METHOD(permissions=[PERM(privilege='delete')]),
 	}
 
+	# [DOC] Occurrences of events pending flush, aggregated per (user, event, subevent, date)
+	_analytics_buffer: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+	_analytics_buffer_size: int = 0
+	# [DOC] Count of occurrences dropped since last flush, for reaching analytics_buffer_cap
+	_analytics_dropped: int = 0
+	_flush_task: Optional['asyncio.Task'] = None
+
+	@staticmethod
+	def _occurrence(*, doc: NAWAH_DOC) -> Dict[str, Any]:
+		return {
+			'args': doc['args'],
+			'score': doc['score'] if 'score' in doc.keys() else 0,
+			'create_time': datetime.datetime.utcnow().isoformat(),
+		}
+
+	@staticmethod
+	def _entry_updates(
+		*, entry: Dict[str, Any]
+	) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+		# [DOC] Push occurrences in chunks to buckets having room for them, creating new bucket if none is found, to keep buckets capped at analytics_bucket_size occurrences
+		bucket_size = Config.analytics_bucket_size
+		updates = []
+		for i in range(0, len(entry['occurrences']), bucket_size):
+			occurrences = entry['occurrences'][i : i + bucket_size]
+			updates.append(
+				(
+					{
+						**entry['query'],
+						'bucket_count': {'$lte': bucket_size - len(occurrences)},
+					},
+					{
+						'$push': {'occurrences': {'$each': occurrences}},
+						'$inc': {
+							'bucket_count': len(occurrences),
+							'score': sum(occurrence['score'] for occurrence in occurrences),
+						},
+					},
+				)
+			)
+		return updates
+
+	def enqueue(self, *, env: NAWAH_ENV, doc: NAWAH_DOC) -> None:
+		# [DOC] Buffer occurrence of event to be written by next flush, without awaiting any I/O. If buffer reached its cap, while flushes are failing, drop occurrence rather than growing buffer
+		if Analytic._analytics_buffer_size >= Config.analytics_buffer_cap:
+			if not Analytic._analytics_dropped:
+				logger.warning(
+					f'Analytics buffer reached its cap of {Config.analytics_buffer_cap} occurrences. Dropping occurrences until next successful flush.'
+				)
+			Analytic._analytics_dropped += 1
+			return
+		query = {
+			'user': env['session'].user._id,
+			'event': doc['event'],
+			'subevent': doc['subevent'],
+			'date': datetime.date.today().isoformat(),
+		}
+		# [DOC] subevent is ANY, and can be of unhashable type. Use its repr for buffer key instead
+		try:
+			buffer_key: Tuple[Any, ...] = tuple(query.values())
+			hash(buffer_key)
+		except TypeError:
+			buffer_key = (query['user'], query['event'], repr(query['subevent']), query['date'])
+		if buffer_key not in Analytic._analytics_buffer.keys():
+			Analytic._analytics_buffer[buffer_key] = {
+				'query': query,
+				'occurrences': [],
+			}
+		Analytic._analytics_buffer[buffer_key]['occurrences'].append(self._occurrence(doc=doc))
+		Analytic._analytics_buffer_size += 1
+		# [DOC] Flush buffer ahead of flush interval, if it reached its limit
+		if Analytic._analytics_buffer_size >= Config.analytics_buffer_limit and (
+			not Analytic._flush_task or Analytic._flush_task.done()
+		):
+			Analytic._flush_task = asyncio.create_task(self.flush(env=Config._sys_env))
+
+	async def flush(self, *, env: NAWAH_ENV) -> None:
+		# [DOC] Swap buffer before awaiting write, so occurrences buffered while flushing are kept for next flush
+		analytics_buffer = Analytic._analytics_buffer
+		if Analytic._analytics_dropped:
+			logger.error(
+				f'Dropped {Analytic._analytics_dropped} analytics occurrences for reaching buffer cap.'
+			)
+			Analytic._analytics_dropped = 0
+		if not analytics_buffer:
+			return
+		Analytic._analytics_buffer = {}
+		Analytic._analytics_buffer_size = 0
+		updates = []
+		updates_keys = []
+		for buffer_key, entry in analytics_buffer.items():
+			for update in self._entry_updates(entry=entry):
+				updates.append(update)
+				updates_keys.append(buffer_key)
+		try:
+			results = await Data.upsert(env=env, collection_name=self.collection, updates=updates)
+			logger.debug(f'Flushed analytics buffer. Results: {results}')
+		except BulkWriteError as e:
+			logger.error(f'Failed to flush part of analytics buffer. Details: {e.details}')
+			# [DOC] Updates are applied unordered, restore only occurrences of updates that failed
+			failed_buffer: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+			for write_error in e.details['writeErrors']:
+				buffer_key = updates_keys[write_error['index']]
+				if buffer_key not in failed_buffer.keys():
+					failed_buffer[buffer_key] = {
+						'query': analytics_buffer[buffer_key]['query'],
+						'occurrences': [],
+					}
+				failed_buffer[buffer_key]['occurrences'] += updates[write_error['index']][1][
+					'$push'
+				]['occurrences']['$each']
+			self._restore_buffer(analytics_buffer=failed_buffer)
+		except Exception as e:
+			logger.error(f'Failed to flush analytics buffer. Exception: {e}')
+			self._restore_buffer(analytics_buffer=analytics_buffer)
+
+	def _restore_buffer(
+		self, *, analytics_buffer: Dict[Tuple[Any, ...], Dict[str, Any]]
+	) -> None:
+		# [DOC] Restore occurrences that failed to flush ahead of ones buffered since, up to analytics_buffer_cap
+		buffer_room = Config.analytics_buffer_cap - Analytic._analytics_buffer_size
+		for buffer_key, entry in analytics_buffer.items():
+			if len(entry['occurrences']) > buffer_room:
+				Analytic._analytics_dropped += len(entry['occurrences']) - max(buffer_room, 0)
+				entry['occurrences'] = entry['occurrences'][: max(buffer_room, 0)]
+			buffer_room -= len(entry['occurrences'])
+			if not entry['occurrences']:
+				continue
+			if buffer_key in Analytic._analytics_buffer.keys():
+				entry['occurrences'] += Analytic._analytics_buffer[buffer_key]['occurrences']
+			Analytic._analytics_buffer[buffer_key] = entry
+		Analytic._analytics_buffer_size = sum(
+			len(entry['occurrences']) for entry in Analytic._analytics_buffer.values()
+		)
+
 	async def pre_create(self, skip_events, env, query, doc, payload):
-		analytic_results = await self.read(
-			skip_events=[Event.PERM],
+		occurrence = self._occurrence(doc=doc)
+		analytic_doc = {
+			'user': env['session'].user._id,
+			'event': doc['event'],
+			'subevent': doc['subevent'],
+			'date': datetime.date.today().isoformat(),
+			'occurrences': [occurrence],
+			'score': occurrence['score'],
+		}
+		# [DOC] Validate doc as create call does, as occurrence is upserted without calling it
+		if Event.ARGS not in skip_events:
+			try:
+				await validate_doc(
+					mode='create',
+					doc=analytic_doc,
+					attrs=self.attrs,
+					skip_events=skip_events,
+					env=env,
+					query=query,
+					concurrent=self.concurrent_validation,
+				)
+			except MissingAttrException as e:
+				raise self.exception(
+					status=400,
+					msg=f'{str(e)} for \'create\' request on module \'CORE_ANALYTIC\'.',
+					args={'code': 'MISSING_ATTR'},
+				)
+			except InvalidAttrException as e:
+				raise self.exception(
+					status=400,
+					msg=f'{str(e)} for \'create\' request on module \'CORE_ANALYTIC\'.',
+					args={'code': 'INVALID_ATTR'},
+				)
+			except ConvertAttrException as e:
+				raise self.exception(
+					status=400,
+					msg=f'{str(e)} for \'create\' request on module \'CORE_ANALYTIC\'.',
+					args={'code': 'CONVERT_INVALID_ATTR'},
+				)
+		# [DOC] Write occurrence directly using single upsert, rather than reading matching doc first
+		results = await Data.upsert(
 			env=env,
-			query=[
-				{
-					'user': env['session'].user._id,
-					'event': doc['event'],
-					'subevent': doc['subevent'],
-					'date': datetime.date.today().isoformat(),
-				},
-				{'$limit': 1},
-			],
-		)
-		if analytic_results.args.count:
-			analytic_results = await self.update(
-				skip_events=[Event.PERM],
-				env=env,
-				query=[{'_id': analytic_results.args.docs[0]._id}],
-				doc={
-					'occurrences': {
-						'$append': {
-							'args': doc['args'],
-							'score': doc['score'] if 'score' in doc.keys() else 0,
-							'create_time': datetime.datetime.utcnow().isoformat(),
-						}
+			collection_name=self.collection,
+			updates=self._entry_updates(
+				entry={
+					'query': {
+						attr: analytic_doc[attr] for attr in ['user', 'event', 'subevent', 'date']
 					},
-					'score': {'$add': doc['score'] if 'score' in doc.keys() else 0},
-				},
-			)
-			if analytic_results.status == 200:
-				return (skip_events, env, query, doc, {'__results': analytic_results})
-			else:
+					'occurrences': analytic_doc['occurrences'],
+				}
+			),
+		)
+		return (
+			skip_events,
+			env,
+			query,
+			doc,
+			{
+				'__results': self.status(
+					status=200, msg=f'Created {results["count"]} docs.', args=results
+				)
+			},
+		)
+
+	async def pre_read(self, skip_events, env, query, doc, payload):
+		await self._expand_buckets_query(env=env, query=query)
+		return (skip_events, env, query, doc, payload)
+
+	async def pre_update(self, skip_events, env, query, doc, payload):
+		# [DOC] occurrences are spread over buckets, and score is summed from them when buckets are merged. Updating them would apply to every bucket, or be discarded
+		for attr in doc.keys():
+			if attr.split('.')[0] in ['occurrences', 'score']:
 				raise self.exception(
-					status=analytic_results.status,
-					msg=analytic_results.msg,
-					args=analytic_results.args,
+					status=400,
+					msg=f'Attr \'{attr.split(".")[0]}\' of module \'CORE_ANALYTIC\' can\'t be updated.',
+					args={'code': 'INVALID_ATTR'},
 				)
-		else:
-			doc = {
-				'event': doc['event'],
-				'subevent': doc['subevent'],
-				'date': datetime.date.today().isoformat(),
-				'occurrences': [
+		await self._expand_buckets_query(env=env, query=query)
+		return (skip_events, env, query, doc, payload)
+
+	async def pre_delete(self, skip_events, env, query, doc, payload):
+		await self._expand_buckets_query(env=env, query=query)
+		return (skip_events, env, query, doc, payload)
+
+	async def _expand_buckets_query(self, *, env: NAWAH_ENV, query: Query) -> None:
+		# [DOC] Docs read are merged from buckets, having _id of first bucket. Have query by _id match all buckets of the doc, by (user, event, subevent, date) of its buckets
+		bucket_ids = [*query['_id']]
+		for _ids in query['_id:$in']:
+			bucket_ids += _ids
+		if not bucket_ids:
+			return
+		buckets_results = await Data.read(
+			env=env,
+			collection_name=self.collection,
+			attrs=self.attrs,
+			query=Query(
+				[{'_id': {'$in': bucket_ids}, '$attrs': ['user', 'event', 'subevent', 'date']}]
+			),
+			skip_process=True,
+		)
+		if not buckets_results['docs']:
+			return
+		del query['_id']['*']
+		del query['_id:$in']['*']
+		query.append(
+			{
+				'__or': [
 					{
-						'args': doc['args'],
-						'score': doc['score'] if 'score' in doc.keys() else 0,
-						'create_time': datetime.datetime.utcnow().isoformat(),
+						'user': bucket_doc['user'],
+						'event': bucket_doc['event'],
+						'subevent': bucket_doc['subevent'],
+						'date': bucket_doc['date'],
 					}
-				],
-				'score': doc['score'] if 'score' in doc.keys() else 0,
+					for bucket_doc in buckets_results['docs']
+				]
 			}
-			return (skip_events, env, query, doc, payload)
+		)
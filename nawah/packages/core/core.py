@@ -21,6 +21,10 @@ class Core(BaseModule):
 			permissions=[PERM(privilege='admin')],
 			query_args={'module': ATTR.STR(), 'cache_set': ATTR.INT()},
 		),
+		'retrieve_cache_stats': METHOD(
+			permissions=[PERM(privilege='admin')],
+			query_args={'module': ATTR.STR()},
+		),
 		'retrieve_cache_results': METHOD(
 			permissions=[PERM(privilege='admin')],
 			query_args={
@@ -61,6 +65,17 @@ class Core(BaseModule):
 			},
 		)
 
+	async def retrieve_cache_stats(self, skip_events=[], env={}, query=[], doc={}):
+		return self.status(
+			status=200,
+			msg='Module Cache Sets stats retrieved.',
+			args={
+				'stats': [
+					cache_set.stats for cache_set in Registry.module(query['module'][0]).cache
+				]
+			},
+		)
+
 	async def retrieve_cache_results(self, skip_events=[], env={}, query=[], doc={}):
 		cache_set_query = list(
 			Registry.module(query['module'][0]).cache[query['cache_set'][0]].queries.keys()
@@ -1,13 +1,31 @@
 from nawah.base_module import BaseModule
+from nawah.config import Config
 from nawah.enums import Event
-from nawah.classes import ATTR, PERM, NAWAH_DOC, METHOD
+from nawah.classes import (
+	ATTR,
+	PERM,
+	NAWAH_ENV,
+	NAWAH_DOC,
+	METHOD,
+	InvalidAttrException,
+	MissingAttrException,
+	ConvertAttrException,
+)
 from nawah.registry import Registry
+from nawah.utils import validate_doc, _expand_attr
+from nawah import data as Data
 
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from typing import Optional, List, Union
+
+import logging, asyncio, copy, datetime
+
+logger = logging.getLogger('nawah')
 
 
 class Diff(BaseModule):
-	'''`Diff` module provides data type and controller for `Diff Workflow`. It is meant for use by internal calls only.'''
+	'''`Diff` module provides data type and controller for `Diff Workflow`. It is meant for use by internal calls only. Diff docs of updates are buffered, and written in batches, without having update calls wait for them.'''
 
 	collection = 'diff'
 	attrs = {
@@ -33,32 +51,108 @@ class Diff(BaseModule):
 		'delete': METHOD(permissions=[PERM(privilege='delete')]),
 	}
 
+	# [DOC] Diff docs pending flush
+	_diff_buffer: List[NAWAH_DOC] = []
+	_flush_task: Optional['asyncio.Task'] = None
+	# [DOC] Diff docs are buffered only while diff_loop of app is running to flush them. Otherwise, they are flushed by enqueue call
+	_buffering: bool = False
+
+	async def enqueue(
+		self,
+		*,
+		env: NAWAH_ENV,
+		module_name: str,
+		docs: List[Union[str, ObjectId]],
+		vars: NAWAH_DOC,
+	) -> None:
+		# [DOC] Buffer Diff doc for every updated doc, to be written by next flush. vars are copied as caller owns update doc
+		if not docs:
+			return
+		diff_doc = {
+			'module': module_name,
+			'doc': ObjectId(docs[0]),
+			'vars': _expand_attr(doc=copy.deepcopy(self.format_doc_oper(doc=vars))),
+			'remarks': '',
+			'create_time': datetime.datetime.utcnow().isoformat(),
+		}
+		if env['session']:
+			diff_doc['user'] = env['session'].user._id
+		# [DOC] Validate Diff doc once, as create call does, as Diff docs of all updated docs differ only by doc
+		try:
+			await validate_doc(
+				mode='create',
+				doc=diff_doc,
+				attrs=self.attrs,
+				skip_events=[Event.PERM],
+				env=env,
+				query=[],
+				concurrent=self.concurrent_validation,
+			)
+		except (InvalidAttrException, MissingAttrException, ConvertAttrException) as e:
+			logger.error(f'Failed to validate Diff doc of module \'{module_name}\'. Exception: {e}')
+			return
+		for doc in docs:
+			Diff._diff_buffer.append({**diff_doc, 'doc': ObjectId(doc)})
+		if not Diff._buffering:
+			await self.flush(env=env)
+		# [DOC] Flush buffer ahead of flush interval, if it reached its limit
+		elif len(Diff._diff_buffer) >= Config.diff_buffer_limit and (
+			not Diff._flush_task or Diff._flush_task.done()
+		):
+			Diff._flush_task = asyncio.create_task(self.flush(env=Config._sys_env))
+
+	async def flush(self, *, env: NAWAH_ENV) -> None:
+		# [DOC] Swap buffer before awaiting write, so Diff docs buffered while flushing are kept for next flush
+		diff_buffer = Diff._diff_buffer
+		if not diff_buffer:
+			return
+		Diff._diff_buffer = []
+		try:
+			results = await Data.create_many(
+				env=env, collection_name=self.collection, attrs=self.attrs, docs=diff_buffer
+			)
+			logger.debug(f'Flushed diff buffer. Results count: {results["count"]}')
+		except BulkWriteError as e:
+			logger.error(f'Failed to flush part of diff buffer. Details: {e.details}')
+			# [DOC] Restore only Diff docs that failed to flush, skipping ones already written before, which fail with duplicate key error
+			Diff._diff_buffer = [
+				diff_buffer[error['index']]
+				for error in e.details['writeErrors']
+				if error['code'] != 11000
+			] + Diff._diff_buffer
+		except Exception as e:
+			logger.error(f'Failed to flush diff buffer. Exception: {e}')
+			# [DOC] Restore Diff docs that failed to flush ahead of ones buffered since
+			Diff._diff_buffer = diff_buffer + Diff._diff_buffer
+
 	async def pre_create(self, skip_events, env, query, doc, payload):
 		# [DOC] format Doc Oper with prefixed underscores to avoid data errors
 		doc = self.format_doc_oper(doc=doc)
-		# [DOC] Detect non-_id update query:
-		if '_id' not in query:
+		# [DOC] Get _id of updated docs from query, or read them if query is non-_id update query
+		if '_id' in query:
+			docs = query['_id'][0]
+		elif '_id:$in' in query:
+			docs = query['_id:$in'][0]
+		else:
 			results = await Registry.module(doc['module']).read(
 				skip_events=[Event.PERM], env=env, query=query
 			)
-			if results.args.count > 1:
-				query.append({'_id': {'$in': [doc._id for doc in results.args.docs]}})
-			elif results.args.count == 1:
-				query.append({'_id': results.args.docs[0]._id})
-			else:
+			if not results.args.count:
 				raise self.exception(
 					status=400, msg='No update docs matched.', args={'code': 'NO_MATCH'}
 				)
-		if '_id' in query and type(query['_id'][0]) == list:
-			for i in range(len(query['_id'][0]) - 1):
-				self.create(
-					skip_events=[Event.PERM],
-					env=env,
-					query=[{'_id': query['_id'][0][i]}],
-					doc=doc,
-				)
-			query['_id'][0] = query['_id'][0][-1]
-		doc['doc'] = ObjectId(query['_id'][0])
+			docs = [doc._id for doc in results.args.docs]
+		if type(docs) != list:
+			docs = [docs]
+		# [DOC] Create Diff doc for all but last doc, which is created by current call
+		for i in range(len(docs) - 1):
+			await self.create(
+				skip_events=[Event.PERM],
+				env=env,
+				query=[{'_id': docs[i]}],
+				doc=doc,
+			)
+		doc['doc'] = ObjectId(docs[-1])
 		return (skip_events, env, query, doc, payload)
 
 	def format_doc_oper(self, *, doc: NAWAH_DOC):
@@ -2,6 +2,7 @@ from nawah.base_module import BaseModule
 from nawah.classes import ATTR, PERM, METHOD
 from nawah.config import Config
 from nawah.enums import Event
+from nawah.registry import Registry
 
 
 class Group(BaseModule):
@@ -81,3 +82,14 @@ class Group(BaseModule):
 			)
 			doc['attrs'] = results.args.docs[0]['attrs']
 		return (skip_events, env, query, doc, payload)
+
+	async def on_update(self, results, skip_events, env, query, doc, payload):
+		# [DOC] Invalidate cached effective privileges of users if groups privileges changed
+		if 'privileges' in {attr.split('.')[0].split(':')[0] for attr in doc.keys()}:
+			await Registry.module('user')._invalidate_privileges()
+		return (results, skip_events, env, query, doc, payload)
+
+	async def on_delete(self, results, skip_events, env, query, doc, payload):
+		if results['count']:
+			await Registry.module('user')._invalidate_privileges()
+		return (results, skip_events, env, query, doc, payload)
@@ -157,13 +157,7 @@ class Session(BaseModule):
 					'HTTP_USER_AGENT': env['HTTP_USER_AGENT'],
 				},
 			}
-			analytic_results = await Registry.module('analytic').create(
-				skip_events=[Event.PERM], env=env, doc=analytic_doc
-			)
-			if analytic_results.status != 200:
-				logger.error(
-					f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
-				)
+			Registry.module('analytic').enqueue(env=env, doc=analytic_doc)
 		# [DOC] Create USER_AUTH Analytic doc
 		if Config.analytics_events['session_user_auth']:
 			analytic_doc = {
@@ -176,13 +170,7 @@ class Session(BaseModule):
 					'client_app': env['client_app'],
 				},
 			}
-			analytic_results = await Registry.module('analytic').create(
-				skip_events=[Event.PERM], env=env, doc=analytic_doc
-			)
-			if analytic_results.status != 200:
-				logger.error(
-					f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
-				)
+			Registry.module('analytic').enqueue(env=env, doc=analytic_doc)
 
 		return self.status(
 			status=200,
@@ -262,13 +250,7 @@ class Session(BaseModule):
 					'HTTP_USER_AGENT': env['HTTP_USER_AGENT'],
 				},
 			}
-			analytic_results = await Registry.module('analytic').create(
-				skip_events=[Event.PERM], env=env, doc=analytic_doc
-			)
-			if analytic_results.status != 200:
-				logger.error(
-					f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
-				)
+			Registry.module('analytic').enqueue(env=env, doc=analytic_doc)
 		# [DOC] Create USER_AUTH Analytic doc
 		if Config.analytics_events['session_user_reauth']:
 			analytic_doc = {
@@ -281,13 +263,7 @@ class Session(BaseModule):
 					'client_app': env['client_app'],
 				},
 			}
-			analytic_results = await Registry.module('analytic').create(
-				skip_events=[Event.PERM], env=env, doc=analytic_doc
-			)
-			if analytic_results.status != 200:
-				logger.error(
-					f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
-				)
+			Registry.module('analytic').enqueue(env=env, doc=analytic_doc)
 
 		return self.status(
 			status=200,
@@ -328,13 +304,7 @@ class Session(BaseModule):
 					'HTTP_USER_AGENT': env['HTTP_USER_AGENT'],
 				},
 			}
-			analytic_results = await Registry.module('analytic').create(
-				skip_events=[Event.PERM], env=env, doc=analytic_doc
-			)
-			if analytic_results.status != 200:
-				logger.error(
-					f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
-				)
+			Registry.module('analytic').enqueue(env=env, doc=analytic_doc)
 		# [DOC] Create USER_AUTH Analytic doc
 		if Config.analytics_events['session_user_deauth']:
 			analytic_doc = {
@@ -347,13 +317,7 @@ class Session(BaseModule):
 					'client_app': env['client_app'],
 				},
 			}
-			analytic_results = await Registry.module('analytic').create(
-				skip_events=[Event.PERM], env=env, doc=analytic_doc
-			)
-			if analytic_results.status != 200:
-				logger.error(
-					f'Failed to create \'Analytic\' doc: {analytic_doc}. Results: {analytic_results}'
-				)
+			Registry.module('analytic').enqueue(env=env, doc=analytic_doc)
 
 		return self.status(
 			status=200,
@@ -4,6 +4,11 @@ from nawah.classes import ATTR, PERM, EXTN, METHOD, InvalidAttrException
 from nawah.utils import validate_doc, generate_dynamic_attr
 from nawah.config import Config
 
+from bson import ObjectId
+from typing import Dict, List, Tuple, Optional, Union, Any
+
+import copy
+
 
 async def attr_extn_val(
 	*,
@@ -143,6 +148,180 @@ class Setting(BaseModule):
 		),
 	}
 
+	# [DOC] Settings docs val, and dynamic ATTR generated from it, keyed by (type, user _id, var), or None for missing settings. settings version is bumped whenever cache is invalidated, which prevents caching results of reads running at the time
+	_settings_cache: Dict[Tuple[str, Optional[str], str], Optional[Dict[str, Any]]] = {}
+	_settings_version: int = 0
+
+	@staticmethod
+	def _setting_cache_key(
+		*, setting_type: str, user: Optional[Union[str, ObjectId]], var: str
+	) -> Tuple[str, Optional[str], str]:
+		# [DOC] Global settings are shared by all users, and are not keyed by user
+		if setting_type == 'global':
+			return (setting_type, None, var)
+		return (setting_type, str(user), var)
+
+	async def _invalidate_settings(
+		self,
+		*,
+		cache_keys: List[Tuple[str, Optional[str], str]] = None,
+		broadcast: bool = True,
+	) -> None:
+		Setting._settings_version += 1
+		# [DOC] If no cache_keys are passed, invalidate all cached settings
+		if cache_keys == None:
+			Setting._settings_cache = {}
+		else:
+			for cache_key in cache_keys:
+				if cache_key in Setting._settings_cache.keys():
+					del Setting._settings_cache[cache_key]
+		# [DOC] Settings cache is per process, broadcast invalidation to other app processes
+		if broadcast:
+			await self._broadcast_module_cache(
+				message={
+					'cache_keys': [list(cache_key) for cache_key in cache_keys]
+					if cache_keys != None
+					else None
+				}
+			)
+
+	async def _process_module_cache(self, *, message: Dict[str, Any]) -> None:
+		if 'reset' in message.keys():
+			await self._invalidate_settings(broadcast=False)
+			return
+		await self._invalidate_settings(
+			cache_keys=[tuple(cache_key) for cache_key in message['cache_keys']]  # type: ignore
+			if message['cache_keys'] != None
+			else None,
+			broadcast=False,
+		)
+
+	async def update_cache(
+		self, skip_events=[], env={}, query=[], doc={}, docs=None, broadcast=True
+	):
+		# [DOC] Invalidate cached settings of written docs here, rather than in on_* handlers, as update_cache is called for every write, even with Event.ON skipped. Writes changing user, var, or type of settings, or of unknown docs invalidate all cached settings
+		cache_keys: Optional[List[Tuple[str, Optional[str], str]]] = None
+		if docs != None and not {
+			attr.split('.')[0].split(':')[0] for attr in (doc or {}).keys()
+		} & {'user', 'var', 'type'}:
+			try:
+				cache_keys = [
+					self._setting_cache_key(
+						setting_type=setting['type'], user=setting.get('user'), var=setting['var']
+					)
+					for setting in docs
+				]
+			except KeyError:
+				cache_keys = None
+		await self._invalidate_settings(cache_keys=cache_keys, broadcast=broadcast)
+		return await super().update_cache(
+			skip_events=skip_events,
+			env=env,
+			query=query,
+			doc=doc,
+			docs=docs,
+			broadcast=broadcast,
+		)
+
+	def _cache_setting(
+		self,
+		*,
+		settings_version: int,
+		cache_key: Tuple[str, Optional[str], str],
+		setting: Optional[Dict[str, Any]],
+	) -> None:
+		# [DOC] Cache only if settings version didn't change while setting was being read
+		if settings_version != Setting._settings_version:
+			return
+		# [DOC] Bound settings cache by evicting oldest cached setting
+		while Setting._settings_cache and len(Setting._settings_cache) >= Config.settings_cache_limit:
+			del Setting._settings_cache[next(iter(Setting._settings_cache))]
+		# [DOC] Missing setting is cached as None, to not read it again until settings cache is invalidated
+		Setting._settings_cache[cache_key] = (
+			{'val': copy.deepcopy(setting['val']), 'dynamic_attr': None}
+			if setting != None
+			else None
+		)
+
+	async def _read_dynamic_attr(
+		self, *, env, setting_type: str, user: Optional[Union[str, ObjectId]], var: str
+	) -> Optional[ATTR]:
+		# [DOC] Return dynamic ATTR generated from Setting doc val, using settings cache
+		cache_key = self._setting_cache_key(setting_type=setting_type, user=user, var=var)
+		if cache_key not in Setting._settings_cache.keys():
+			settings_version = Setting._settings_version
+			setting_query = {'type': setting_type, 'var': var}
+			if user:
+				setting_query['user'] = user
+			setting_results = await self.read(
+				skip_events=[Event.PERM], env=env, query=[setting_query]
+			)
+			setting = setting_results.args.docs[0] if setting_results.args.count else None
+			self._cache_setting(
+				settings_version=settings_version, cache_key=cache_key, setting=setting
+			)
+			if setting == None:
+				return None
+			if cache_key not in Setting._settings_cache.keys():
+				return generate_dynamic_attr(dynamic_attr=copy.deepcopy(setting.val))[0]
+
+		cached_setting = Setting._settings_cache[cache_key]
+		if cached_setting == None:
+			return None
+		if not cached_setting['dynamic_attr']:
+			# [DOC] generate_dynamic_attr updates dynamic_attr in-place, pass copy of cached val
+			cached_setting['dynamic_attr'] = generate_dynamic_attr(
+				dynamic_attr=copy.deepcopy(cached_setting['val'])
+			)[0]
+		return cached_setting['dynamic_attr']
+
+	async def _read_users_settings(
+		self, *, env, users: List[ObjectId], settings_vars: List[str]
+	) -> Dict[str, Dict[str, Any]]:
+		# [DOC] Return vals of settings_vars of users, keyed by user _id, then var. Settings not in cache are read for all users in single call
+		users_settings: Dict[str, Dict[str, Any]] = {str(user): {} for user in users}
+		read_users: List[ObjectId] = []
+		for user in users:
+			for var in settings_vars:
+				cache_key = self._setting_cache_key(
+					setting_type=Config.user_settings[var].type, user=user, var=var
+				)
+				if cache_key not in Setting._settings_cache.keys():
+					read_users.append(user)
+					break
+				cached_setting = Setting._settings_cache[cache_key]
+				# [DOC] Missing settings are cached as None, and are not included in results
+				if cached_setting != None:
+					users_settings[str(user)][var] = copy.deepcopy(cached_setting['val'])
+
+		if read_users:
+			settings_version = Setting._settings_version
+			setting_results = await self.read(
+				skip_events=[Event.PERM, Event.ARGS],
+				env=env,
+				query=[{'user': {'$in': read_users}, 'var': {'$in': settings_vars}}],
+			)
+			read_settings: Dict[Tuple[str, Optional[str], str], Dict[str, Any]] = {}
+			for setting in setting_results.args.docs:
+				users_settings[str(setting['user'])][setting['var']] = setting['val']
+				read_settings[
+					self._setting_cache_key(
+						setting_type=setting['type'], user=setting['user'], var=setting['var']
+					)
+				] = setting
+			for user in read_users:
+				for var in settings_vars:
+					cache_key = self._setting_cache_key(
+						setting_type=Config.user_settings[var].type, user=user, var=var
+					)
+					self._cache_setting(
+						settings_version=settings_version,
+						cache_key=cache_key,
+						setting=read_settings.get(cache_key),
+					)
+
+		return users_settings
+
 	async def on_create(self, results, skip_events, env, query, doc, payload):
 		if doc['type'] in ['user', 'user_sys']:
 			if doc['user'] == env['session'].user._id and doc['var'] in Config.user_doc_settings:
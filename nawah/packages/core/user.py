@@ -6,6 +6,7 @@ from nawah.registry import Registry
 from nawah.utils import validate_attr, encode_attr_type
 
 from bson import ObjectId
+from typing import Dict, List, Set, Tuple, Union, Any
 
 import copy
 
@@ -84,24 +85,56 @@ class User(BaseModule):
 		'delete_file': METHOD(permissions=[PERM(privilege='__sys')]),
 	}
 
+	# [DOC] Effective privileges of users, keyed by (user _id, groups version). groups version is bumped by Group module whenever groups privileges change, which leaves entries computed against older versions unreachable
+	_privileges_cache: Dict[Tuple[str, int], Dict[str, List[str]]] = {}
+	_privileges_groups_version: int = 0
+
+	async def _invalidate_privileges(
+		self, *, users: List[Union[str, ObjectId]] = None, broadcast: bool = True
+	) -> None:
+		# [DOC] If no users are passed, invalidate all cached privileges by bumping groups version
+		if users == None:
+			User._privileges_groups_version += 1
+			User._privileges_cache = {}
+		else:
+			users_ids = {str(user) for user in users}
+			for cache_key in [
+				cache_key
+				for cache_key in User._privileges_cache.keys()
+				if cache_key[0] in users_ids
+			]:
+				del User._privileges_cache[cache_key]
+		# [DOC] Privileges cache is per process, broadcast invalidation to other app processes
+		if broadcast:
+			await self._broadcast_module_cache(
+				message={'users': [str(user) for user in users] if users != None else None}
+			)
+
+	async def _process_module_cache(self, *, message: Dict[str, Any]) -> None:
+		if 'reset' in message.keys():
+			await self._invalidate_privileges(broadcast=False)
+			return
+		await self._invalidate_privileges(users=message['users'], broadcast=False)
+
 	async def on_read(self, results, skip_events, env, query, doc, payload):
+		# [DOC] Read user_doc_settings of all users in results at once, rather than reading them for every user
+		if len(Config.user_doc_settings) and results['docs']:
+			users_settings = await Registry.module('setting')._read_users_settings(
+				env=env,
+				users=[user._id for user in results['docs']],
+				settings_vars=Config.user_doc_settings,
+			)
 		for i in range(len(results['docs'])):
 			user = results['docs'][i]
 			for auth_attr in Config.user_attrs.keys():
 				del user[f'{auth_attr}_hash']
 			if len(Config.user_doc_settings):
-				setting_results = await Registry.module('setting').read(
-					skip_events=[Event.PERM, Event.ARGS],
-					env=env,
-					query=[{'user': user._id, 'var': {'$in': Config.user_doc_settings}}],
-				)
-				user_doc_settings = copy.copy(Config.user_doc_settings)
-				if setting_results.args.count:
-					for setting_doc in setting_results.args.docs:
-						user_doc_settings.remove(setting_doc['var'])
-						user[setting_doc['var']] = setting_doc['val']
-				# [DOC] Forward-compatibility: If user was created before presence of any user_doc_settings, add them with default value
-				for setting_attr in user_doc_settings:
+				user_settings = users_settings[str(user._id)]
+				for setting_attr in Config.user_doc_settings:
+					if setting_attr in user_settings.keys():
+						user[setting_attr] = user_settings[setting_attr]
+						continue
+					# [DOC] Forward-compatibility: If user was created before presence of any user_doc_settings, add them with default value
 					user[setting_attr] = Config.user_settings[setting_attr].default
 					# [DOC] Set NAWAH_VALUES.NONE_VALUE to None if it was default
 					if user[setting_attr] == NAWAH_VALUES.NONE_VALUE:
@@ -163,6 +196,16 @@ class User(BaseModule):
 					return setting_results
 		return (results, skip_events, env, query, doc, payload)
 
+	async def on_update(self, results, skip_events, env, query, doc, payload):
+		# [DOC] Invalidate cached privileges of updated users if privileges or groups changed
+		if {attr.split('.')[0].split(':')[0] for attr in doc.keys()} & {'privileges', 'groups'}:
+			await self._invalidate_privileges(users=[user['_id'] for user in results['docs']])
+		return (results, skip_events, env, query, doc, payload)
+
+	async def on_delete(self, results, skip_events, env, query, doc, payload):
+		await self._invalidate_privileges(users=[user['_id'] for user in results['docs']])
+		return (results, skip_events, env, query, doc, payload)
+
 	async def read_privileges(self, skip_events=[], env={}, query=[], doc={}):
 		# [DOC] Confirm _id is valid
 		results = await self.read(
@@ -173,19 +216,54 @@ class User(BaseModule):
 				status=400, msg='User is invalid.', args={'code': 'INVALID_USER'}
 			)
 		user = results.args.docs[0]
-		for group in user.groups:
-			group_results = await Registry.module('group').read(
-				skip_events=[Event.PERM], env=env, query=[{'_id': group}]
+		# [DOC] Attempt to use cached effective privileges
+		cache_key = (str(user._id), User._privileges_groups_version)
+		if cache_key in User._privileges_cache.keys():
+			user['privileges'] = {
+				privilege: list(privileges)
+				for privilege, privileges in User._privileges_cache[cache_key].items()
+			}
+			return results
+		# [DOC] Merge groups privileges using sets to avoid quadratic membership checks
+		privileges: Dict[str, List[str]] = {
+			privilege: list(user.privileges[privilege]) for privilege in user.privileges.keys()
+		}
+		privileges_sets: Dict[str, Set[str]] = {
+			privilege: set(privileges[privilege]) for privilege in privileges.keys()
+		}
+		if user.groups:
+			groups_results = await Registry.module('group').read(
+				skip_events=[Event.PERM], env=env, query=[{'_id': {'$in': user.groups}}]
 			)
-			group = group_results.args.docs[0]
-			for privilege in group.privileges.keys():
-				if privilege not in user.privileges.keys():
-					user.privileges[privilege] = []
-				for i in range(len(group.privileges[privilege])):
-					if group.privileges[privilege][i] not in user.privileges[privilege]:
-						user.privileges[privilege].append(group.privileges[privilege][i])
+			for group in groups_results.args.docs:
+				for privilege in group.privileges.keys():
+					if privilege not in privileges.keys():
+						privileges[privilege] = []
+						privileges_sets[privilege] = set()
+					for group_privilege in group.privileges[privilege]:
+						if group_privilege not in privileges_sets[privilege]:
+							privileges_sets[privilege].add(group_privilege)
+							privileges[privilege].append(group_privilege)
+		self._cache_privileges(cache_key=cache_key, privileges=privileges)
+		user['privileges'] = privileges
 		return results
 
+	def _cache_privileges(
+		self, *, cache_key: Tuple[str, int], privileges: Dict[str, List[str]]
+	) -> None:
+		# [DOC] Cache only if groups version didn't change while privileges were being read
+		if cache_key[1] != User._privileges_groups_version:
+			return
+		# [DOC] Bound privileges cache by evicting oldest cached privileges
+		while (
+			User._privileges_cache
+			and len(User._privileges_cache) >= Config.privileges_cache_limit
+		):
+			del User._privileges_cache[next(iter(User._privileges_cache))]
+		User._privileges_cache[cache_key] = {
+			privilege: list(privileges[privilege]) for privilege in privileges.keys()
+		}
+
 	async def add_group(self, skip_events=[], env={}, query=[], doc={}):
 		# [DOC] Check for list group attr
 		if type(doc['group']) == list:
@@ -9,6 +9,7 @@ from ._attr import (
 from ._validate import (
 	validate_doc,
 	validate_attr,
+	compile_attr,
 	_process_file_obj,
 	generate_dynamic_attr,
 )
@@ -19,6 +20,7 @@ from ._encode_attr_type import encode_attr_type
 from ._config import (
 	_process_config,
 	_config_data,
+	_warm_cache,
 	_compile_anon_user,
 	_compile_anon_session,
 )
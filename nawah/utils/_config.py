@@ -16,7 +16,7 @@ from croniter import croniter
 from bson import ObjectId
 from passlib.hash import pbkdf2_sha512
 
-import os, logging, datetime, time, requests
+import os, logging, datetime, time, requests, asyncio
 
 from ._attr import _deep_update
 
@@ -607,6 +607,12 @@ async def _config_data():
 	Config._sys_conn[Config.data_name]['analytics'].create_index([('user', 1)])
 	Config._sys_conn[Config.data_name]['analytics'].create_index([('event', 1)])
 	Config._sys_conn[Config.data_name]['analytics'].create_index([('subevent', 1)])
+	logger.debug(
+		'Creating \'user\', \'event\', \'subevent\', \'date\' data index for analytics buckets.'
+	)
+	Config._sys_conn[Config.data_name]['analytics'].create_index(
+		[('user', 1), ('event', 1), ('subevent', 1), ('date', 1)]
+	)
 	logger.debug('Creating \'__deleted\' data indexes for all collections.')
 	for module in Config.modules:
 		if Config.modules[module].collection:
@@ -654,6 +660,36 @@ async def _config_data():
 		Config.test = True
 
 
+async def _warm_cache():
+	# [DOC] Read warm queries of all Cache Sets concurrently, so the app starts with populated cache
+	warm_queries = []
+	warm_reads = []
+	for module_name, module in Config.modules.items():
+		for cache_set in module.cache:
+			for query in cache_set.warm:
+				warm_queries.append((module_name, query))
+				warm_reads.append(
+					module.read(skip_events=[Event.PERM], env=Config._sys_env, query=query)
+				)
+
+	if not warm_reads:
+		return
+
+	logger.info(f'Warming Cache Sets with {len(warm_reads)} queries.')
+	warm_start = time.time()
+	warm_results = await asyncio.gather(*warm_reads, return_exceptions=True)
+	warm_failures = 0
+	for (module_name, query), results in zip(warm_queries, warm_results):
+		if isinstance(results, BaseException) or results.status != 200:
+			warm_failures += 1
+			logger.warning(
+				f'Failed to warm Cache Set of module \'{module_name}\' with query: {query}. Results: {results}'
+			)
+	logger.info(
+		f'Warmed Cache Sets in {time.time() - warm_start:.3f} seconds, with {warm_failures} failed queries.'
+	)
+
+
 def _compile_anon_user():
 	from nawah.utils import generate_attr
 
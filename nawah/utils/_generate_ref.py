@@ -130,6 +130,10 @@ def _generate_ref():
 					Config._api_ref += f'* Set {i}:\n'
 					Config._api_ref += f'  * CACHE condition: `{extract_lambda_body(Config.modules[module].cache[i].condition)}`\n'
 					Config._api_ref += f'  * CACHE period: {Config.modules[module].cache[i].period}\n'
+					Config._api_ref += f'  * CACHE max entries: {Config.modules[module].cache[i].max_entries}\n'
+					Config._api_ref += f'  * CACHE max bytes: {Config.modules[module].cache[i].max_bytes}\n'
+					Config._api_ref += f'  * CACHE cache response: {Config.modules[module].cache[i].cache_response}\n'
+					Config._api_ref += f'  * CACHE warm queries: {len(Config.modules[module].cache[i].warm)}\n'
 			else:
 				Config._api_ref += '#### Cache Sets: None\n'
 			# [DOC] Add module analytics sets
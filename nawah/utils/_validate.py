@@ -18,7 +18,19 @@ from nawah.classes import (
 )
 
 from bson import binary, ObjectId
-from typing import Dict, Optional, List, Union, Any, cast, Literal, Tuple, TYPE_CHECKING
+from typing import (
+	Dict,
+	Optional,
+	List,
+	Union,
+	Any,
+	Awaitable,
+	Callable,
+	cast,
+	Literal,
+	Tuple,
+	TYPE_CHECKING,
+)
 
 import logging, copy, re, asyncio, datetime
 
@@ -74,8 +86,11 @@ async def validate_doc(
 	skip_events: NAWAH_EVENTS = None,
 	env: NAWAH_ENV = None,
 	query: Union[NAWAH_QUERY, Query] = None,
+	concurrent: bool = False,
 ):
+	# [DOC] If concurrent, async validations of attrs are gathered, and awaited together before the first ordered attr, and at end. Exceptions are raised in order of attrs regardless
 	attrs_map = {attr.split('.')[0]: attr for attr in doc.keys()}
+	pending_attrs: List[Tuple[str, Awaitable]] = []
 
 	for attr in attrs.keys():
 		if attr not in attrs_map.keys():
@@ -88,36 +103,115 @@ async def validate_doc(
 		elif mode != 'create' and doc[attrs_map[attr]] != None:
 			attr = attrs_map[attr]
 
+		ordered = concurrent and _attr_ordered(attr_type=attrs[attr.split('.')[0]], mode=mode)
+		if ordered:
+			await _validate_pending_attrs(doc=doc, pending_attrs=pending_attrs)
+
 		try:
-			env = cast(NAWAH_ENV, env)
-			if mode != 'create' and '.' in attr:
-				doc[attr] = await _validate_dot_notated(
-					attr=attr,
-					doc=doc,
-					attrs=attrs,
-					skip_events=skip_events,
-					env=env,
-					query=query,
-				)
-			else:
-				doc[attr] = await validate_attr(
-					attr_name=attr,
-					attr_type=attrs[attr],
-					attr_val=doc[attr],
-					mode=mode,
-					skip_events=skip_events,
-					env=env,
-					query=query,
-					doc=doc,
-				)
+			attr_validation = _validate_doc_attr(
+				mode=mode,
+				attr=attr,
+				doc=doc,
+				attrs=attrs,
+				skip_events=skip_events,
+				env=env,
+				query=query,
+			)
+		except Exception:
+			# [DOC] Raise exceptions of pending attrs preceding attr first
+			await _validate_pending_attrs(doc=doc, pending_attrs=pending_attrs)
+			raise
+
+		if not attr_validation:
+			continue
+		elif concurrent and not ordered:
+			pending_attrs.append((attr, attr_validation))
+			continue
+
+		try:
+			doc[attr] = await attr_validation
 		except Exception as e:
-			if type(e) in [InvalidAttrException, ConvertAttrException]:
-				if doc[attr] == None:
-					raise MissingAttrException(attr_name=attr)
-				else:
-					raise e
-			else:
-				raise e
+			_raise_doc_attr_exception(attr=attr, doc=doc, exception=e)
+
+	await _validate_pending_attrs(doc=doc, pending_attrs=pending_attrs)
+
+
+def _validate_doc_attr(
+	*,
+	mode: Literal['create', 'create_draft', 'update'],
+	attr: str,
+	doc: NAWAH_DOC,
+	attrs: Dict[str, ATTR],
+	skip_events: Optional[NAWAH_EVENTS],
+	env: Optional[NAWAH_ENV],
+	query: Optional[Union[NAWAH_QUERY, Query]],
+) -> Optional[Awaitable]:
+	# [DOC] Validate attr in-place if it has sync validator, otherwise return awaitable validating it
+	env = cast(NAWAH_ENV, env)
+	if mode != 'create' and '.' in attr:
+		return _validate_dot_notated(
+			attr=attr,
+			doc=doc,
+			attrs=attrs,
+			skip_events=skip_events,
+			env=env,
+			query=query,
+		)
+
+	ctx: VALIDATE_CTX = {
+		'mode': mode,
+		'attr_name': attr,
+		'skip_events': skip_events,
+		'env': env,
+		'query': query,
+		'doc': doc,
+		'scope': None,
+	}
+	# [DOC] Call compiled validator directly, if it is sync, skipping creating coroutine for it
+	if validator := _sync_validator(attr_type=attrs[attr], mode=mode):
+		try:
+			doc[attr] = validator(doc[attr], ctx)
+		except Exception as e:
+			_raise_doc_attr_exception(attr=attr, doc=doc, exception=e)
+		return None
+
+	return _validate_attr_ctx(attr_type=attrs[attr], attr_val=doc[attr], ctx=ctx)
+
+
+async def _validate_pending_attrs(
+	*, doc: NAWAH_DOC, pending_attrs: List[Tuple[str, Awaitable]]
+):
+	if not pending_attrs:
+		return
+
+	attrs_results = await asyncio.gather(
+		*[attr_validation for _, attr_validation in pending_attrs], return_exceptions=True
+	)
+	pending_attrs_results = list(zip([attr for attr, _ in pending_attrs], attrs_results))
+	pending_attrs.clear()
+	for attr, attr_result in pending_attrs_results:
+		if isinstance(attr_result, BaseException):
+			_raise_doc_attr_exception(attr=attr, doc=doc, exception=attr_result)
+		doc[attr] = attr_result
+
+
+def _raise_doc_attr_exception(*, attr: str, doc: NAWAH_DOC, exception: BaseException):
+	if type(exception) in [InvalidAttrException, ConvertAttrException] and doc[attr] == None:
+		raise MissingAttrException(attr_name=attr)
+	raise exception
+
+
+def _attr_ordered(*, attr_type: ATTR, mode: Literal['create', 'create_draft', 'update']):
+	compile_attr(attr_type=attr_type)
+	if attr_type._validator_ordered:
+		return True
+	# [DOC] Default of Attr Type TYPE is called for create calls only
+	attr_default = attr_type._default
+	return (
+		mode == 'create'
+		and type(attr_default) == ATTR
+		and attr_default._args.get('ordered', False)
+	)
 
 
 async def _validate_dot_notated(
@@ -194,814 +288,1101 @@ async def _validate_dot_notated(
 		)
 
 
-async def _validate_default(
-	*,
-	mode: Literal['create', 'create_draft', 'update', 'deep'],
-	attr_name: str,
-	attr_type: ATTR,
-	attr_val: Any,
-	skip_events: NAWAH_EVENTS,
-	env: NAWAH_ENV,
-	query: Union[NAWAH_QUERY, Query],
-	doc: NAWAH_DOC,
-	scope: NAWAH_DOC,
-):
-	if (
-		mode == 'create'
-		and type(attr_type._default) == ATTR
-		and attr_type._default._type == 'TYPE'
-	):
-		attr_val = await attr_type._default._args['func'](
-			mode=mode,
-			attr_name=attr_name,
+_DATE_RE = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$')
+_DATETIME_RE = re.compile(
+	r'^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]{6})?)?$'
+)
+_TIME_RE = re.compile(r'^[0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]{6})?)?$')
+_EMAIL_RE = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
+_FLOAT_RE = re.compile(r'^[0-9]+(\.[0-9]+)?$')
+_INT_RE = re.compile(r'^[0-9]+$')
+_IP_RE = re.compile(
+	r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
+)
+_PHONE_RE = re.compile(r'^\+[0-9]+$')
+_URI_WEB_RE = re.compile(r'^https?:\/\/(?:[\w\-\_]+\.)(?:\.?[\w]{2,})+([\?\/].*)?$')
+# [DOC] Pattern never matching any value, used in place of invalid patterns
+_NO_MATCH_RE = re.compile(r'(?!)')
+
+_DATE_RANGE_UNITS = {'d': 'days', 'w': 'weeks'}
+_DATETIME_RANGE_UNITS = {
+	'd': 'days',
+	's': 'seconds',
+	'm': 'minutes',
+	'h': 'hours',
+	'w': 'weeks',
+}
+_TIME_RANGE_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours'}
+
+# [DOC] Validation context passed to compiled validators, with keys: mode, attr_name, skip_events, env, query, doc, scope
+VALIDATE_CTX = Dict[str, Any]
+ATTR_VALIDATOR = Callable[[Any, VALIDATE_CTX], Any]
+ATTR_CHECK = Callable[[Any, VALIDATE_CTX], Any]
+
+
+class _InvalidAttrVal(Exception):
+	'''Raised by compiled checks for invalid values, without the overhead of building InvalidAttrException, which is built if required by fallback of validator.'''
+
+	pass
+
+
+def _compile_pattern(pattern: str) -> 're.Pattern':
+	try:
+		return re.compile(pattern)
+	except re.error:
+		return _NO_MATCH_RE
+
+
+def _resolve_range(
+	*, attr_range: List[str], units: Dict[str, str], range_format: Callable[[str], str]
+) -> List[str]:
+	resolved_range = [attr_range[0], attr_range[1]]
+	for i in [0, 1]:
+		if resolved_range[i][0] in ['+', '-']:
+			range_delta = {}
+			if resolved_range[i][-1] in units.keys():
+				range_delta = {units[resolved_range[i][-1]]: int(resolved_range[i][:-1])}
+			resolved_range[i] = range_format(
+				(datetime.datetime.utcnow() + datetime.timedelta(**range_delta)).isoformat()
+			)
+	return resolved_range
+
+
+def _child_ctx(*, ctx: VALIDATE_CTX, attr_name: str, scope: Any) -> VALIDATE_CTX:
+	return {**ctx, 'mode': 'deep', 'attr_name': attr_name, 'scope': scope}
+
+
+def compile_attr(*, attr_type: ATTR) -> ATTR_VALIDATOR:
+	# [DOC] Compile Attr Type into validator callable, once, and store it on Attr Type. Validators of Attr Types having no TYPE, COUNTER or DYNAMIC_VAL Attr Types are sync
+	if attr_type._validator:
+		return attr_type._validator
+
+	if attr_type._type == 'COUNTER':
+		attr_type._validator_async = True
+		attr_type._validator_ordered = _compile_ordered(attr_type=attr_type)
+		attr_type._validator = _compile_counter_validator(attr_type=attr_type)
+		return attr_type._validator
+
+	check, check_async = _COMPILE_CHECK[attr_type._type](attr_type=attr_type)
+	attr_type._validator_async = check_async
+	attr_type._validator_ordered = _compile_ordered(attr_type=attr_type)
+	if check_async:
+		attr_type._validator = _compile_async_validator(attr_type=attr_type, check=check)
+	else:
+		attr_type._validator = _compile_sync_validator(attr_type=attr_type, check=check)
+	return attr_type._validator
+
+
+def _compile_ordered(*, attr_type: ATTR) -> bool:
+	# [DOC] Check whether Attr Type reads other doc values, requiring it to be validated in order of attrs when validating doc concurrently
+	if attr_type._type == 'TYPE':
+		return bool(attr_type._args.get('ordered'))
+	elif attr_type._type == 'DYNAMIC_VAL':
+		return '$__doc.' in attr_type._args['dynamic_attr']
+	elif attr_type._type == 'COUNTER':
+		return bool(attr_type._args['values'])
+	elif attr_type._type == 'LIST':
+		child_attrs_types = attr_type._args['list']
+	elif attr_type._type == 'UNION':
+		child_attrs_types = attr_type._args['union']
+	elif attr_type._type == 'TYPED_DICT':
+		child_attrs_types = list(attr_type._args['dict'].values())
+	elif attr_type._type == 'KV_DICT':
+		child_attrs_types = [attr_type._args['key'], attr_type._args['val']]
+	else:
+		return False
+	return any(child_attr_type._validator_ordered for child_attr_type in child_attrs_types)
+
+
+def _sync_validator(*, attr_type: ATTR, mode: str) -> Optional[ATTR_VALIDATOR]:
+	# [DOC] Return compiled validator if it can be called without awaiting, otherwise None
+	validator = compile_attr(attr_type=attr_type)
+	if attr_type._validator_async:
+		return None
+	if mode == 'create' and type(attr_type._default) == ATTR:
+		return None
+	return validator
+
+
+def _compile_sync_validator(*, attr_type: ATTR, check: ATTR_CHECK) -> ATTR_VALIDATOR:
+	def validator(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if attr_val is None:
+			if ctx['mode'] == 'update':
+				return None
+			attr_default = attr_type._default
+			if attr_default != NAWAH_VALUES.NONE_VALUE:
+				return copy.deepcopy(attr_default)
+
+		attr_oper = None
+		if ctx['mode'] == 'update' and type(attr_val) == dict:
+			attr_oper, attr_oper_args, attr_val = _extract_attr_oper(
+				attr_name=ctx['attr_name'], attr_type=attr_type, attr_val=attr_val
+			)
+			if attr_oper in ['$del_val', '$del_index']:
+				return return_valid_attr(
+					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
+				)
+
+		validate_exception = None
+		try:
+			if not attr_oper:
+				return check(attr_val, ctx)
+			return return_valid_attr(
+				attr_val=check(attr_val, ctx), attr_oper=attr_oper, attr_oper_args=attr_oper_args
+			)
+		except InvalidAttrException as e:
+			validate_exception = e
+		except Exception:
+			pass
+
+		return _validate_fallback(
 			attr_type=attr_type,
 			attr_val=attr_val,
-			skip_events=skip_events,
-			env=env,
-			query=query,
-			doc=doc,
-			scope=scope,
+			ctx=ctx,
+			validate_exception=validate_exception,
 		)
-		return copy.deepcopy(attr_val)
 
-	elif attr_type._type == 'COUNTER':
-		counter_groups = re.findall(
-			r'(\$__(?:values:[0-9]+|counters\.[a-z0-9_]+))', attr_type._args['pattern']
+	return validator
+
+
+def _compile_async_validator(*, attr_type: ATTR, check: ATTR_CHECK) -> ATTR_VALIDATOR:
+	async def validator(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if attr_val is None:
+			if ctx['mode'] == 'update':
+				return None
+			attr_default = attr_type._default
+			if attr_default != NAWAH_VALUES.NONE_VALUE:
+				return copy.deepcopy(attr_default)
+
+		attr_oper = None
+		if ctx['mode'] == 'update' and type(attr_val) == dict:
+			attr_oper, attr_oper_args, attr_val = _extract_attr_oper(
+				attr_name=ctx['attr_name'], attr_type=attr_type, attr_val=attr_val
+			)
+			if attr_oper in ['$del_val', '$del_index']:
+				return return_valid_attr(
+					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
+				)
+
+		validate_exception = None
+		try:
+			if not attr_oper:
+				return await check(attr_val, ctx)
+			return return_valid_attr(
+				attr_val=await check(attr_val, ctx),
+				attr_oper=attr_oper,
+				attr_oper_args=attr_oper_args,
+			)
+		except InvalidAttrException as e:
+			validate_exception = e
+		except Exception:
+			pass
+
+		return _validate_fallback(
+			attr_type=attr_type,
+			attr_val=attr_val,
+			ctx=ctx,
+			validate_exception=validate_exception,
 		)
-		counter_val = attr_type._args['pattern']
-		for group in counter_groups:
-			for group in counter_groups:
-				if group.startswith('$__values:'):
-					value_callable = attr_type._args['values'][int(group.replace('$__values:', ''))]
-					counter_val = counter_val.replace(
-						group, str(value_callable(skip_events=skip_events, env=env, query=query, doc=doc))
-					)
-				elif group.startswith('$__counters.'):
-					env = cast(NAWAH_ENV, env)
-					counter_name = group.replace('$__counters.', '')
-					setting_read_results = await Config.modules['setting'].read(
-						skip_events=[Event.PERM],
-						env=env,
-						query=[
-							{
-								'var': '__counter:' + counter_name,
-								'type': 'global',
-							}
-						],
-					)
-					setting = setting_read_results.args.docs[0]
-					setting_update_results = asyncio.create_task(
-						Config.modules['setting'].update(
-							skip_events=[Event.PERM],
-							env=env,
-							query=[{'_id': setting._id, 'type': 'global'}],
-							doc={'val': {'$add': 1}},
-						)
+
+	return validator
+
+
+def _compile_counter_validator(*, attr_type: ATTR) -> ATTR_VALIDATOR:
+	async def validator(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		try:
+			return await _generate_counter(attr_type=attr_type, ctx=ctx)
+		except Exception:
+			pass
+
+		return _validate_fallback(
+			attr_type=attr_type, attr_val=attr_val, ctx=ctx, validate_exception=None
+		)
+
+	return validator
+
+
+def _validate_fallback(
+	*,
+	attr_type: ATTR,
+	attr_val: Any,
+	ctx: VALIDATE_CTX,
+	validate_exception: Optional[InvalidAttrException],
+) -> Any:
+	if ctx['mode'] == 'update':
+		return None
+	elif (
+		ctx['mode'] in ['create', 'create_draft']
+		and attr_type._default != NAWAH_VALUES.NONE_VALUE
+	):
+		return attr_type._default
+	elif validate_exception:
+		# [DOC] Raise InvalidAttrException raised during validation
+		raise validate_exception
+	raise InvalidAttrException(
+		attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
+	)
+
+
+def _extract_attr_oper(
+	*, attr_name: str, attr_type: ATTR, attr_val: Dict[str, Any]
+) -> Tuple[
+	Literal[None, '$add', '$multiply', '$append', '$set_index', '$del_val', '$del_index'],
+	Dict[str, Any],
+	Any,
+]:
+	attr_oper_args: Dict[str, Any] = {}
+	if '$add' in attr_val.keys():
+		if '$field' in attr_val.keys() and attr_val['$field']:
+			attr_oper_args['$field'] = attr_val['$field']
+		else:
+			attr_oper_args['$field'] = None
+		return ('$add', attr_oper_args, attr_val['$add'])
+	elif '$multiply' in attr_val.keys():
+		if '$field' in attr_val.keys() and attr_val['$field']:
+			attr_oper_args['$field'] = attr_val['$field']
+		else:
+			attr_oper_args['$field'] = None
+		return ('$multiply', attr_oper_args, attr_val['$multiply'])
+	elif '$append' in attr_val.keys():
+		if '$unique' in attr_val.keys() and attr_val['$unique'] == True:
+			attr_oper_args['$unique'] = True
+		else:
+			attr_oper_args['$unique'] = False
+		return ('$append', attr_oper_args, [attr_val['$append']])
+	elif '$set_index' in attr_val.keys():
+		attr_oper_args['$index'] = attr_val['$index']
+		return ('$set_index', attr_oper_args, [attr_val['$set_index']])
+	elif '$del_val' in attr_val.keys():
+		if attr_type._type != 'LIST' or type(attr_val['$del_val']) != list:
+			raise InvalidAttrException(
+				attr_name=attr_name, attr_type=attr_type, val_type=type(attr_val['$del_val'])
+			)
+		return ('$del_val', attr_oper_args, attr_val['$del_val'])
+	elif '$del_index' in attr_val.keys():
+		attr_oper_args['$index'] = attr_val['$del_index']
+		if (attr_type._type == 'LIST' and type(attr_val['$del_index']) == int) or (
+			attr_type._type == 'KV_DICT' and type(attr_val['$del_index']) == str
+		):
+			return ('$del_index', attr_oper_args, attr_val['$del_index'])
+		raise InvalidAttrException(
+			attr_name=attr_name, attr_type=attr_type, val_type=type(attr_val['$del_index'])
+		)
+	return (None, attr_oper_args, attr_val)
+
+
+# [DOC] Ranges of counters values leased by worker, for COUNTER Attr Types with block, as [next val, last val]
+_counters_blocks: Dict[str, List[int]] = {}
+# [DOC] In-flight leasing of new ranges of counters values, shared by calls waiting for them
+_counters_leases: Dict[str, 'asyncio.Future[None]'] = {}
+
+
+async def _generate_counter(*, attr_type: ATTR, ctx: VALIDATE_CTX) -> str:
+	counter_groups = re.findall(
+		r'(\$__(?:values:[0-9]+|counters\.[a-z0-9_]+))', attr_type._args['pattern']
+	)
+	counter_val = attr_type._args['pattern']
+	for group in counter_groups:
+		if group.startswith('$__values:'):
+			value_callable = attr_type._args['values'][int(group.replace('$__values:', ''))]
+			counter_val = counter_val.replace(
+				group,
+				str(
+					value_callable(
+						skip_events=ctx['skip_events'],
+						env=ctx['env'],
+						query=ctx['query'],
+						doc=ctx['doc'],
 					)
-					# [DOC] Condition "not task.cancelled()" is added to avoid exceptions with the task getting cancelled during its run as such it might be running in test mode, or at time of shutting down Nawah
-					setting_update_results.add_done_callback(
-						setting_update_callback_wrapper(counter_name)
+				),
+			)
+		elif group.startswith('$__counters.'):
+			counter_val = counter_val.replace(
+				group,
+				str(
+					await _next_counter_val(
+						counter_name=group.replace('$__counters.', ''),
+						env=cast(NAWAH_ENV, ctx['env']),
+						block=attr_type._args.get('block'),
 					)
-					counter_val = counter_val.replace(group, str(setting.val + 1))
-		return counter_val
+				),
+			)
+	return counter_val
+
+
+async def _next_counter_val(*, counter_name: str, env: NAWAH_ENV, block: Optional[int]) -> int:
+	if not block:
+		return await _increment_counter(counter_name=counter_name, env=env, val=1)
+
+	# [DOC] Serve values from leased range of counter, leasing new range of block values once it is used up. Values of leased range not used by worker are skipped
+	while True:
+		counter_block = _counters_blocks.get(counter_name)
+		if counter_block and counter_block[0] <= counter_block[1]:
+			counter_val = counter_block[0]
+			counter_block[0] += 1
+			return counter_val
 
-	elif attr_val == None:
-		if mode == 'update':
+		if counter_name not in _counters_leases.keys():
+			_counters_leases[counter_name] = asyncio.ensure_future(
+				_lease_counter_block(counter_name=counter_name, env=env, block=block)
+			)
+		# [DOC] Shield lease, so cancelling call that started it, or any other call waiting for it, doesn't cancel lease for the rest
+		await asyncio.shield(_counters_leases[counter_name])
+
+
+async def _lease_counter_block(*, counter_name: str, env: NAWAH_ENV, block: int) -> None:
+	try:
+		counter_last_val = await _increment_counter(counter_name=counter_name, env=env, val=block)
+		_counters_blocks[counter_name] = [counter_last_val - block + 1, counter_last_val]
+	finally:
+		del _counters_leases[counter_name]
+
+
+async def _increment_counter(*, counter_name: str, env: NAWAH_ENV, val: int) -> int:
+	from nawah import data as Data
+
+	# [DOC] Increment counter Setting doc directly, in single atomic call, rather than reading, and updating it using Setting module
+	return await Data.increment(
+		env=env,
+		collection_name=Config.modules['setting'].collection,
+		query={'var': f'__counter:{counter_name}', 'type': 'global'},
+		attr='val',
+		val=val,
+		doc={
+			'user': ObjectId('f00000000000000000000010'),
+			'val_type': {'type': 'INT', 'args': {}, 'allow_none': False, 'default': None},
+		},
+	)
+
+
+def _compile_check_ANY(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if attr_val != None:
 			return attr_val
-		elif attr_type._default != NAWAH_VALUES.NONE_VALUE:
-			return copy.deepcopy(attr_type._default)
+		raise _InvalidAttrVal()
 
-	raise Exception('No default set to validate.')
+	return (check, False)
 
 
-def setting_update_callback_wrapper(counter_name):
-	def setting_update_callback(task):
-		if not task.cancelled() and task.result().status != 200:
-			logger.error(f'Failed to update Setting doc for counter \'{counter_name}\'')
+def _compile_check_ACCESS(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if (
+			type(attr_val) == dict
+			and set(attr_val.keys()) == {'anon', 'users', 'groups'}
+			and type(attr_val['anon']) == bool
+			and type(attr_val['users']) == list
+			and type(attr_val['groups']) == list
+		):
+			return attr_val
+		raise _InvalidAttrVal()
 
-	return setting_update_callback
+	return (check, False)
 
 
-async def validate_attr(
+def _compile_check_BOOL(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == bool:
+			return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_ranged_str(
 	*,
-	mode: Literal['create', 'create_draft', 'update', 'deep'],
-	attr_name: str,
 	attr_type: ATTR,
-	attr_val: Any,
-	skip_events: NAWAH_EVENTS = None,
-	env: NAWAH_ENV = None,
-	query: Union[NAWAH_QUERY, Query] = None,
-	doc: NAWAH_DOC = None,
-	scope: NAWAH_DOC = None,
-):
-	# [TODO] Test setting attr_name to reflect a path for nested attrs
-	try:
-		skip_events = cast(NAWAH_EVENTS, skip_events)
-		env = cast(NAWAH_ENV, env)
-		query = cast(Union[NAWAH_QUERY, Query], query)
-		doc = cast(NAWAH_DOC, doc)
-		return await _validate_default(
-			mode=mode,
-			attr_name=attr_name,
-			attr_type=attr_type,
+	pattern: 're.Pattern',
+	units: Dict[str, str],
+	range_format: Callable[[str], str],
+) -> Tuple[ATTR_CHECK, bool]:
+	# [DOC] Shared check for Attr Types DATE, DATETIME, TIME
+	attr_ranges = attr_type._args['ranges']
+
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str and pattern.match(attr_val):
+			if not attr_ranges:
+				return attr_val
+			for attr_range in attr_ranges:
+				attr_range = _resolve_range(
+					attr_range=attr_range, units=units, range_format=range_format
+				)
+				if attr_val >= attr_range[0] and attr_val < attr_range[1]:
+					return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_DATE(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	return _compile_check_ranged_str(
+		attr_type=attr_type,
+		pattern=_DATE_RE,
+		units=_DATE_RANGE_UNITS,
+		range_format=lambda range_val: range_val.split('T')[0],
+	)
+
+
+def _compile_check_DATETIME(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	return _compile_check_ranged_str(
+		attr_type=attr_type,
+		pattern=_DATETIME_RE,
+		units=_DATETIME_RANGE_UNITS,
+		range_format=lambda range_val: range_val,
+	)
+
+
+def _compile_check_TIME(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	return _compile_check_ranged_str(
+		attr_type=attr_type,
+		pattern=_TIME_RE,
+		units=_TIME_RANGE_UNITS,
+		range_format=lambda range_val: range_val.split('T')[1],
+	)
+
+
+def _compile_check_DYNAMIC_ATTR(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	attr_types = attr_type._args['types']
+
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == dict:
+			try:
+				if (not attr_types) or (attr_types and attr_val['type'] in attr_types):
+					# [DOC] generate_dynamic_attr updates dynamic_attr in-place, deepcopy it first
+					_, attr_val = generate_dynamic_attr(dynamic_attr=copy.deepcopy(attr_val))
+					return attr_val
+			except Exception as e:
+				logger.debug(
+					'Exception occurred while validating type \'DYNAMIC_ATTR\'. Exception details:'
+				)
+				logger.debug(e)
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_DYNAMIC_VAL(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	async def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		# [DOC] Populate setting_query
+		setting_query = {}
+		if attr_type._args['dynamic_attr'].startswith('$__settings.global/'):
+			setting_query['type'] = 'global'
+			setting_query['var'] = attr_type._args['dynamic_attr'].split('/')[1]
+		elif attr_type._args['dynamic_attr'].startswith('$__settings.user/'):
+			setting_query['type'] = 'user'
+			_, setting_query['user'], setting_query['var'] = attr_type._args[
+				'dynamic_attr'
+			].split('/')
+		# [DOC] Check if variables are present in setting_query['var']
+		for setting_query_var in re.findall(
+			r'(\$__doc\.([a-zA-Z0-9_]+))', setting_query['var']
+		):
+			doc = cast(Dict[str, Any], ctx['doc'])
+			setting_query['var'] = setting_query['var'].replace(
+				setting_query_var[0], str(_extract_attr(scope=doc, attr_path=setting_query_var[1]))
+			)
+		# [DOC] Read dynamic ATTR generated from setting val, using settings cache of Setting module
+		dynamic_attr = await Config.modules['setting']._read_dynamic_attr(
+			env=cast(NAWAH_ENV, ctx['env']),
+			setting_type=setting_query['type'],
+			user=setting_query.get('user'),
+			var=setting_query['var'],
+		)
+		if not dynamic_attr:
+			raise _InvalidAttrVal()
+		return await validate_attr(
+			mode='create',
+			attr_name=ctx['attr_name'],
+			attr_type=dynamic_attr,
 			attr_val=attr_val,
-			skip_events=skip_events,
-			env=env,
-			query=query,
-			doc=doc,
-			scope=scope if scope else doc,
 		)
-	except:
-		pass
 
-	attr_oper: Literal[
-		None, '$add', '$multiply', '$append', '$set_index', '$del_val', '$del_index'
-	] = None
-	attr_oper_args = {}
-	if mode == 'update' and type(attr_val) == dict:
-		if '$add' in attr_val.keys():
-			attr_oper = '$add'
-			if '$field' in attr_val.keys() and attr_val['$field']:
-				attr_oper_args['$field'] = attr_val['$field']
-			else:
-				attr_oper_args['$field'] = None
-			attr_val = attr_val['$add']
-		elif '$multiply' in attr_val.keys():
-			attr_oper = '$multiply'
-			if '$field' in attr_val.keys() and attr_val['$field']:
-				attr_oper_args['$field'] = attr_val['$field']
-			else:
-				attr_oper_args['$field'] = None
-			attr_val = attr_val['$multiply']
-		elif '$append' in attr_val.keys():
-			attr_oper = '$append'
-			if '$unique' in attr_val.keys() and attr_val['$unique'] == True:
-				attr_oper_args['$unique'] = True
-			else:
-				attr_oper_args['$unique'] = False
-			attr_val = [attr_val['$append']]
-		elif '$set_index' in attr_val.keys():
-			attr_oper = '$set_index'
-			attr_oper_args['$index'] = attr_val['$index']
-			attr_val = [attr_val['$set_index']]
-		elif '$del_val' in attr_val.keys():
-			attr_oper = '$del_val'
-			attr_val = attr_val['$del_val']
-			if attr_type._type != 'LIST' or type(attr_val) != list:
-				raise InvalidAttrException(
-					attr_name=attr_name, attr_type=attr_type, val_type=type(attr_val)
+	return (check, True)
+
+
+def _compile_check_KV_DICT(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	attr_min = attr_type._args['min']
+	attr_max = attr_type._args['max']
+	attr_req = attr_type._args['req']
+	key_validator = compile_attr(attr_type=attr_type._args['key'])
+	key_async = attr_type._args['key']._validator_async
+	val_validator = compile_attr(attr_type=attr_type._args['val'])
+	val_async = attr_type._args['val']._validator_async
+
+	def check_dict(attr_val: Any, ctx: VALIDATE_CTX):
+		if type(attr_val) != dict:
+			raise _InvalidAttrVal()
+		if (attr_min and len(attr_val.keys()) < attr_min) or (
+			attr_max and len(attr_val.keys()) > attr_max
+		):
+			raise InvalidAttrException(
+				attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
+			)
+		if attr_req:
+			for req_key in attr_req:
+				if req_key not in attr_val.keys():
+					raise InvalidAttrException(
+						attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
+					)
+
+	if not key_async and not val_async:
+
+		def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+			check_dict(attr_val, ctx)
+			shadow_attr_val = {}
+			for child_attr_val in attr_val.keys():
+				child_ctx = _child_ctx(
+					ctx=ctx, attr_name=f'{ctx["attr_name"]}.{child_attr_val}', scope=attr_val
 				)
-			return return_valid_attr(
-				attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
+				child_val = val_validator(attr_val[child_attr_val], child_ctx)
+				shadow_attr_val[key_validator(child_attr_val, child_ctx)] = child_val
+			return shadow_attr_val
+
+		return (check, False)
+
+	async def async_check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		check_dict(attr_val, ctx)
+		shadow_attr_val = {}
+		for child_attr_val in attr_val.keys():
+			child_ctx = _child_ctx(
+				ctx=ctx, attr_name=f'{ctx["attr_name"]}.{child_attr_val}', scope=attr_val
 			)
-		elif '$del_index' in attr_val.keys():
-			attr_oper = '$del_index'
-			attr_oper_args['$index'] = attr_val['$del_index']
-			attr_val = attr_val['$del_index']
-			if (attr_type._type == 'LIST' and type(attr_val) == int) or (
-				attr_type._type == 'KV_DICT' and type(attr_val) == str
-			):
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
+			child_val = val_validator(attr_val[child_attr_val], child_ctx)
+			if val_async:
+				child_val = await child_val
+			child_key = key_validator(child_attr_val, child_ctx)
+			if key_async:
+				child_key = await child_key
+			shadow_attr_val[child_key] = child_val
+		return shadow_attr_val
+
+	return (async_check, True)
+
+
+def _compile_check_TYPED_DICT(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	dict_validators: Dict[str, Tuple[ATTR_VALIDATOR, bool]] = {}
+	for child_attr in attr_type._args['dict'].keys():
+		dict_validators[child_attr] = (
+			compile_attr(attr_type=attr_type._args['dict'][child_attr]),
+			attr_type._args['dict'][child_attr]._validator_async,
+		)
+	dict_keys = set(dict_validators.keys())
+	check_async = any(child_async for _, child_async in dict_validators.values())
+
+	def check_keys(attr_val: Dict[str, Any], ctx: VALIDATE_CTX):
+		# [DOC] Match keys _after_ checking child attrs in order to allow defaults to be set for all child attrs
+		if set(attr_val.keys()) != dict_keys:
+			raise InvalidAttrException(
+				attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
+			)
+
+	if not check_async:
+
+		def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+			if type(attr_val) != dict:
+				raise _InvalidAttrVal()
+			# [DOC] Shallow copy attr_val to set validated child attrs without updating original object
+			attr_val = dict(attr_val)
+			for child_attr, (child_validator, _) in dict_validators.items():
+				attr_val[child_attr] = child_validator(
+					attr_val.get(child_attr),
+					_child_ctx(ctx=ctx, attr_name=f'{ctx["attr_name"]}.{child_attr}', scope=attr_val),
 				)
+			check_keys(attr_val, ctx)
+			return attr_val
+
+		return (check, False)
+
+	async def async_check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) != dict:
+			raise _InvalidAttrVal()
+		attr_val = dict(attr_val)
+		for child_attr, (child_validator, child_async) in dict_validators.items():
+			child_val = child_validator(
+				attr_val.get(child_attr),
+				_child_ctx(ctx=ctx, attr_name=f'{ctx["attr_name"]}.{child_attr}', scope=attr_val),
+			)
+			if child_async:
+				child_val = await child_val
+			attr_val[child_attr] = child_val
+		check_keys(attr_val, ctx)
+		return attr_val
+
+	return (async_check, True)
+
+
+def _compile_check_EMAIL(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	allowed_domains = attr_type._args['allowed_domains']
+	disallowed_domains = attr_type._args['disallowed_domains']
+	if attr_type._args['strict']:
+		if allowed_domains:
+			allowed_domains = [f'@{domain}' for domain in allowed_domains]
+		if disallowed_domains:
+			disallowed_domains = [f'@{domain}' for domain in disallowed_domains]
+
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str and _EMAIL_RE.match(attr_val):
+			if allowed_domains:
+				if attr_val.endswith(tuple(allowed_domains)):
+					return attr_val
+			elif disallowed_domains:
+				if not attr_val.endswith(tuple(disallowed_domains)):
+					return attr_val
 			else:
+				return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_FILE(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	file_types = attr_type._args['types']
+
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == list and len(attr_val):
+			try:
+				attr_val = attr_type._validator(
+					attr_val[0], _child_ctx(ctx=ctx, attr_name=ctx['attr_name'], scope=attr_val)
+				)
+			except Exception as e:
+				logger.debug('Exception occurred while validating type \'FILE\'. Exception details:')
+				logger.debug(e)
 				raise InvalidAttrException(
-					attr_name=attr_name, attr_type=attr_type, val_type=type(attr_val)
+					attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
 				)
+		if not (
+			type(attr_val) == dict
+			and set(attr_val.keys()) == {'name', 'lastModified', 'type', 'size', 'content'}
+			and type(attr_val['name']) == str
+			and type(attr_val['type']) == str
+			and type(attr_val['lastModified']) == int
+			and type(attr_val['size']) == int
+			and type(attr_val['content']) in [binary.Binary, bytes]
+		):
+			raise InvalidAttrException(
+				attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
+			)
+		if not file_types:
+			return attr_val
+		for file_type in file_types:
+			if attr_val['type'].split('/')[0] == file_type.split('/')[0]:
+				if (
+					file_type.split('/')[1] == '*'
+					or attr_val['type'].split('/')[1] == file_type.split('/')[1]
+				):
+					return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_FLOAT(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	attr_ranges = attr_type._args['ranges']
+
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str and _FLOAT_RE.match(attr_val):
+			attr_val = float(attr_val)
+		elif type(attr_val) == int:
+			attr_val = float(attr_val)
+
+		if type(attr_val) == float:
+			if not attr_ranges:
+				return attr_val
+			for attr_range in attr_ranges:
+				if attr_val >= attr_range[0] and attr_val < attr_range[1]:
+					return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_GEO(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if (
+			type(attr_val) == dict
+			and set(attr_val.keys()) == {'type', 'coordinates'}
+			and attr_val['type'] in ['Point']
+			and type(attr_val['coordinates']) == list
+			and len(attr_val['coordinates']) == 2
+			and type(attr_val['coordinates'][0]) in [int, float]
+			and type(attr_val['coordinates'][1]) in [int, float]
+		):
+			return attr_val
+		raise _InvalidAttrVal()
 
-	# [DOC] Deepcopy attr_val to eliminate changes in in original object
-	attr_val = copy.deepcopy(attr_val)
+	return (check, False)
 
-	try:
-		if attr_type._type == 'ANY':
-			if attr_val != None:
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
 
-		elif attr_type._type == 'ACCESS':
-			if (
-				type(attr_val) == dict
-				and set(attr_val.keys()) == {'anon', 'users', 'groups'}
-				and type(attr_val['anon']) == bool
-				and type(attr_val['users']) == list
-				and type(attr_val['groups']) == list
-			):
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
+def _compile_check_ID(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == BaseModel or type(attr_val) == DictObj:
+			return attr_val._id
+		elif type(attr_val) == ObjectId:
+			return attr_val
+		elif type(attr_val) == str:
+			try:
+				return ObjectId(attr_val)
+			except Exception as e:
+				logger.debug('Exception occurred while validating type \'ID\'. Exception details:')
+				logger.debug(e)
+				raise ConvertAttrException(
+					attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
 				)
+		raise _InvalidAttrVal()
 
-		elif attr_type._type == 'BOOL':
-			if type(attr_val) == bool:
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+	return (check, False)
 
-		elif attr_type._type == 'DATE':
-			if re.match(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$', attr_val):
-				if attr_type._args['ranges']:
-					for date_range in attr_type._args['ranges']:
-						date_range = copy.deepcopy(date_range)
-						for i in [0, 1]:
-							if date_range[i][0] in ['+', '-']:
-								date_range_delta = {}
-								if date_range[i][-1] == 'd':
-									date_range_delta = {'days': int(date_range[i][:-1])}
-								elif date_range[i][-1] == 'w':
-									date_range_delta = {'weeks': int(date_range[i][:-1])}
-								date_range[i] = (
-									(datetime.datetime.utcnow() + datetime.timedelta(**date_range_delta))
-									.isoformat()
-									.split('T')[0]
-								)
-						if attr_val >= date_range[0] and attr_val < date_range[1]:
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
 
-		elif attr_type._type == 'DATETIME':
-			if re.match(
-				r'^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]{6})?)?$',
-				attr_val,
-			):
-				if attr_type._args['ranges']:
-					for datetime_range in attr_type._args['ranges']:
-						datetime_range = copy.deepcopy(datetime_range)
-						for i in [0, 1]:
-							if datetime_range[i][0] in ['+', '-']:
-								datetime_range_delta = {}
-								if datetime_range[i][-1] == 'd':
-									datetime_range_delta = {'days': int(datetime_range[i][:-1])}
-								elif datetime_range[i][-1] == 's':
-									datetime_range_delta = {'seconds': int(datetime_range[i][:-1])}
-								elif datetime_range[i][-1] == 'm':
-									datetime_range_delta = {'minutes': int(datetime_range[i][:-1])}
-								elif datetime_range[i][-1] == 'h':
-									datetime_range_delta = {'hours': int(datetime_range[i][:-1])}
-								elif datetime_range[i][-1] == 'w':
-									datetime_range_delta = {'weeks': int(datetime_range[i][:-1])}
-								datetime_range[i] = (
-									datetime.datetime.utcnow() + datetime.timedelta(**datetime_range_delta)
-								).isoformat()
-						if attr_val >= datetime_range[0] and attr_val < datetime_range[1]:
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
+def _compile_check_INT(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	attr_ranges = attr_type._args['ranges']
 
-		elif attr_type._type == 'DYNAMIC_ATTR':
-			if type(attr_val) == dict:
-				try:
-					if (not attr_type._args['types']) or (
-						attr_type._args['types'] and attr_val['type'] in attr_type._args['types']
-					):
-						_, attr_val = generate_dynamic_attr(dynamic_attr=attr_val)
-						return return_valid_attr(
-							attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-						)
-				except Exception as e:
-					logger.debug(
-						'Exception occurred while validating type \'DYNAMIC_ATTR\'. Exception details:'
-					)
-					logger.debug(e)
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str and _INT_RE.match(attr_val):
+			attr_val = int(attr_val)
 
-		elif attr_type._type == 'DYNAMIC_VAL':
-			# [DOC] Populate setting_query
-			setting_query = {}
-			if attr_type._args['dynamic_attr'].startswith('$__settings.global/'):
-				setting_query['type'] = 'global'
-				setting_query['var'] = attr_type._args['dynamic_attr'].split('/')[1]
-			elif attr_type._args['dynamic_attr'].startswith('$__settings.user/'):
-				setting_query['type'] = 'user'
-				_, setting_query['user'], setting_query['var'] = attr_type._args[
-					'dynamic_attr'
-				].split('/')
-			# [DOC] Check if variables are present in setting_query['var']
-			for setting_query_var in re.findall(
-				r'(\$__doc\.([a-zA-Z0-9_]+))', setting_query['var']
-			):
-				doc = cast(Dict[str, Any], doc)
-				setting_query['var'] = setting_query['var'].replace(
-					setting_query_var[0], str(_extract_attr(scope=doc, attr_path=setting_query_var[1]))
-				)
-			# [DOC] Read setting val
-			env = cast(NAWAH_ENV, env)
-			setting_results = await Config.modules['setting'].read(
-				skip_events=[Event.PERM], env=env, query=[setting_query]
-			)
-			setting = setting_results.args.docs[0]
-			dynamic_attr = generate_dynamic_attr(dynamic_attr=setting.val)[0]
-			attr_val = await validate_attr(
-				mode='create', attr_name=attr_name, attr_type=dynamic_attr, attr_val=attr_val
-			)
-			return return_valid_attr(
-				attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
+		if type(attr_val) == int:
+			if not attr_ranges:
+				return attr_val
+			for attr_range in attr_ranges:
+				if attr_val in range(*attr_range):
+					return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_IP(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str and _IP_RE.match(attr_val):
+			return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_LIST(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	attr_min = attr_type._args['min']
+	attr_max = attr_type._args['max']
+	list_validators: List[Tuple[ATTR_VALIDATOR, bool]] = [
+		(compile_attr(attr_type=child_attr_type), child_attr_type._validator_async)
+		for child_attr_type in attr_type._args['list']
+	]
+	check_async = any(child_async for _, child_async in list_validators)
+
+	def check_list(attr_val: Any, ctx: VALIDATE_CTX):
+		if type(attr_val) != list:
+			raise _InvalidAttrVal()
+		if (attr_min and len(attr_val) < attr_min) or (attr_max and len(attr_val) > attr_max):
+			raise InvalidAttrException(
+				attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
 			)
 
-		elif attr_type._type == 'KV_DICT':
-			if type(attr_val) == dict:
-				if attr_type._args['min']:
-					if len(attr_val.keys()) < attr_type._args['min']:
-						raise InvalidAttrException(
-							attr_name=attr_name,
-							attr_type=attr_type,
-							val_type=type(attr_val),
-						)
-				if attr_type._args['max']:
-					if len(attr_val.keys()) > attr_type._args['max']:
-						raise InvalidAttrException(
-							attr_name=attr_name,
-							attr_type=attr_type,
-							val_type=type(attr_val),
-						)
-				if attr_type._args['req']:
-					for req_key in attr_type._args['req']:
-						if req_key not in attr_val.keys():
-							raise InvalidAttrException(
-								attr_name=attr_name,
-								attr_type=attr_type,
-								val_type=type(attr_val),
-							)
-				shadow_attr_val = {}
-				for child_attr_val in attr_val.keys():
-					shadow_attr_val[
-						await validate_attr(
-							mode='deep',
-							attr_name=f'{attr_name}.{child_attr_val}',
-							attr_type=attr_type._args['key'],
-							attr_val=child_attr_val,
-							skip_events=skip_events,
-							env=env,
-							query=query,
-							doc=doc,
-							scope=attr_val,
-						)
-					] = await validate_attr(
-						mode='deep',
-						attr_name=f'{attr_name}.{child_attr_val}',
-						attr_type=attr_type._args['val'],
-						attr_val=attr_val[child_attr_val],
-						skip_events=skip_events,
-						env=env,
-						query=query,
-						doc=doc,
-						scope=attr_val,
-					)
-				return return_valid_attr(
-					attr_val=shadow_attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+	if not check_async:
 
-		elif attr_type._type == 'TYPED_DICT':
-			if type(attr_val) == dict:
-				for child_attr_type in attr_type._args['dict'].keys():
-					if child_attr_type not in attr_val.keys():
-						attr_val[child_attr_type] = None
+		def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+			check_list(attr_val, ctx)
+			# [DOC] Shallow copy attr_val to set validated items without updating original object
+			attr_val = list(attr_val)
+			child_ctx = _child_ctx(ctx=ctx, attr_name=ctx['attr_name'], scope=attr_val)
+			for i in range(len(attr_val)):
+				child_attr_val = attr_val[i]
+				for child_validator, _ in list_validators:
 					try:
-						attr_val[child_attr_type] = await validate_attr(
-							mode='deep',
-							attr_name=f'{attr_name}.{child_attr_type}',
-							attr_type=attr_type._args['dict'][child_attr_type],
-							attr_val=attr_val[child_attr_type],
-							skip_events=skip_events,
-							env=env,
-							query=query,
-							doc=doc,
-							scope=attr_val,
-						)
+						attr_val[i] = child_validator(child_attr_val, child_ctx)
+						break
 					except Exception as e:
 						logger.debug(
-							'Exception occurred while validating type \'TYPED_DICT\'. Exception details:'
+							'Exception occurred while validating type \'LIST\'. Exception details:'
 						)
 						logger.debug(e)
-						raise e
-
-				# [DOC] Match keys _after_ checking child attrs in order to allow _validate_default to run on all child attrs
-				if set(attr_val.keys()) != set(attr_type._args['dict'].keys()):
+				else:
 					raise InvalidAttrException(
-						attr_name=attr_name,
-						attr_type=attr_type,
-						val_type=type(attr_val),
+						attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
 					)
+			return attr_val
 
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+		return (check, False)
 
-		elif attr_type._type == 'EMAIL':
-			if type(attr_val) == str and re.match(r'^[^@]+@[^@]+\.[^@]+$', attr_val):
-				if attr_type._args['allowed_domains']:
-					for domain in attr_type._args['allowed_domains']:
-						if attr_type._args['strict']:
-							domain = f'@{domain}'
-						if attr_val.endswith(domain):
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-				elif attr_type._args['disallowed_domains']:
-					for domain in attr_type._args['disallowed_domains']:
-						if attr_type._args['strict']:
-							domain = f'@{domain}'
-						if attr_val.endswith(domain):
-							break
-					else:
-						return return_valid_attr(
-							attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-						)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
-
-		elif attr_type._type == 'FILE':
-			if type(attr_val) == list and len(attr_val):
+	async def async_check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		check_list(attr_val, ctx)
+		attr_val = list(attr_val)
+		child_ctx = _child_ctx(ctx=ctx, attr_name=ctx['attr_name'], scope=attr_val)
+		for i in range(len(attr_val)):
+			child_attr_val = attr_val[i]
+			for child_validator, child_async in list_validators:
 				try:
-					attr_val = await validate_attr(
-						mode='deep',
-						attr_name=attr_name,
-						attr_type=attr_type,
-						attr_val=attr_val[0],
-						skip_events=skip_events,
-						env=env,
-						query=query,
-						doc=doc,
-						scope=attr_val,
-					)
+					child_val = child_validator(child_attr_val, child_ctx)
+					if child_async:
+						child_val = await child_val
+					attr_val[i] = child_val
+					break
 				except Exception as e:
 					logger.debug(
-						'Exception occurred while validating type \'FILE\'. Exception details:'
+						'Exception occurred while validating type \'LIST\'. Exception details:'
 					)
 					logger.debug(e)
-					raise InvalidAttrException(
-						attr_name=attr_name,
-						attr_type=attr_type,
-						val_type=type(attr_val),
-					)
-			file_type_check = (
-				type(attr_val) == dict
-				and set(attr_val.keys()) == {'name', 'lastModified', 'type', 'size', 'content'}
-				and type(attr_val['name']) == str
-				and type(attr_val['type']) == str
-				and type(attr_val['lastModified']) == int
-				and type(attr_val['size']) == int
-				and type(attr_val['content']) in [binary.Binary, bytes]
-			)
-			if not file_type_check:
-				raise InvalidAttrException(
-					attr_name=attr_name, attr_type=attr_type, val_type=type(attr_val)
-				)
-			if attr_type._args['types']:
-				for file_type in attr_type._args['types']:
-					if attr_val['type'].split('/')[0] == file_type.split('/')[0]:
-						if (
-							file_type.split('/')[1] == '*'
-							or attr_val['type'].split('/')[1] == file_type.split('/')[1]
-						):
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
 			else:
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
+				raise InvalidAttrException(
+					attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
 				)
+		return attr_val
 
-		elif attr_type._type == 'FLOAT':
-			if type(attr_val) == str and re.match(r'^[0-9]+(\.[0-9]+)?$', attr_val):
-				attr_val = float(attr_val)
-			elif type(attr_val) == int:
-				attr_val = float(attr_val)
-
-			if type(attr_val) == float:
-				if attr_type._args['ranges']:
-					for _range in attr_type._args['ranges']:
-						if attr_val >= _range[0] and attr_val < _range[1]:
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
+	return (async_check, True)
+
+
+def _compile_check_LOCALE(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	# [DOC] Attr Type LOCALE is validated as KV_DICT of LITERAL keys of Config.locales, and STR values, requiring Config.locale. Config values are read at time of validation
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) != dict or not attr_val or Config.locale not in attr_val.keys():
+			raise _InvalidAttrVal()
+		for locale in attr_val.keys():
+			if locale not in Config.locales or type(attr_val[locale]) != str:
+				raise _InvalidAttrVal()
+		if Config.locale_strategy == LOCALE_STRATEGY.NONE_VALUE:
+			return {
+				locale: attr_val[locale] if locale in attr_val.keys() else None
+				for locale in Config.locales
+			}
+		elif callable(Config.locale_strategy):
+			return {
+				locale: attr_val[locale]
+				if locale in attr_val.keys()
+				else Config.locale_strategy(attr_val=attr_val, locale=locale)
+				for locale in Config.locales
+			}
+		return {
+			locale: attr_val[locale] if locale in attr_val.keys() else attr_val[Config.locale]
+			for locale in Config.locales
+		}
+
+	return (check, False)
+
+
+def _compile_check_LOCALES(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if attr_val in Config.locales:
+			return attr_val
+		raise _InvalidAttrVal()
 
-		elif attr_type._type == 'GEO':
-			if (
-				type(attr_val) == dict
-				and set(attr_val.keys()) == {'type', 'coordinates'}
-				and attr_val['type'] in ['Point']
-				and type(attr_val['coordinates']) == list
-				and len(attr_val['coordinates']) == 2
-				and type(attr_val['coordinates'][0]) in [int, float]
-				and type(attr_val['coordinates'][1]) in [int, float]
-			):
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+	return (check, False)
 
-		elif attr_type._type == 'ID':
-			if type(attr_val) == BaseModel or type(attr_val) == DictObj:
-				return return_valid_attr(
-					attr_val=attr_val._id, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
-			elif type(attr_val) == ObjectId:
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
-			elif type(attr_val) == str:
-				try:
-					return return_valid_attr(
-						attr_val=ObjectId(attr_val), attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
-				except Exception as e:
-					logger.debug('Exception occurred while validating type \'ID\'. Exception details:')
-					logger.debug(e)
-					raise ConvertAttrException(
-						attr_name=attr_name,
-						attr_type=attr_type,
-						val_type=type(attr_val),
-					)
 
-		elif attr_type._type == 'INT':
-			if type(attr_val) == str and re.match(r'^[0-9]+$', attr_val):
-				attr_val = int(attr_val)
-
-			if type(attr_val) == int:
-				if attr_type._args['ranges']:
-					for _range in attr_type._args['ranges']:
-						if attr_val in range(*_range):
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
+def _compile_check_PHONE(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	if attr_type._args['codes']:
+		phone_patterns = [
+			_compile_pattern(fr'^\+{phone_code}[0-9]+$') for phone_code in attr_type._args['codes']
+		]
+	else:
+		phone_patterns = [_PHONE_RE]
 
-		elif attr_type._type == 'IP':
-			if re.match(
-				r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$',
-				attr_val,
-			):
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str:
+			for phone_pattern in phone_patterns:
+				if phone_pattern.match(attr_val):
+					return attr_val
+		raise _InvalidAttrVal()
 
-		elif attr_type._type == 'LIST':
-			if type(attr_val) == list:
-				if attr_type._args['min']:
-					if len(attr_val) < attr_type._args['min']:
-						raise InvalidAttrException(
-							attr_name=attr_name,
-							attr_type=attr_type,
-							val_type=type(attr_val),
-						)
-				if attr_type._args['max']:
-					if len(attr_val) > attr_type._args['max']:
-						raise InvalidAttrException(
-							attr_name=attr_name,
-							attr_type=attr_type,
-							val_type=type(attr_val),
-						)
-				for i in range(len(attr_val)):
-					child_attr_val = attr_val[i]
-					child_attr_check = False
-					for child_attr_type in attr_type._args['list']:
-						try:
-							attr_val[i] = await validate_attr(
-								mode='deep',
-								attr_name=attr_name,
-								attr_type=child_attr_type,
-								attr_val=child_attr_val,
-								skip_events=skip_events,
-								env=env,
-								query=query,
-								doc=doc,
-								scope=attr_val,
-							)
-							child_attr_check = True
-							break
-						except Exception as e:
-							logger.debug(
-								'Exception occurred while validating type \'LIST\'. Exception details:'
-							)
-							logger.debug(e)
-					if not child_attr_check:
-						raise InvalidAttrException(
-							attr_name=attr_name,
-							attr_type=attr_type,
-							val_type=type(attr_val),
-						)
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+	return (check, False)
 
-		elif attr_type._type == 'LOCALE':
-			attr_val = await validate_attr(
-				mode='deep',
-				attr_name=attr_name,
-				attr_type=ATTR.KV_DICT(
-					key=ATTR.LITERAL(literal=[locale for locale in Config.locales]),
-					val=ATTR.STR(),
-					min=1,
-					req=[Config.locale],
-				),
-				attr_val=attr_val,
-				skip_events=skip_events,
-				env=env,
-				query=query,
-				doc=doc,
-				scope=attr_val,
-			)
-			if Config.locale_strategy == LOCALE_STRATEGY.NONE_VALUE:
-				attr_val = {
-					locale: attr_val[locale] if locale in attr_val.keys() else None
-					for locale in Config.locales
-				}
-			elif callable(Config.locale_strategy):
-				attr_val = {
-					locale: attr_val[locale]
-					if locale in attr_val.keys()
-					else Config.locale_strategy(attr_val=attr_val, locale=locale)
-					for locale in Config.locales
-				}
-			else:
-				attr_val = {
-					locale: attr_val[locale] if locale in attr_val.keys() else attr_val[Config.locale]
-					for locale in Config.locales
-				}
-			return return_valid_attr(
-				attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-			)
 
-		elif attr_type._type == 'LOCALES':
-			if attr_val in Config.locales:
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+def _compile_check_STR(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	str_pattern = None
+	if attr_type._args['pattern']:
+		str_pattern = _compile_pattern(f'^{attr_type._args["pattern"]}$')
 
-		elif attr_type._type == 'PHONE':
-			if attr_type._args['codes']:
-				for phone_code in attr_type._args['codes']:
-					if re.match(fr'^\+{phone_code}[0-9]+$', attr_val):
-						return return_valid_attr(
-							attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-						)
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str and (not str_pattern or str_pattern.match(attr_val)):
+			return attr_val
+		raise _InvalidAttrVal()
+
+	return (check, False)
+
+
+def _compile_check_URI_WEB(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	allowed_domains = attr_type._args['allowed_domains']
+	disallowed_domains = attr_type._args['disallowed_domains']
+	strict = attr_type._args['strict']
+
+	def domain_match(attr_val_domain: str, domains: List[str]) -> bool:
+		if strict:
+			return attr_val_domain in domains
+		return attr_val_domain.endswith(tuple(domains))
+
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if type(attr_val) == str and _URI_WEB_RE.match(attr_val):
+			if allowed_domains:
+				if domain_match(attr_val.split('/')[2], allowed_domains):
+					return attr_val
+			elif disallowed_domains:
+				if not domain_match(attr_val.split('/')[2], disallowed_domains):
+					return attr_val
 			else:
-				if re.match(r'^\+[0-9]+$', attr_val):
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
+				return attr_val
+		raise _InvalidAttrVal()
 
-		elif attr_type._type == 'STR':
-			if type(attr_val) == str:
-				if attr_type._args['pattern']:
-					if re.match(f'^{attr_type._args["pattern"]}$', attr_val):
-						return return_valid_attr(
-							attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-						)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
+	return (check, False)
 
-		elif attr_type._type == 'TIME':
-			if re.match(r'^[0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]{6})?)?$', attr_val):
-				if attr_type._args['ranges']:
-					for time_range in attr_type._args['ranges']:
-						time_range = copy.deepcopy(time_range)
-						for i in [0, 1]:
-							if time_range[i][0] in ['+', '-']:
-								time_range_delta = {}
-								if time_range[i][-1] == 's':
-									time_range_delta = {'seconds': int(time_range[i][:-1])}
-								elif time_range[i][-1] == 'm':
-									time_range_delta = {'minutes': int(time_range[i][:-1])}
-								elif time_range[i][-1] == 'h':
-									time_range_delta = {'hours': int(time_range[i][:-1])}
-								time_range[i] = (
-									(datetime.datetime.utcnow() + datetime.timedelta(**time_range_delta))
-									.isoformat()
-									.split('T')[1]
-								)
-						if attr_val >= time_range[0] and attr_val < time_range[1]:
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
 
-		elif attr_type._type == 'URI_WEB':
-			if re.match(r'^https?:\/\/(?:[\w\-\_]+\.)(?:\.?[\w]{2,})+([\?\/].*)?$', attr_val):
-				if attr_type._args['allowed_domains']:
-					attr_val_domain = attr_val.split('/')[2]
-					for domain in attr_type._args['allowed_domains']:
-						if attr_type._args['strict'] and attr_val_domain == domain:
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-						elif not attr_type._args['strict'] and attr_val_domain.endswith(domain):
-							return return_valid_attr(
-								attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-							)
-				elif attr_type._args['disallowed_domains']:
-					attr_val_domain = attr_val.split('/')[2]
-					for domain in attr_type._args['disallowed_domains']:
-						if attr_type._args['strict'] and attr_val_domain == domain:
-							break
-						elif not attr_type._args['strict'] and attr_val_domain.endswith(domain):
-							break
-					else:
-						return return_valid_attr(
-							attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-						)
-				else:
-					return return_valid_attr(
-						attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-					)
+def _compile_check_LITERAL(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	literal = attr_type._args['literal']
 
-		elif attr_type._type == 'LITERAL':
-			if attr_val in attr_type._args['literal']:
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+	def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		if attr_val in literal:
+			return attr_val
+		raise _InvalidAttrVal()
 
-		elif attr_type._type == 'UNION':
-			for child_attr in attr_type._args['union']:
+	return (check, False)
+
+
+def _compile_check_UNION(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	union_validators: List[Tuple[ATTR_VALIDATOR, bool]] = [
+		(compile_attr(attr_type=child_attr_type), child_attr_type._validator_async)
+		for child_attr_type in attr_type._args['union']
+	]
+	check_async = any(child_async for _, child_async in union_validators)
+
+	if not check_async:
+
+		def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+			child_ctx = _child_ctx(ctx=ctx, attr_name=ctx['attr_name'], scope=attr_val)
+			for child_validator, _ in union_validators:
 				try:
-					attr_val = await validate_attr(
-						mode='deep',
-						attr_name=attr_name,
-						attr_type=child_attr,
-						attr_val=attr_val,
-						skip_events=skip_events,
-						env=env,
-						query=query,
-						doc=doc,
-						scope=attr_val,
-					)
+					return child_validator(attr_val, child_ctx)
 				except Exception as e:
 					logger.debug(
 						'Exception occurred while validating type \'UNION\'. Exception details:'
 					)
 					logger.debug(e)
-					continue
-				return return_valid_attr(
-					attr_val=attr_val, attr_oper=attr_oper, attr_oper_args=attr_oper_args
-				)
+			raise _InvalidAttrVal()
+
+		return (check, False)
 
-		elif attr_type._type == 'TYPE':
+	async def async_check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		child_ctx = _child_ctx(ctx=ctx, attr_name=ctx['attr_name'], scope=attr_val)
+		for child_validator, child_async in union_validators:
 			try:
-				attr_val = await attr_type._args['func'](
-					mode=mode,
-					attr_name=attr_name,
-					attr_type=attr_type,
-					attr_val=attr_val,
-					skip_events=skip_events,
-					env=env,
-					query=query,
-					doc=doc,
-					scope=attr_val,
-				)
-			except InvalidAttrException as e:
-				raise e
-			except:
-				raise InvalidAttrException(
-					attr_name=attr_name, attr_type=attr_type, val_type=type(attr_val)
-				)
-			return return_valid_attr(
+				child_val = child_validator(attr_val, child_ctx)
+				if child_async:
+					child_val = await child_val
+				return child_val
+			except Exception as e:
+				logger.debug('Exception occurred while validating type \'UNION\'. Exception details:')
+				logger.debug(e)
+		raise _InvalidAttrVal()
+
+	return (async_check, True)
+
+
+def _compile_check_TYPE(*, attr_type: ATTR) -> Tuple[ATTR_CHECK, bool]:
+	async def check(attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+		# [DOC] Deepcopy attr_val as TYPE function can update it in-place
+		attr_val = copy.deepcopy(attr_val)
+		try:
+			return await attr_type._args['func'](
+				mode=ctx['mode'],
+				attr_name=ctx['attr_name'],
+				attr_type=attr_type,
 				attr_val=attr_val,
-				attr_oper=attr_oper,
-				attr_oper_args=attr_oper_args,
+				skip_events=ctx['skip_events'],
+				env=ctx['env'],
+				query=ctx['query'],
+				doc=ctx['doc'],
+				scope=attr_val,
+			)
+		except InvalidAttrException as e:
+			raise e
+		except:
+			raise InvalidAttrException(
+				attr_name=ctx['attr_name'], attr_type=attr_type, val_type=type(attr_val)
 			)
 
-	except InvalidAttrException as e:
-		# [DOC] Assign exception to a variable for later processing
-		validate_exception = e
-	except:
-		# [DOC] For any other exception, skip for now to raise
-		pass
-
-	if mode == 'update':
-		return None
-	elif (
-		mode in ['create', 'create_draft'] and attr_type._default != NAWAH_VALUES.NONE_VALUE
+	return (check, True)
+
+
+_COMPILE_CHECK: Dict[str, Callable[..., Tuple[ATTR_CHECK, bool]]] = {
+	'ANY': _compile_check_ANY,
+	'ACCESS': _compile_check_ACCESS,
+	'BOOL': _compile_check_BOOL,
+	'DATE': _compile_check_DATE,
+	'DATETIME': _compile_check_DATETIME,
+	'DYNAMIC_ATTR': _compile_check_DYNAMIC_ATTR,
+	'DYNAMIC_VAL': _compile_check_DYNAMIC_VAL,
+	'KV_DICT': _compile_check_KV_DICT,
+	'TYPED_DICT': _compile_check_TYPED_DICT,
+	'EMAIL': _compile_check_EMAIL,
+	'FILE': _compile_check_FILE,
+	'FLOAT': _compile_check_FLOAT,
+	'GEO': _compile_check_GEO,
+	'ID': _compile_check_ID,
+	'INT': _compile_check_INT,
+	'IP': _compile_check_IP,
+	'LIST': _compile_check_LIST,
+	'LOCALE': _compile_check_LOCALE,
+	'LOCALES': _compile_check_LOCALES,
+	'PHONE': _compile_check_PHONE,
+	'STR': _compile_check_STR,
+	'TIME': _compile_check_TIME,
+	'URI_WEB': _compile_check_URI_WEB,
+	'LITERAL': _compile_check_LITERAL,
+	'UNION': _compile_check_UNION,
+	'TYPE': _compile_check_TYPE,
+}
+
+
+async def _validate_attr_ctx(*, attr_type: ATTR, attr_val: Any, ctx: VALIDATE_CTX) -> Any:
+	validator = compile_attr(attr_type=attr_type)
+	# [DOC] Default of Attr Type TYPE is called for create calls, regardless of value of attr
+	if (
+		ctx['mode'] == 'create'
+		and type(attr_default := attr_type._default) == ATTR
+		and attr_default._type == 'TYPE'
 	):
-		return attr_type._default
-	else:
 		try:
-			# [DOC] Attempt to raise InvalidAttrException raised during validation
-			raise validate_exception
-		except:
-			raise InvalidAttrException(
-				attr_name=attr_name, attr_type=attr_type, val_type=type(attr_val)
+			return copy.deepcopy(
+				await attr_default._args['func'](
+					mode=ctx['mode'],
+					attr_name=ctx['attr_name'],
+					attr_type=attr_type,
+					attr_val=attr_val,
+					skip_events=ctx['skip_events'],
+					env=ctx['env'],
+					query=ctx['query'],
+					doc=ctx['doc'],
+					scope=ctx['scope'] if ctx['scope'] else ctx['doc'],
+				)
 			)
+		except:
+			pass
+	if attr_type._validator_async:
+		return await validator(attr_val, ctx)
+	return validator(attr_val, ctx)
+
+
+async def validate_attr(
+	*,
+	mode: Literal['create', 'create_draft', 'update', 'deep'],
+	attr_name: str,
+	attr_type: ATTR,
+	attr_val: Any,
+	skip_events: NAWAH_EVENTS = None,
+	env: NAWAH_ENV = None,
+	query: Union[NAWAH_QUERY, Query] = None,
+	doc: NAWAH_DOC = None,
+	scope: NAWAH_DOC = None,
+):
+	# [TODO] Test setting attr_name to reflect a path for nested attrs
+	return await _validate_attr_ctx(
+		attr_type=attr_type,
+		attr_val=attr_val,
+		ctx={
+			'mode': mode,
+			'attr_name': attr_name,
+			'skip_events': skip_events,
+			'env': env,
+			'query': query,
+			'doc': doc,
+			'scope': scope,
+		},
+	)
 
 
 def return_valid_attr(
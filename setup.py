@@ -38,6 +38,7 @@ setuptools.setup(
 		'nawah.cli': ['template.tar.gz', 'py.typed'],
 		'nawah.base_method': ['py.typed'],
 		'nawah.base_module': ['py.typed'],
+		'nawah.cache': ['py.typed'],
 		'nawah.classes': ['py.typed'],
 		'nawah.config': ['py.typed'],
 		'nawah.data': ['py.typed'],
@@ -54,6 +55,7 @@ setuptools.setup(
 		'nawah.cli',
 		'nawah.base_method',
 		'nawah.base_module',
+		'nawah.cache',
 		'nawah.classes',
 		'nawah.config',
 		'nawah.data',
@@ -81,7 +83,7 @@ setuptools.setup(
 	],
 	python_requires='>=3.8',
 	install_requires=requirements,
-	extras_require={'dev': dev_requirements},
+	extras_require={'dev': dev_requirements, 'orjson': ['orjson==3.5.2']},
 	cmdclass={
 		'version': version,
 		'api_level': api_level,
@@ -0,0 +1,83 @@
+from nawah.classes import BaseModel
+
+from . import MockUtilityModule, MockModule
+
+import pytest
+
+
+def _mock_stream(mocker, *, docs):
+	async def stream(**kwargs):
+		for doc in docs:
+			yield BaseModel(doc)
+
+	return mocker.patch('nawah.data.stream', side_effect=stream)
+
+
+@pytest.mark.asyncio
+async def test_iter_read_utility_module(mocker):
+	utility_module = MockUtilityModule()
+	with pytest.raises(Exception):
+		async for _ in utility_module.iter_read():
+			pass
+
+
+@pytest.mark.asyncio
+async def test_iter_read_on_read_doc(mocker):
+	class MockOnReadDocModule(MockModule):
+		async def on_read_doc(self, read_doc, skip_events, env, query, doc, payload):
+			if read_doc['attr'] == 'skip':
+				return None
+			read_doc['attr'] = read_doc['attr'].upper()
+			return read_doc
+
+	data_stream = _mock_stream(
+		mocker,
+		docs=[
+			{'_id': 1, 'attr': 'val_1', 'other_attr': 'other'},
+			{'_id': 2, 'attr': 'skip', 'other_attr': 'other'},
+			{'_id': 3, 'attr': 'val_3', 'other_attr': 'other'},
+		],
+	)
+	module = MockOnReadDocModule()
+	read_docs = [
+		read_doc
+		async for read_doc in module.iter_read(query=[{'$attrs': ['attr']}], batch_size=10)
+	]
+	assert read_docs == [{'_id': 1, 'attr': 'VAL_1'}, {'_id': 3, 'attr': 'VAL_3'}]
+	assert data_stream.call_args.kwargs['batch_size'] == 10
+
+
+@pytest.mark.asyncio
+async def test_iter_read_on_read_batches(mocker):
+	on_read_batches = []
+
+	class MockOnReadModule(MockModule):
+		async def on_read(self, results, skip_events, env, query, doc, payload):
+			on_read_batches.append([read_doc['_id'] for read_doc in results['docs']])
+			return (results, skip_events, env, query, doc, payload)
+
+	_mock_stream(mocker, docs=[{'_id': i} for i in range(5)])
+	module = MockOnReadModule()
+	read_docs = [read_doc async for read_doc in module.iter_read(batch_size=2)]
+	assert [read_doc['_id'] for read_doc in read_docs] == [0, 1, 2, 3, 4]
+	assert on_read_batches == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_read_on_read_doc():
+	class MockOnReadDocModule(MockModule):
+		async def on_read_doc(self, read_doc, skip_events, env, query, doc, payload):
+			if read_doc['_id'] == 2:
+				return None
+			return read_doc
+
+	results, *_ = await MockOnReadDocModule().on_read(
+		results={'count': 2, 'docs': [BaseModel({'_id': 1}), BaseModel({'_id': 2})]},
+		skip_events=[],
+		env={},
+		query=[],
+		doc={},
+		payload={},
+	)
+	assert results['count'] == 1
+	assert [read_doc['_id'] for read_doc in results['docs']] == [1]
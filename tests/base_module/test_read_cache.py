@@ -0,0 +1,205 @@
+from nawah.classes import CACHE, BaseModel, Query
+from nawah.enums import CACHE_STRATEGY
+from nawah.base_method import BaseMethod
+from nawah.base_module import BaseModule
+from nawah import data as Data
+
+from bson import ObjectId
+
+from . import MockModule
+
+import pytest, asyncio, datetime, json
+
+
+def _results(**kwargs):
+	return {'count': 1, 'docs': [BaseModel({'_id': ObjectId()})]}
+
+
+def _read_method(module):
+	return BaseMethod(
+		module=module,
+		method='read',
+		permissions=[],
+		query_args=[],
+		doc_args=[],
+		watch_method=False,
+		get_method=False,
+		post_method=False,
+	)
+
+
+@pytest.mark.asyncio
+async def test_read_cache_stale_while_revalidate(mocker):
+	module = MockModule()
+	module.cache = [
+		CACHE(
+			condition=lambda skip_events, env, query: True,
+			period=60,
+			cache_strategy=CACHE_STRATEGY.STALE_WHILE_REVALIDATE,
+			max_stale=60,
+		)
+	]
+	cache_set = module.cache[0]
+	mock_read = mocker.patch.object(Data, 'read', mocker.AsyncMock(side_effect=_results))
+	results = await module.read(query=Query([]))
+	assert mock_read.await_count == 1
+	cache_key = list(cache_set.queries.keys())[0]
+	stale_query_time = cache_set.queries[cache_key].query_time - datetime.timedelta(
+		seconds=90
+	)
+	cache_set.queries[cache_key].query_time = stale_query_time
+
+	# [DOC] Stale cached query is served, and refreshed once in background
+	results = await asyncio.gather(
+		module.read(query=Query([])), module.read(query=Query([]))
+	)
+	assert [results_item.args['cache'] for results_item in results] == [
+		stale_query_time.isoformat()
+	] * 2
+	assert cache_set.stats['stale_hits'] == 2
+	await asyncio.sleep(0)
+	assert mock_read.await_count == 2
+	assert cache_set.queries[cache_key].query_time > stale_query_time
+	assert cache_set._revalidating_queries == set()
+
+	# [DOC] Cached query beyond max_stale is read again
+	cache_set.queries[cache_key].query_time -= datetime.timedelta(seconds=150)
+	await module.read(query=Query([]))
+	assert mock_read.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_read_cache_stale_if_error(mocker):
+	module = MockModule()
+	module.cache = [
+		CACHE(
+			condition=lambda skip_events, env, query: True,
+			period=60,
+			stale_if_error=True,
+		)
+	]
+	cache_set = module.cache[0]
+	mocker.patch.object(Data, 'read', mocker.AsyncMock(side_effect=_results))
+	await module.read(query=Query([]))
+	cache_key = list(cache_set.queries.keys())[0]
+	cache_set.queries[cache_key].query_time -= datetime.timedelta(seconds=90)
+
+	mocker.patch.object(
+		Data, 'read', mocker.AsyncMock(side_effect=Exception('read failed'))
+	)
+	results = await module.read(query=Query([]))
+	assert results.args['cache'] == cache_set.queries[cache_key].query_time.isoformat()
+
+	# [DOC] Without stale_if_error, read exception is raised
+	cache_set.stale_if_error = False
+	with pytest.raises(Exception):
+		await module.read(query=Query([]))
+
+
+@pytest.mark.asyncio
+async def test_read_cache_backend(mocker):
+	from nawah.cache import MemoryCacheBackend
+
+	mocker.patch.object(BaseModule, '_cache_invalidation_tasks', set())
+
+	backend = MemoryCacheBackend()
+	# [DOC] Simulate two app processes with Cache Sets sharing same backend
+	modules = []
+	for _ in range(2):
+		module = MockModule()
+		module.cache = [
+			CACHE(condition=lambda skip_events, env, query: True, backend=backend)
+		]
+		module._initialise()
+		modules.append(module)
+
+	mock_read = mocker.patch.object(Data, 'read', mocker.AsyncMock(side_effect=_results))
+	results = await modules[0].read(query=Query([]))
+	backend_results = await modules[1].read(query=Query([]))
+	assert mock_read.await_count == 1
+	assert backend_results.args['docs'][0]._id == results.args['docs'][0]._id
+	assert modules[1].cache[0].stats['backend_hits'] == 1
+
+	# [DOC] Write on one process invalidates shared backend
+	await modules[0].update_cache(docs=[{'_id': results.args['docs'][0]._id}])
+	await asyncio.gather(*BaseModule._cache_invalidation_tasks)
+	modules[1].cache[0].invalidate_queries(docs=None)
+	await modules[1].read(query=Query([]))
+	assert mock_read.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_cache_backend_late_store(mocker):
+	from nawah.cache import MemoryCacheBackend
+
+	backend = MemoryCacheBackend()
+	module = MockModule()
+	module.cache = [CACHE(condition=lambda skip_events, env, query: True, backend=backend)]
+	module._initialise()
+	cache_set = module.cache[0]
+
+	# [DOC] Other app process invalidates backend while query is being read, before Cache Bus message reaches this process
+	async def read_invalidated(**kwargs):
+		await backend.invalidate(namespace=cache_set.namespace, docs=None)
+		return _results()
+
+	mocker.patch.object(Data, 'read', mocker.AsyncMock(side_effect=read_invalidated))
+	await module.read(query=Query([]))
+	assert len(cache_set.queries) == 1
+	assert backend._records == {}
+
+
+@pytest.mark.asyncio
+async def test_read_cache_response(mocker):
+	module = MockModule()
+	module.cache = [
+		CACHE(condition=lambda skip_events, env, query: True, period=60, cache_response=True)
+	]
+	cache_set = module.cache[0]
+	mocker.patch.object(Data, 'read', mocker.AsyncMock(side_effect=_results))
+	ws = mocker.AsyncMock()
+	env = {'ws': ws, 'session': None}
+	read = _read_method(module)
+
+	# [DOC] Response of cache miss is not kept
+	await read(env=env, query=Query([]), call_id='call_1')
+	cached_query = list(cache_set.queries.values())[0]
+	assert cached_query.response == None
+
+	# [DOC] Response of cache hit is kept, and served with call_id spliced in
+	cache_size = cache_set.size
+	await read(env=env, query=Query([]), call_id='call_2')
+	assert cached_query.response != None
+	assert cache_set.size == cache_size + len(cached_query.response)
+	await read(env=env, query=Query([]), call_id='call_3')
+	responses = [json.loads(call.args[0]) for call in ws.send_str.await_args_list[1:]]
+	assert [response['args'].pop('call_id') for response in responses] == [
+		'call_2',
+		'call_3',
+	]
+	assert responses[0] == responses[1]
+	assert responses[0]['args']['count'] == 1
+	assert responses[0]['args']['cache'] == cached_query.query_time.isoformat()
+
+	# [DOC] Nested calls are served results
+	results = await read(env={'session': None}, query=Query([]))
+	assert '__response' not in results.args
+	assert results.args['docs'][0]._id == cached_query._results['docs'][0]._id
+
+
+@pytest.mark.asyncio
+async def test_read_cache_response_on_read(mocker):
+	class MockOnReadModule(MockModule):
+		async def on_read(self, results, skip_events, env, query, doc, payload):
+			return (results, skip_events, env, query, doc, payload)
+
+	module = MockOnReadModule()
+	module.cache = [
+		CACHE(condition=lambda skip_events, env, query: True, period=60, cache_response=True)
+	]
+	mocker.patch.object(Data, 'read', mocker.AsyncMock(side_effect=_results))
+	env = {'ws': mocker.AsyncMock(), 'session': None}
+	read = _read_method(module)
+	await read(env=env, query=Query([]), call_id='call_1')
+	await read(env=env, query=Query([]), call_id='call_2')
+	assert list(module.cache[0].queries.values())[0].response == None
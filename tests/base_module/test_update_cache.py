@@ -0,0 +1,120 @@
+from nawah.classes import CACHE, BaseModel, Query
+from nawah.base_module import BaseModule
+from nawah.enums import CACHE_STRATEGY
+from nawah import data as Data
+
+from bson import ObjectId
+
+from . import MockModule
+
+import pytest, asyncio
+
+
+@pytest.mark.asyncio
+async def test_update_cache_debounce(mocker):
+	module = MockModule()
+	module.cache = [
+		CACHE(condition=lambda skip_events, env, query: True, refresh_delay=0.01)
+	]
+	cache_set = module.cache[0]
+	doc_id = ObjectId()
+	results = {'count': 1, 'docs': [BaseModel({'_id': doc_id})]}
+	cache_set.cache_query(query_key='query_1', results=results, query=Query([]))
+	cache_set.cache_query(
+		query_key='query_2', results=results, query=Query([{'_id': doc_id}])
+	)
+	mock_read = mocker.patch.object(
+		Data, 'read', mocker.AsyncMock(return_value=results)
+	)
+
+	# [DOC] Multiple writes to same doc result in one refresh of affected queries
+	for _ in range(5):
+		await module.update_cache(docs=[{'_id': doc_id}])
+	assert cache_set.queries == {}
+	await cache_set._refresh_task
+	assert mock_read.await_count == 2
+	assert set(cache_set.queries.keys()) == {'query_1', 'query_2'}
+
+
+@pytest.mark.asyncio
+async def test_update_cache_dismiss(mocker):
+	module = MockModule()
+	module.cache = [
+		CACHE(
+			condition=lambda skip_events, env, query: True,
+			cache_strategy=CACHE_STRATEGY.DISMISS,
+		)
+	]
+	cache_set = module.cache[0]
+	results = {'count': 1, 'docs': [BaseModel({'_id': ObjectId()})]}
+	cache_set.cache_query(query_key='query', results=results, query=Query([]))
+	await module.update_cache(docs=[{'_id': ObjectId()}])
+	assert cache_set.queries == {}
+	assert cache_set._refresh_task == None
+
+
+@pytest.mark.asyncio
+async def test_update_cache_broadcast(mocker, preserve_state):
+	import nawah.config
+
+	mocker.patch.object(BaseModule, '_cache_invalidation_tasks', set())
+	with preserve_state(nawah.config, 'Config'):
+		cache_bus = mocker.Mock(publish=mocker.AsyncMock())
+		nawah.config.Config.cache_bus = cache_bus
+		module = MockModule()
+		module.cache = [CACHE(condition=lambda skip_events, env, query: True)]
+		doc_id = ObjectId()
+		await module.update_cache(
+			docs=[BaseModel({'_id': doc_id, 'attr': 'val', 'file': {'content': b''}})],
+			doc={'attr': 'new_val'},
+		)
+		await asyncio.gather(*BaseModule._cache_invalidation_tasks)
+		cache_bus.publish.assert_awaited_once_with(
+			message={
+				'module': 'mock_module',
+				'docs': [{'_id': doc_id, 'attr': 'val'}],
+				'doc': {'attr': 'new_val'},
+			}
+		)
+
+		# [DOC] Invalidations received from Cache Bus are not broadcast again
+		await module.update_cache(docs=[{'_id': str(doc_id)}], broadcast=False)
+		assert not BaseModule._cache_invalidation_tasks
+		assert cache_bus.publish.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_update_cache_broadcast_background(mocker, preserve_state):
+	import nawah.config
+
+	mocker.patch.object(BaseModule, '_cache_invalidation_tasks', set())
+	with preserve_state(nawah.config, 'Config'):
+		publish_event = asyncio.Event()
+
+		async def publish(*, message):
+			await publish_event.wait()
+
+		nawah.config.Config.cache_bus = mocker.Mock(publish=publish)
+		module = MockModule()
+		module.cache = [
+			CACHE(
+				condition=lambda skip_events, env, query: True,
+				cache_strategy=CACHE_STRATEGY.DISMISS,
+			)
+		]
+		cache_set = module.cache[0]
+		mock_invalidate_backend = mocker.patch.object(
+			cache_set, 'invalidate_backend', mocker.AsyncMock()
+		)
+		results = {'count': 1, 'docs': [BaseModel({'_id': ObjectId()})]}
+		cache_set.cache_query(query_key='query', results=results, query=Query([]))
+
+		# [DOC] Write doesn't wait on stalled Cache Bus, while local cache is invalidated right away
+		await asyncio.wait_for(module.update_cache(docs=[{'_id': ObjectId()}]), timeout=1)
+		assert cache_set.queries == {}
+		assert len(BaseModule._cache_invalidation_tasks) == 1
+		mock_invalidate_backend.assert_not_awaited()
+		publish_event.set()
+		await asyncio.gather(*BaseModule._cache_invalidation_tasks)
+		mock_invalidate_backend.assert_awaited_once()
+		assert not BaseModule._cache_invalidation_tasks
@@ -0,0 +1,193 @@
+from nawah.cache import (
+	MemoryCacheBackend,
+	UnixSocketCacheBackend,
+	BSONCacheSerializer,
+	PickleCacheSerializer,
+)
+from nawah.classes import BaseModel
+
+from bson import ObjectId
+
+import pytest, datetime, asyncio, bson
+
+
+@pytest.mark.parametrize('serializer', [BSONCacheSerializer(), PickleCacheSerializer()])
+def test_cache_serializer(serializer):
+	doc_id = ObjectId()
+	results = {
+		'total': 1,
+		'count': 1,
+		'docs': [
+			BaseModel(
+				{
+					'_id': doc_id,
+					'create_time': datetime.datetime(2020, 1, 1),
+					'user': BaseModel({'_id': ObjectId(), 'name': 'user'}),
+				}
+			)
+		],
+		'groups': {},
+	}
+	loaded_results = serializer.loads(value=serializer.dumps(results=results))
+	assert type(loaded_results['docs'][0]) == BaseModel
+	assert type(loaded_results['docs'][0].user) == BaseModel
+	assert loaded_results['docs'][0]._id == doc_id
+	assert loaded_results['docs'][0].create_time == datetime.datetime(2020, 1, 1)
+	assert loaded_results['count'] == 1
+
+
+async def _set(
+	backend, *, namespace='namespace', key='key', expiry=None, ids=[], deps={}, version=None
+):
+	await backend.set(
+		namespace=namespace,
+		key=key,
+		value=b'value',
+		query_time=datetime.datetime(2020, 1, 1),
+		expiry=expiry,
+		ids=ids,
+		deps=deps,
+		version=version,
+	)
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_backend():
+	backend = MemoryCacheBackend(max_entries=2)
+	doc_id = str(ObjectId())
+	await _set(backend, key='key_1', ids=[doc_id], deps={'status': [['active']]})
+	await _set(backend, key='key_2', namespace='other_namespace')
+	assert await backend.get(namespace='namespace', key='key_1') == {
+		'value': b'value',
+		'query_time': datetime.datetime(2020, 1, 1),
+	}
+	assert await backend.get(namespace='namespace', key='key_2') == None
+
+	# [DOC] Invalidation is scoped by namespace, and dependencies
+	await backend.invalidate(
+		namespace='namespace', docs=[{'_id': str(ObjectId()), 'status': 'deleted'}]
+	)
+	assert await backend.get(namespace='namespace', key='key_1') != None
+	await backend.invalidate(namespace='namespace', docs=[{'_id': doc_id}])
+	assert await backend.get(namespace='namespace', key='key_1') == None
+	assert await backend.get(namespace='other_namespace', key='key_2') != None
+
+	# [DOC] Expired, and least recently used records are dropped
+	await _set(
+		backend,
+		key='key_3',
+		expiry=datetime.datetime.utcnow() - datetime.timedelta(seconds=1),
+	)
+	assert await backend.get(namespace='namespace', key='key_3') == None
+	await _set(backend, key='key_4')
+	await _set(backend, key='key_5')
+	assert await backend.get(namespace='other_namespace', key='key_2') == None
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_backend(tmp_path):
+	path = str(tmp_path / 'cache_backend.sock')
+	hub_backend = UnixSocketCacheBackend(path=path)
+	backend = UnixSocketCacheBackend(path=path)
+	try:
+		await _set(hub_backend, key='key_1')
+		assert hub_backend.is_hub
+		# [DOC] Records set by hub are available to other processes, and vice versa
+		assert (await backend.get(namespace='namespace', key='key_1'))['value'] == b'value'
+		assert not backend.is_hub
+		doc_id = str(ObjectId())
+		await _set(backend, key='key_2', ids=[doc_id])
+		assert await hub_backend.get(namespace='namespace', key='key_2') != None
+		await backend.invalidate(namespace='namespace', docs=[{'_id': doc_id}], doc={})
+		assert await hub_backend.get(namespace='namespace', key='key_2') == None
+		await backend.clear()
+		assert await backend.get(namespace='namespace', key='key_1') == None
+	finally:
+		await backend.close()
+		await hub_backend.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_backend_concurrent_takeover(tmp_path):
+	path = str(tmp_path / 'cache_backend.sock')
+	backend = UnixSocketCacheBackend(path=path)
+	await _set(backend, key='key_1')
+	await backend.close()
+	# [DOC] Processes connecting at same time with stale socket file left behind should agree on single hub
+	backends = [UnixSocketCacheBackend(path=path) for _ in range(5)]
+	try:
+		await asyncio.gather(*[_set(backend, key='key_2') for backend in backends])
+		assert len([backend for backend in backends if backend.is_hub]) == 1
+		for backend in backends:
+			assert await backend.get(namespace='namespace', key='key_2') != None
+	finally:
+		for backend in backends:
+			await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_backend_version():
+	backend = MemoryCacheBackend()
+	version = await backend.version(namespace='namespace')
+	other_version = await backend.version(namespace='other_namespace')
+	# [DOC] Records read before namespace was invalidated are rejected
+	await backend.invalidate(namespace='namespace', docs=[{'_id': str(ObjectId())}])
+	await _set(backend, key='key_1', version=version)
+	assert await backend.get(namespace='namespace', key='key_1') == None
+	await _set(backend, key='key_1', version=await backend.version(namespace='namespace'))
+	assert await backend.get(namespace='namespace', key='key_1') != None
+	await _set(backend, key='key_2', namespace='other_namespace', version=other_version)
+	assert await backend.get(namespace='other_namespace', key='key_2') != None
+	# [DOC] Clearing backend changes version of all namespaces
+	await backend.clear()
+	await _set(backend, key='key_2', namespace='other_namespace', version=other_version)
+	assert await backend.get(namespace='other_namespace', key='key_2') == None
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_backend_version(tmp_path):
+	path = str(tmp_path / 'cache_backend.sock')
+	hub_backend = UnixSocketCacheBackend(path=path)
+	backend = UnixSocketCacheBackend(path=path)
+	try:
+		await hub_backend.clear()
+		version = await backend.version(namespace='namespace')
+		await hub_backend.invalidate(namespace='namespace', docs=None)
+		await _set(backend, key='key_1', version=version)
+		assert await hub_backend.get(namespace='namespace', key='key_1') == None
+		await _set(backend, key='key_1', version=await backend.version(namespace='namespace'))
+		assert await hub_backend.get(namespace='namespace', key='key_1') != None
+	finally:
+		await backend.close()
+		await hub_backend.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_backend_pipelining(tmp_path):
+	path = str(tmp_path / 'cache_backend.sock')
+	from nawah.cache._backend import _read_frame
+
+	# [DOC] Hub replying to requests out of order, which requires client to send next request before response of previous one
+	async def handle_client(reader, writer):
+		requests = [await _read_frame(reader), await _read_frame(reader)]
+		for request in reversed(requests):
+			writer.write(
+				bson.encode({'version': request['version'], 'request_id': request['request_id']})
+			)
+		await writer.drain()
+
+	async def version(request_version):
+		return await backend._request(
+			request={'op': 'version', 'namespace': 'namespace', 'version': request_version}
+		)
+
+	server = await asyncio.start_unix_server(handle_client, path=path)
+	backend = UnixSocketCacheBackend(path=path)
+	try:
+		responses = await asyncio.wait_for(asyncio.gather(version(1), version(2)), timeout=1)
+		assert [response['version'] for response in responses] == [1, 2]
+		assert not backend.is_hub
+	finally:
+		await backend.close()
+		server.close()
+		await server.wait_closed()
@@ -0,0 +1,151 @@
+from nawah.cache import UnixSocketCacheBus
+
+import pytest, asyncio
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_bus(tmp_path):
+	path = str(tmp_path / 'cache_bus.sock')
+	messages = {'hub': [], 'peer_1': [], 'peer_2': []}
+
+	def on_message(name):
+		async def _(message):
+			messages[name].append(message)
+
+		return _
+
+	buses = {name: UnixSocketCacheBus(path=path) for name in messages.keys()}
+	for name, bus in buses.items():
+		await bus.connect(on_message=on_message(name))
+	assert buses['hub'].is_hub
+	assert not buses['peer_1'].is_hub
+	# [DOC] Allow hub to accept peers connections
+	await asyncio.sleep(0.05)
+
+	try:
+		# [DOC] Message published by peer is received by hub, other peers, not publishing peer
+		await buses['peer_1'].publish(message={'module': 'module', 'docs': None, 'doc': {}})
+		# [DOC] Message published by hub is received by all peers
+		await buses['hub'].publish(message={'module': 'hub_module', 'docs': None, 'doc': {}})
+		await asyncio.sleep(0.1)
+		assert [message['module'] for message in messages['hub']] == ['module']
+		assert messages['peer_1'] == [{'module': 'hub_module', 'docs': None, 'doc': {}}]
+		assert sorted(message['module'] for message in messages['peer_2']) == [
+			'hub_module',
+			'module',
+		]
+	finally:
+		for bus in buses.values():
+			await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_bus_stale_socket(tmp_path):
+	path = str(tmp_path / 'cache_bus.sock')
+
+	async def on_message(message):
+		pass
+
+	bus = UnixSocketCacheBus(path=path)
+	await bus.connect(on_message=on_message)
+	# [DOC] Closing hub server leaves socket file behind, next bus should take over as hub
+	await bus.close()
+	bus = UnixSocketCacheBus(path=path)
+	await bus.connect(on_message=on_message)
+	assert bus.is_hub
+	await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_bus_concurrent_takeover(tmp_path):
+	path = str(tmp_path / 'cache_bus.sock')
+	messages = []
+
+	async def on_message(message):
+		messages.append(message)
+
+	bus = UnixSocketCacheBus(path=path)
+	await bus.connect(on_message=on_message)
+	await bus.close()
+	# [DOC] Processes connecting at same time with stale socket file left behind should agree on single hub
+	buses = [UnixSocketCacheBus(path=path, reconnect_delay=0.01) for _ in range(5)]
+	await asyncio.gather(*[bus.connect(on_message=on_message) for bus in buses])
+	try:
+		assert len([bus for bus in buses if bus.is_hub]) == 1
+		await asyncio.sleep(0.05)
+		await [bus for bus in buses if not bus.is_hub][0].publish(
+			message={'module': 'module', 'docs': None, 'doc': {}}
+		)
+		await asyncio.sleep(0.1)
+		assert len(messages) == 4
+	finally:
+		for bus in buses:
+			await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_bus_read_hub_failure(tmp_path, mocker):
+	path = str(tmp_path / 'cache_bus.sock')
+
+	async def on_message(message):
+		pass
+
+	hub = UnixSocketCacheBus(path=path)
+	await hub.connect(on_message=on_message)
+	bus = UnixSocketCacheBus(path=path, reconnect_delay=0.01)
+	await bus.connect(on_message=on_message)
+	await asyncio.sleep(0.05)
+	try:
+		# [DOC] Failure reading from hub is logged, and bus reconnects rather than silently stopping
+		read_task = bus._read_task
+		mocker.patch.object(
+			bus, '_deliver', side_effect=[Exception('Failed'), mocker.DEFAULT]
+		)
+		await hub.publish(message={'module': 'module', 'docs': None, 'doc': {}})
+		await asyncio.sleep(0.1)
+		assert read_task.done() and not read_task.exception()
+		assert bus._read_task and not bus._read_task.done()
+		assert not bus.is_hub
+	finally:
+		await bus.close()
+		await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_cache_bus_reset_caches(tmp_path):
+	path = str(tmp_path / 'cache_bus.sock')
+	messages = {'hub': [], 'peer_1': [], 'peer_2': []}
+
+	def on_message(name):
+		async def _(message):
+			messages[name].append(message)
+
+		return _
+
+	hub = UnixSocketCacheBus(path=path)
+	await hub.connect(on_message=on_message('hub'))
+	# [DOC] Second peer reconnects first, taking over as the hub
+	peers = {
+		'peer_1': UnixSocketCacheBus(path=path, reconnect_delay=0.2),
+		'peer_2': UnixSocketCacheBus(path=path, reconnect_delay=0.1),
+	}
+	for name, peer in peers.items():
+		await peer.connect(on_message=on_message(name))
+	await asyncio.sleep(0.05)
+	try:
+		# [DOC] Hub going away leaves peers disconnected until reconnect delay passes
+		await hub.close()
+		await asyncio.sleep(0.05)
+		assert not peers['peer_1']._writer
+		# [DOC] Message published while disconnected can't be dropped silently, local caches are reset instead
+		await peers['peer_1'].publish(message={'module': 'module', 'docs': None, 'doc': {}})
+		assert messages['peer_1'] == [{'module': '*'}]
+		# [DOC] Once reconnected, peers reset local caches for missed messages, and peer with dropped message has other peers reset theirs
+		await asyncio.sleep(0.4)
+		assert peers['peer_2'].is_hub
+		assert messages['peer_1'] == [{'module': '*'}, {'module': '*'}]
+		assert messages['peer_2'] == [{'module': '*'}, {'module': '*'}]
+		assert messages['hub'] == []
+	finally:
+		for peer in peers.values():
+			await peer.close()
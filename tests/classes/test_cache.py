@@ -0,0 +1,213 @@
+from nawah.classes import CACHE, BaseModel, Query
+
+from bson import ObjectId
+
+import pytest, datetime, bson
+
+
+def _results(count=1):
+	return {'count': count, 'docs': [BaseModel({'_id': ObjectId()}) for _ in range(count)]}
+
+
+def test_cache_hit_miss():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True)
+	assert cache_set.get_query(query_key='query') == None
+	cache_set.cache_query(query_key='query', results=_results())
+	cached_query = cache_set.get_query(query_key='query')
+	assert cached_query.results['count'] == 1
+	assert cache_set.stats['hits'] == 1
+	assert cache_set.stats['misses'] == 1
+	assert cache_set.stats['entries'] == 1
+	assert cache_set.stats['bytes'] == cached_query.size > 0
+
+
+def test_cache_max_entries_lru():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True, max_entries=2)
+	cache_set.cache_query(query_key='query_1', results=_results())
+	cache_set.cache_query(query_key='query_2', results=_results())
+	# [DOC] Access query_1 to make query_2 the least recently used
+	cache_set.get_query(query_key='query_1')
+	cache_set.cache_query(query_key='query_3', results=_results())
+	assert list(cache_set.queries.keys()) == ['query_1', 'query_3']
+	assert cache_set.stats['evictions'] == 1
+
+
+def test_cache_max_bytes():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True)
+	cache_set.cache_query(query_key='query_1', results=_results())
+	entry_size = cache_set.size
+	cache_set = CACHE(
+		condition=lambda skip_events, env, query: True, max_bytes=int(entry_size * 1.5)
+	)
+	cache_set.cache_query(query_key='query_1', results=_results())
+	cache_set.cache_query(query_key='query_2', results=_results())
+	assert list(cache_set.queries.keys()) == ['query_2']
+	assert cache_set.size == cache_set.queries['query_2'].size
+	# [DOC] Results bigger than max_bytes are not cached
+	cache_set.cache_query(query_key='query_3', results=_results(count=10))
+	assert 'query_3' not in cache_set.queries.keys()
+
+
+def test_cache_ttl():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True, period=60)
+	cached_query = cache_set.cache_query(query_key='query', results=_results())
+	cached_query.query_time -= datetime.timedelta(seconds=120)
+	assert cache_set.get_query(query_key='query') == None
+	assert cache_set.stats['expirations'] == 1
+	assert cache_set.stats['entries'] == 0
+	assert cache_set.stats['bytes'] == 0
+
+
+def test_cache_invalidate_queries_ids():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True)
+	results = _results(count=2)
+	cache_set.cache_query(
+		query_key='query', results=results, query=Query([{'status': 'active'}])
+	)
+	assert cache_set.invalidate_queries(docs=[{'_id': ObjectId(), 'status': 'deleted'}]) == {}
+	assert 'query' in cache_set.queries.keys()
+	invalidated_queries = cache_set.invalidate_queries(
+		docs=[{'_id': results['docs'][1]._id, 'status': 'deleted'}]
+	)
+	assert list(invalidated_queries.keys()) == ['query']
+	assert 'query' not in cache_set.queries.keys()
+
+
+def test_cache_invalidate_queries_no_deps():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True)
+	cache_set.cache_query(query_key='query', results=_results(), query=Query([]))
+	# [DOC] Any written doc can affect cached query with no attrs to match against
+	assert 'query' in cache_set.invalidate_queries(docs=[{'_id': ObjectId()}])
+
+
+def test_cache_invalidate_queries_deps():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True)
+	user_id = ObjectId()
+	cache_set.cache_query(
+		query_key='query',
+		results=_results(count=0),
+		query=Query([{'user': user_id, 'status': {'$in': ['active', 'pending']}}]),
+	)
+	# [DOC] Docs not matching query attrs don't affect cached query
+	assert (
+		cache_set.invalidate_queries(
+			docs=[{'_id': ObjectId(), 'user': ObjectId(), 'status': 'active'}]
+		)
+		== {}
+	)
+	assert (
+		cache_set.invalidate_queries(
+			docs=[{'_id': ObjectId(), 'user': user_id, 'status': 'deleted'}]
+		)
+		== {}
+	)
+	# [DOC] Update doc not changing query attrs doesn't affect cached query
+	assert (
+		cache_set.invalidate_queries(
+			docs=[{'_id': ObjectId(), 'user': user_id, 'status': 'deleted'}],
+			doc={'name': 'new_name'},
+		)
+		== {}
+	)
+	# [DOC] Update doc changing query attrs to matching value affects cached query
+	assert 'query' in cache_set.invalidate_queries(
+		docs=[{'_id': ObjectId(), 'user': user_id, 'status': 'deleted'}],
+		doc={'status': 'pending'},
+	)
+	cache_set.cache_query(
+		query_key='query',
+		results=_results(count=0),
+		query=Query([{'user': user_id, 'status': {'$in': ['active', 'pending']}}]),
+	)
+	# [DOC] Created doc matching query attrs affects cached query
+	assert 'query' in cache_set.invalidate_queries(
+		docs=[{'_id': ObjectId(), 'user': str(user_id), 'status': 'active'}]
+	)
+
+
+def test_cache_query_version():
+	cache_set = CACHE(condition=lambda skip_events, env, query: True)
+	cache_version = cache_set.version
+	cache_set.invalidate_queries(docs=[{'_id': ObjectId()}])
+	# [DOC] Results read before write are not cached
+	cache_set.cache_query(query_key='query', results=_results(), version=cache_version)
+	assert 'query' not in cache_set.queries.keys()
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidate_backend_message(mocker):
+	from nawah.cache import MemoryCacheBackend
+
+	backend = MemoryCacheBackend()
+	mock_invalidate = mocker.spy(backend, 'invalidate')
+	cache_set = CACHE(condition=lambda skip_events, env, query: True, backend=backend)
+	cache_set.namespace = 'namespace'
+	user_id = ObjectId()
+	await backend.set(
+		namespace='namespace',
+		key='query',
+		value=b'',
+		query_time=datetime.datetime.utcnow(),
+		expiry=None,
+		ids=[],
+		deps={'user': [[str(user_id)]]},
+	)
+	doc_id = ObjectId()
+	doc_user_id = ObjectId()
+	# [DOC] Only scalar attrs of written docs, and update doc are sent to backend, with other values replaced by placeholder
+	await cache_set.invalidate_backend(
+		docs=[{'_id': doc_id, 'user': doc_user_id, 'file': {'content': b'content'}}],
+		doc={'name': 'new_name', 'user': {'_id': user_id, 'tags': {1, 2}}},
+	)
+	mock_invalidate.assert_awaited_once_with(
+		namespace='namespace',
+		docs=[{'_id': doc_id, 'user': doc_user_id}],
+		doc={'name': 'new_name', 'user': {'$': None}},
+	)
+	bson.encode(mock_invalidate.call_args.kwargs)
+	# [DOC] Placeholder affects cached queries depending on attr, as update doc value would
+	assert await backend.get(namespace='namespace', key='query') == None
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidate_backend_failure(mocker):
+	from nawah.cache import MemoryCacheBackend
+
+	backend = MemoryCacheBackend()
+	cache_set = CACHE(condition=lambda skip_events, env, query: True, backend=backend)
+	cache_set.namespace = 'namespace'
+	backend_version = await cache_set.backend_version()
+
+	# [DOC] Failing to invalidate docs falls back to clearing namespace, bumping its version
+	mock_invalidate = mocker.patch.object(
+		backend,
+		'invalidate',
+		mocker.AsyncMock(side_effect=[Exception('Failed'), None]),
+	)
+	await cache_set.invalidate_backend(docs=[{'_id': ObjectId()}])
+	assert mock_invalidate.await_args_list[1] == mocker.call(
+		namespace='namespace', docs=None
+	)
+	assert not cache_set._backend_stale
+
+	# [DOC] Failing to clear namespace as well stops reading from, and storing in backend
+	mock_invalidate.side_effect = Exception('Failed')
+	await cache_set.invalidate_backend(docs=[{'_id': ObjectId()}])
+	assert cache_set._backend_stale
+	mock_get = mocker.patch.object(backend, 'get', mocker.AsyncMock(return_value=None))
+	mock_set = mocker.patch.object(backend, 'set', mocker.AsyncMock())
+	assert await cache_set.load_query(query_key='query') == None
+	mock_get.assert_not_awaited()
+	cache_set.cache_query(query_key='query', results=_results())
+	await cache_set.store_query(
+		query_key='query',
+		cached_query=cache_set.queries['query'],
+		version=backend_version,
+	)
+	mock_set.assert_not_awaited()
+
+	# [DOC] Reading from backend resumes once namespace is cleared
+	mock_invalidate.side_effect = None
+	assert await cache_set.load_query(query_key='query') == None
+	mock_get.assert_awaited_once()
+	assert not cache_set._backend_stale
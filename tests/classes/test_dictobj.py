@@ -0,0 +1,65 @@
+from nawah.classes import DictObj, BaseModel
+
+from bson import ObjectId
+
+import pytest, copy
+
+
+def test_dictobj_attrs():
+	dictobj = DictObj({'attr': 'val', 'keys_attr': ['item']})
+	assert dictobj.attr == 'val'
+	assert dictobj['keys_attr'] == ['item']
+	assert 'attr' in dictobj
+	assert list(dictobj.keys()) == ['attr', 'keys_attr']
+	assert dictobj == {'attr': 'val', 'keys_attr': ['item']}
+	with pytest.raises(AttributeError):
+		dictobj.missing_attr
+	with pytest.raises(AttributeError):
+		dictobj.attr = 'new_val'
+	with pytest.raises(TypeError):
+		DictObj([('attr', 'val')])
+
+
+def test_dictobj_attrs_precedence():
+	# [DOC] Stored attrs named as mapping methods take precedence over methods when accessed as object attributes, and methods remain accessible through class
+	dictobj = DictObj({'keys': ['key'], 'items': 3, 'get': 'val'})
+	assert dictobj.keys == ['key']
+	assert dictobj.items == 3
+	assert dictobj.get == 'val'
+	assert list(DictObj.keys(dictobj)) == ['keys', 'items', 'get']
+	assert dictobj['keys'] == ['key']
+	assert DictObj({'attr': 'val'}).get('attr') == 'val'
+	base_model = BaseModel({'_id': ObjectId(), 'values': [1, 2]})
+	assert base_model.values == [1, 2]
+	assert list(BaseModel({'attr': 'val'}).values()) == ['val']
+
+
+def test_dictobj_copy_on_write(mocker):
+	deepcopy = mocker.spy(copy, 'deepcopy')
+	dictobj = DictObj({'attr': 'val', 'nested': {'list': [1]}})
+	dictobj_copy = DictObj(dictobj)
+	# [DOC] Reading immutable values doesn't copy shared attrs
+	assert dictobj_copy.attr == 'val'
+	deepcopy.assert_not_called()
+
+	# [DOC] Mutating either of shared DictObj doesn't affect the other
+	dictobj_copy.nested['list'].append(2)
+	dictobj['attr'] = 'new_val'
+	assert dictobj == {'attr': 'new_val', 'nested': {'list': [1]}}
+	assert dictobj_copy == {'attr': 'val', 'nested': {'list': [1, 2]}}
+
+	deepcopy_dictobj = copy.deepcopy(dictobj)
+	del deepcopy_dictobj['attr']
+	assert 'attr' in dictobj
+
+
+def test_base_model_lazy_wrap():
+	user_id = ObjectId()
+	attrs = {'_id': ObjectId(), 'user': {'_id': user_id, 'name': 'user'}, 'meta': {'key': 'val'}}
+	base_model = BaseModel(attrs)
+	# [DOC] Original dict is not mutated, nested dicts having _id are wrapped when accessed
+	assert type(attrs['user']) == dict
+	assert type(base_model.user) == BaseModel
+	assert base_model.user._id == user_id
+	assert type(base_model.meta) == dict
+	assert type(BaseModel(base_model).user) == BaseModel
@@ -0,0 +1,77 @@
+from nawah.classes import EXPORT_STREAM, BaseModel
+
+from bson import ObjectId
+
+import pytest, copy
+
+
+async def _docs(docs):
+	for doc in docs:
+		yield BaseModel(doc)
+
+
+async def _encode(export_stream):
+	return [chunk async for chunk in export_stream.encode()]
+
+
+@pytest.mark.asyncio
+async def test_export_stream_ndjson():
+	export_stream = EXPORT_STREAM(docs=_docs([{'attr': 1}, {'attr': 2}]))
+	assert export_stream.content_type == 'application/x-ndjson; charset=utf-8'
+	chunks = await _encode(export_stream)
+	assert b''.join(chunks).replace(b' ', b'') == b'{"attr":1}\n{"attr":2}\n'
+
+
+@pytest.mark.asyncio
+async def test_export_stream_csv():
+	doc_id = ObjectId()
+	export_stream = EXPORT_STREAM(
+		docs=_docs(
+			[
+				{'_id': doc_id, 'name': 'a,b', 'tags': ['x'], 'extra': None},
+				{'_id': doc_id, 'name': 'c'},
+			]
+		),
+		format='csv',
+	)
+	assert export_stream.content_type == 'text/csv; charset=utf-8'
+	chunks = await _encode(export_stream)
+	rows = b''.join(chunks).decode('utf-8').split('\r\n')
+	assert rows[0] == '_id,name,tags,extra'
+	assert rows[1].replace(' ', '') == f'{doc_id},"a,b","[""x""]",'
+	assert rows[2] == f'{doc_id},c,,'
+
+
+@pytest.mark.asyncio
+async def test_export_stream_chunks():
+	export_stream = EXPORT_STREAM(
+		docs=_docs([{'attr': i} for i in range(10)]),
+		format='csv',
+		attrs=['attr'],
+		chunk_size=4,
+	)
+	chunks = await _encode(export_stream)
+	# [DOC] Header is sent with first row, every other chunk holds two rows
+	assert chunks[0] == b'attr\r\n0\r\n1\r\n'
+	assert len(chunks) == 5
+
+
+def test_export_stream_deepcopy():
+	export_stream = EXPORT_STREAM(docs=_docs([]))
+	assert copy.deepcopy({'stream': export_stream})['stream'] is export_stream
+
+
+def test_export_stream_content_disposition():
+	assert EXPORT_STREAM(docs=_docs([])).content_disposition == None
+	assert (
+		EXPORT_STREAM(docs=_docs([]), name='export.csv').content_disposition
+		== 'attachment; filename="export.csv"; filename*=UTF-8\'\'export.csv'
+	)
+	# [DOC] Quotes, line breaks, and non-ASCII chars are not passed to header as-is
+	content_disposition = EXPORT_STREAM(
+		docs=_docs([]), name='a"b\r\nSet-Cookie: x=1;ملف.csv'
+	).content_disposition
+	assert '\r' not in content_disposition and '\n' not in content_disposition
+	assert content_disposition.startswith('attachment; filename="a_b__Set-Cookie_ x_1_')
+	assert content_disposition.count('"') == 2
+	assert content_disposition.isascii()
@@ -0,0 +1,92 @@
+from nawah.classes import (
+	DictObj,
+	BaseModel,
+	StdJSONSerializer,
+	OrjsonJSONSerializer,
+	_json_serializer,
+)
+from nawah.classes._json_encoder import _DefaultJSONSerializer
+
+from bson import ObjectId
+
+import pytest, datetime, json, sys
+
+
+def _results():
+	return DictObj(
+		{
+			'status': 200,
+			'msg': 'Found 1 docs.',
+			'args': DictObj(
+				{
+					'count': 1,
+					'docs': [
+						BaseModel(
+							{
+								'_id': ObjectId('f00000000000000000000001'),
+								'create_time': datetime.datetime(2021, 1, 1, 10, 30),
+								'file': b'content',
+								'nested': DictObj({1: 'one'}),
+							}
+						)
+					],
+				}
+			),
+		}
+	)
+
+
+def _check_encoded(encoded):
+	assert json.loads(encoded) == {
+		'status': 200,
+		'msg': 'Found 1 docs.',
+		'args': {
+			'count': 1,
+			'docs': [
+				{
+					'_id': 'f00000000000000000000001',
+					'create_time': '2021-01-01T10:30:00',
+					'file': True,
+					'nested': {'1': 'one'},
+				}
+			],
+		},
+	}
+
+
+def test_std_json_serializer(mocker):
+	attrs = mocker.spy(DictObj, '_attrs')
+	serializer = StdJSONSerializer()
+	_check_encoded(serializer.encode(_results()))
+	_check_encoded(serializer.encode_bytes(_results()).decode('utf-8'))
+	# [DOC] DictObj, BaseModel values are encoded without being copied
+	attrs.assert_not_called()
+
+
+def test_orjson_json_serializer(mocker):
+	pytest.importorskip('orjson')
+	attrs = mocker.spy(DictObj, '_attrs')
+	serializer = OrjsonJSONSerializer()
+	_check_encoded(serializer.encode(_results()))
+	_check_encoded(serializer.encode_bytes(_results()))
+	attrs.assert_not_called()
+	# [DOC] Values orjson can't serialise are encoded by JSONEncoder
+	assert json.loads(serializer.encode({'big': 2 ** 70})) == {'big': 2 ** 70}
+
+
+def test_json_serializer_config(mocker, preserve_state):
+	import nawah.config
+
+	with preserve_state(nawah.config, 'Config'):
+		serializer = StdJSONSerializer()
+		nawah.config.Config.json_serializer = serializer
+		assert _json_serializer() is serializer
+
+
+def test_json_serializer_default_std(mocker):
+	mocker.patch.object(_DefaultJSONSerializer, 'serializer', None)
+	# [DOC] Simulate orjson not being installed
+	mocker.patch.dict(sys.modules, {'orjson': None})
+	serializer = _json_serializer()
+	assert type(serializer) == StdJSONSerializer
+	assert _json_serializer() is serializer
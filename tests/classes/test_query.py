@@ -0,0 +1,152 @@
+import copy
+
+from nawah.classes import Query
+
+
+def test_query_copy():
+	in_vals = ['val1', 'val2']
+	query = Query([{'attr': {'$in': in_vals}, '__or': [{'attr': 'val'}]}, {'$limit': 10}])
+	query_copy = query._copy()
+	assert type(query_copy) == Query
+	assert query_copy == query
+	assert query_copy['$limit'] == 10
+	assert query_copy['attr:$in'][0] == in_vals
+
+	# [DOC] Setting, deleting attrs of copy doesn't affect original query
+	del query_copy['attr:$in'][0]
+	del query_copy['$limit']
+	query_copy['attr'][0] = 'new_val'
+	assert 'attr:$in' in query
+	assert query['attr'][0] == 'val'
+	assert query['$limit'] == 10
+	# [DOC] Attrs values are shared
+	assert query['attr:$in'][0] is in_vals
+
+
+def test_query_append_index():
+	query = Query([{'attr1': 'val1'}])
+	query.append({'attr2': {'$gt': 5}, '$limit': 5})
+	query.append({'$skip': 2})
+	assert len(query) == 2
+	assert query == [{'attr1': 'val1'}, {'attr2': {'$gt': 5}}]
+	assert query['$limit'] == 5
+	assert query['$skip'] == 2
+	assert query['attr2:$gt'][0] == 5
+	assert query._index['attr2'] == [{'oper': '$gt', 'path': [1], 'val': {'$gt': 5}}]
+
+
+def test_query_index_set_attr(mocker):
+	query = Query([{'attr1': 'val1'}, {'attr2': 'val2'}])
+	spy_create_index = mocker.spy(query, '_create_index')
+	query['attr2'][0] = {'$in': ['val2', 'val3']}
+	assert query == [{'attr1': 'val1'}, {'attr2': {'$in': ['val2', 'val3']}}]
+	assert query['attr2:$in'][0] == ['val2', 'val3']
+	assert 'attr2:$eq' not in query
+	spy_create_index.assert_not_called()
+
+
+def test_query_index_del_attr():
+	query = Query(
+		[
+			{'attr1': 'val1'},
+			{'__or': [{'attr1': 'val2'}, {'attr2': 'val3'}]},
+			{'attr2': 'val4', 'attr3': 'val5'},
+		]
+	)
+	del query['attr1']['*']
+	# [DOC] Emptied steps are removed, and paths of following steps are updated
+	assert query == [{'__or': [{'attr2': 'val3'}]}, {'attr2': 'val4', 'attr3': 'val5'}]
+	assert 'attr1' not in query
+	assert query._index['attr2'][0]['path'] == [0, '__or', 0]
+	assert query._index['attr3'][0]['path'] == [1]
+	del query['attr2'][0]
+	assert query == [{'attr2': 'val4', 'attr3': 'val5'}]
+	query['attr3'][0] = 'val6'
+	assert query == [{'attr2': 'val4', 'attr3': 'val6'}]
+
+
+def test_query_index_replace_attr():
+	query = Query([{'attr1': 'val1'}, {'attr2': 'val2'}])
+	query['attr1'].replace_attr(0, 'attr3')
+	assert query == [{'attr3': 'val1'}, {'attr2': 'val2'}]
+	assert 'attr1' not in query
+	assert query['attr3'][0] == 'val1'
+	query['attr3'][0] = 'val3'
+	assert query == [{'attr3': 'val3'}, {'attr2': 'val2'}]
+
+
+def test_query_index_leading_special_step():
+	query = Query([{'$limit': 10}, {'user': 'u1'}, {'status': 'active'}])
+	# [DOC] Index paths point to steps of sanitised query, with special-only steps removed
+	assert query == [{'user': 'u1'}, {'status': 'active'}]
+	assert query._index['user'][0]['path'] == [0]
+	query.append({'owner': 'o1'})
+	query['user'][0] = 'u2'
+	assert query == [{'user': 'u2'}, {'status': 'active'}, {'owner': 'o1'}]
+	assert query['$limit'] == 10
+	del query['user'][0]
+	assert query == [{'status': 'active'}, {'owner': 'o1'}]
+	query['owner'][0] = 'o2'
+	assert query == [{'status': 'active'}, {'owner': 'o2'}]
+
+
+def test_query_index_or_special_step():
+	query = Query(
+		[
+			{'__or': [{'$skip': 5}, {'attr1': 'val1'}, {'attr2': 'val2'}]},
+			{'__or': [{'$sort': {'attr1': 1}}]},
+			{'attr3': 'val3'},
+		]
+	)
+	assert query == [{'__or': [{'attr1': 'val1'}, {'attr2': 'val2'}]}, {'attr3': 'val3'}]
+	assert query['$skip'] == 5
+	assert query['$sort'] == {'attr1': 1}
+	assert query._index['attr1'][0]['path'] == [0, '__or', 0]
+	assert query._index['attr3'][0]['path'] == [1]
+	query['attr2'][0] = 'val4'
+	query['attr3'][0] = 'val5'
+	assert query == [{'__or': [{'attr1': 'val1'}, {'attr2': 'val4'}]}, {'attr3': 'val5'}]
+	query.append({'__or': [{'$limit': 1}, {'attr4': 'val6'}]})
+	assert query._index['attr4'][0]['path'] == [2, '__or', 0]
+	query['attr4'][0] = 'val7'
+	assert list(query)[2] == {'__or': [{'attr4': 'val7'}]}
+
+
+def test_query_index_paths_after_mutations():
+	import random
+
+	attrs = ['attr1', 'attr2', 'attr3']
+	for seed in range(200):
+		rand = random.Random(seed)
+
+		def rand_step():
+			step = {rand.choice(attrs): rand.randint(0, 9)}
+			if rand.random() < 0.3:
+				step['$limit'] = rand.randint(1, 9)
+			if rand.random() < 0.3:
+				step['__or'] = [
+					{rand.choice(attrs): rand.randint(0, 9)} for _ in range(rand.randint(0, 2))
+				]
+			if rand.random() < 0.2:
+				step = {'$skip': rand.randint(1, 9)}
+			return step
+
+		query = Query([rand_step() for _ in range(rand.randint(0, 4))])
+		for _ in range(10):
+			action = rand.choice(['append', 'set', 'del', 'replace'])
+			attr = rand.choice(attrs)
+			if action == 'append':
+				query.append(rand_step())
+			elif attr in query:
+				i = rand.randrange(len(query[attr]))
+				if action == 'set':
+					query[attr][i] = rand.randint(10, 19)
+				elif action == 'del':
+					del query[attr][i]
+				else:
+					query[attr].replace_attr(i, rand.choice(attrs))
+			# [DOC] Every index record points to step holding its attr, and query matches index re-created from it
+			for index_attr, records in query._index.items():
+				for record in records:
+					assert query._get_step(record['path'])[index_attr] == record['val']
+			assert query._index == Query(copy.deepcopy(list(query)))._index
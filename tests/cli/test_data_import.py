@@ -0,0 +1,79 @@
+from nawah.base_module import BaseModule
+from nawah.classes import ATTR
+from nawah.cli._data import _read_rows, _import_docs
+
+from pymongo.errors import BulkWriteError
+
+import pytest, io, json
+
+
+class MockImportModule(BaseModule):
+	collection = 'import_collection'
+	attrs = {'name': ATTR.STR(), 'count': ATTR.INT()}
+
+
+def test_read_rows_csv():
+	rows = list(
+		_read_rows(
+			file=io.StringIO('name,count\n001,2\nname_2,\n'),
+			file_format='csv',
+			attrs=MockImportModule.attrs,
+		)
+	)
+	# [DOC] Values of STR attrs are kept as-is, other values are decoded from JSON
+	assert rows == [(2, {'name': '001', 'count': 2}, None), (3, {'name': 'name_2'}, None)]
+
+
+def test_read_rows_ndjson():
+	rows = list(
+		_read_rows(
+			file=io.StringIO('{"name": "name_1"}\n\nnot json\n[1]\n'),
+			file_format='ndjson',
+			attrs=MockImportModule.attrs,
+		)
+	)
+	assert rows[0] == (1, {'name': 'name_1'}, None)
+	assert [row[0] for row in rows[1:]] == [3, 4]
+	assert rows[1][2].startswith('Invalid JSON')
+	assert rows[2][2] == 'Row is not JSON object.'
+
+
+@pytest.mark.asyncio
+async def test_import_docs(mocker):
+	inserted_batches = []
+
+	async def create_many(*, docs, **kwargs):
+		inserted_batches.append(docs)
+		if len(inserted_batches) == 2:
+			raise BulkWriteError(
+				{'nInserted': 1, 'writeErrors': [{'index': 1, 'errmsg': 'duplicate key'}]}
+			)
+		return {'count': len(docs), 'docs': []}
+
+	mocker.patch('nawah.data.create_many', side_effect=create_many)
+	report_file = io.StringIO()
+	rows = [
+		(1, {'name': 'name_1', 'count': 1}, None),
+		(2, {'name': 'name_2', 'count': 'invalid'}, None),
+		(3, {'name': 'name_3', 'count': 3, 'extra': True}, None),
+		(4, None, 'Invalid JSON'),
+		(5, {'name': 'name_5', 'count': 5}, None),
+		(6, {'name': 'name_6', 'count': 6}, None),
+	]
+
+	import_stats = await _import_docs(
+		env={},
+		module=MockImportModule(),
+		rows=iter(rows),
+		batch_size=2,
+		concurrency=2,
+		report_file=report_file,
+	)
+	assert import_stats['rows'] == 6
+	assert import_stats['inserted'] == 3
+	assert import_stats['rejected'] == 3
+	assert inserted_batches[0] == [{'name': 'name_1', 'count': 1}, {'name': 'name_3', 'count': 3}]
+
+	report = [json.loads(line) for line in report_file.getvalue().splitlines()]
+	assert sorted(line['row'] for line in report if 'row' in line) == [2, 4, 6]
+	assert report[-1]['summary']['inserted'] == 3
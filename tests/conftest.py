@@ -60,6 +60,18 @@ def mock_module():
 	return _
 
 
+@pytest.fixture
+def mock_collection(mocker):
+	# [DOC] Return conn, and collection returned by conn for any db, collection names, with collection methods set per kwargs
+	def _(**methods):
+		collection = mocker.Mock(**methods)
+		conn = mocker.MagicMock()
+		conn.__getitem__.return_value.__getitem__.return_value = collection
+		return (conn, collection)
+
+	return _
+
+
 @pytest.fixture
 def attr_obj():
 	return {
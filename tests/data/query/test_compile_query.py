@@ -223,4 +223,26 @@ def test_compile_query_one_step(mocker):
 		attrs={},
 		step={'attr': 'match_term'},
 		watch_mode=False,
-	)
\ No newline at end of file
+	)
+
+def test_compile_query_no_mutation():
+	query = Query(
+		[
+			{
+				'_id': 'f00000000000000000000001',
+				'__or': [{'attr': {'$bet': [1, 2]}}, {'attr': 3}],
+				'__deleted': True,
+				'$limit': 1,
+			}
+		]
+	)
+	query_str = str(query)
+	_query._compile_query(
+		collection_name='collection_name',
+		attrs={'attr': ATTR.INT()},
+		query=query,
+		watch_mode=False,
+	)
+	assert str(query) == query_str
+	assert '__deleted' in query
+	assert query['$limit'] == 1
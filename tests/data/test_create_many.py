@@ -0,0 +1,22 @@
+from nawah.data import create_many
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_create_many(mocker, mock_collection):
+	conn, collection = mock_collection(
+		insert_many=mocker.AsyncMock(return_value=mocker.Mock(inserted_ids=['id_1', 'id_2']))
+	)
+
+	results = await create_many(
+		env={'conn': conn},
+		collection_name='diff',
+		attrs={},
+		docs=[{'module': 'module_1'}, {'module': 'module_2'}],
+	)
+	assert results['count'] == 2
+	assert [doc._id for doc in results['docs']] == ['id_1', 'id_2']
+	collection.insert_many.assert_awaited_once_with(
+		[{'module': 'module_1'}, {'module': 'module_2'}], ordered=False
+	)
@@ -0,0 +1,29 @@
+from nawah.data import increment
+
+from pymongo import ReturnDocument
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_increment(mocker, mock_collection):
+	conn, collection = mock_collection(
+		find_one_and_update=mocker.AsyncMock(return_value={'_id': 'id', 'val': 7})
+	)
+
+	val = await increment(
+		env={'conn': conn},
+		collection_name='settings',
+		query={'var': '__counter:counter'},
+		attr='val',
+		val=2,
+		doc={'type': 'global'},
+	)
+	assert val == 7
+	collection.find_one_and_update.assert_awaited_once_with(
+		{'var': '__counter:counter'},
+		{'$inc': {'val': 2}, '$setOnInsert': {'type': 'global'}},
+		projection={'val': True},
+		upsert=True,
+		return_document=ReturnDocument.AFTER,
+	)
@@ -0,0 +1,135 @@
+from nawah.classes import ATTR, Query, BaseModel
+from nawah.data import _read, create
+
+from bson import ObjectId
+
+import pytest, asyncio
+
+
+@pytest.mark.asyncio
+async def test_read_single_flight(mocker):
+	doc_id = ObjectId()
+
+	async def execute_read(**kwargs):
+		await asyncio.sleep(0.01)
+		return {
+			'total': 1,
+			'count': 1,
+			'docs': [BaseModel({'_id': doc_id, 'attr': 'val'})],
+			'groups': {},
+		}
+
+	mock_execute_read = mocker.patch.object(
+		_read, '_execute_read', mocker.AsyncMock(side_effect=execute_read)
+	)
+	results = await asyncio.gather(
+		*[
+			_read.read(
+				env={}, collection_name='collection_name', attrs={}, query=Query([{'_id': doc_id}])
+			)
+			for _ in range(3)
+		]
+	)
+	assert mock_execute_read.await_count == 1
+	assert [results_item['docs'][0]['attr'] for results_item in results] == ['val'] * 3
+	# [DOC] Each call receives private copy of results
+	results[0]['docs'][0]['attr'] = 'new_val'
+	assert results[1]['docs'][0]['attr'] == 'val'
+	assert results[0]['docs'][0] is not results[2]['docs'][0]
+	assert _read._reads_in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_read_single_flight_different_queries(mocker):
+	mock_execute_read = mocker.patch.object(
+		_read,
+		'_execute_read',
+		mocker.AsyncMock(return_value={'total': 0, 'count': 0, 'docs': [], 'groups': []}),
+	)
+	await asyncio.gather(
+		_read.read(env={}, collection_name='collection_name', attrs={}, query=Query([])),
+		_read.read(
+			env={}, collection_name='collection_name', attrs={}, query=Query([{'$limit': 1}])
+		),
+		_read.read(
+			env={},
+			collection_name='collection_name',
+			attrs={},
+			query=Query([]),
+			skip_extn=True,
+		),
+	)
+	assert mock_execute_read.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_read_single_flight_exception(mocker):
+	async def execute_read(**kwargs):
+		await asyncio.sleep(0.01)
+		raise Exception('read failed')
+
+	mocker.patch.object(_read, '_execute_read', mocker.AsyncMock(side_effect=execute_read))
+	results = await asyncio.gather(
+		*[
+			_read.read(env={}, collection_name='collection_name', attrs={}, query=Query([]))
+			for _ in range(2)
+		],
+		return_exceptions=True,
+	)
+	assert [str(results_item) for results_item in results] == ['read failed'] * 2
+	assert _read._reads_in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_read_single_flight_after_write(mocker, mock_collection):
+	read_vals = iter(['val', 'new_val'])
+
+	async def execute_read(**kwargs):
+		read_val = next(read_vals)
+		await asyncio.sleep(0.02)
+		return {'total': 1, 'count': 1, 'docs': [BaseModel({'attr': read_val})], 'groups': []}
+
+	mock_execute_read = mocker.patch.object(
+		_read, '_execute_read', mocker.AsyncMock(side_effect=execute_read)
+	)
+	conn, _ = mock_collection(
+		insert_one=mocker.AsyncMock(return_value=mocker.Mock(inserted_id=ObjectId()))
+	)
+
+	read_task = asyncio.create_task(
+		_read.read(env={}, collection_name='collection_name', attrs={}, query=Query([]))
+	)
+	await asyncio.sleep(0)
+	await create(env={'conn': conn}, collection_name='collection_name', attrs={}, doc={})
+	# [DOC] Read started after write doesn't join in-flight read started before it
+	results = await _read.read(
+		env={}, collection_name='collection_name', attrs={}, query=Query([])
+	)
+	assert (await read_task)['docs'][0]['attr'] == 'val'
+	assert results['docs'][0]['attr'] == 'new_val'
+	assert mock_execute_read.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_stages(mocker):
+	mock_execute_read = mocker.patch.object(
+		_read,
+		'_execute_read',
+		mocker.AsyncMock(return_value={'total': 0, 'count': 0, 'docs': [], 'groups': []}),
+	)
+	stages = [{'$group': {'_id': '$attr'}}]
+	await _read.read(
+		env={},
+		collection_name='collection_name',
+		attrs={'attr': ATTR.STR()},
+		query=Query([{'attr': 'val', '$attrs': ['attr'], '$limit': 1}]),
+		stages=stages,
+	)
+	# [DOC] Stages are applied before query match, and $attrs, with sort, skip, limit applied after them
+	aggregate_query = mock_execute_read.await_args.kwargs['aggregate_query']
+	stages_index = aggregate_query.index(stages[0])
+	assert [
+		i for i, stage in enumerate(aggregate_query) if stage == {'$match': {'attr': 'val'}}
+	][0] > stages_index
+	assert aggregate_query[-1]['$group'] == {'_id': '$_id', 'attr': {'$first': '$attr'}}
+	assert mock_execute_read.await_args.kwargs['limit'] == 1
@@ -0,0 +1,88 @@
+from nawah.classes import Query
+from nawah.data import stream
+
+import pytest
+
+
+class _Cursor:
+	def __init__(self, *, mocker, docs):
+		self.docs = docs
+		self.close = mocker.AsyncMock()
+
+	async def __aiter__(self):
+		for doc in self.docs:
+			yield doc
+
+
+@pytest.mark.asyncio
+async def test_stream(mocker, mock_collection):
+	cursor = _Cursor(mocker=mocker, docs=[{'_id': i} for i in range(3)])
+	conn, collection = mock_collection(aggregate=mocker.Mock(return_value=cursor))
+
+	docs = [
+		doc
+		async for doc in stream(
+			env={'conn': conn},
+			collection_name='collection',
+			attrs={},
+			query=Query([{'$limit': 3}]),
+			batch_size=2,
+		)
+	]
+	assert [doc._id for doc in docs] == [0, 1, 2]
+	aggregate_query = collection.aggregate.call_args.args[0]
+	assert aggregate_query[-1] == {'$limit': 3}
+	assert collection.aggregate.call_args.kwargs['batchSize'] == 2
+	cursor.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_stop_early(mocker, mock_collection):
+	cursor = _Cursor(mocker=mocker, docs=[{'_id': i} for i in range(3)])
+	conn, _ = mock_collection(aggregate=mocker.Mock(return_value=cursor))
+
+	docs = stream(
+		env={'conn': conn},
+		collection_name='collection',
+		attrs={},
+		query=Query([]),
+		batch_size=2,
+	)
+	async for doc in docs:
+		break
+	# [DOC] Cursor is closed when consumer stops early
+	await docs.aclose()
+	cursor.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_extn_models_batch(mocker, mock_collection):
+	from nawah.data import _read
+
+	cursor = _Cursor(mocker=mocker, docs=[{'_id': i} for i in range(5)])
+	conn, _ = mock_collection(aggregate=mocker.Mock(return_value=cursor))
+	extns_models = []
+
+	async def process_results_doc(*, extn_models, doc, **kwargs):
+		extn_models[str(doc['_id'])] = None
+		extns_models.append(extn_models)
+		return doc
+
+	mocker.patch.object(_read, '_process_results_doc', side_effect=process_results_doc)
+	docs = [
+		doc
+		async for doc in stream(
+			env={'conn': conn},
+			collection_name='collection',
+			attrs={},
+			query=Query([]),
+			batch_size=2,
+		)
+	]
+	assert len(docs) == 5
+	# [DOC] extn_models is reset every batch
+	assert [list(extn_models.keys()) for extn_models in extns_models[::2]] == [
+		['0', '1'],
+		['2', '3'],
+		['4'],
+	]
@@ -0,0 +1,152 @@
+from nawah.classes import ATTR
+from nawah.data import update
+from nawah.data._update import _compile_update
+
+from bson import ObjectId
+
+import pytest
+
+
+async def _update_doc(*, mocker, mock_collection, doc, attrs=None):
+	conn, collection = mock_collection(
+		update_many=mocker.AsyncMock(return_value=mocker.Mock(modified_count=1))
+	)
+
+	await update(
+		env={'conn': conn},
+		collection_name='collection',
+		attrs=attrs or {},
+		docs=[ObjectId()],
+		doc=doc,
+	)
+	return collection.update_many.await_args.args[1]
+
+
+def _optional_attr(*, attr_type):
+	attr_type._default = None
+	return attr_type
+
+
+@pytest.mark.asyncio
+async def test_update_native_operators(mocker, mock_collection):
+	update_doc = await _update_doc(
+		mocker=mocker,
+		mock_collection=mock_collection,
+		doc={
+			'attr_str': 'str',
+			'attr_dict.child': {'key': 'val'},
+			'attr_add': {'$add': 1, '$field': None},
+			'attr_multiply': {'$multiply': 2, '$field': None},
+			'attr_append': {'$append': 'val', '$unique': False},
+			'attr_append_unique': {'$append': 'val', '$unique': True},
+			'attr_del_val': {'$del_val': ['val_1', 'val_2']},
+			'attr_del_index': {'$del_index': 'key'},
+		},
+		attrs={
+			'attr_add': ATTR.INT(),
+			'attr_multiply': ATTR.FLOAT(),
+			'attr_append': ATTR.LIST(list=[ATTR.STR()]),
+			'attr_append_unique': ATTR.LIST(list=[ATTR.STR()]),
+		},
+	)
+	assert update_doc == {
+		'$set': {
+			'attr_str': 'str',
+			'attr_dict.child': {'key': 'val'},
+		},
+		'$inc': {'attr_add': 1},
+		'$mul': {'attr_multiply': 2},
+		'$push': {'attr_append': 'val'},
+		'$addToSet': {'attr_append_unique': 'val'},
+		'$pull': {'attr_del_val': {'$in': ['val_1', 'val_2']}},
+		'$unset': {'attr_del_index.key': ''},
+	}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+	'doc',
+	[
+		# [DOC] Index paths
+		{'attr_list:0.child': 'val'},
+		# [DOC] $add with another field
+		{'attr_add': {'$add': 1, '$field': 'attr_other'}},
+		# [DOC] Setting index, which can be past end of LIST
+		{'attr_set_index': {'$set_index': 'val', '$index': 1}},
+		{'attr_set_index': {'$set_index': 'val', '$index': -1}},
+		# [DOC] Attrs that can be null
+		{'attr_add': {'$add': 1, '$field': None}},
+		{'attr_multiply': {'$multiply': 2, '$field': None}},
+		{'attr_append': {'$append': 'val', '$unique': False}},
+		# [DOC] Removing LIST item by index
+		{'attr_del_index': {'$del_index': 0}},
+		# [DOC] Conflicting paths
+		{'attr_dict': {'child': 'val'}, 'attr_dict.child': 'val'},
+		# [DOC] Values with keys starting with $
+		{'attr_dict': {'$key': 'val'}},
+	],
+)
+async def test_update_pipeline_fallback(mocker, mock_collection, doc):
+	update_doc = await _update_doc(
+		mocker=mocker,
+		mock_collection=mock_collection,
+		doc=doc,
+		attrs={
+			'attr_add': _optional_attr(attr_type=ATTR.INT()),
+			'attr_multiply': _optional_attr(attr_type=ATTR.FLOAT()),
+			'attr_append': _optional_attr(attr_type=ATTR.LIST(list=[ATTR.STR()])),
+			'attr_set_index': ATTR.LIST(list=[ATTR.STR()]),
+		},
+	)
+	assert type(update_doc) == list
+
+
+@pytest.mark.asyncio
+async def test_update_plan_cache(mocker, mock_collection):
+	update_plans = mocker.patch('nawah.data._update._update_plans', {})
+	compile_update = mocker.patch(
+		'nawah.data._update._compile_update',
+		side_effect=_compile_update,
+	)
+	attrs = {'status': ATTR.STR(), 'counter': ATTR.INT()}
+
+	update_doc = await _update_doc(
+		mocker=mocker,
+		mock_collection=mock_collection,
+		doc={'status': 'active', 'counter': {'$add': 1, '$field': None}},
+		attrs=attrs,
+	)
+	assert update_doc == {'$set': {'status': 'active'}, '$inc': {'counter': 1}}
+	# [DOC] Doc of same shape with different values reuses compiled update
+	update_doc = await _update_doc(
+		mocker=mocker,
+		mock_collection=mock_collection,
+		doc={'status': 'inactive', 'counter': {'$add': 5, '$field': None}},
+		attrs=attrs,
+	)
+	assert update_doc == {'$set': {'status': 'inactive'}, '$inc': {'counter': 5}}
+	assert compile_update.call_count == 1
+	assert len(update_plans) == 1
+
+	# [DOC] Doc of same shape with value requiring update pipeline binds values into compiled pipeline
+	update_doc = await _update_doc(
+		mocker=mocker,
+		mock_collection=mock_collection,
+		doc={'status': {'$key': 'val'}, 'counter': {'$add': 2, '$field': None}},
+		attrs=attrs,
+	)
+	assert type(update_doc) == list
+	assert update_doc[0] == {'$set': {'status': {'$literal': {'$key': 'val'}}}}
+	assert update_doc[1]['$set']['counter']['$add'][1] == 2
+	assert compile_update.call_count == 1
+
+	# [DOC] Doc of same shape for attr that can be null uses separate update plan
+	update_doc = await _update_doc(
+		mocker=mocker,
+		mock_collection=mock_collection,
+		doc={'status': 'active', 'counter': {'$add': 1, '$field': None}},
+		attrs={'status': ATTR.STR(), 'counter': _optional_attr(attr_type=ATTR.INT())},
+	)
+	assert type(update_doc) == list
+	assert update_doc[1]['$set']['counter']['$add'][0]['$cond']['then'] == 0
+	assert len(update_plans) == 2
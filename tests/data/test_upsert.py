@@ -0,0 +1,33 @@
+from nawah.data import upsert
+
+from pymongo import UpdateOne
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_upsert(mocker, mock_collection):
+	conn, collection = mock_collection(
+		bulk_write=mocker.AsyncMock(
+			return_value=mocker.Mock(
+				matched_count=1, upserted_count=1, upserted_ids={1: 'upserted_id'}
+			)
+		)
+	)
+
+	results = await upsert(
+		env={'conn': conn},
+		collection_name='analytics',
+		updates=[
+			({'event': 'event_1'}, {'$inc': {'score': 1}}),
+			({'event': 'event_2'}, {'$inc': {'score': 2}}),
+		],
+	)
+	assert results == {'count': 2, 'docs': [{'_id': 'upserted_id'}]}
+	collection.bulk_write.assert_awaited_once_with(
+		[
+			UpdateOne({'event': 'event_1'}, {'$inc': {'score': 1}}, upsert=True),
+			UpdateOne({'event': 'event_2'}, {'$inc': {'score': 2}}, upsert=True),
+		],
+		ordered=False,
+	)
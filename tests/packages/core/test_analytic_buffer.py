@@ -0,0 +1,267 @@
+from nawah.config import Config
+from nawah.classes import DictObj, Query
+from nawah.packages.core.analytic import Analytic
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+import pytest
+
+
+def _env(*, user):
+	return {'session': DictObj({'user': DictObj({'_id': user})})}
+
+
+@pytest.mark.asyncio
+async def test_analytic_buffer_aggregates_occurrences(mocker):
+	analytic_module = Analytic()
+	mocker.patch.object(Analytic, '_analytics_buffer', {})
+	mocker.patch.object(Analytic, '_analytics_buffer_size', 0)
+	data_upsert = mocker.patch(
+		'nawah.data.upsert', new=mocker.AsyncMock(return_value={'count': 2, 'docs': []})
+	)
+	user = ObjectId()
+
+	analytic_module.enqueue(
+		env=_env(user=user),
+		doc={'event': 'event', 'subevent': 'subevent', 'args': {'arg': 1}, 'score': 2},
+	)
+	analytic_module.enqueue(
+		env=_env(user=user),
+		doc={'event': 'event', 'subevent': 'subevent', 'args': {'arg': 2}, 'score': 3},
+	)
+	# [DOC] subevent of unhashable type is buffered under its own key
+	analytic_module.enqueue(
+		env=_env(user=user),
+		doc={'event': 'event', 'subevent': {'sub': 'event'}, 'args': {}},
+	)
+	assert len(Analytic._analytics_buffer) == 2
+	data_upsert.assert_not_awaited()
+
+	await analytic_module.flush(env={})
+	assert Analytic._analytics_buffer == {}
+	data_upsert.assert_awaited_once()
+	updates = data_upsert.await_args.kwargs['updates']
+	assert len(updates) == 2
+	query, update = updates[0]
+	assert query['user'] == user
+	assert query['event'] == 'event'
+	assert query['subevent'] == 'subevent'
+	assert [occurrence['args'] for occurrence in update['$push']['occurrences']['$each']] == [
+		{'arg': 1},
+		{'arg': 2},
+	]
+	assert query['bucket_count'] == {'$lte': Config.analytics_bucket_size - 2}
+	assert update['$inc'] == {'bucket_count': 2, 'score': 5}
+	assert updates[1][0]['subevent'] == {'sub': 'event'}
+
+
+@pytest.mark.asyncio
+async def test_analytic_buffer_restored_on_failed_flush(mocker):
+	analytic_module = Analytic()
+	mocker.patch.object(Analytic, '_analytics_buffer', {})
+	mocker.patch.object(Analytic, '_analytics_buffer_size', 0)
+	mocker.patch('nawah.data.upsert', new=mocker.AsyncMock(side_effect=Exception()))
+	user = ObjectId()
+
+	analytic_module.enqueue(
+		env=_env(user=user), doc={'event': 'event', 'subevent': None, 'args': {}, 'score': 1}
+	)
+	await analytic_module.flush(env={})
+
+	assert len(Analytic._analytics_buffer) == 1
+	entry = list(Analytic._analytics_buffer.values())[0]
+	assert len(entry['occurrences']) == 1
+	assert Analytic._analytics_buffer_size == 1
+
+
+@pytest.mark.asyncio
+async def test_analytic_buffer_restores_failed_updates_only(mocker):
+	analytic_module = Analytic()
+	mocker.patch.object(Analytic, '_analytics_buffer', {})
+	mocker.patch.object(Analytic, '_analytics_buffer_size', 0)
+	mocker.patch(
+		'nawah.data.upsert',
+		new=mocker.AsyncMock(
+			side_effect=BulkWriteError({'writeErrors': [{'index': 1, 'code': 1}]})
+		),
+	)
+	user = ObjectId()
+
+	for event in ['event_1', 'event_2', 'event_3']:
+		analytic_module.enqueue(
+			env=_env(user=user), doc={'event': event, 'subevent': None, 'args': {}}
+		)
+	await analytic_module.flush(env={})
+
+	# [DOC] Occurrences of updates written by unordered bulk write are not restored, to not count them twice
+	assert [entry['query']['event'] for entry in Analytic._analytics_buffer.values()] == [
+		'event_2'
+	]
+	assert Analytic._analytics_buffer_size == 1
+
+
+@pytest.mark.asyncio
+async def test_analytic_buffer_cap(mocker):
+	analytic_module = Analytic()
+	mocker.patch.object(Analytic, '_analytics_buffer', {})
+	mocker.patch.object(Analytic, '_analytics_buffer_size', 0)
+	mocker.patch.object(Analytic, '_analytics_dropped', 0)
+	mocker.patch.object(Config, 'analytics_buffer_cap', 3)
+	mocker.patch('nawah.data.upsert', new=mocker.AsyncMock(side_effect=Exception()))
+	user = ObjectId()
+
+	for i in range(2):
+		analytic_module.enqueue(
+			env=_env(user=user), doc={'event': 'event', 'subevent': i, 'args': {}}
+		)
+	await analytic_module.flush(env={})
+	for i in range(2, 5):
+		analytic_module.enqueue(
+			env=_env(user=user), doc={'event': 'event', 'subevent': i, 'args': {}}
+		)
+	# [DOC] Buffer doesn't grow past its cap, while flushes are failing
+	assert Analytic._analytics_buffer_size == 3
+	assert Analytic._analytics_dropped == 2
+
+	await analytic_module.flush(env={})
+	assert Analytic._analytics_buffer_size == 3
+	assert Analytic._analytics_dropped == 0
+
+
+def test_analytic_buffer_capped_buckets(mocker):
+	mocker.patch.object(Config, 'analytics_bucket_size', 2)
+	updates = Analytic._entry_updates(
+		entry={
+			'query': {'event': 'event'},
+			'occurrences': [{'args': {}, 'score': i, 'create_time': ''} for i in range(5)],
+		}
+	)
+	assert [query['bucket_count'] for query, _ in updates] == [
+		{'$lte': 0},
+		{'$lte': 0},
+		{'$lte': 1},
+	]
+	assert [update['$inc'] for _, update in updates] == [
+		{'bucket_count': 2, 'score': 1},
+		{'bucket_count': 2, 'score': 5},
+		{'bucket_count': 1, 'score': 4},
+	]
+
+
+@pytest.mark.asyncio
+async def test_analytic_query_by_id_matches_buckets(mocker):
+	user = ObjectId()
+	bucket_id = ObjectId()
+	data_read = mocker.patch(
+		'nawah.data.read',
+		new=mocker.AsyncMock(
+			return_value={
+				'count': 1,
+				'docs': [
+					DictObj(
+						{
+							'_id': bucket_id,
+							'user': user,
+							'event': 'event',
+							'subevent': None,
+							'date': '2021-01-01',
+						}
+					)
+				],
+			}
+		),
+	)
+	query = Query([{'_id': bucket_id}, {'$limit': 5}])
+	await Analytic()._expand_buckets_query(env={}, query=query)
+	assert data_read.await_args.kwargs['query']['_id:$in'][0] == [bucket_id]
+	# [DOC] Query by _id of merged doc is replaced with attrs its buckets are merged by
+	assert '_id' not in query
+	assert query == [
+		{
+			'__or': [
+				{'user': user, 'event': 'event', 'subevent': None, 'date': '2021-01-01'}
+			]
+		}
+	]
+	assert query['$limit'] == 5
+
+
+@pytest.mark.asyncio
+async def test_analytic_query_without_id(mocker):
+	data_read = mocker.patch('nawah.data.read', new=mocker.AsyncMock())
+	query = Query([{'event': 'event'}])
+	await Analytic()._expand_buckets_query(env={}, query=query)
+	data_read.assert_not_awaited()
+	assert query == [{'event': 'event'}]
+
+
+@pytest.mark.asyncio
+async def test_analytic_create_validates_doc(mocker):
+	from nawah.classes import MethodException
+
+	data_upsert = mocker.patch(
+		'nawah.data.upsert', new=mocker.AsyncMock(return_value={'count': 1, 'docs': []})
+	)
+	analytic = Analytic()
+	_, _, _, _, payload = await analytic.pre_create(
+		skip_events=[],
+		env=_env(user=ObjectId()),
+		query=Query([]),
+		doc={'event': 'event', 'subevent': 'subevent', 'args': {}, 'score': 2},
+		payload={},
+	)
+	assert payload['__results'].status == 200
+	assert data_upsert.await_args.kwargs['updates'][0][1]['$inc']['score'] == 2
+
+	# [DOC] Doc failing validation of attrs is not upserted
+	data_upsert.reset_mock()
+	with pytest.raises(MethodException):
+		await analytic.pre_create(
+			skip_events=[],
+			env=_env(user=ObjectId()),
+			query=Query([]),
+			doc={'event': 'event', 'subevent': 'subevent', 'args': {}, 'score': 'score'},
+			payload={},
+		)
+	data_upsert.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_analytic_update_occurrences_score(mocker):
+	from nawah.classes import MethodException
+
+	mocker.patch('nawah.data.read', new=mocker.AsyncMock())
+	analytic = Analytic()
+	for doc in [
+		{'occurrences': {'$append': {'args': {}, 'score': 1}}},
+		{'score': {'$add': 1}},
+		{'occurrences.0.score': 1},
+	]:
+		with pytest.raises(MethodException):
+			await analytic.pre_update(
+				skip_events=[], env={}, query=Query([{'event': 'event'}]), doc=doc, payload={}
+			)
+	await analytic.pre_update(
+		skip_events=[], env={}, query=Query([{'event': 'event'}]), doc={'subevent': 'x'}, payload={}
+	)
+
+
+def test_analytic_read_stages_before_attrs():
+	from nawah.data._query import _compile_query
+
+	*_, aggregate_query = _compile_query(
+		collection_name='analytics',
+		attrs=Analytic.attrs,
+		query=Query([{'score': 5, '$attrs': ['score', 'occurrences']}]),
+		watch_mode=False,
+		stages=Analytic.read_stages,
+	)
+	# [DOC] Buckets are merged before docs are matched by, and projected to attrs of merged doc
+	merge_index = aggregate_query.index(Analytic.read_stages[2])
+	assert aggregate_query.index({'$match': {'score': 5}}) > merge_index
+	assert aggregate_query[-1]['$group'] == {
+		'_id': '$_id',
+		'score': {'$first': '$score'},
+		'occurrences': {'$first': '$occurrences'},
+	}
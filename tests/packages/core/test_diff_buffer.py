@@ -0,0 +1,120 @@
+from nawah.classes import DictObj
+from nawah.packages.core.diff import Diff
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+import pytest
+
+
+def _env(*, user):
+	return {'session': DictObj({'user': DictObj({'_id': user})})}
+
+
+@pytest.mark.asyncio
+async def test_diff_buffer_flush(mocker):
+	diff_module = Diff()
+	mocker.patch.object(Diff, '_diff_buffer', [])
+	mocker.patch.object(Diff, '_buffering', True)
+	data_create_many = mocker.patch(
+		'nawah.data.create_many', new=mocker.AsyncMock(return_value={'count': 2, 'docs': []})
+	)
+	user = ObjectId()
+	docs = [ObjectId(), ObjectId()]
+	update_doc = {'attr': {'$add': 1}, 'dict_attr.child': 'val'}
+
+	await diff_module.enqueue(
+		env=_env(user=user), module_name='module', docs=docs, vars=update_doc
+	)
+	# [DOC] Update doc owned by caller can be mutated after enqueue, without affecting Diff docs
+	update_doc['attr']['$add'] = 2
+	data_create_many.assert_not_awaited()
+
+	await diff_module.flush(env={})
+	assert Diff._diff_buffer == []
+	diff_docs = data_create_many.await_args.kwargs['docs']
+	assert [diff_doc['doc'] for diff_doc in diff_docs] == docs
+	assert diff_docs[0]['user'] == user
+	assert diff_docs[0]['module'] == 'module'
+	# [DOC] Dot-notated attrs of vars are expanded, as create call does
+	assert diff_docs[0]['vars'] == {'attr': {'__$add': 1}, 'dict_attr': {'child': 'val'}}
+
+
+@pytest.mark.asyncio
+async def test_diff_enqueue_without_diff_loop(mocker):
+	diff_module = Diff()
+	mocker.patch.object(Diff, '_diff_buffer', [])
+	data_create_many = mocker.patch(
+		'nawah.data.create_many', new=mocker.AsyncMock(return_value={'count': 1, 'docs': []})
+	)
+	doc_id = ObjectId()
+
+	# [DOC] Without diff_loop running, Diff docs are written by enqueue call
+	await diff_module.enqueue(
+		env=_env(user=ObjectId()), module_name='module', docs=[doc_id], vars={'attr': 'val'}
+	)
+	assert Diff._diff_buffer == []
+	assert data_create_many.await_args.kwargs['docs'][0]['doc'] == doc_id
+
+
+@pytest.mark.asyncio
+async def test_diff_enqueue_invalid_doc(mocker):
+	diff_module = Diff()
+	mocker.patch.object(Diff, '_diff_buffer', [])
+	mocker.patch.object(Diff, '_buffering', True)
+
+	# [DOC] Diff doc failing validation is not buffered
+	await diff_module.enqueue(
+		env={'session': None}, module_name='module', docs=[ObjectId()], vars={'attr': 'val'}
+	)
+	assert Diff._diff_buffer == []
+
+
+@pytest.mark.asyncio
+async def test_diff_buffer_restored_on_failed_flush(mocker):
+	diff_module = Diff()
+	mocker.patch.object(Diff, '_diff_buffer', [])
+	mocker.patch.object(Diff, '_buffering', True)
+	mocker.patch(
+		'nawah.data.create_many',
+		new=mocker.AsyncMock(
+			side_effect=BulkWriteError(
+				{
+					'writeErrors': [
+						{'index': 0, 'code': 11000},
+						{'index': 2, 'code': 1},
+					]
+				}
+			)
+		),
+	)
+	docs = [ObjectId(), ObjectId(), ObjectId()]
+
+	await diff_module.enqueue(
+		env=_env(user=ObjectId()), module_name='module', docs=docs, vars={}
+	)
+	await diff_module.flush(env={})
+
+	# [DOC] Diff doc failing with duplicate key error is already written, and is not restored
+	assert [diff_doc['doc'] for diff_doc in Diff._diff_buffer] == [docs[2]]
+
+
+@pytest.mark.asyncio
+async def test_diff_pre_create_multiple_docs(mocker):
+	diff_module = Diff()
+	diff_create = mocker.AsyncMock()
+	# [DOC] Module methods are accessed through methods dict, replace create method with mock
+	diff_module.methods = {**Diff.methods, 'create': diff_create}
+	docs = [ObjectId(), ObjectId(), ObjectId()]
+
+	from nawah.classes import Query
+
+	_, _, query, doc, _ = await diff_module.pre_create(
+		skip_events=[],
+		env={},
+		query=Query([{'_id': {'$in': docs}}]),
+		doc={'module': 'module', 'vars': {}},
+		payload={},
+	)
+	assert diff_create.await_count == 2
+	assert doc['doc'] == docs[2]
@@ -0,0 +1,280 @@
+from nawah.classes import ATTR, DictObj
+from nawah.packages.core.setting import Setting
+from nawah.packages.core.user import User
+
+from bson import ObjectId
+
+import pytest
+
+
+def _setting_results(*, settings):
+	return DictObj(
+		{
+			'status': 200,
+			'args': DictObj(
+				{'count': len(settings), 'docs': [DictObj(setting) for setting in settings]}
+			),
+		}
+	)
+
+
+@pytest.mark.asyncio
+async def test_setting_cache_dynamic_attr(mocker):
+	setting_module = Setting()
+	await setting_module._invalidate_settings()
+	setting_read = mocker.AsyncMock(
+		return_value=_setting_results(
+			settings=[
+				{
+					'_id': ObjectId(),
+					'user': ObjectId(),
+					'var': 'var',
+					'type': 'global',
+					'val': {'type': 'INT', 'args': {'ranges': [[0, 10]]}},
+				}
+			]
+		)
+	)
+	# [DOC] Module methods are accessed through methods dict, replace read method with mock
+	setting_module.methods = {**Setting.methods, 'read': setting_read}
+
+	dynamic_attr = await setting_module._read_dynamic_attr(
+		env={}, setting_type='global', user=None, var='var'
+	)
+	assert type(dynamic_attr) == ATTR
+	assert dynamic_attr._type == 'INT'
+	assert dynamic_attr._args['ranges'] == [[0, 10]]
+
+	# [DOC] Second call is served from cache, with same dynamic ATTR
+	assert (
+		await setting_module._read_dynamic_attr(
+			env={}, setting_type='global', user=None, var='var'
+		)
+		is dynamic_attr
+	)
+	assert setting_read.await_count == 1
+
+	# [DOC] Updating setting invalidates its cache
+	await setting_module.update_cache(
+		docs=[{'_id': ObjectId(), 'var': 'var', 'type': 'global', 'user': ObjectId()}],
+		doc={'val': {'type': 'STR', 'args': {}}},
+	)
+	await setting_module._read_dynamic_attr(
+		env={}, setting_type='global', user=None, var='var'
+	)
+	assert setting_read.await_count == 2
+
+	# [DOC] Missing setting is cached, and is not read again until invalidated
+	setting_read.return_value = _setting_results(settings=[])
+	for _ in range(2):
+		assert (
+			await setting_module._read_dynamic_attr(
+				env={}, setting_type='global', user=None, var='missing_var'
+			)
+			== None
+		)
+	assert setting_read.await_count == 3
+	await setting_module.update_cache(
+		docs=[{'_id': ObjectId(), 'var': 'missing_var', 'type': 'global'}]
+	)
+	await setting_module._read_dynamic_attr(
+		env={}, setting_type='global', user=None, var='missing_var'
+	)
+	assert setting_read.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_setting_cache_user_on_read(mocker, preserve_state):
+	import nawah.config
+
+	with preserve_state(nawah.config, 'Config'):
+		setting_module = Setting()
+		await setting_module._invalidate_settings()
+		users_ids = [ObjectId(), ObjectId(), ObjectId()]
+		setting_read = mocker.AsyncMock(
+			return_value=_setting_results(
+				settings=[
+					{
+						'_id': ObjectId(),
+						'user': users_ids[0],
+						'var': 'setting_attr',
+						'type': 'user',
+						'val': 'val0',
+					},
+					{
+						'_id': ObjectId(),
+						'user': users_ids[1],
+						'var': 'setting_attr',
+						'type': 'user',
+						'val': 'val1',
+					},
+				]
+			)
+		)
+		setting_module.methods = {**Setting.methods, 'read': setting_read}
+		nawah.config.Config.modules = {'setting': setting_module}
+		nawah.config.Config.user_attrs = {}
+		nawah.config.Config.user_doc_settings = ['setting_attr']
+		nawah.config.Config.user_settings = {
+			'setting_attr': mocker.Mock(type='user', default='default_val')
+		}
+
+		def _results():
+			return {'docs': [DictObj({'_id': user_id}) for user_id in users_ids]}
+
+		user_module = User()
+		results, *_ = await user_module.on_read(
+			results=_results(), skip_events=[], env={}, query=[], doc={}, payload={}
+		)
+		# [DOC] Settings of all users are read in single call
+		assert setting_read.await_count == 1
+		assert setting_read.await_args.kwargs['query'] == [
+			{'user': {'$in': users_ids}, 'var': {'$in': ['setting_attr']}}
+		]
+		assert [user['setting_attr'] for user in results['docs']] == [
+			'val0',
+			'val1',
+			'default_val',
+		]
+
+		# [DOC] Missing settings are cached as well, and all users are served from cache
+		results, *_ = await user_module.on_read(
+			results=_results(), skip_events=[], env={}, query=[], doc={}, payload={}
+		)
+		assert setting_read.await_count == 1
+		assert [user['setting_attr'] for user in results['docs']] == [
+			'val0',
+			'val1',
+			'default_val',
+		]
+
+		# [DOC] Only users with invalidated settings are read again
+		await setting_module.update_cache(
+			docs=[
+				{'_id': ObjectId(), 'var': 'setting_attr', 'type': 'user', 'user': users_ids[2]}
+			]
+		)
+		results, *_ = await user_module.on_read(
+			results=_results(), skip_events=[], env={}, query=[], doc={}, payload={}
+		)
+		assert setting_read.await_count == 2
+		assert setting_read.await_args.kwargs['query'] == [
+			{'user': {'$in': [users_ids[2]]}, 'var': {'$in': ['setting_attr']}}
+		]
+
+
+@pytest.mark.asyncio
+async def test_setting_cache_update_invalidation(preserve_state):
+	import nawah.config
+
+	setting_module = Setting()
+	users_ids = [str(ObjectId()), str(ObjectId())]
+
+	def _cache_settings():
+		Setting._settings_cache = {
+			('user', users_ids[0], 'locale'): {'val': 'en', 'dynamic_attr': None},
+			('user', users_ids[1], 'locale'): {'val': 'en', 'dynamic_attr': None},
+			('global', None, 'locale'): {'val': 'en', 'dynamic_attr': None},
+		}
+
+	def _setting(*, user):
+		return {'_id': ObjectId(), 'var': 'locale', 'type': 'user', 'user': ObjectId(user)}
+
+	with preserve_state(nawah.config, 'Config'):
+		nawah.config.Config.cache_bus = None
+
+		# [DOC] Write of settings invalidates only their cache
+		_cache_settings()
+		await setting_module.update_cache(docs=[_setting(user=users_ids[0])], doc={'val': 'ar'})
+		assert set(Setting._settings_cache.keys()) == {
+			('user', users_ids[1], 'locale'),
+			('global', None, 'locale'),
+		}
+		_cache_settings()
+		await setting_module.update_cache(
+			docs=[_setting(user=users_ids[0]), _setting(user=users_ids[1])]
+		)
+		assert set(Setting._settings_cache.keys()) == {('global', None, 'locale')}
+
+		# [DOC] Update changing user, var, or type of setting invalidates all cached settings
+		_cache_settings()
+		await setting_module.update_cache(
+			docs=[_setting(user=users_ids[0])], doc={'user': ObjectId(users_ids[1])}
+		)
+		assert Setting._settings_cache == {}
+
+		# [DOC] Write of unknown docs invalidates all cached settings
+		_cache_settings()
+		await setting_module.update_cache(docs=None)
+		assert Setting._settings_cache == {}
+		_cache_settings()
+		await setting_module.update_cache(docs=[{'_id': ObjectId()}])
+		assert Setting._settings_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_setting_cache_limit(preserve_state):
+	import nawah.config
+
+	with preserve_state(nawah.config, 'Config'):
+		nawah.config.Config.settings_cache_limit = 2
+		setting_module = Setting()
+		await setting_module._invalidate_settings()
+		for var in ['var0', 'var1', 'var2']:
+			setting_module._cache_setting(
+				settings_version=Setting._settings_version,
+				cache_key=('global', None, var),
+				setting={'type': 'global', 'user': None, 'var': var, 'val': var},
+			)
+		# [DOC] Oldest cached setting is evicted
+		assert list(Setting._settings_cache.keys()) == [
+			('global', None, 'var1'),
+			('global', None, 'var2'),
+		]
+
+
+@pytest.mark.asyncio
+async def test_setting_cache_bus(mocker, preserve_state):
+	import nawah.config
+	from nawah.cache._bus import _process_cache_message
+
+	mocker.patch.object(nawah.config.Config, '_sys_env', {}, create=True)
+	with preserve_state(nawah.config, 'Config'):
+		setting_module = Setting()
+		setting_module.module_name = 'setting'
+		nawah.config.Config.modules = {'setting': setting_module}
+		nawah.config.Config.cache_bus = mocker.Mock(publish=mocker.AsyncMock())
+		user_id = str(ObjectId())
+
+		# [DOC] Invalidation is broadcast to other processes
+		await setting_module._invalidate_settings(cache_keys=[('user', user_id, 'locale')])
+		nawah.config.Config.cache_bus.publish.assert_awaited_once_with(
+			message={
+				'module': 'setting',
+				'module_cache': {'cache_keys': [['user', user_id, 'locale']]},
+			}
+		)
+
+		# [DOC] Invalidation received from other process is applied without broadcasting it again
+		Setting._settings_cache = {
+			('user', user_id, 'locale'): {'val': 'en', 'dynamic_attr': None},
+			('global', None, 'locale'): {'val': 'en', 'dynamic_attr': None},
+		}
+		await _process_cache_message(
+			{
+				'module': 'setting',
+				'module_cache': {'cache_keys': [['user', user_id, 'locale']]},
+			}
+		)
+		assert list(Setting._settings_cache.keys()) == [('global', None, 'locale')]
+		await _process_cache_message(
+			{'module': 'setting', 'module_cache': {'cache_keys': None}}
+		)
+		assert Setting._settings_cache == {}
+		assert nawah.config.Config.cache_bus.publish.await_count == 1
+
+		# [DOC] Reset message received when Cache Bus messages were missed clears all settings
+		Setting._settings_cache = {('global', None, 'locale'): {'val': 'en', 'dynamic_attr': None}}
+		await _process_cache_message({'module': '*'})
+		assert Setting._settings_cache == {}
+		assert nawah.config.Config.cache_bus.publish.await_count == 1
@@ -0,0 +1,162 @@
+from nawah.classes import DictObj
+from nawah.packages.core.user import User
+
+from bson import ObjectId
+
+import pytest
+
+
+def _user_results(*, user_id, groups, privileges):
+	return DictObj(
+		{
+			'status': 200,
+			'args': DictObj(
+				{
+					'count': 1,
+					'docs': [
+						DictObj({'_id': user_id, 'groups': groups, 'privileges': privileges})
+					],
+				}
+			),
+		}
+	)
+
+
+def _groups_results(*, groups_privileges):
+	return DictObj(
+		{
+			'status': 200,
+			'args': DictObj(
+				{
+					'count': len(groups_privileges),
+					'docs': [
+						DictObj({'_id': ObjectId(), 'privileges': privileges})
+						for privileges in groups_privileges
+					],
+				}
+			),
+		}
+	)
+
+
+@pytest.mark.asyncio
+async def test_read_privileges_merge_cache(mocker, preserve_state):
+	import nawah.config
+
+	with preserve_state(nawah.config, 'Config'):
+		user_module = User()
+		await user_module._invalidate_privileges()
+		user_id = ObjectId()
+		# [DOC] Module methods are accessed through methods dict, replace read method with mock
+		user_module.methods = {
+			**User.methods,
+			'read': mocker.AsyncMock(
+				side_effect=lambda **kwargs: _user_results(
+					user_id=user_id,
+					groups=[ObjectId(), ObjectId()],
+					privileges={'user': ['read']},
+				)
+			),
+		}
+		group_read = mocker.AsyncMock(
+			return_value=_groups_results(
+				groups_privileges=[
+					{'user': ['read', 'update'], 'blog': ['read']},
+					{'blog': ['read', 'create']},
+				]
+			)
+		)
+		group_module = mocker.Mock(read=group_read)
+		nawah.config.Config.modules = {'user': user_module, 'group': group_module}
+
+		results = await user_module._method_read_privileges(query={'_id': [user_id]})
+		assert results.args.docs[0].privileges == {
+			'user': ['read', 'update'],
+			'blog': ['read', 'create'],
+		}
+		assert group_read.await_count == 1
+
+		# [DOC] Second call is served from cache without reading groups
+		results = await user_module._method_read_privileges(query={'_id': [user_id]})
+		assert results.args.docs[0].privileges == {
+			'user': ['read', 'update'],
+			'blog': ['read', 'create'],
+		}
+		assert group_read.await_count == 1
+
+		# [DOC] Invalidating cache of the user results in reading groups again
+		await user_module._invalidate_privileges(users=[user_id])
+		await user_module._method_read_privileges(query={'_id': [user_id]})
+		assert group_read.await_count == 2
+
+		# [DOC] Bumping groups version results in reading groups again
+		await user_module._invalidate_privileges()
+		await user_module._method_read_privileges(query={'_id': [user_id]})
+		assert group_read.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_read_privileges_cache_bus(mocker, preserve_state):
+	import nawah.config
+	from nawah.cache._bus import _process_cache_message
+
+	mocker.patch.object(nawah.config.Config, '_sys_env', {}, create=True)
+	with preserve_state(nawah.config, 'Config'):
+		user_module = User()
+		user_module.module_name = 'user'
+		nawah.config.Config.modules = {'user': user_module}
+		nawah.config.Config.cache_bus = mocker.Mock(publish=mocker.AsyncMock())
+		users_ids = [str(ObjectId()), str(ObjectId())]
+
+		# [DOC] Invalidation is broadcast to other processes
+		await user_module._invalidate_privileges(users=[ObjectId(users_ids[0])])
+		nawah.config.Config.cache_bus.publish.assert_awaited_once_with(
+			message={'module': 'user', 'module_cache': {'users': [users_ids[0]]}}
+		)
+
+		# [DOC] Invalidation received from other process is applied without broadcasting it again
+		groups_version = User._privileges_groups_version
+		User._privileges_cache = {
+			(user_id, groups_version): {'user': ['read']} for user_id in users_ids
+		}
+		await _process_cache_message(
+			{'module': 'user', 'module_cache': {'users': [users_ids[0]]}}
+		)
+		assert list(User._privileges_cache.keys()) == [(users_ids[1], groups_version)]
+		await _process_cache_message({'module': 'user', 'module_cache': {'users': None}})
+		assert User._privileges_cache == {}
+		assert User._privileges_groups_version == groups_version + 1
+		assert nawah.config.Config.cache_bus.publish.await_count == 1
+
+		# [DOC] Reset message received when Cache Bus messages were missed clears all privileges
+		User._privileges_cache = {(users_ids[0], groups_version + 1): {'user': ['read']}}
+		await _process_cache_message({'module': '*'})
+		assert User._privileges_cache == {}
+		assert nawah.config.Config.cache_bus.publish.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_read_privileges_cache_limit(preserve_state):
+	import nawah.config
+
+	with preserve_state(nawah.config, 'Config'):
+		nawah.config.Config.privileges_cache_limit = 2
+		user_module = User()
+		await user_module._invalidate_privileges()
+		groups_version = User._privileges_groups_version
+		users_ids = [str(ObjectId()) for _ in range(3)]
+		for user_id in users_ids:
+			user_module._cache_privileges(
+				cache_key=(user_id, groups_version), privileges={'user': ['read']}
+			)
+		# [DOC] Oldest cached privileges are evicted
+		assert list(User._privileges_cache.keys()) == [
+			(users_ids[1], groups_version),
+			(users_ids[2], groups_version),
+		]
+
+		# [DOC] Privileges read before groups version was bumped are not cached
+		user_module._cache_privileges(
+			cache_key=(users_ids[0], groups_version - 1), privileges={'user': ['read']}
+		)
+		assert (users_ids[0], groups_version - 1) not in User._privileges_cache.keys()
@@ -0,0 +1,84 @@
+from nawah.classes import ATTR, InvalidAttrException
+from nawah.utils import compile_attr, validate_attr
+
+import pytest, inspect
+
+
+def _ctx(mode='create'):
+	return {
+		'mode': mode,
+		'attr_name': 'test_compile_attr',
+		'skip_events': None,
+		'env': None,
+		'query': None,
+		'doc': None,
+		'scope': None,
+	}
+
+
+def test_compile_attr_sync():
+	attr_type = ATTR.TYPED_DICT(
+		dict={
+			'key1': ATTR.STR(pattern=r'[a-z]+'),
+			'key2': ATTR.LIST(list=[ATTR.INT(), ATTR.ID()]),
+			'key3': ATTR.KV_DICT(key=ATTR.STR(), val=ATTR.UNION(union=[ATTR.BOOL(), ATTR.FLOAT()])),
+		}
+	)
+	validator = compile_attr(attr_type=attr_type)
+	assert not attr_type._validator_async
+	assert not inspect.iscoroutinefunction(validator)
+	# [DOC] Validator is compiled once, and stored on Attr Type
+	assert compile_attr(attr_type=attr_type) is validator
+
+	attr_val = {'key1': 'str', 'key2': ['1', 2], 'key3': {'key': 1}}
+	assert validator(attr_val, _ctx()) == {'key1': 'str', 'key2': [1, 2], 'key3': {'key': 1.0}}
+	# [DOC] Original value is not updated
+	assert attr_val == {'key1': 'str', 'key2': ['1', 2], 'key3': {'key': 1}}
+
+	with pytest.raises(InvalidAttrException):
+		validator({'key1': 'STR', 'key2': [], 'key3': {}}, _ctx())
+
+
+def test_compile_attr_async():
+	async def attr_type_func(*, attr_val, **_):
+		return attr_val
+
+	attr_type = ATTR.LIST(list=[ATTR.STR(), ATTR.TYPE(type=attr_type_func)])
+	validator = compile_attr(attr_type=attr_type)
+	assert attr_type._validator_async
+	assert inspect.iscoroutinefunction(validator)
+	assert not attr_type._args['list'][0]._validator_async
+
+	counter_attr_type = ATTR.UNION(union=[ATTR.COUNTER(pattern='C-$__values:0', values=[lambda **_: 1])])
+	compile_attr(attr_type=counter_attr_type)
+	assert counter_attr_type._validator_async
+
+
+@pytest.mark.asyncio
+async def test_compile_attr_validate_attr_type_default():
+	async def attr_type_func(*, attr_val, **_):
+		return 'default_val'
+
+	attr_type = ATTR.STR()
+	compile_attr(attr_type=attr_type)
+	attr_type._default = ATTR.TYPE(type=attr_type_func)
+	ATTR.validate_type(attr_type=attr_type._default)
+	# [DOC] Default of Attr Type TYPE is called for create calls, even if validator is sync
+	assert (
+		await validate_attr(
+			mode='create',
+			attr_name='test_compile_attr',
+			attr_type=attr_type,
+			attr_val=None,
+		)
+		== 'default_val'
+	)
+	assert (
+		await validate_attr(
+			mode='create_draft',
+			attr_name='test_compile_attr',
+			attr_type=attr_type,
+			attr_val='val',
+		)
+		== 'val'
+	)
@@ -4,7 +4,7 @@ from nawah.utils import validate_attr
 from bson import ObjectId
 from tests.conftest import Module
 
-import pytest
+import pytest, asyncio
 
 
 @pytest.mark.asyncio
@@ -22,25 +22,14 @@ async def test_validate_attr_COUNTER_valid_type():
 
 
 @pytest.mark.asyncio
-async def test_validate_attr_COUNTER_values(
-	preserve_state, mock_module, mock_call_results
-):
-	import nawah.config
+async def test_validate_attr_COUNTER_values(preserve_state, mocker):
+	import nawah.config, nawah.data
 
 	with preserve_state(nawah.config, 'Config'):
-		modules = {
-			'setting': mock_module(
-				read=mock_call_results(
-					status=200,
-					count=1,
-					doc={
-						'_id': ObjectId(),
-						'val': 5,
-					},
-				),
-			)
-		}
-		nawah.config.Config.modules = modules
+		nawah.config.Config.modules = {'setting': mocker.Mock(collection='settings')}
+		mock_increment = mocker.patch.object(
+			nawah.data, 'increment', mocker.AsyncMock(return_value=6)
+		)
 
 		attr_type = ATTR.COUNTER(
 			pattern='COUNTER-$__values:0$__values:1$__values:0-$__counters.order_counter',
@@ -56,3 +45,91 @@ async def test_validate_attr_COUNTER_values(
 			mode='create',
 		)
 		assert attr_val == 'COUNTER-422442-6'
+		mock_increment.assert_awaited_once()
+		assert mock_increment.await_args.kwargs['collection_name'] == 'settings'
+		assert mock_increment.await_args.kwargs['query'] == {
+			'var': '__counter:order_counter',
+			'type': 'global',
+		}
+		assert mock_increment.await_args.kwargs['val'] == 1
+
+
+@pytest.mark.asyncio
+async def test_validate_attr_COUNTER_block(preserve_state, mocker):
+	import nawah.config, nawah.data
+	from nawah.utils import _validate
+
+	increment_vals = iter([3, 6])
+
+	async def increment(**kwargs):
+		await asyncio.sleep(0.01)
+		return next(increment_vals)
+
+	with preserve_state(nawah.config, 'Config'):
+		nawah.config.Config.modules = {'setting': mocker.Mock(collection='settings')}
+		mocker.patch.object(_validate, '_counters_blocks', {})
+		mock_increment = mocker.patch.object(
+			nawah.data, 'increment', mocker.AsyncMock(side_effect=increment)
+		)
+
+		attr_type = ATTR.COUNTER(pattern='$__counters.order_counter', block=3)
+		attr_vals = await asyncio.gather(
+			*[
+				validate_attr(
+					attr_name='test_validate_attr_COUNTER',
+					attr_type=attr_type,
+					attr_val=None,
+					mode='create',
+				)
+				for _ in range(4)
+			]
+		)
+		# [DOC] Values are leased in blocks of 3, with single lease shared by concurrent calls
+		assert sorted(attr_vals) == ['1', '2', '3', '4']
+		assert mock_increment.await_count == 2
+		assert mock_increment.await_args.kwargs['val'] == 3
+		assert _validate._counters_leases == {}
+
+
+@pytest.mark.asyncio
+async def test_validate_attr_COUNTER_invalid_block():
+	for block in [0, -1]:
+		with pytest.raises(InvalidAttrTypeException):
+			ATTR.COUNTER(pattern='$__counters.order_counter', block=block)
+
+
+@pytest.mark.asyncio
+async def test_validate_attr_COUNTER_block_cancel(preserve_state, mocker):
+	import nawah.config, nawah.data
+	from nawah.utils import _validate
+
+	async def increment(**kwargs):
+		await asyncio.sleep(0.01)
+		return 3
+
+	with preserve_state(nawah.config, 'Config'):
+		nawah.config.Config.modules = {'setting': mocker.Mock(collection='settings')}
+		mocker.patch.object(_validate, '_counters_blocks', {})
+		mocker.patch.object(nawah.data, 'increment', mocker.AsyncMock(side_effect=increment))
+
+		attr_type = ATTR.COUNTER(pattern='$__counters.order_counter', block=3)
+
+		def _validate_attr():
+			return asyncio.ensure_future(
+				validate_attr(
+					attr_name='test_validate_attr_COUNTER',
+					attr_type=attr_type,
+					attr_val=None,
+					mode='create',
+				)
+			)
+
+		# [DOC] Cancelling call that started lease doesn't cancel lease for calls waiting for it
+		starter = _validate_attr()
+		await asyncio.sleep(0)
+		waiters = [_validate_attr(), _validate_attr()]
+		await asyncio.sleep(0)
+		starter.cancel()
+		assert sorted(await asyncio.gather(*waiters)) == ['1', '2']
+		assert starter.cancelled()
+		assert _validate._counters_leases == {}
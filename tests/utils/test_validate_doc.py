@@ -1,7 +1,7 @@
 from nawah.classes import ATTR, InvalidAttrException, MissingAttrException
 from nawah import utils, config
 
-import pytest
+import pytest, asyncio
 
 
 @pytest.mark.asyncio
@@ -149,3 +149,76 @@ async def test_validate_doc_allow_update_list_typed_dict_locale_str_dot_notated(
 		doc = {'val.0.address.jp_JP': 'new_address'}
 		await utils.validate_doc(doc=doc, attrs=attrs, mode='update')
 		assert doc == {'val.0.address.jp_JP': 'new_address'}
+
+
+def _type_attr(func, *, ordered=False):
+	attr_type = ATTR.TYPE(type=func, ordered=ordered)
+	ATTR.validate_type(attr_type=attr_type)
+	return attr_type
+
+
+@pytest.mark.asyncio
+async def test_validate_doc_concurrent():
+	attr1_started = asyncio.Event()
+	attr2_started = asyncio.Event()
+
+	async def attr1_type(*, attr_val, **_):
+		attr1_started.set()
+		await attr2_started.wait()
+		return attr_val.upper()
+
+	async def attr2_type(*, attr_val, **_):
+		attr2_started.set()
+		await attr1_started.wait()
+		return attr_val.upper()
+
+	attrs = {
+		'attr1': _type_attr(attr1_type),
+		'attr_int': ATTR.INT(),
+		'attr2': _type_attr(attr2_type),
+	}
+	doc = {'attr1': 'val1', 'attr_int': '42', 'attr2': 'val2'}
+	# [DOC] Validations of attr1, attr2 wait for each other, and can only complete if run concurrently
+	await asyncio.wait_for(
+		utils.validate_doc(mode='create', doc=doc, attrs=attrs, concurrent=True), timeout=1
+	)
+	assert doc == {'attr1': 'VAL1', 'attr_int': 42, 'attr2': 'VAL2'}
+
+
+@pytest.mark.asyncio
+async def test_validate_doc_concurrent_exceptions_order():
+	async def attr1_type(*, attr_name, attr_type, attr_val, **_):
+		await asyncio.sleep(0.01)
+		raise InvalidAttrException(attr_name=attr_name, attr_type=attr_type, val_type=str)
+
+	async def attr2_type(*, attr_name, attr_type, attr_val, **_):
+		raise InvalidAttrException(attr_name=attr_name, attr_type=attr_type, val_type=str)
+
+	attrs = {
+		'attr1': _type_attr(attr1_type),
+		'attr2': _type_attr(attr2_type),
+		'attr_int': ATTR.INT(),
+	}
+	doc = {'attr1': 'val1', 'attr2': 'val2', 'attr_int': 'abc'}
+	with pytest.raises(InvalidAttrException) as e:
+		await utils.validate_doc(mode='create', doc=doc, attrs=attrs, concurrent=True)
+	assert e.value.attr_name == 'attr1'
+
+
+@pytest.mark.asyncio
+async def test_validate_doc_concurrent_ordered():
+	async def attr1_type(*, attr_val, **_):
+		await asyncio.sleep(0.01)
+		return attr_val.upper()
+
+	async def attr2_type(*, attr_val, doc, **_):
+		return f'{doc["attr1"]}:{attr_val}'
+
+	attrs = {
+		'attr1': _type_attr(attr1_type),
+		'attr2': _type_attr(attr2_type, ordered=True),
+	}
+	doc = {'attr1': 'val1', 'attr2': 'val2'}
+	await utils.validate_doc(mode='create', doc=doc, attrs=attrs, concurrent=True)
+	# [DOC] Ordered attr2 is validated after validation of attr1 is complete
+	assert doc == {'attr1': 'VAL1', 'attr2': 'VAL1:val2'}
@@ -0,0 +1,60 @@
+from nawah.classes import CACHE, DictObj
+from nawah.enums import Event
+from nawah.utils import _warm_cache
+
+from types import SimpleNamespace
+
+import pytest, asyncio, logging
+
+
+@pytest.mark.asyncio
+async def test_warm_cache(mocker, preserve_state, caplog):
+	import nawah.config
+
+	mocker.patch.object(nawah.config.Config, '_sys_env', {}, create=True)
+	caplog.set_level(logging.INFO, logger='nawah')
+	with preserve_state(nawah.config, 'Config'):
+		reads_in_progress = []
+
+		async def _read(**kwargs):
+			# [DOC] Check warm queries are read concurrently
+			reads_in_progress.append(kwargs['query'])
+			await asyncio.sleep(0)
+			assert len(reads_in_progress) == 3
+			if kwargs['query'] == [{'fail': True}]:
+				return DictObj({'status': 500, 'msg': 'Failed', 'args': DictObj({})})
+			return DictObj({'status': 200, 'msg': 'Found 0 docs.', 'args': DictObj({})})
+
+		warm_module = SimpleNamespace(
+			cache=[
+				CACHE(
+					condition=lambda skip_events, env, query: True,
+					warm=[[{'attr': 'val'}], [{'fail': True}]],
+				),
+				CACHE(condition=lambda skip_events, env, query: True, warm=[[]]),
+			],
+			read=mocker.AsyncMock(side_effect=_read),
+		)
+		cold_module = SimpleNamespace(cache=[], read=mocker.AsyncMock())
+		nawah.config.Config.modules = {'warm_module': warm_module, 'cold_module': cold_module}
+
+		await _warm_cache()
+		assert warm_module.read.await_count == 3
+		assert warm_module.read.await_args_list[0].kwargs['skip_events'] == [Event.PERM]
+		cold_module.read.assert_not_awaited()
+		assert 'Failed to warm Cache Set of module \'warm_module\'' in caplog.text
+		assert 'with 1 failed queries' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_no_queries(mocker, preserve_state):
+	import nawah.config
+
+	with preserve_state(nawah.config, 'Config'):
+		module = SimpleNamespace(
+			cache=[CACHE(condition=lambda skip_events, env, query: True)],
+			read=mocker.AsyncMock(),
+		)
+		nawah.config.Config.modules = {'module': module}
+		await _warm_cache()
+		module.read.assert_not_awaited()